@@ -5,6 +5,8 @@ Accrual Bot CLI 入口
 - accrual-bot         啟動 Streamlit UI（預設）
 - accrual-bot init    初始化工作區
 - accrual-bot version 顯示版本
+- accrual-bot cache   顯示 / 清除輸入檔案快取
+- accrual-bot batch   多行程並行執行月結批次
 """
 
 import argparse
@@ -147,6 +149,77 @@ def cmd_version(args=None):
     _safe_print(f"accrual-bot v{__version__}")
 
 
+def cmd_cache(args=None):
+    """顯示或清除輸入檔案快取"""
+    from accrual_bot.core.datasources.ingest_cache import get_ingest_cache
+
+    cache = get_ingest_cache()
+    action = getattr(args, "action", "stats")
+
+    if action == "purge":
+        removed = cache.purge()
+        _safe_print(f"已清除輸入快取 {removed} 筆：{cache.cache_dir}")
+        return
+
+    stats = cache.get_stats()
+    _safe_print(f"輸入快取目錄：{stats['cache_dir']}（{'啟用' if stats['enabled'] else '停用'}）")
+    _safe_print(f"   條目數：{stats['entries']}")
+    _safe_print(
+        f"   大小：{stats['size_bytes'] / (1024 * 1024):.2f} MB"
+        f" / 上限 {stats['max_size_bytes'] / (1024 * 1024):.0f} MB"
+    )
+
+
+def cmd_batch(args=None):
+    """以多行程並行執行月結批次（預設讀取 run_config.toml 的 [batch] 區段）"""
+    import json
+
+    from accrual_bot.runner.batch_runner import BatchRunner, load_batch_jobs, parse_job_spec
+
+    config_path = Path(args.config) if getattr(args, "config", None) else None
+    jobs, max_workers = load_batch_jobs(config_path)
+
+    if getattr(args, "jobs", None):
+        processing_date = args.date or (jobs[0].processing_date if jobs else None)
+        if processing_date is None:
+            _safe_print("錯誤：請以 --date 指定處理日期 (YYYYMM)")
+            sys.exit(2)
+        jobs = [parse_job_spec(spec, processing_date) for spec in args.jobs]
+    elif getattr(args, "date", None):
+        for job in jobs:
+            job.processing_date = args.date
+
+    if not jobs:
+        _safe_print("沒有要執行的工作：請在 run_config.toml [batch].jobs 設定或以 --jobs 指定")
+        sys.exit(2)
+
+    if getattr(args, "workers", None) is not None:
+        max_workers = args.workers
+
+    result = BatchRunner(max_workers=max_workers).run(jobs)
+
+    _safe_print("\n" + "=" * 60)
+    _safe_print(f"批次執行: {len(result.jobs)} 個工作，worker 數 {result.max_workers}，"
+                f"耗時 {result.duration:.2f} 秒")
+    for job in result.jobs:
+        _safe_print(f"  [{'成功' if job['success'] else '失敗'}] {job['job']} ({job['duration']:.2f} 秒)")
+        for path in job.get("output_paths", {}).values():
+            _safe_print(f"      輸出: {path}")
+        for error in job.get("errors", [])[:3]:
+            _safe_print(f"      錯誤: {error}")
+    _safe_print("=" * 60)
+
+    if getattr(args, "summary", None):
+        Path(args.summary).write_text(
+            json.dumps(result.to_dict(), ensure_ascii=False, indent=2, default=str),
+            encoding="utf-8",
+        )
+        _safe_print(f"摘要已寫入: {args.summary}")
+
+    if not result.success:
+        sys.exit(1)
+
+
 def main():
     """CLI 主進入點"""
     parser = argparse.ArgumentParser(
@@ -164,12 +237,32 @@ def main():
     # version
     subparsers.add_parser("version", help="顯示版本")
 
+    # cache
+    cache_parser = subparsers.add_parser("cache", help="輸入檔案快取管理")
+    cache_parser.add_argument(
+        "action", nargs="?", choices=["stats", "purge"], default="stats",
+        help="stats 顯示統計（預設），purge 清除所有快取",
+    )
+
+    # batch
+    batch_parser = subparsers.add_parser("batch", help="多行程並行執行月結批次")
+    batch_parser.add_argument(
+        "--jobs", nargs="+", metavar="ENTITY:TYPE",
+        help="工作清單（如 SPX:PO SPX:PR SPT:PROCUREMENT:PO），預設讀取 run_config.toml [batch]",
+    )
+    batch_parser.add_argument("--date", type=int, help="處理日期 (YYYYMM)")
+    batch_parser.add_argument("--workers", type=int, help="worker 行程數，<= 1 時依序執行")
+    batch_parser.add_argument("--config", help="run_config.toml 路徑")
+    batch_parser.add_argument("--summary", help="將結果摘要寫入 JSON 檔")
+
     args = parser.parse_args()
 
     commands = {
         "init": cmd_init,
         "ui": cmd_ui,
         "version": cmd_version,
+        "cache": cmd_cache,
+        "batch": cmd_batch,
         None: cmd_ui,  # 預設啟動 UI
     }
 
@@ -5,7 +5,10 @@
 
 from .base import DataSource, DataSourceType
 from .config import DataSourceConfig
+from .frame_cache import DataFrameCache, get_shared_frame_cache
 from .factory import DataSourceFactory, DataSourcePool
+from .ingest_cache import IngestCache, get_ingest_cache
+from .workbook_writer import WorkbookWriter, write_workbook
 
 # 具體實現
 from .excel_source import ExcelSource
@@ -24,6 +27,12 @@ __all__ = [
     'DataSourceConfig',
     'DataSourceFactory',
     'DataSourcePool',
+    'DataFrameCache',
+    'get_shared_frame_cache',
+    'IngestCache',
+    'get_ingest_cache',
+    'WorkbookWriter',
+    'write_workbook',
     'ExcelSource',
     'CSVSource',
     'ParquetSource',
@@ -10,8 +10,11 @@ import pandas as pd
 import asyncio
 import hashlib
 import json
+from pathlib import Path
 from accrual_bot.utils.logging import get_logger
 from accrual_bot.core.datasources.config import DataSourceConfig
+from accrual_bot.core.datasources.frame_cache import DataFrameCache
+from accrual_bot.core.datasources.ingest_cache import IngestCache, resolve_ingest_cache
 from datetime import datetime, timedelta
 
 
@@ -38,10 +41,18 @@ class DataSource(ABC):
         """
         self.config = config
         self.logger = get_logger(f"datasource.{self.__class__.__name__}")
-        self._cache: Dict[str, Tuple[pd.DataFrame, datetime]] = {}
+        self._cache = DataFrameCache(
+            max_bytes=config.cache_max_bytes,
+            max_items=config.cache_max_items,
+            copy_on_read=config.cache_copy_on_read,
+        )
+        self._cache_shared = False
         self._cache_ttl = timedelta(seconds=config.cache_ttl_seconds)
-        self._cache_max_size = config.cache_max_items
+        self._cache_namespace = self._generate_cache_namespace()
         self._metadata = {}
+        self._ingest_cache_setting = config.connection_params.get('ingest_cache')
+        self._ingest_cache: Optional[IngestCache] = None
+        self._ingest_cache_resolved = False
         
     @abstractmethod
     async def read(self, query: Optional[str] = None, **kwargs) -> pd.DataFrame:
@@ -85,6 +96,9 @@ class DataSource(ABC):
         """
         帶 TTL+LRU 快取的讀取
 
+        快取依位元組預算（cache_max_bytes）與條目上限（cache_max_items）驅逐；
+        cache_copy_on_read=True 時每次返回副本，否則返回共用物件（呼叫端不可修改）。
+
         Args:
             query: 查詢條件
             **kwargs: 額外參數
@@ -97,48 +111,107 @@ class DataSource(ABC):
 
         cache_key = self._generate_cache_key(query, kwargs)
 
-        if cache_key in self._cache:
-            data, timestamp = self._cache[cache_key]
-            if datetime.now() - timestamp < self._cache_ttl:
-                self.logger.debug(f"快取命中 (key={cache_key[:8]}...)")
-                return data.copy()
-            else:
-                del self._cache[cache_key]
-                self.logger.debug(f"快取已過期，重新載入 (key={cache_key[:8]}...)")
+        data = self._cache.get(cache_key)
+        if data is not None:
+            self.logger.debug(f"快取命中 (key={cache_key[-8:]})")
+            return data
 
         data = await self.read(query, **kwargs)
-        self._cache[cache_key] = (data.copy(), datetime.now())
+        stored = self._cache.put(
+            cache_key, data, ttl_seconds=self._cache_ttl.total_seconds()
+        )
+        if stored and self._cache.copy_on_read:
+            # 快取保留原物件，呼叫端取得副本
+            return data.copy()
+        return data
 
-        # LRU 驅逐：超過上限時移除最舊的條目
-        if len(self._cache) > self._cache_max_size:
-            oldest_key = min(self._cache, key=lambda k: self._cache[k][1])
-            del self._cache[oldest_key]
-            self.logger.debug(f"LRU 驅逐快取條目 (key={oldest_key[:8]}...)")
+    def _generate_cache_namespace(self) -> str:
+        """
+        生成數據源識別碼，作為共用快取中的鍵值前綴
 
-        return data
+        Returns:
+            str: 由類別與連接參數組成的 MD5 值
+        """
+        params = {k: v for k, v in self.config.connection_params.items()
+                  if k != 'ingest_cache'}
+        key_data = {'source': self.__class__.__name__, 'params': params}
+        key_json = json.dumps(key_data, sort_keys=True, default=str)
+        return hashlib.md5(key_json.encode('utf-8')).hexdigest()
 
     def _generate_cache_key(self, query: Optional[str], kwargs: dict) -> str:
         """
-        生成 MD5 快取鍵值
+        生成 MD5 快取鍵值（以數據源識別碼為前綴）
 
         Args:
             query: 查詢條件
             kwargs: 額外參數
 
         Returns:
-            str: MD5 快取鍵值
+            str: 快取鍵值
         """
         # 排除日誌相關參數，避免影響快取鍵值
         filtered_kwargs = {k: v for k, v in sorted(kwargs.items())
                            if k not in ('logger', 'log_level')}
         key_data = {'query': query, 'kwargs': filtered_kwargs}
         key_json = json.dumps(key_data, sort_keys=True, default=str)
-        return hashlib.md5(key_json.encode('utf-8')).hexdigest()
+        return f"{self._cache_namespace}:{hashlib.md5(key_json.encode('utf-8')).hexdigest()}"
+
+    def attach_cache(self, cache: DataFrameCache):
+        """
+        改用外部（共用）快取
+
+        Args:
+            cache: 共用的 DataFrameCache
+        """
+        self._cache = cache
+        self._cache_shared = True
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        取得快取統計（命中 / 未命中 / 驅逐次數等）
+
+        Returns:
+            Dict[str, Any]: 快取統計；共用快取時為所有數據源的合計
+        """
+        return {**self._cache.get_stats(), 'shared': self._cache_shared}
+
+    def _get_ingest_cache(self) -> Optional[IngestCache]:
+        """取得輸入檔案持久化快取（connection_params['ingest_cache'] 或全域配置）"""
+        if not self._ingest_cache_resolved:
+            self._ingest_cache = resolve_ingest_cache(self._ingest_cache_setting)
+            self._ingest_cache_resolved = True
+        return self._ingest_cache
+
+    def _read_ingest_cache(self, file_path, params: Dict[str, Any]
+                           ) -> Tuple[Optional[str], Optional[pd.DataFrame]]:
+        """
+        從輸入檔案快取讀取解析結果
+
+        Args:
+            file_path: 輸入檔案路徑
+            params: 影響解析結果的讀取參數
+
+        Returns:
+            Tuple[Optional[str], Optional[pd.DataFrame]]: (快取鍵, 命中的數據)
+        """
+        cache = self._get_ingest_cache()
+        if cache is None:
+            return None, None
+        key = cache.make_key(file_path, params)
+        df = cache.get(key)
+        if df is not None:
+            self.logger.info(f"輸入快取命中: {Path(file_path).name}")
+        return key, df
+
+    def _write_ingest_cache(self, key: Optional[str], data: pd.DataFrame) -> None:
+        """將解析結果寫入輸入檔案快取"""
+        cache = self._get_ingest_cache()
+        if cache is not None and key is not None:
+            cache.put(key, data)
 
     def clear_cache(self):
-        """清除所有快取"""
-        count = len(self._cache)
-        self._cache.clear()
+        """清除此數據源的快取（共用快取中其他數據源的條目不受影響）"""
+        count = self._cache.invalidate(f"{self._cache_namespace}:")
         self.logger.debug(f"快取已清除（共 {count} 筆）")
     
     async def validate_connection(self) -> bool:
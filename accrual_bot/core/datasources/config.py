@@ -30,6 +30,8 @@ class DataSourceConfig:
         lazy_load: 是否延遲載入
         encoding: 編碼（用於文本檔案）
         chunk_size: 分塊大小（用於大檔案）
+        cache_max_bytes: 快取位元組預算（依 memory_usage(deep=True) 計算）
+        cache_copy_on_read: 快取命中時是否返回副本
     """
     source_type: DataSourceType
     connection_params: Dict[str, Any]
@@ -40,6 +42,8 @@ class DataSourceConfig:
     cache_ttl_seconds: int = 300        # 快取過期秒數（預設 5 分鐘）
     cache_max_items: int = 10           # 最大快取條目數
     cache_eviction_policy: str = "lru"  # 驅逐策略
+    cache_max_bytes: Optional[int] = 256 * 1024 * 1024  # 快取位元組上限（預設 256MB）
+    cache_copy_on_read: bool = True     # 命中時返回副本
     
     def validate(self) -> tuple[bool, List[str]]:
         """
@@ -109,7 +113,9 @@ class DataSourceConfig:
             chunk_size=self.chunk_size,
             cache_ttl_seconds=self.cache_ttl_seconds,
             cache_max_items=self.cache_max_items,
-            cache_eviction_policy=self.cache_eviction_policy
+            cache_eviction_policy=self.cache_eviction_policy,
+            cache_max_bytes=self.cache_max_bytes,
+            cache_copy_on_read=self.cache_copy_on_read
         )
     
     @classmethod
@@ -136,7 +142,9 @@ class DataSourceConfig:
             chunk_size=config_dict.get('chunk_size'),
             cache_ttl_seconds=config_dict.get('cache_ttl_seconds', 300),
             cache_max_items=config_dict.get('cache_max_items', 10),
-            cache_eviction_policy=config_dict.get('cache_eviction_policy', 'lru')
+            cache_eviction_policy=config_dict.get('cache_eviction_policy', 'lru'),
+            cache_max_bytes=config_dict.get('cache_max_bytes', 256 * 1024 * 1024),
+            cache_copy_on_read=config_dict.get('cache_copy_on_read', True)
         )
     
     def to_dict(self) -> Dict[str, Any]:
@@ -155,7 +163,9 @@ class DataSourceConfig:
             'chunk_size': self.chunk_size,
             'cache_ttl_seconds': self.cache_ttl_seconds,
             'cache_max_items': self.cache_max_items,
-            'cache_eviction_policy': self.cache_eviction_policy
+            'cache_eviction_policy': self.cache_eviction_policy,
+            'cache_max_bytes': self.cache_max_bytes,
+            'cache_copy_on_read': self.cache_copy_on_read
         }
 
 
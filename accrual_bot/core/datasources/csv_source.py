@@ -4,7 +4,7 @@ CSV數據源實現
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional, Any, List, Union
+from typing import AsyncIterator, Dict, Optional, Any, List, Union
 from pathlib import Path
 import asyncio
 import logging
@@ -86,15 +86,19 @@ class CSVSource(DataSource):
                 if skiprows is not None:
                     read_kwargs['skiprows'] = skiprows
                 
-                # 如果指定了chunk_size，返回迭代器
-                if chunksize:
-                    read_kwargs['chunksize'] = chunksize
-                    chunks = []
-                    for chunk in pd.read_csv(self.file_path, **read_kwargs):
-                        chunks.append(chunk)
-                    df = pd.concat(chunks, ignore_index=True)
-                else:
-                    df = pd.read_csv(self.file_path, **read_kwargs)
+                cache_key, df = self._read_ingest_cache(self.file_path, read_kwargs)
+                
+                if df is None:
+                    # 如果指定了chunk_size，返回迭代器
+                    if chunksize:
+                        read_kwargs['chunksize'] = chunksize
+                        chunks = []
+                        for chunk in pd.read_csv(self.file_path, **read_kwargs):
+                            chunks.append(chunk)
+                        df = pd.concat(chunks, ignore_index=True)
+                    else:
+                        df = pd.read_csv(self.file_path, **read_kwargs)
+                    self._write_ingest_cache(cache_key, df)
                 
                 # 如果有查詢條件，應用篩選
                 if query:
@@ -187,11 +191,53 @@ class CSVSource(DataSource):
             metadata['column_names'] = []
             metadata['num_rows'] = 0
         
+        metadata['cache'] = self.get_cache_stats()
         return metadata
     
+    async def iter_chunks(self, chunk_size: Optional[int] = None) -> AsyncIterator[pd.DataFrame]:
+        """
+        分塊串流讀取CSV文件（每次只在記憶體保留一塊，供串流 Pipeline 使用）
+        
+        Args:
+            chunk_size: 每塊的行數，預設為 config.chunk_size 或 10000
+            
+        Yields:
+            pd.DataFrame: 數據塊（索引延續檔案列號）
+        """
+        chunk_size = chunk_size or self.chunk_size or 10000
+        loop = asyncio.get_running_loop()
+        
+        def open_reader():
+            return pd.read_csv(
+                self.file_path,
+                sep=self.sep,
+                encoding=self.encoding,
+                header=self.header,
+                chunksize=chunk_size,
+                dtype=self.dtype,
+                na_values=self.na_values,
+                parse_dates=self.parse_dates,
+                usecols=self.usecols
+            )
+        
+        count = 0
+        try:
+            reader = await loop.run_in_executor(self._executor, open_reader)
+            with reader:
+                while True:
+                    chunk = await loop.run_in_executor(self._executor, next, reader, None)
+                    if chunk is None:
+                        break
+                    count += 1
+                    yield chunk
+        except Exception as e:
+            self.logger.error(f"Error reading CSV in chunks: {str(e)}")
+            raise
+        self.logger.info(f"Read {count} chunks from CSV")
+    
     async def read_in_chunks(self, chunk_size: int = 10000) -> List[pd.DataFrame]:
         """
-        分塊讀取CSV文件（適合處理大文件）
+        分塊讀取CSV文件並收集為列表（向後兼容；大文件請改用 iter_chunks）
         
         Args:
             chunk_size: 每塊的行數
@@ -199,29 +245,7 @@ class CSVSource(DataSource):
         Returns:
             List[pd.DataFrame]: 數據塊列表
         """
-        def read_chunks_sync():
-            chunks = []
-            try:
-                for chunk in pd.read_csv(
-                    self.file_path,
-                    sep=self.sep,
-                    encoding=self.encoding,
-                    chunksize=chunk_size,
-                    dtype=self.dtype,
-                    na_values=self.na_values,
-                    parse_dates=self.parse_dates
-                ):
-                    chunks.append(chunk)
-                
-                self.logger.info(f"Read {len(chunks)} chunks from CSV")
-                return chunks
-                
-            except Exception as e:
-                self.logger.error(f"Error reading CSV in chunks: {str(e)}")
-                raise
-        
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(self._executor, read_chunks_sync)
+        return [chunk async for chunk in self.iter_chunks(chunk_size)]
     
     async def append_data(self, data: pd.DataFrame) -> bool:
         """
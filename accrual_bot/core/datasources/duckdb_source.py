@@ -1,6 +1,6 @@
 """
 DuckDB數據源實現 - Phase 2 完成版（Transaction支持）
-修復：內存數據庫使用持久連接，文件數據庫使用臨時連接
+修復：內存數據庫使用持久連接，文件數據庫使用連接池
 """
 
 import pandas as pd
@@ -24,20 +24,207 @@ except ImportError:
     from accrual_bot.core.datasources import DataSourceConfig, DataSourceType
 
 
+# 連接資源預設值（可由 connection_params 覆寫）
+DEFAULT_MEMORY_LIMIT = '4GB'
+DEFAULT_POOL_SIZE = 4
+DEFAULT_HEALTH_CHECK_INTERVAL = 60.0
+
+
+def _default_threads() -> int:
+    """預設執行緒數：不超過 4 且不超過本機 CPU 數"""
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def _fetch_arrow(result):
+    """
+    將查詢結果取回為 Arrow Table
+
+    duckdb >= 1.4 以 to_arrow_table 取代 fetch_arrow_table，兩者皆支援。
+    """
+    fetch = getattr(result, 'to_arrow_table', None) or result.fetch_arrow_table
+    return fetch()
+
+
+class DuckDBConnectionPool:
+    """
+    文件數據庫連接池
+
+    - 以單一根連接開啟資料庫檔案，池中連接為其 cursor（各自獨立的連接與 transaction）
+    - memory_limit / threads 於根連接建立時設定一次
+    - 健康檢查延遲執行：僅在連接閒置超過 health_check_interval 或上次使用發生錯誤時檢查
+    """
+
+    def __init__(self,
+                 db_path: str,
+                 read_only: bool = False,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 memory_limit: str = DEFAULT_MEMORY_LIMIT,
+                 threads: Optional[int] = None,
+                 health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+                 logger: Optional[logging.Logger] = None):
+        self.db_path = db_path
+        self.read_only = read_only
+        self.pool_size = max(1, int(pool_size))
+        self.memory_limit = memory_limit
+        self.threads = threads or _default_threads()
+        self.health_check_interval = health_check_interval
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._root: Optional[duckdb.DuckDBPyConnection] = None
+        self._idle: List[Tuple[duckdb.DuckDBPyConnection, float]] = []
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stats = {'created': 0, 'reused': 0, 'health_checks': 0, 'recreated': 0}
+
+    def _create(self) -> duckdb.DuckDBPyConnection:
+        """建立池中連接（根連接的 cursor）"""
+        with self._cond:
+            if self._root is None:
+                # 以 SET 而非 connect(config=...) 設定，避免同檔案不同設定的實例衝突
+                self._root = duckdb.connect(self.db_path, read_only=self.read_only)
+                self._root.execute(f"SET memory_limit='{self.memory_limit}'")
+                self._root.execute(f"SET threads TO {int(self.threads)}")
+                self.logger.debug(
+                    f"Opened pooled DuckDB file {self.db_path} "
+                    f"(memory_limit={self.memory_limit}, threads={self.threads})"
+                )
+            conn = self._root.cursor()
+            self._stats['created'] += 1
+        return conn
+
+    def _is_healthy(self, conn: duckdb.DuckDBPyConnection) -> bool:
+        """連接健康檢查"""
+        self._stats['health_checks'] += 1
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> duckdb.DuckDBPyConnection:
+        """
+        取得連接；池滿時等待其他執行緒歸還
+
+        Args:
+            timeout: 最長等待秒數，None 表示無限等待
+
+        Returns:
+            duckdb.DuckDBPyConnection: 可用連接
+
+        Raises:
+            TimeoutError: 等待逾時
+            RuntimeError: 連接池已關閉
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("DuckDB connection pool is closed")
+            while not self._idle and self._in_use >= self.pool_size:
+                if not self._cond.wait(timeout):
+                    raise TimeoutError(
+                        f"Timed out waiting for DuckDB connection ({self.pool_size} in use)"
+                    )
+            conn, last_used = self._idle.pop() if self._idle else (None, 0.0)
+            self._in_use += 1
+
+        try:
+            if conn is None:
+                return self._create()
+            if time.monotonic() - last_used > self.health_check_interval and not self._is_healthy(conn):
+                self.logger.warning("Pooled DuckDB connection invalid, recreating...")
+                self._close_quietly(conn)
+                self._stats['recreated'] += 1
+                return self._create()
+            self._stats['reused'] += 1
+            return conn
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn: duckdb.DuckDBPyConnection, failed: bool = False) -> None:
+        """
+        歸還連接
+
+        Args:
+            conn: 連接
+            failed: 使用期間是否發生錯誤；是則下次取用時強制健康檢查
+        """
+        with self._cond:
+            self._in_use -= 1
+            if self._closed:
+                self._close_quietly(conn)
+            else:
+                # 發生錯誤的連接以 last_used=-inf 標記，下次取用必定檢查
+                self._idle.append((conn, float('-inf') if failed else time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """取得 / 歸還連接的 context manager"""
+        conn = self.acquire(timeout)
+        failed = False
+        try:
+            yield conn
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.release(conn, failed=failed)
+
+    @staticmethod
+    def _close_quietly(conn: duckdb.DuckDBPyConnection) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """關閉所有閒置連接與根連接（釋放資料庫檔案）"""
+        with self._cond:
+            self._closed = True
+            for conn, _ in self._idle:
+                self._close_quietly(conn)
+            self._idle.clear()
+            if self._root is not None:
+                self._close_quietly(self._root)
+                self._root = None
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """取得連接池統計"""
+        with self._cond:
+            return {
+                **self._stats,
+                'pool_size': self.pool_size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'closed': self._closed,
+            }
+
+
 class DuckDBSource(DataSource):
     """
     DuckDB數據源 - Phase 2 完成版
     
     主要改進：
     - ✅ 內存數據庫：使用線程本地持久連接（避免數據丟失）
-    - ✅ 文件數據庫：使用 context manager 臨時連接（線程安全）
+    - ✅ 文件數據庫：使用連接池（DuckDBConnectionPool）重用連接
     - ✅ Transaction 支持（Phase 2）
     - ✅ 統一的重試邏輯
     - ✅ 向後兼容所有現有 API
     
+    connection_params：
+    - db_path / table_name / read_only
+    - memory_limit: 記憶體上限（預設 '4GB'）
+    - threads: 執行緒數（預設 min(4, CPU 數)）
+    - pool_size: 文件數據庫連接池大小（預設 4；0 表示每次操作建立臨時連接）
+    - health_check_interval: 連接閒置超過此秒數才做健康檢查（預設 60）
+    
     重要說明：
     - 內存DB適合單線程/快速測試
-    - 文件DB適合生產環境/併發場景
+    - 文件DB適合生產環境/併發場景；啟用連接池時資料庫檔案於 close() 前保持開啟
     """
     
     # 類級別的線程池
@@ -51,10 +238,16 @@ class DuckDBSource(DataSource):
             config: 數據源配置
         """
         super().__init__(config)
-        self.db_path = config.connection_params.get('db_path', ':memory:')
-        self.table_name = config.connection_params.get('table_name')
-        self.read_only = config.connection_params.get('read_only', False)
+        params = config.connection_params
+        self.db_path = params.get('db_path', ':memory:')
+        self.table_name = params.get('table_name')
+        self.read_only = params.get('read_only', False)
         self.is_memory_db = (self.db_path == ':memory:')
+        self.memory_limit = params.get('memory_limit', DEFAULT_MEMORY_LIMIT)
+        self.threads = params.get('threads') or _default_threads()
+        self.health_check_interval = params.get('health_check_interval', DEFAULT_HEALTH_CHECK_INTERVAL)
+        self.pool_size = params.get('pool_size', DEFAULT_POOL_SIZE)
+        self._pool: Optional[DuckDBConnectionPool] = None
         
         # 對於內存數據庫，使用線程本地存儲保持持久連接
         if self.is_memory_db:
@@ -62,34 +255,58 @@ class DuckDBSource(DataSource):
             self._lock = threading.Lock()
             self.logger.info("Initialized in-memory DuckDB (persistent connections per thread)")
         else:
-            self.logger.info(f"Initialized file-based DuckDB: {self.db_path}")
+            if self.pool_size:
+                self._pool = DuckDBConnectionPool(
+                    self.db_path,
+                    read_only=self.read_only,
+                    pool_size=self.pool_size,
+                    memory_limit=self.memory_limit,
+                    threads=self.threads,
+                    health_check_interval=self.health_check_interval,
+                    logger=self.logger,
+                )
+            self.logger.info(f"Initialized file-based DuckDB: {self.db_path} (pool_size={self.pool_size})")
     
     # ===== 連接管理 =====
     
+    def _configure(self, conn: duckdb.DuckDBPyConnection) -> None:
+        """套用 connection_params 的記憶體 / 執行緒設定"""
+        conn.execute(f"SET memory_limit='{self.memory_limit}'")
+        conn.execute(f"SET threads TO {int(self.threads)}")
+    
+    def _new_memory_connection(self) -> duckdb.DuckDBPyConnection:
+        conn = duckdb.connect(':memory:', read_only=self.read_only)
+        self._configure(conn)
+        self._local.checked_at = time.monotonic()
+        return conn
+    
     def _get_memory_connection(self) -> duckdb.DuckDBPyConnection:
         """
         獲取內存數據庫的持久連接（每線程一個）
         
+        健康檢查為延遲執行：僅在連接閒置超過 health_check_interval
+        或上次操作失敗後才執行 SELECT 1。
+        
         Returns:
             duckdb.DuckDBPyConnection: 線程本地的持久連接
         """
         if not hasattr(self._local, 'conn') or self._local.conn is None:
             with self._lock:
                 if not hasattr(self._local, 'conn') or self._local.conn is None:
-                    self._local.conn = duckdb.connect(':memory:', read_only=self.read_only)
-                    self._local.conn.execute("SET memory_limit='4GB'")
-                    self._local.conn.execute("SET threads TO 4")
+                    self._local.conn = self._new_memory_connection()
                     self.logger.debug(
                         f"Created persistent memory connection for thread {threading.current_thread().name}")
+            return self._local.conn
         
-        # 健康檢查
-        try:
-            self._local.conn.execute("SELECT 1").fetchone()
-        except Exception:
-            self.logger.warning("Memory connection invalid, recreating...")
-            self._local.conn = duckdb.connect(':memory:', read_only=self.read_only)
-            self._local.conn.execute("SET memory_limit='4GB'")
-            self._local.conn.execute("SET threads TO 4")
+        # 延遲健康檢查
+        now = time.monotonic()
+        if now - getattr(self._local, 'checked_at', float('-inf')) > self.health_check_interval:
+            try:
+                self._local.conn.execute("SELECT 1").fetchone()
+                self._local.checked_at = now
+            except Exception:
+                self.logger.warning("Memory connection invalid, recreating...")
+                self._local.conn = self._new_memory_connection()
         
         return self._local.conn
     
@@ -99,7 +316,7 @@ class DuckDBSource(DataSource):
         獲取數據庫連接的 context manager
         
         - 內存數據庫：返回持久連接（不關閉）
-        - 文件數據庫：創建臨時連接（自動關閉）
+        - 文件數據庫：自連接池取用並於結束時歸還；pool_size=0 時建立臨時連接（自動關閉）
         
         Yields:
             duckdb.DuckDBPyConnection: DuckDB 連接對象
@@ -111,15 +328,24 @@ class DuckDBSource(DataSource):
                 yield conn
             except Exception as e:
                 self.logger.error(f"Memory DB operation error: {e}")
+                # 下次取用時強制健康檢查
+                self._local.checked_at = float('-inf')
                 raise
             # 注意：不關閉內存連接！
+        elif self._pool is not None:
+            # 文件數據庫：連接池
+            try:
+                with self._pool.connection() as conn:
+                    yield conn
+            except Exception as e:
+                self.logger.error(f"File DB operation error: {e}")
+                raise
         else:
             # 文件數據庫：創建臨時連接
             conn = None
             try:
                 conn = duckdb.connect(self.db_path, read_only=self.read_only)
-                conn.execute("SET memory_limit='4GB'")
-                conn.execute("SET threads TO 4")
+                self._configure(conn)
                 self.logger.debug(f"Created file connection for thread {threading.current_thread().name}")
                 yield conn
             except Exception as e:
@@ -200,6 +426,19 @@ class DuckDBSource(DataSource):
     
     # ===== 核心操作方法 =====
     
+    def _build_read_query(self, query: Optional[str], limit: Optional[int]) -> str:
+        """準備讀取查詢（預設表 + LIMIT 子句）"""
+        if query is None:
+            if self.table_name:
+                query = f"SELECT * FROM {self.table_name}"
+            else:
+                raise ValueError("No query provided and no default table specified")
+        
+        # 添加LIMIT子句（如果指定）
+        if limit and 'LIMIT' not in query.upper():
+            query = f"{query} LIMIT {limit}"
+        return query
+    
     async def read(self, query: Optional[str] = None, **kwargs) -> pd.DataFrame:
         """
         異步讀取數據 - 保持 API 不變
@@ -212,17 +451,7 @@ class DuckDBSource(DataSource):
         Returns:
             pd.DataFrame: 查詢結果
         """
-        # 準備查詢語句
-        if query is None:
-            if self.table_name:
-                query = f"SELECT * FROM {self.table_name}"
-            else:
-                raise ValueError("No query provided and no default table specified")
-        
-        # 添加LIMIT子句（如果指定）
-        limit = kwargs.get('limit')
-        if limit and 'LIMIT' not in query.upper():
-            query = f"{query} LIMIT {limit}"
+        query = self._build_read_query(query, kwargs.get('limit'))
         
         def _read_once():
             """單次讀取操作"""
@@ -244,6 +473,36 @@ class DuckDBSource(DataSource):
             loop = asyncio.get_running_loop()
             return await loop.run_in_executor(self._executor, _read_with_retry)
     
+    async def read_arrow(self, query: Optional[str] = None, **kwargs):
+        """
+        異步讀取數據為 Arrow Table（不經 pandas 轉換）
+        
+        Args:
+            query: SQL查詢語句
+            **kwargs: 額外參數
+                - limit: 限制返回行數
+            
+        Returns:
+            pyarrow.Table: 查詢結果
+        """
+        query = self._build_read_query(query, kwargs.get('limit'))
+        
+        def _read_arrow_once():
+            with self._connection() as conn:
+                self.logger.debug(f"Executing arrow query: {query[:100]}...")
+                result = _fetch_arrow(conn.execute(query))
+                self.logger.info(f"Arrow query returned {result.num_rows} rows")
+                return result
+        
+        def _read_arrow_with_retry():
+            return self._with_retry(_read_arrow_once)
+        
+        try:
+            return await asyncio.to_thread(_read_arrow_with_retry)
+        except AttributeError:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, _read_arrow_with_retry)
+    
     async def write(self, data: pd.DataFrame, **kwargs) -> bool:
         """
         異步寫入數據 - 保持 API 不變
@@ -466,7 +725,7 @@ class DuckDBSource(DataSource):
         關閉數據源 - 向後兼容
         
         - 內存數據庫：關閉線程本地連接
-        - 文件數據庫：無需操作（每次自動關閉）
+        - 文件數據庫：關閉連接池（釋放資料庫檔案）
         """
         if self.is_memory_db and hasattr(self, '_local'):
             if hasattr(self._local, 'conn') and self._local.conn:
@@ -478,6 +737,10 @@ class DuckDBSource(DataSource):
                 finally:
                     self._local.conn = None
         
+        if self._pool is not None:
+            self._pool.close()
+            self.logger.info("Closed file database connection pool")
+        
         self.logger.debug("Close completed")
         self.clear_cache()
         
@@ -494,8 +757,12 @@ class DuckDBSource(DataSource):
                 metadata = {
                     'db_path': self.db_path,
                     'read_only': self.read_only,
-                    'is_memory_db': self.is_memory_db
+                    'is_memory_db': self.is_memory_db,
+                    'memory_limit': self.memory_limit,
+                    'threads': self.threads
                 }
+                if self._pool is not None:
+                    metadata['pool'] = self._pool.get_stats()
                 
                 # 獲取所有表
                 tables = conn.execute("SHOW TABLES").df()
@@ -509,11 +776,13 @@ class DuckDBSource(DataSource):
                 # 獲取版本信息
                 version_info = conn.execute("SELECT version()").fetchone()
                 metadata['duckdb_version'] = version_info[0] if version_info else 'unknown'
+                metadata['cache'] = self.get_cache_stats()
                 
                 return metadata
         except Exception as e:
             self.logger.warning(f"Could not retrieve metadata: {str(e)}")
-            return {'db_path': self.db_path, 'read_only': self.read_only, 'is_memory_db': self.is_memory_db}
+            return {'db_path': self.db_path, 'read_only': self.read_only, 'is_memory_db': self.is_memory_db,
+                    'cache': self.get_cache_stats()}
     
     async def create_table(self, table_name: str, schema: Dict[str, str]) -> bool:
         """創建新表"""
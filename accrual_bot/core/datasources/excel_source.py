@@ -1,5 +1,11 @@
 """
 Excel數據源實現
+
+讀取引擎（connection_params['engine']）：
+  - 'auto'（預設）：已安裝 python-calamine 時使用 calamine，否則使用 openpyxl
+  - 'calamine'：Rust 實作的讀取器，大型 .xlsx 解析速度明顯較快
+  - 'openpyxl'：純 Python 讀取器
+calamine 讀取失敗時會自動以 openpyxl 重試。寫入一律使用 openpyxl。
 """
 
 import pandas as pd
@@ -7,6 +13,7 @@ import numpy as np
 from typing import Dict, Optional, Any, List, Union
 from pathlib import Path
 import asyncio
+import importlib.util
 import logging
 from concurrent.futures import ThreadPoolExecutor
 
@@ -18,6 +25,39 @@ except ImportError:
     from accrual_bot.core.datasources import DataSourceConfig, DataSourceType
 
 
+# 支援的讀取引擎（依偏好順序）
+EXCEL_READ_ENGINES = ('calamine', 'openpyxl')
+
+
+def is_calamine_available() -> bool:
+    """檢查是否已安裝 calamine 讀取器（python-calamine）"""
+    return importlib.util.find_spec('python_calamine') is not None
+
+
+def resolve_excel_engine(engine: Optional[str] = 'auto') -> str:
+    """
+    解析實際使用的 Excel 讀取引擎
+
+    Args:
+        engine: 'auto' / 'calamine' / 'openpyxl'，None 視同 'auto'
+
+    Returns:
+        str: 實際使用的引擎名稱；指定 calamine 但未安裝時回傳 'openpyxl'
+
+    Raises:
+        ValueError: 不支援的引擎名稱
+    """
+    engine = (engine or 'auto').lower()
+    if engine not in ('auto', *EXCEL_READ_ENGINES):
+        raise ValueError(
+            f"Unsupported Excel engine: {engine}, "
+            f"expected one of {('auto', *EXCEL_READ_ENGINES)}"
+        )
+    if engine in ('auto', 'calamine'):
+        return 'calamine' if is_calamine_available() else 'openpyxl'
+    return engine
+
+
 class ExcelSource(DataSource):
     """Excel文件數據源"""
     
@@ -39,6 +79,7 @@ class ExcelSource(DataSource):
         self.dtype = config.connection_params.get('dtype')
         self.na_values = config.connection_params.get('na_values')
         self.parse_dates = config.connection_params.get('parse_dates')
+        self.engine = resolve_excel_engine(config.connection_params.get('engine', 'auto'))
         
         if not self.file_path.exists():
             raise FileNotFoundError(f"Excel file not found: {self.file_path}")
@@ -64,29 +105,28 @@ class ExcelSource(DataSource):
         
         def read_excel_sync():
             try:
-                self.logger.info(f"Reading Excel file: {self.file_path}")
+                self.logger.info(f"Reading Excel file: {self.file_path} (engine={self.engine})")
                 
-                # 構建讀取參數
-                read_kwargs = {
-                    'sheet_name': sheet_name,
-                    'header': header,
-                    'engine': 'openpyxl'  # 使用openpyxl引擎
-                }
+                # 構建讀取參數（usecols / dtype / nrows 由引擎在解析時套用）
+                read_kwargs = self._build_read_kwargs(
+                    header=header, usecols=usecols, dtype=dtype,
+                    nrows=nrows, skiprows=skiprows
+                )
                 
-                if usecols is not None:
-                    read_kwargs['usecols'] = usecols
-                if dtype is not None:
-                    read_kwargs['dtype'] = dtype
-                if self.na_values is not None:
-                    read_kwargs['na_values'] = self.na_values
-                if self.parse_dates is not None:
-                    read_kwargs['parse_dates'] = self.parse_dates
-                if nrows is not None:
-                    read_kwargs['nrows'] = nrows
-                if skiprows is not None:
-                    read_kwargs['skiprows'] = skiprows
+                # 多工作表（sheet_name=None / list）回傳 dict，不經過輸入快取
+                cache_key, df = None, None
+                if isinstance(sheet_name, (str, int)):
+                    cache_key, df = self._read_ingest_cache(
+                        self.file_path, {'sheet_name': sheet_name, **read_kwargs}
+                    )
                 
-                df = pd.read_excel(self.file_path, **read_kwargs)
+                if df is None:
+                    df = self._read_with_fallback(
+                        lambda engine: pd.read_excel(
+                            self.file_path, sheet_name=sheet_name, engine=engine, **read_kwargs
+                        )
+                    )
+                    self._write_ingest_cache(cache_key, df)
                 
                 # 如果有查詢條件，應用篩選（簡單實現）
                 if query:
@@ -102,6 +142,42 @@ class ExcelSource(DataSource):
         # 使用類級別的線程池執行器
         loop = asyncio.get_running_loop()
         return await loop.run_in_executor(self._executor, read_excel_sync)
+
+    def _build_read_kwargs(self, header=0, usecols=None, dtype=None,
+                           nrows=None, skiprows=None) -> Dict[str, Any]:
+        """構建 pd.read_excel / ExcelFile.parse 的共用參數"""
+        read_kwargs: Dict[str, Any] = {'header': header}
+        if usecols is not None:
+            read_kwargs['usecols'] = usecols
+        if dtype is not None:
+            read_kwargs['dtype'] = dtype
+        if self.na_values is not None:
+            read_kwargs['na_values'] = self.na_values
+        if self.parse_dates is not None:
+            read_kwargs['parse_dates'] = self.parse_dates
+        if nrows is not None:
+            read_kwargs['nrows'] = nrows
+        if skiprows is not None:
+            read_kwargs['skiprows'] = skiprows
+        return read_kwargs
+
+    def _read_with_fallback(self, read_func):
+        """
+        以目前引擎執行讀取，calamine 失敗時改用 openpyxl 重試
+
+        Args:
+            read_func: 接收引擎名稱並回傳讀取結果的函數
+        """
+        try:
+            return read_func(self.engine)
+        except Exception as e:
+            if self.engine == 'openpyxl':
+                raise
+            self.logger.warning(
+                f"{self.engine} engine failed for {self.file_path.name}, "
+                f"falling back to openpyxl: {str(e)}"
+            )
+            return read_func('openpyxl')
     
     async def write(self, data: pd.DataFrame, **kwargs) -> bool:
         """
@@ -160,21 +236,22 @@ class ExcelSource(DataSource):
         """
         metadata = {
             'file_path': str(self.file_path),
+            'engine': self.engine,
             'file_size': self.file_path.stat().st_size if self.file_path.exists() else 0,
             'file_modified': self.file_path.stat().st_mtime if self.file_path.exists() else None
         }
         
         # 嘗試獲取工作表信息
         try:
-            # 使用上下文管理器確保pd.ExcelFile正確關閉
-            with pd.ExcelFile(self.file_path, engine='openpyxl') as excel_file:
-                metadata['sheet_names'] = excel_file.sheet_names
-                metadata['num_sheets'] = len(excel_file.sheet_names)
+            sheet_names = self._get_sheet_names_sync()
+            metadata['sheet_names'] = sheet_names
+            metadata['num_sheets'] = len(sheet_names)
         except Exception as e:
             self.logger.warning(f"Could not read sheet information: {str(e)}")
             metadata['sheet_names'] = []
             metadata['num_sheets'] = 0
         
+        metadata['cache'] = self.get_cache_stats()
         return metadata
     
     async def get_sheet_names(self) -> List[str]:
@@ -186,34 +263,59 @@ class ExcelSource(DataSource):
         """
         def get_sheets_sync():
             try:
-                # 使用上下文管理器確保pd.ExcelFile正確關閉
-                with pd.ExcelFile(self.file_path, engine='openpyxl') as excel_file:
-                    return excel_file.sheet_names
+                return self._get_sheet_names_sync()
             except Exception as e:
                 self.logger.error(f"Error getting sheet names: {str(e)}")
                 return []
         
         loop = asyncio.get_running_loop()
         return await loop.run_in_executor(self._executor, get_sheets_sync)
+
+    def _get_sheet_names_sync(self) -> List[str]:
+        """同步取得工作表名稱"""
+        def _sheet_names(engine):
+            # 使用上下文管理器確保pd.ExcelFile正確關閉
+            with pd.ExcelFile(self.file_path, engine=engine) as excel_file:
+                return excel_file.sheet_names
+        return self._read_with_fallback(_sheet_names)
     
-    async def read_all_sheets(self) -> Dict[str, pd.DataFrame]:
+    async def read_all_sheets(self, **kwargs) -> Dict[str, pd.DataFrame]:
         """
-        讀取所有工作表
+        讀取所有工作表（活頁簿只開啟一次）
+        
+        Args:
+            **kwargs: header / usecols / dtype / nrows / skiprows，套用至每個工作表
         
         Returns:
             Dict[str, pd.DataFrame]: 工作表名稱到DataFrame的映射
         """
-        sheet_names = await self.get_sheet_names()
-        result = {}
-        
-        for sheet_name in sheet_names:
+        read_kwargs = self._build_read_kwargs(
+            header=kwargs.get('header', self.header),
+            usecols=kwargs.get('usecols', self.usecols),
+            dtype=kwargs.get('dtype', self.dtype),
+            nrows=kwargs.get('nrows'),
+            skiprows=kwargs.get('skiprows'),
+        )
+
+        def read_all_sync(engine):
+            result = {}
+            with pd.ExcelFile(self.file_path, engine=engine) as excel_file:
+                for sheet_name in excel_file.sheet_names:
+                    try:
+                        result[sheet_name] = excel_file.parse(sheet_name, **read_kwargs)
+                    except Exception as e:
+                        self.logger.warning(f"Could not read sheet {sheet_name}: {str(e)}")
+            return result
+
+        def read_all_with_fallback():
             try:
-                df = await self.read(sheet_name=sheet_name)
-                result[sheet_name] = df
+                return self._read_with_fallback(read_all_sync)
             except Exception as e:
-                self.logger.warning(f"Could not read sheet {sheet_name}: {str(e)}")
-        
-        return result
+                self.logger.error(f"Error reading Excel file: {str(e)}")
+                return {}
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, read_all_with_fallback)
     
     def _apply_query(self, df: pd.DataFrame, query: str) -> pd.DataFrame:
         """
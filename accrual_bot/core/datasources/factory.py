@@ -15,6 +15,7 @@ try:
     from .csv_source import CSVSource
     from .parquet_source import ParquetSource
     from .duckdb_source import DuckDBSource
+    from .frame_cache import DataFrameCache
 except ImportError:
     from accrual_bot.core.datasources import DataSource, DataSourceType
     from accrual_bot.core.datasources import DataSourceConfig
@@ -22,6 +23,7 @@ except ImportError:
     from accrual_bot.core.datasources import CSVSource
     from accrual_bot.core.datasources import ParquetSource
     from accrual_bot.core.datasources import DuckDBSource
+    from accrual_bot.core.datasources import DataFrameCache
 
 # GoogleSheetsSource 為可選依賴（需安裝 gspread）
 try:
@@ -213,8 +215,14 @@ class DataSourcePool:
     數據源連接池（用於管理多個數據源）
     """
     
-    def __init__(self):
+    def __init__(self, cache: Optional[DataFrameCache] = None):
+        """
+        Args:
+            cache: 共用快取；提供時加入池的數據源改用此快取，
+                   多個池傳入同一實例即可跨池共用（見 get_shared_frame_cache）
+        """
         self.sources: Dict[str, DataSource] = {}
+        self.cache = cache
         self.logger = logging.getLogger("DataSourcePool")
     
     def add_source(self, name: str, source: DataSource):
@@ -225,9 +233,20 @@ class DataSourcePool:
             name: 數據源名稱
             source: 數據源實例
         """
+        if self.cache is not None:
+            source.attach_cache(self.cache)
         self.sources[name] = source
         self.logger.info(f"Added data source to pool: {name}")
     
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        取得共用快取統計
+        
+        Returns:
+            Optional[Dict[str, Any]]: 未設定共用快取時返回 None
+        """
+        return self.cache.get_stats() if self.cache is not None else None
+    
     def get_source(self, name: str) -> Optional[DataSource]:
         """
         獲取數據源
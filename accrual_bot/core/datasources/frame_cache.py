@@ -0,0 +1,191 @@
+"""
+DataFrame 記憶體快取
+
+以 OrderedDict 實作 O(1) LRU，依位元組預算（memory_usage(deep=True)）驅逐，
+可選擇讀取時複製（copy-on-read）以防止呼叫端修改快取內容。
+同一個快取實例可由多個數據源 / DataSourcePool 共用，讓多個步驟讀取的
+參考檔案只需解析一次。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class _CacheEntry:
+    """快取條目"""
+    data: pd.DataFrame
+    size_bytes: int
+    expires_at: Optional[float]
+
+
+class DataFrameCache:
+    """以位元組預算驅逐的 LRU DataFrame 快取（執行緒安全）"""
+
+    def __init__(self, max_bytes: Optional[int] = DEFAULT_CACHE_MAX_BYTES,
+                 max_items: Optional[int] = None,
+                 copy_on_read: bool = True):
+        """
+        初始化快取
+
+        Args:
+            max_bytes: 快取總大小上限（位元組），None 表示不限制
+            max_items: 最大條目數，None 表示不限制
+            copy_on_read: 讀取時是否返回副本；False 時呼叫端需視返回值為唯讀
+        """
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.copy_on_read = copy_on_read
+
+        self._entries: 'OrderedDict[str, _CacheEntry]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        """目前快取佔用的位元組數"""
+        return self._total_bytes
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        讀取快取條目並標記為最近使用
+
+        Args:
+            key: 快取鍵
+
+        Returns:
+            Optional[pd.DataFrame]: 命中時返回數據（依 copy_on_read 決定是否複製）
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at is not None and time.monotonic() >= entry.expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            data = entry.data
+        return data.copy() if self.copy_on_read else data
+
+    def put(self, key: str, data: pd.DataFrame,
+            ttl_seconds: Optional[float] = None) -> bool:
+        """
+        寫入快取條目（不複製，呼叫端不應再修改傳入的物件）
+
+        Args:
+            key: 快取鍵
+            data: 數據
+            ttl_seconds: 存活秒數，None 表示不過期
+
+        Returns:
+            bool: 是否寫入；單一條目超過位元組上限時不寫入
+        """
+        size_bytes = int(data.memory_usage(deep=True).sum())
+        if self.max_bytes is not None and size_bytes > self.max_bytes:
+            return False
+
+        expires_at = time.monotonic() + ttl_seconds if ttl_seconds is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(data, size_bytes, expires_at)
+            self._total_bytes += size_bytes
+            self._evict()
+        return True
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size_bytes
+
+    def _evict(self) -> None:
+        """從最久未使用的條目開始驅逐，直到符合位元組與條目上限"""
+        while self._entries and (
+            (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+            or (self.max_items is not None and len(self._entries) > self.max_items)
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry.size_bytes
+            self.evictions += 1
+
+    def invalidate(self, prefix: str = '') -> int:
+        """
+        移除鍵值以 prefix 開頭的條目（空字串表示全部）
+
+        Args:
+            prefix: 鍵值前綴
+
+        Returns:
+            int: 移除的條目數
+        """
+        with self._lock:
+            keys = [k for k in self._entries if k.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def clear(self) -> int:
+        """清除所有條目"""
+        return self.invalidate()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        取得快取統計
+
+        Returns:
+            Dict[str, Any]: 條目數、位元組用量與命中/未命中/驅逐次數
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'max_items': self.max_items,
+                'copy_on_read': self.copy_on_read,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+_shared_cache: Optional[DataFrameCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_frame_cache() -> DataFrameCache:
+    """
+    取得程序內共用的 DataFrame 快取
+
+    各實體載入步驟讀取的參考檔（如科目映射）會掛上此快取（attach_cache），
+    同一程序內多個 pipeline 只解析一次。
+
+    Returns:
+        DataFrameCache: 共用快取實例
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = DataFrameCache()
+    return _shared_cache
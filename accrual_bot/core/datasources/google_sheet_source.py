@@ -304,6 +304,7 @@ class GoogleSheetsSource(DataSource):
                 'default_sheet': self.default_sheet,
                 'available_sheets': [ws.title for ws in worksheets],
                 'total_sheets': len(worksheets),
+                'cache': self.get_cache_stats(),
             }
         except Exception as e:
             self.logger.error(f"取得元數據失敗: {e}")
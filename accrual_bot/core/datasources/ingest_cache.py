@@ -0,0 +1,330 @@
+"""
+輸入檔案持久化快取（Ingest Cache）
+
+以「檔案內容雜湊 + 讀取參數」為鍵，將 Excel / CSV 解析結果以 Parquet 存於磁碟。
+同一個月份反覆執行 pipeline 時，未變動的輸入檔案可直接載入 Parquet，
+不必重新解析 Excel / CSV。
+
+快取以檔案修改時間實作 LRU：命中時更新 mtime，總大小超過上限時
+由最久未使用的條目開始刪除。
+
+配置（stagging.toml）:
+    [ingest_cache]
+    enabled = true
+    cache_dir = ""        # 空字串使用 default_cache_dir()，不依賴目前工作目錄
+    max_size_mb = 2048
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from accrual_bot.utils.helpers.file_utils import calculate_file_hash
+from accrual_bot.utils.logging import get_logger
+
+# 快取格式版本，變更儲存方式時遞增以使舊條目失效
+INGEST_CACHE_VERSION = 1
+
+DEFAULT_MAX_SIZE_MB = 2048
+
+
+def default_cache_dir() -> Path:
+    """
+    使用者層級的快取目錄
+
+    Windows 為 %LOCALAPPDATA%\\accrual_bot\\cache\\ingest，
+    其他平台為 $XDG_CACHE_HOME/accrual_bot/ingest（預設 ~/.cache）。
+
+    Returns:
+        Path: 快取目錄
+    """
+    if sys.platform == 'win32' and os.environ.get('LOCALAPPDATA'):
+        return Path(os.environ['LOCALAPPDATA']) / 'accrual_bot' / 'cache' / 'ingest'
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'accrual_bot' / 'ingest'
+
+
+class IngestCache:
+    """以 Parquet 儲存的輸入檔案快取"""
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+                 enabled: bool = True,
+                 hash_algorithm: str = 'md5'):
+        """
+        初始化輸入檔案快取
+
+        Args:
+            cache_dir: 快取目錄，None 時使用 default_cache_dir()
+            max_size_mb: 快取總大小上限（MB），超過時依 LRU 驅逐
+            enabled: 是否啟用
+            hash_algorithm: 檔案雜湊算法
+        """
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else default_cache_dir()
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.hash_algorithm = hash_algorithm
+        self.logger = get_logger("datasource.IngestCache")
+
+        self._lock = threading.Lock()
+        # (路徑, 大小, mtime_ns) -> 檔案雜湊，避免同一程序內重複計算
+        self._hash_memo: Dict[Tuple[str, int, int], str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------ keys
+    def _file_hash(self, file_path: Path) -> Optional[str]:
+        """計算（或從記憶取得）檔案內容雜湊"""
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+        memo_key = (str(file_path.resolve()), stat.st_size, stat.st_mtime_ns)
+        file_hash = self._hash_memo.get(memo_key)
+        if file_hash is None:
+            file_hash = calculate_file_hash(str(file_path), self.hash_algorithm)
+            if file_hash is not None:
+                self._hash_memo[memo_key] = file_hash
+        return file_hash
+
+    def make_key(self, file_path: Any, params: Dict[str, Any]) -> Optional[str]:
+        """
+        產生快取鍵
+
+        Args:
+            file_path: 輸入檔案路徑
+            params: 影響解析結果的讀取參數（sheet、header、usecols、dtype 等）
+
+        Returns:
+            Optional[str]: 快取鍵，無法計算檔案雜湊時返回 None
+        """
+        file_path = Path(file_path)
+        file_hash = self._file_hash(file_path)
+        if file_hash is None:
+            return None
+        key_data = {
+            'version': INGEST_CACHE_VERSION,
+            'file_hash': file_hash,
+            'suffix': file_path.suffix.lower(),
+            'params': params,
+        }
+        key_json = json.dumps(key_data, sort_keys=True, default=str)
+        return hashlib.md5(key_json.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.parquet"
+
+    # ------------------------------------------------------------------ get / put
+    def get(self, key: Optional[str]) -> Optional[pd.DataFrame]:
+        """
+        讀取快取條目
+
+        Args:
+            key: 快取鍵
+
+        Returns:
+            Optional[pd.DataFrame]: 命中時返回 DataFrame，否則 None
+        """
+        if not self.enabled or key is None:
+            return None
+        path = self._entry_path(key)
+        try:
+            df = pd.read_parquet(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            self.logger.warning(f"輸入快取條目損毀，已移除 ({path.name}): {str(e)}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        # 更新 mtime 作為 LRU 的最近使用時間
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return self._restore_missing_values(df)
+
+    def put(self, key: Optional[str], df: pd.DataFrame) -> bool:
+        """
+        寫入快取條目
+
+        無法以 Parquet 表示的資料（非字串欄名、混合型別 object 欄位等）不快取。
+
+        Args:
+            key: 快取鍵
+            df: 要快取的 DataFrame
+
+        Returns:
+            bool: 是否成功寫入
+        """
+        if not self.enabled or key is None or not isinstance(df, pd.DataFrame):
+            return False
+        # Parquet 會將欄名轉為字串，讀回後與原始資料不一致
+        if not all(isinstance(col, str) for col in df.columns):
+            self.logger.debug("欄名非字串，略過輸入快取")
+            return False
+        path = self._entry_path(key)
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(tmp_path, index=True)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            self.logger.debug(f"資料無法寫入輸入快取，略過: {str(e)}")
+            return False
+
+        self._enforce_size_limit()
+        return True
+
+    @staticmethod
+    def _restore_missing_values(df: pd.DataFrame) -> pd.DataFrame:
+        """Parquet 讀回的 object 欄位缺失值為 None，還原為與 pandas 解析一致的 NaN"""
+        for col in df.columns[df.dtypes == object]:
+            series = df[col]
+            if series.isna().any():
+                df[col] = series.where(series.notna(), np.nan)
+        return df
+
+    # ------------------------------------------------------------------ maintenance
+    def _list_entries(self) -> List[Tuple[Path, os.stat_result]]:
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for path in self.cache_dir.glob("*.parquet"):
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                continue
+        return entries
+
+    def _enforce_size_limit(self) -> int:
+        """依 LRU 驅逐條目直到總大小不超過上限，返回驅逐數量"""
+        with self._lock:
+            entries = self._list_entries()
+            total = sum(stat.st_size for _, stat in entries)
+            if total <= self.max_size_bytes:
+                return 0
+
+            evicted = 0
+            for path, stat in sorted(entries, key=lambda item: item[1].st_mtime_ns):
+                if total <= self.max_size_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= stat.st_size
+                evicted += 1
+
+            self.evictions += evicted
+            self.logger.debug(f"輸入快取 LRU 驅逐 {evicted} 筆")
+            return evicted
+
+    def purge(self) -> int:
+        """
+        清除所有快取條目
+
+        Returns:
+            int: 刪除的條目數
+        """
+        removed = 0
+        with self._lock:
+            for path, _ in self._list_entries():
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError as e:
+                    self.logger.warning(f"無法刪除快取條目 {path.name}: {str(e)}")
+            for tmp_path in self.cache_dir.glob("*.tmp") if self.cache_dir.exists() else []:
+                tmp_path.unlink(missing_ok=True)
+        self.logger.info(f"已清除輸入快取（共 {removed} 筆）: {self.cache_dir}")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        取得快取統計
+
+        Returns:
+            Dict[str, Any]: 條目數、總大小與命中/未命中/驅逐次數
+        """
+        entries = self._list_entries()
+        return {
+            'enabled': self.enabled,
+            'cache_dir': str(self.cache_dir),
+            'entries': len(entries),
+            'size_bytes': sum(stat.st_size for _, stat in entries),
+            'max_size_bytes': self.max_size_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+_default_cache: Optional[IngestCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_ingest_cache() -> IngestCache:
+    """
+    取得依配置建立的全域輸入快取
+
+    Returns:
+        IngestCache: 全域快取實例（配置 [ingest_cache]）
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                from accrual_bot.utils.config import config_manager
+                section = config_manager._config_toml.get('ingest_cache', {})
+                _default_cache = IngestCache(
+                    cache_dir=section.get('cache_dir') or None,
+                    max_size_mb=section.get('max_size_mb', DEFAULT_MAX_SIZE_MB),
+                    enabled=section.get('enabled', False),
+                )
+    return _default_cache
+
+
+def set_ingest_cache(cache: Optional[IngestCache]) -> None:
+    """
+    替換全域輸入快取（None 表示下次依配置重新建立）
+
+    Args:
+        cache: 快取實例
+    """
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = cache
+
+
+def resolve_ingest_cache(setting: Any) -> Optional[IngestCache]:
+    """
+    解析 connection_params['ingest_cache'] 設定
+
+    Args:
+        setting: None（依全域配置）、bool 或 IngestCache 實例
+
+    Returns:
+        Optional[IngestCache]: 使用的快取，停用時返回 None
+    """
+    if isinstance(setting, IngestCache):
+        cache = setting
+    elif setting is False:
+        return None
+    else:
+        cache = get_ingest_cache()
+        if setting is True and not cache.enabled:
+            cache = IngestCache(cache.cache_dir, cache.max_size_bytes / (1024 * 1024))
+    return cache if cache.enabled else None
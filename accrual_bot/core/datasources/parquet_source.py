@@ -216,6 +216,7 @@ class ParquetSource(DataSource):
             except Exception as e:
                 self.logger.warning(f"Could not read Parquet metadata: {str(e)}")
         
+        metadata['cache'] = self.get_cache_stats()
         return metadata
     
     async def read_row_groups(self, row_groups: List[int] = None) -> pd.DataFrame:
@@ -0,0 +1,398 @@
+"""
+工作簿匯出寫入器（Workbook Writer）
+
+所有匯出步驟共用的 Excel 寫出器。預設使用 xlsxwriter 的 constant_memory 模式：
+每一列寫出後即落地到暫存檔，不會把整本工作簿保留為 Python 儲存格物件，
+記憶體用量與列數無關。
+
+- 各欄位的型別判斷、NA 遮罩與儲存格格式每欄只處理一次，不逐格推斷
+- 儲存格值每 WRITE_BLOCK_ROWS 列轉為一批 Python 物件，暫存的儲存格物件不隨列數成長
+- '<NA>' 字串在寫出時視為空白，不需先對整個 DataFrame 做 replace 複製
+- 同一個 writer 可依序寫入多個 sheet，一次完成整本工作簿
+- 可選擇同步輸出 CSV / Parquet sidecar 檔（每個 sheet 一個檔案）
+
+配置（stagging.toml）:
+    [export]
+    engine = "xlsxwriter"
+    constant_memory = true
+    sidecar = ""
+
+使用範例:
+    with WorkbookWriter.from_config(output_path) as writer:
+        writer.write_sheet('PO', df_po)
+        writer.write_sheet('kiosk_data', df_kiosk, index=True)
+"""
+
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+from pandas.api import types as ptypes
+
+from accrual_bot.utils.helpers.file_utils import get_safe_filename
+from accrual_bot.utils.logging import get_logger
+
+# Excel 工作表上限（含標題列）
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_COLUMNS = 16_384
+
+SUPPORTED_ENGINES = ('xlsxwriter', 'openpyxl')
+SIDECAR_FORMATS = ('csv', 'parquet')
+
+# 每批轉為 Python 儲存格物件的列數
+WRITE_BLOCK_ROWS = 10_000
+
+DEFAULT_NA_STRINGS = ('<NA>',)
+DEFAULT_DATETIME_FORMAT = 'yyyy-mm-dd hh:mm:ss'
+DEFAULT_DATE_FORMAT = 'yyyy-mm-dd'
+
+# 與 pandas to_excel 預設標題樣式一致
+_HEADER_FORMAT = {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}
+
+
+def get_export_settings() -> Dict[str, Any]:
+    """
+    讀取匯出配置
+
+    Returns:
+        Dict[str, Any]: engine / constant_memory / sidecar（配置 [export]）
+    """
+    from accrual_bot.utils.config import config_manager
+    section = config_manager._config_toml.get('export', {}) or {}
+    return {
+        'engine': section.get('engine', 'xlsxwriter'),
+        'constant_memory': section.get('constant_memory', True),
+        'sidecar': section.get('sidecar', '') or None,
+    }
+
+
+class WorkbookWriter:
+    """以 xlsxwriter 逐列寫出的多 sheet Excel 寫入器"""
+
+    def __init__(self, output_path: Union[str, Path],
+                 engine: str = 'xlsxwriter',
+                 constant_memory: bool = True,
+                 sidecar: Optional[str] = None,
+                 na_strings: Iterable[str] = DEFAULT_NA_STRINGS,
+                 datetime_format: str = DEFAULT_DATETIME_FORMAT,
+                 date_format: str = DEFAULT_DATE_FORMAT,
+                 block_rows: int = WRITE_BLOCK_ROWS):
+        """
+        初始化寫入器
+
+        Args:
+            output_path: 輸出 .xlsx 路徑
+            engine: 'xlsxwriter'（逐列寫出）或 'openpyxl'（pandas ExcelWriter，舊行為）
+            constant_memory: xlsxwriter 是否啟用 constant_memory 模式
+            sidecar: 同步輸出的 sidecar 格式：None / 'csv' / 'parquet'
+            na_strings: 寫出時視為空白的字串值
+            datetime_format: datetime 欄位的儲存格格式
+            date_format: date 物件的儲存格格式
+            block_rows: xlsxwriter 每批轉換儲存格值的列數
+
+        Raises:
+            ValueError: engine 或 sidecar 不支援
+        """
+        if engine not in SUPPORTED_ENGINES:
+            raise ValueError(f"不支援的匯出引擎: {engine}（可用: {', '.join(SUPPORTED_ENGINES)}）")
+        if sidecar is not None and sidecar not in SIDECAR_FORMATS:
+            raise ValueError(f"不支援的 sidecar 格式: {sidecar}（可用: {', '.join(SIDECAR_FORMATS)}）")
+
+        self.output_path = Path(output_path)
+        self.engine = engine
+        self.constant_memory = constant_memory
+        self.sidecar = sidecar
+        self.na_strings = list(na_strings)
+        self.datetime_format = datetime_format
+        self.date_format = date_format
+        self.block_rows = max(1, int(block_rows))
+        self.logger = get_logger("datasource.WorkbookWriter")
+
+        self.sheets_written: List[str] = []
+        self.sidecar_paths: List[Path] = []
+        self._workbook = None
+        self._pandas_writer = None
+        self._formats: Dict[str, Any] = {}
+        self._open()
+
+    @classmethod
+    def from_config(cls, output_path: Union[str, Path], **overrides) -> 'WorkbookWriter':
+        """
+        依 [export] 配置建立寫入器
+
+        Args:
+            output_path: 輸出 .xlsx 路徑
+            **overrides: 覆寫配置的參數
+
+        Returns:
+            WorkbookWriter: 寫入器
+        """
+        settings = get_export_settings()
+        settings.update(overrides)
+        return cls(output_path, **settings)
+
+    # ------------------------------------------------------------------ lifecycle
+    def _open(self) -> None:
+        """建立底層工作簿"""
+        if self.engine == 'openpyxl':
+            self._pandas_writer = pd.ExcelWriter(self.output_path, engine='openpyxl')
+            return
+
+        import xlsxwriter
+        self._workbook = xlsxwriter.Workbook(str(self.output_path), {
+            'constant_memory': self.constant_memory,
+            # 資料原樣寫出：不把字串轉為公式 / 超連結 / 數字
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+            'strings_to_numbers': False,
+            'nan_inf_to_errors': True,
+            'default_date_format': self.datetime_format,
+        })
+        self._formats = {
+            'header': self._workbook.add_format(_HEADER_FORMAT),
+            'datetime': self._workbook.add_format({'num_format': self.datetime_format}),
+            'date': self._workbook.add_format({'num_format': self.date_format}),
+        }
+
+    def close(self) -> None:
+        """
+        完成工作簿寫出（可重複呼叫）
+
+        Raises:
+            OSError: 無法建立輸出檔（例如檔案被 Excel 開啟而 PermissionError）
+        """
+        if self._workbook is not None:
+            from xlsxwriter.exceptions import FileCreateError
+            workbook, self._workbook = self._workbook, None
+            try:
+                workbook.close()
+            except FileCreateError as e:
+                # 還原為原始的 OSError，與 pandas ExcelWriter 的錯誤型別一致
+                if e.args and isinstance(e.args[0], OSError):
+                    raise e.args[0] from e
+                raise
+        if self._pandas_writer is not None:
+            self._pandas_writer.close()
+            self._pandas_writer = None
+
+    def __enter__(self) -> 'WorkbookWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------ writing
+    def write_sheet(self, sheet_name: str, df: pd.DataFrame, index: bool = False) -> int:
+        """
+        寫入一個 sheet
+
+        Args:
+            sheet_name: 工作表名稱
+            df: 要寫入的數據（不會被修改）
+            index: 是否寫出 index 欄
+
+        Returns:
+            int: 寫入的資料列數
+
+        Raises:
+            ValueError: 列數或欄數超過 Excel 上限
+        """
+        n_rows = len(df)
+        n_cols = len(df.columns) + (df.index.nlevels if index else 0)
+        if n_rows + 1 > EXCEL_MAX_ROWS:
+            raise ValueError(
+                f"sheet '{sheet_name}' 共 {n_rows:,} 列，超過 Excel 上限 {EXCEL_MAX_ROWS - 1:,} 列，"
+                f"請改用 sidecar（csv / parquet）輸出"
+            )
+        if n_cols > EXCEL_MAX_COLUMNS:
+            raise ValueError(f"sheet '{sheet_name}' 共 {n_cols:,} 欄，超過 Excel 上限 {EXCEL_MAX_COLUMNS:,} 欄")
+
+        if self._pandas_writer is not None:
+            df.replace(self.na_strings, pd.NA).to_excel(
+                self._pandas_writer, sheet_name=sheet_name, index=index
+            )
+        else:
+            self._write_rows(sheet_name, df, index)
+
+        if self.sidecar:
+            self.sidecar_paths.append(self._write_sidecar(sheet_name, df, index))
+
+        self.sheets_written.append(sheet_name)
+        self.logger.debug(f"Wrote sheet '{sheet_name}': {n_rows} rows, {n_cols} columns")
+        return n_rows
+
+    def _write_rows(self, sheet_name: str, df: pd.DataFrame, index: bool) -> None:
+        """以 xlsxwriter 逐列寫出（constant_memory 要求依列序寫入）"""
+        worksheet = self._workbook.add_worksheet(sheet_name)
+
+        headers: List[Any] = []
+        series_list: List[pd.Series] = []
+        if index:
+            index_frame = df.index.to_frame(index=False)
+            headers.extend(name if name is not None else '' for name in df.index.names)
+            series_list.extend(index_frame[col] for col in index_frame.columns)
+        headers.extend(df.columns)
+        series_list.extend(df.iloc[:, i] for i in range(df.shape[1]))
+
+        header_format = self._formats['header']
+        for col, header in enumerate(headers):
+            worksheet.write_string(0, col, self._header_text(header), header_format)
+
+        columns = [self._column_writer(worksheet, series) for series in series_list]
+        n_rows = len(df)
+        if not columns or n_rows == 0:
+            return
+
+        writers = [writer for writer, _ in columns]
+        col_range = range(len(columns))
+        for start in range(0, n_rows, self.block_rows):
+            stop = min(start + self.block_rows, n_rows)
+            blocks = [cells(start, stop) for _, cells in columns]
+            for row, values in enumerate(zip(*blocks), start=start + 1):
+                for col in col_range:
+                    value = values[col]
+                    if value is not None:
+                        writers[col](row, col, value)
+
+    @staticmethod
+    def _header_text(header: Any) -> str:
+        """欄位名稱轉為標題文字（MultiIndex 欄位以 '.' 連接）"""
+        if isinstance(header, tuple):
+            return '.'.join(str(part) for part in header)
+        return str(header)
+
+    def _column_writer(self, worksheet, series: pd.Series
+                       ) -> Tuple[Callable, Callable[[int, int], List[Any]]]:
+        """
+        決定一欄的寫入函式與儲存格值的分批轉換（NA 轉為 None，寫出時略過）
+
+        Args:
+            worksheet: xlsxwriter 工作表
+            series: 欄位數據
+
+        Returns:
+            Tuple[Callable, Callable]: (寫入函式, cells(start, stop) -> 該區段的儲存格值列表)
+        """
+        dtype = series.dtype
+        mask = series.isna().to_numpy()
+
+        if ptypes.is_bool_dtype(dtype):
+            writer = worksheet.write_boolean
+        elif ptypes.is_numeric_dtype(dtype):
+            writer = worksheet.write_number
+        elif ptypes.is_datetime64_any_dtype(dtype):
+            if getattr(dtype, 'tz', None) is not None:
+                series = series.dt.tz_localize(None)
+            datetime_format = self._formats['datetime']
+            write_datetime = worksheet.write_datetime
+
+            def writer(row, col, value):
+                return write_datetime(row, col, value, datetime_format)
+        else:
+            if self.na_strings and (ptypes.is_object_dtype(dtype) or ptypes.is_string_dtype(dtype)
+                                    or isinstance(dtype, pd.CategoricalDtype)):
+                mask = mask | series.isin(self.na_strings).to_numpy()
+            writer = self._generic_writer(worksheet)
+
+        def cells(start: int, stop: int) -> List[Any]:
+            block = series.iloc[start:stop].to_numpy(dtype=object, copy=True)
+            block_mask = mask[start:stop]
+            if block_mask.any():
+                block[block_mask] = None
+            return block.tolist()
+
+        return writer, cells
+
+    def _generic_writer(self, worksheet) -> Callable:
+        """object 欄位寫入函式：字串直接寫出，其他型別交由 xlsxwriter 判斷"""
+        write_string = worksheet.write_string
+        write_any = worksheet.write
+        date_format = self._formats['date']
+
+        def writer(row, col, value):
+            if type(value) is str:
+                return write_string(row, col, value)
+            if type(value) is date:
+                return write_any(row, col, value, date_format)
+            try:
+                return write_any(row, col, value)
+            except TypeError:
+                # xlsxwriter 不支援的型別（list / dict / Decimal 以外的物件等）以文字寫出
+                return write_string(row, col, str(value))
+
+        return writer
+
+    # ------------------------------------------------------------------ sidecar
+    def _sidecar_path(self, sheet_name: str) -> Path:
+        """sidecar 檔案路徑：{檔名}_{sheet}.{格式}"""
+        stem = get_safe_filename(f"{self.output_path.stem}_{sheet_name}")
+        return self.output_path.with_name(f"{stem}.{self.sidecar}")
+
+    def _write_sidecar(self, sheet_name: str, df: pd.DataFrame, index: bool) -> Path:
+        """
+        輸出 sheet 對應的 CSV / Parquet 檔
+
+        Args:
+            sheet_name: 工作表名稱
+            df: 數據
+            index: 是否包含 index
+
+        Returns:
+            Path: sidecar 檔案路徑
+        """
+        path = self._sidecar_path(sheet_name)
+        frame = self._mask_na_strings(df)
+        if self.sidecar == 'csv':
+            # utf-8-sig 讓 Excel 直接開啟時正確顯示中文
+            frame.to_csv(path, index=index, encoding='utf-8-sig')
+        else:
+            try:
+                frame.to_parquet(path, index=index)
+            except (TypeError, ValueError) as e:
+                # 混合型別的 object 欄位（或非字串欄名）無法直接轉為 Arrow，改存字串
+                self.logger.debug(f"sidecar '{path.name}' 含混合型別欄位，object 欄位改存字串: {e}")
+                object_cols = frame.columns[frame.dtypes == object]
+                frame = frame.astype({col: 'string' for col in object_cols})
+                frame.columns = [self._header_text(col) for col in frame.columns]
+                frame.to_parquet(path, index=index)
+        return path
+
+    def _mask_na_strings(self, df: pd.DataFrame) -> pd.DataFrame:
+        """將 object 欄位中的 '<NA>' 字串轉為 NA（僅複製含有這些值的欄位）"""
+        if not self.na_strings:
+            return df
+        replaced = {}
+        for col in df.columns[df.dtypes == object]:
+            hits = df[col].isin(self.na_strings)
+            if hits.any():
+                replaced[col] = df[col].mask(hits)
+        if not replaced:
+            return df
+        frame = df.copy(deep=False)
+        for col, values in replaced.items():
+            frame[col] = values
+        return frame
+
+
+def write_workbook(output_path: Union[str, Path],
+                   sheets: Dict[str, pd.DataFrame],
+                   index: Union[bool, Dict[str, bool]] = False,
+                   **options) -> List[str]:
+    """
+    以單一寫入器寫出多個 sheet
+
+    Args:
+        output_path: 輸出 .xlsx 路徑
+        sheets: {sheet 名稱: DataFrame}，依插入順序寫出
+        index: 是否寫出 index；可用 {sheet 名稱: bool} 逐 sheet 指定
+        **options: 覆寫 [export] 配置的 WorkbookWriter 參數
+
+    Returns:
+        List[str]: 寫入的 sheet 名稱
+    """
+    with WorkbookWriter.from_config(output_path, **options) as writer:
+        for sheet_name, df in sheets.items():
+            sheet_index = index.get(sheet_name, False) if isinstance(index, dict) else index
+            writer.write_sheet(sheet_name, df, index=sheet_index)
+        return list(writer.sheets_written)
@@ -28,6 +28,30 @@ from .pipeline import (
     PipelineExecutor
 )
 
+# DAG 排程
+from .dag import (
+    DAGScheduler,
+    build_step_graph,
+    DATA_KEY,
+    aux_key,
+    var_key
+)
+
+# 步驟效能分析
+from .profiler import (
+    PipelineProfiler,
+    StepProfile
+)
+
+# 串流（分塊）執行
+from .streaming import (
+    StreamingExecutor,
+    StreamingPlan,
+    plan_streaming,
+    align_chunks,
+    iter_dataframe_chunks
+)
+
 # checkpoint
 from .checkpoint import (
     CheckpointManager,
@@ -84,6 +108,24 @@ __all__ = [
     'PipelineConfig',
     'PipelineExecutor',
 
+    # DAG
+    'DAGScheduler',
+    'build_step_graph',
+    'DATA_KEY',
+    'aux_key',
+    'var_key',
+
+    # Profiling
+    'PipelineProfiler',
+    'StepProfile',
+
+    # Streaming
+    'StreamingExecutor',
+    'StreamingPlan',
+    'plan_streaming',
+    'align_chunks',
+    'iter_dataframe_chunks',
+
     # checkpoint
     'CheckpointManager',
     'PipelineWithCheckpoint',
@@ -5,7 +5,7 @@ Pipeline 步驟基類
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Optional, Any, Dict, List, Union, Callable, TypeVar, Generic
+from typing import Optional, Any, Dict, List, Union, Callable, TypeVar, Generic, Iterable, FrozenSet, Tuple
 from dataclasses import dataclass, field
 import asyncio
 from accrual_bot.utils.logging import get_logger
@@ -67,8 +67,24 @@ class PipelineStep(ABC, Generic[T]):
     """
     Pipeline 步驟基類
     所有處理步驟必須繼承此類
+
+    DAG 執行模式下，子類可宣告讀寫的上下文鍵（'data'、'aux:<name>'、'var:<name>'）：
+        reads = ('data', 'aux:ap_invoice')
+        writes = ('data',)
+    writes 為 None 表示未宣告，排程時視為屏障並保持原本順序。
+
+    串流執行模式下，只依賴各列內容的步驟可宣告 chunkable = True 逐塊執行；
+    需要完整群組（如同一 PO 的所有列）時以 chunk_key 指定群組鍵欄位。
     """
     
+    # DAG 排程用的讀寫宣告（見 core/pipeline/dag.py）
+    reads: Optional[Iterable[str]] = None
+    writes: Optional[Iterable[str]] = None
+    
+    # 串流執行宣告（見 core/pipeline/streaming.py）
+    chunkable: bool = False
+    chunk_key: Optional[str] = None
+    
     def __init__(self, 
                  name: str,
                  description: str = "",
@@ -162,6 +178,7 @@ class PipelineStep(ABC, Generic[T]):
             # 執行主邏輯（支援重試）
             result = None
             last_error = None
+            data_version = getattr(context, 'data_version', None)
             
             for attempt in range(self.retry_count + 1):
                 try:
@@ -201,6 +218,10 @@ class PipelineStep(ABC, Generic[T]):
                         message=str(last_error)
                     )
             
+            # 登記主數據擁有者（步驟未於 update_data 指定 owner 時）
+            if data_version is not None and context.data_version != data_version:
+                context.claim_data(self.name, context.data_version)
+            
             # 執行後置動作
             for action in self._post_actions:
                 await action(context)
@@ -221,6 +242,34 @@ class PipelineStep(ABC, Generic[T]):
                 duration=duration
             )
     
+    def declare_io(self,
+                   reads: Optional[Iterable[str]] = None,
+                   writes: Optional[Iterable[str]] = None) -> 'PipelineStep':
+        """
+        覆寫此實例的讀寫宣告（供 orchestrator 或自定義步驟使用）
+        
+        Args:
+            reads: 讀取的上下文鍵
+            writes: 寫入的上下文鍵
+            
+        Returns:
+            PipelineStep: 自身
+        """
+        self.reads = tuple(reads or ())
+        self.writes = tuple(writes or ())
+        return self
+    
+    def get_io(self) -> Tuple[Optional[FrozenSet[str]], Optional[FrozenSet[str]]]:
+        """
+        取得讀寫宣告
+        
+        Returns:
+            Tuple: (reads, writes)；未宣告時為 (None, None)
+        """
+        if self.writes is None:
+            return None, None
+        return frozenset(self.reads or ()), frozenset(self.writes)
+    
     def add_prerequisite(self, action: Callable):
         """添加前置動作"""
         self._prerequisites.append(action)
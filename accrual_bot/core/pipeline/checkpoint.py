@@ -15,6 +15,18 @@ Pipeline Checkpoint 系統
 3. 快速測試後續步驟
 4. 自動清理舊 checkpoint
 
+儲存格式（CheckpointManager(checkpoint_format=...)）：
+  - "parquet"（預設）：相容既有 checkpoint
+  - "arrow"：未壓縮 Arrow IPC（Feather v2），載入時以 memory map 讀取，
+    適合逐步執行模式每步儲存的情境
+  兩種格式皆以 thread pool 並行寫入主數據與輔助數據；
+  恢復時 DataFrame 型輔助數據延遲載入，首次存取才讀入。
+
+增量儲存（CheckpointManager(incremental=True)，預設啟用）：
+  輔助數據以內容指紋比對，與先前 checkpoint 相同者以 hard link
+  （不支援時改為檔案複製）引用既有檔案，不再重新序列化；
+  checkpoint_info.json 的 frames / parent_checkpoint 記錄來源與血緣。
+
 使用方式：
     # 首次執行 - 自動儲存 checkpoint（orchestrator 整合）
     result = await execute_pipeline_with_checkpoint(
@@ -43,14 +55,19 @@ Pipeline Checkpoint 系統
     )
 """
 
+import hashlib
 import json
+import os
 import pickle
 import shutil
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
 import pandas as pd
+import pyarrow as pa
 
 from .context import ProcessingContext
 from .pipeline import Pipeline
@@ -58,20 +75,55 @@ from .base import StepResult, StepStatus
 from accrual_bot.utils.logging import get_logger
 
 
+# 支援的 checkpoint 格式 → DataFrame 檔案副檔名
+CHECKPOINT_FORMATS = {
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+}
+
+# 載入時的檔案優先順序（同名時前者優先）
+_FRAME_SUFFIXES = ('.arrow', '.parquet', '.pkl')
+
+
 class CheckpointManager:
     """Pipeline Checkpoint 管理器"""
 
-    def __init__(self, checkpoint_dir: str = "./checkpoints"):
+    def __init__(
+        self,
+        checkpoint_dir: str = "./checkpoints",
+        checkpoint_format: str = "parquet",
+        max_workers: Optional[int] = None,
+        incremental: bool = True,
+    ):
         """
         初始化 Checkpoint 管理器
 
         Args:
             checkpoint_dir: checkpoint 儲存目錄（預設 ./checkpoints）
+            checkpoint_format: 儲存格式，"parquet"（預設）或 "arrow"
+            max_workers: 並行寫入的執行緒數，None 表示依 CPU 數決定
+            incremental: 是否以內容指紋重用未變動的輔助數據檔案
         """
+        if checkpoint_format not in CHECKPOINT_FORMATS:
+            raise ValueError(
+                f"不支援的 checkpoint 格式: {checkpoint_format}，"
+                f"可用格式: {list(CHECKPOINT_FORMATS)}"
+            )
         self.checkpoint_dir = Path(checkpoint_dir)
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_format = checkpoint_format
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+        self.incremental = incremental
         self.logger = get_logger("pipeline.checkpoint")
 
+        # 指紋 → (已寫入檔案, 所屬 checkpoint 名稱)
+        self._frame_index: Dict[str, Tuple[Path, str]] = {}
+        # 由 load_checkpoint 建立之 context 的延遲輔助數據來源 {名稱: (檔案, 指紋)}
+        self._lazy_sources: "weakref.WeakKeyDictionary[ProcessingContext, Dict[str, Tuple[Path, str]]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._last_checkpoint: Optional[str] = None
+
     # ────────────────────────────────────────────────
     # 儲存
     # ────────────────────────────────────────────────
@@ -86,9 +138,11 @@ class CheckpointManager:
         儲存 checkpoint
 
         儲存策略：
-          - 主數據優先 Parquet，失敗時 fallback 至 Pickle
-          - DataFrame 型輔助數據：Parquet → Pickle fallback
+          - 主數據：Parquet / Arrow IPC（依 checkpoint_format），失敗時 fallback 至 Pickle
+          - DataFrame 型輔助數據：同主數據，與主數據一併以 thread pool 並行寫入
           - 非 DataFrame 型輔助數據：直接 Pickle
+          - 增量模式：內容指紋與先前 checkpoint 相同的輔助數據直接 hard link 既有檔案；
+            由 load_checkpoint 延遲登記且尚未讀取的輔助數據不需載入即可引用
           - 變數：JSON 安全序列化（不可序列化值轉為 str）
 
         Args:
@@ -108,35 +162,44 @@ class CheckpointManager:
         checkpoint_path = self.checkpoint_dir / checkpoint_name
         checkpoint_path.mkdir(parents=True, exist_ok=True)
 
-        # --- 儲存主數據 ---
+        # --- 收集待寫入的 DataFrame（主數據 + 輔助數據）---
+        # (名稱, DataFrame, 不含副檔名路徑, 日誌名稱, 指紋)
+        frame_jobs: List[Tuple[str, pd.DataFrame, Path, str, Optional[str]]] = []
+        frames: Dict[str, Dict[str, Any]] = {}
         if context.data is not None and not context.data.empty:
-            self._save_dataframe(
-                context.data,
-                checkpoint_path / "data.parquet",
-                checkpoint_path / "data.pkl",
-                label="主數據",
-            )
+            frame_jobs.append(("data", context.data, checkpoint_path / "data", "主數據", None))
 
-        # --- 儲存輔助數據 ---
         aux_data_dir = checkpoint_path / "auxiliary_data"
         aux_data_dir.mkdir(exist_ok=True)
+        lazy_sources = self._lazy_sources.get(context, {})
 
         for aux_name in context.list_auxiliary_data():
+            base_path = aux_data_dir / aux_name
+
+            # 尚未讀取的延遲輔助數據：內容必與來源檔案相同，直接引用
+            if (self.incremental and aux_name in lazy_sources
+                    and not context.is_auxiliary_data_loaded(aux_name)):
+                source, fingerprint = lazy_sources[aux_name]
+                if self._reuse_frame(aux_name, fingerprint, source, base_path, frames):
+                    continue
+
             aux_data = context.get_auxiliary_data(aux_name)
             if aux_data is None:
                 continue
             if isinstance(aux_data, pd.DataFrame):
                 if aux_data.empty:
                     continue
-                # 特定欄位型別修正（如 ops_validation 的 discount 欄）
-                aux_data_to_save = aux_data.copy()
-                if 'discount' in aux_data_to_save.columns:
-                    aux_data_to_save['discount'] = aux_data_to_save['discount'].astype(str)
-                self._save_dataframe(
-                    aux_data_to_save,
-                    aux_data_dir / f"{aux_name}.parquet",
-                    aux_data_dir / f"{aux_name}.pkl",
-                    label=f"輔助數據 {aux_name}",
+                # 特定欄位型別修正（如 ops_validation 的 discount 欄）；僅轉換該欄，不複製整表
+                if 'discount' in aux_data.columns:
+                    aux_data = aux_data.astype({'discount': str}, copy=False)
+
+                fingerprint = self._frame_fingerprint(aux_data) if self.incremental else None
+                if fingerprint and fingerprint in self._frame_index:
+                    source, _ = self._frame_index[fingerprint]
+                    if self._reuse_frame(aux_name, fingerprint, source, base_path, frames):
+                        continue
+                frame_jobs.append(
+                    (aux_name, aux_data, base_path, f"輔助數據 {aux_name}", fingerprint)
                 )
             else:
                 # 非 DataFrame：直接用 pickle
@@ -146,6 +209,20 @@ class CheckpointManager:
                 except Exception as e:
                     self.logger.error(f"輔助數據（非 DataFrame）{aux_name} 儲存失敗: {e}")
 
+        # --- 並行寫入 DataFrame ---
+        written = self._save_dataframes(frame_jobs)
+        for name, _, _, _, fingerprint in frame_jobs:
+            target = written.get(name)
+            if target is None:
+                continue
+            frames[name] = {
+                'file': target.relative_to(checkpoint_path).as_posix(),
+                'fingerprint': fingerprint,
+                'reused_from': None,
+            }
+            if fingerprint:
+                self._frame_index[fingerprint] = (target, checkpoint_name)
+
         # --- 儲存變數與元數據（JSON 安全序列化）---
         safe_variables = {}
         for k, v in context._variables.items():
@@ -164,6 +241,9 @@ class CheckpointManager:
             'warnings': context.warnings,
             'errors': context.errors,
             'timestamp': timestamp,
+            'checkpoint_format': self.checkpoint_format,
+            'parent_checkpoint': self._last_checkpoint,
+            'frames': frames,
             'auxiliary_data_list': context.list_auxiliary_data(),
             'data_shape': list(context.data.shape) if context.data is not None else [0, 0],
             'metadata': metadata or {},
@@ -172,29 +252,210 @@ class CheckpointManager:
         with open(checkpoint_path / "checkpoint_info.json", 'w', encoding='utf-8') as f:
             json.dump(checkpoint_info, f, indent=2, ensure_ascii=False, default=str)
 
+        reused = sum(1 for f in frames.values() if f['reused_from'])
+        self._last_checkpoint = checkpoint_name
         self.logger.info(
             f"Checkpoint 已儲存: {checkpoint_name} "
             f"（主數據 {checkpoint_info['data_shape'][0]} 行，"
-            f"輔助數據 {len(checkpoint_info['auxiliary_data_list'])} 個）"
+            f"輔助數據 {len(checkpoint_info['auxiliary_data_list'])} 個，"
+            f"重用未變動檔案 {reused} 個）"
         )
         return checkpoint_name
 
+    @staticmethod
+    def _frame_fingerprint(df: pd.DataFrame) -> Optional[str]:
+        """
+        計算 DataFrame 內容指紋（欄位、型別、index 與逐列雜湊）
+
+        含不可雜湊值（如 list）的欄位無法計算時回傳 None，該 DataFrame 一律重新寫入。
+        """
+        try:
+            row_hash = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        except (TypeError, ValueError):
+            return None
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr((
+            [str(c) for c in df.columns],
+            [str(t) for t in df.dtypes],
+            df.shape,
+        )).encode('utf-8'))
+        h.update(row_hash.tobytes())
+        return h.hexdigest()
+
+    def _reuse_frame(
+        self,
+        name: str,
+        fingerprint: Optional[str],
+        source: Path,
+        base_path: Path,
+        frames: Dict[str, Dict[str, Any]],
+    ) -> bool:
+        """
+        以 hard link（失敗時複製）引用先前 checkpoint 的檔案
+
+        Returns:
+            bool: 是否成功引用；來源檔案已不存在時回傳 False
+        """
+        if not source.exists():
+            if fingerprint:
+                self._frame_index.pop(fingerprint, None)
+            return False
+
+        target = base_path.with_name(base_path.name + source.suffix)
+        try:
+            if not (target.exists() and os.path.samefile(source, target)):
+                if target.exists():
+                    target.unlink()
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copy2(source, target)
+        except OSError as e:
+            self.logger.warning(f"輔助數據 {name} 引用既有檔案失敗，改為重新寫入: {e}")
+            return False
+
+        self._remove_stale_frames(base_path, target)
+        source_checkpoint = source.parent.parent.name
+        frames[name] = {
+            'file': target.relative_to(base_path.parent.parent).as_posix(),
+            'fingerprint': fingerprint,
+            'reused_from': source_checkpoint if source_checkpoint != base_path.parent.parent.name else None,
+        }
+        if fingerprint:
+            self._frame_index[fingerprint] = (target, base_path.parent.parent.name)
+        return True
+
+    @staticmethod
+    def _remove_stale_frames(base_path: Path, keep: Path) -> None:
+        """移除同名的其他格式檔案，避免載入到舊格式的殘留資料"""
+        for other in _FRAME_SUFFIXES:
+            stale = base_path.with_name(base_path.name + other)
+            if stale != keep and stale.exists():
+                stale.unlink()
+
+    def _save_dataframes(
+        self, jobs: List[Tuple[str, pd.DataFrame, Path, str, Optional[str]]]
+    ) -> Dict[str, Optional[Path]]:
+        """
+        以 thread pool 並行寫入多個 DataFrame（pyarrow 寫檔時釋放 GIL）
+
+        Returns:
+            Dict[str, Optional[Path]]: {名稱: 實際寫入的檔案}，寫入失敗者為 None
+        """
+        if len(jobs) <= 1 or self.max_workers <= 1:
+            return {
+                name: self._save_dataframe(df, base_path, label)
+                for name, df, base_path, label, _ in jobs
+            }
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(jobs)),
+            thread_name_prefix="checkpoint",
+        ) as pool:
+            futures = {
+                name: pool.submit(self._save_dataframe, df, base_path, label)
+                for name, df, base_path, label, _ in jobs
+            }
+            return {name: future.result() for name, future in futures.items()}
+
     def _save_dataframe(
         self,
         df: pd.DataFrame,
-        parquet_path: Path,
-        pkl_path: Path,
+        base_path: Path,
         label: str = "DataFrame",
-    ) -> None:
-        """嘗試 Parquet 儲存，失敗時 fallback 至 Pickle"""
+    ) -> Optional[Path]:
+        """
+        依 checkpoint_format 儲存 DataFrame，失敗時 fallback 至 Pickle
+
+        寫入前先移除既有檔案（可能是與其他 checkpoint 共用的 hard link），
+        成功後移除同名的其他格式檔案，避免載入到舊格式的殘留資料。
+
+        Args:
+            df: 要儲存的 DataFrame
+            base_path: 不含副檔名的檔案路徑
+            label: 日誌用名稱
+
+        Returns:
+            Optional[Path]: 實際寫入的檔案，全部失敗時為 None
+        """
+        suffix = CHECKPOINT_FORMATS[self.checkpoint_format]
+        target = base_path.with_name(base_path.name + suffix)
+        if target.exists():
+            target.unlink()
         try:
-            df.to_parquet(parquet_path, index=False)
+            if self.checkpoint_format == 'arrow':
+                self._write_arrow(df, target)
+            else:
+                df.to_parquet(target, index=False)
         except Exception as e:
-            self.logger.warning(f"{label} Parquet 儲存失敗，改用 Pickle: {e}")
+            self.logger.warning(f"{label} {self.checkpoint_format} 儲存失敗，改用 Pickle: {e}")
+            target = base_path.with_name(base_path.name + '.pkl')
+            if target.exists():
+                target.unlink()
             try:
-                df.to_pickle(pkl_path)
+                df.to_pickle(target)
             except Exception as e2:
                 self.logger.error(f"{label} Pickle 儲存亦失敗: {e2}")
+                return None
+
+        self._remove_stale_frames(base_path, target)
+        return target
+
+    def _write_arrow(self, df: pd.DataFrame, path: Path) -> None:
+        """寫入未壓縮的 Arrow IPC 檔案（先寫暫存檔再替換）"""
+        table = self._to_arrow_table(df)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with pa.OSFile(str(tmp_path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def _to_arrow_table(self, df: pd.DataFrame) -> pa.Table:
+        """
+        轉換為 Arrow Table
+
+        混合型別的 object 欄位（如數字與字串並存）無法直接轉換時，
+        僅將這些欄位轉為字串後重試，不複製整個 DataFrame。
+        """
+        try:
+            return pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+
+        fixups = {}
+        for col in df.columns[(df.dtypes == object).to_numpy()]:
+            try:
+                pa.array(df[col], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                fixups[col] = str
+        if fixups:
+            self.logger.debug(f"Arrow 轉換時改以字串儲存欄位: {list(fixups)}")
+        return pa.Table.from_pandas(df.astype(fixups, copy=False), preserve_index=False)
+
+    @staticmethod
+    def _read_arrow(path: Path) -> pd.DataFrame:
+        """以 memory map 讀取 Arrow IPC 檔案"""
+        with pa.memory_map(str(path), 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas()
+
+    def _read_frame(self, path: Path) -> pd.DataFrame:
+        """依副檔名讀取 DataFrame"""
+        if path.suffix == '.arrow':
+            return self._read_arrow(path)
+        if path.suffix == '.parquet':
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def _lazy_frame_loader(self, path: Path, aux_name: str):
+        """建立輔助數據的延遲載入函數，載入失敗時記錄警告並回傳 None"""
+        def _load():
+            try:
+                return self._read_frame(path)
+            except Exception as e:
+                self.logger.warning(f"輔助數據 {aux_name}{path.suffix} 載入失敗: {e}")
+                return None
+        return _load
 
     # ────────────────────────────────────────────────
     # 載入
@@ -205,8 +466,9 @@ class CheckpointManager:
         載入 checkpoint，恢復完整的 ProcessingContext
 
         載入策略：
-          - 主數據：優先 Parquet，不存在則 Pickle
-          - 輔助數據：先載入所有 Parquet，再補載 Pickle（不覆蓋已存在的）
+          - 主數據：依 Arrow → Parquet → Pickle 順序尋找（Arrow 以 memory map 讀取）
+          - 輔助數據：Arrow / Parquet 檔案延遲載入（首次存取才讀入），
+            再補載 Pickle（不覆蓋已存在的）
           - 恢復 variables、warnings、errors
 
         Args:
@@ -225,15 +487,12 @@ class CheckpointManager:
             info = json.load(f)
 
         # --- 載入主數據 ---
-        data_parquet = checkpoint_path / "data.parquet"
-        data_pkl = checkpoint_path / "data.pkl"
-
-        if data_parquet.exists():
-            data = pd.read_parquet(data_parquet)
-        elif data_pkl.exists():
-            data = pd.read_pickle(data_pkl)
-        else:
-            data = pd.DataFrame()
+        data = pd.DataFrame()
+        for suffix in _FRAME_SUFFIXES:
+            data_file = checkpoint_path / f"data{suffix}"
+            if data_file.exists():
+                data = self._read_frame(data_file)
+                break
 
         # --- 建立上下文 ---
         context = ProcessingContext(
@@ -252,15 +511,27 @@ class CheckpointManager:
         context.errors = info.get('errors', [])
 
         # --- 恢復輔助數據 ---
+        # 指紋資訊供後續增量儲存重用（舊版 checkpoint 無 frames 欄位則略過）
+        frame_fingerprints = {
+            name: record.get('fingerprint')
+            for name, record in info.get('frames', {}).items()
+        }
+        lazy_sources: Dict[str, Tuple[Path, str]] = {}
         aux_data_dir = checkpoint_path / "auxiliary_data"
         if aux_data_dir.exists():
-            # 先載 Parquet
-            for aux_file in sorted(aux_data_dir.glob("*.parquet")):
-                aux_name = aux_file.stem
-                try:
-                    context.add_auxiliary_data(aux_name, pd.read_parquet(aux_file))
-                except Exception as e:
-                    self.logger.warning(f"輔助數據 {aux_name}.parquet 載入失敗: {e}")
+            # 先登記 Arrow / Parquet（延遲載入）
+            for suffix in ('.arrow', '.parquet'):
+                for aux_file in sorted(aux_data_dir.glob(f"*{suffix}")):
+                    aux_name = aux_file.stem
+                    if context.has_auxiliary_data(aux_name):
+                        continue
+                    context.add_lazy_auxiliary_data(
+                        aux_name, self._lazy_frame_loader(aux_file, aux_name)
+                    )
+                    fingerprint = frame_fingerprints.get(aux_name)
+                    if fingerprint:
+                        lazy_sources[aux_name] = (aux_file, fingerprint)
+                        self._frame_index[fingerprint] = (aux_file, checkpoint_name)
 
             # 再補 Pickle（不覆蓋已存在的）
             for aux_file in sorted(aux_data_dir.glob("*.pkl")):
@@ -273,6 +544,10 @@ class CheckpointManager:
                 except Exception as e:
                     self.logger.warning(f"輔助數據 {aux_name}.pkl 載入失敗: {e}")
 
+        if lazy_sources:
+            self._lazy_sources[context] = lazy_sources
+        self._last_checkpoint = checkpoint_name
+
         self.logger.info(
             f"Checkpoint 已載入: {checkpoint_name} | "
             f"主數據 {len(context.data)} 行 | "
@@ -493,6 +768,7 @@ async def execute_pipeline_with_checkpoint(
     checkpoint_dir: str = "./checkpoints",
     save_checkpoints: bool = True,
     processing_type: str = 'PO',
+    checkpoint_format: str = 'parquet',
 ) -> Dict[str, Any]:
     """
     Orchestrator 整合用：建立 pipeline 並執行，自動儲存 checkpoint
@@ -505,6 +781,7 @@ async def execute_pipeline_with_checkpoint(
         checkpoint_dir: checkpoint 儲存目錄
         save_checkpoints: 是否儲存 checkpoint
         processing_type: 處理類型（PO/PR/PPE）
+        checkpoint_format: checkpoint 儲存格式（parquet/arrow）
 
     Returns:
         Dict: 執行結果
@@ -514,7 +791,7 @@ async def execute_pipeline_with_checkpoint(
     else:
         pipeline = pipeline_func(file_paths)
 
-    checkpoint_manager = CheckpointManager(checkpoint_dir)
+    checkpoint_manager = CheckpointManager(checkpoint_dir, checkpoint_format=checkpoint_format)
     context = ProcessingContext(
         data=pd.DataFrame(),
         entity_type=entity,
@@ -536,6 +813,7 @@ async def resume_from_step(
     file_paths: Optional[Dict[str, Any]] = None,
     checkpoint_dir: str = "./checkpoints",
     save_checkpoints: bool = True,
+    checkpoint_format: str = 'parquet',
 ) -> Dict[str, Any]:
     """
     從 checkpoint 恢復並從指定步驟開始執行
@@ -547,11 +825,12 @@ async def resume_from_step(
         file_paths: 檔案路徑（若 checkpoint 中未保存則必填）
         checkpoint_dir: checkpoint 目錄
         save_checkpoints: 是否儲存新的 checkpoint
+        checkpoint_format: 新 checkpoint 的儲存格式（載入時依檔案自動判斷）
 
     Returns:
         Dict: 執行結果
     """
-    checkpoint_manager = CheckpointManager(checkpoint_dir)
+    checkpoint_manager = CheckpointManager(checkpoint_dir, checkpoint_format=checkpoint_format)
     context = checkpoint_manager.load_checkpoint(checkpoint_name)
 
     if file_paths is None:
@@ -3,14 +3,38 @@
 在Pipeline步驟間傳遞數據和狀態
 """
 
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Iterator, Optional, List
 from datetime import datetime
 import pandas as pd
 
 from accrual_bot.utils.logging import get_logger
 
 
+def is_copy_on_write_active() -> bool:
+    """pandas Copy-on-Write 是否已啟用（'warn' 模式不視為啟用）"""
+    return pd.options.mode.copy_on_write is True
+
+
+@contextmanager
+def copy_on_write_mode(enabled: bool = True) -> Iterator[None]:
+    """
+    在區塊內切換 pandas Copy-on-Write，離開時還原原設定
+
+    注意 pandas 選項為行程層級設定，區塊內其他執行緒亦受影響。
+
+    Args:
+        enabled: 是否啟用
+    """
+    previous = pd.options.mode.copy_on_write
+    pd.set_option('mode.copy_on_write', enabled)
+    try:
+        yield
+    finally:
+        pd.set_option('mode.copy_on_write', previous)
+
+
 @dataclass
 class ValidationResult:
     """驗證結果"""
@@ -52,7 +76,8 @@ class ProcessingContext:
                  data: pd.DataFrame,
                  entity_type: str,
                  processing_date: int,
-                 processing_type: str = "PO"):
+                 processing_type: str = "PO",
+                 copy_on_write: bool = False):
         """
         初始化處理上下文
         
@@ -61,8 +86,14 @@ class ProcessingContext:
             entity_type: 實體類型 (MOB/SPT/SPX)
             processing_date: 處理日期 (YYYYMM)
             processing_type: 處理類型 (PO/PR)
+            copy_on_write: 是否使用 Copy-on-Write 模式；啟用且 pandas CoW 生效時，
+                get_data_copy 回傳淺層 view，修改時才由 pandas 延遲複製
         """
         self.data = data
+        self.copy_on_write = copy_on_write
+        # 主數據擁有權：最後一次寫入主數據的步驟與版本號
+        self._data_owner: Optional[str] = None
+        self._data_version = 0
         self.metadata = ContextMetadata(
             entity_type=entity_type,
             processing_date=processing_date,
@@ -71,6 +102,8 @@ class ProcessingContext:
         
         # 輔助數據存儲
         self._auxiliary_data: Dict[str, pd.DataFrame] = {}
+        # 延遲載入的輔助數據（如 checkpoint 恢復時），首次存取才讀入
+        self._lazy_auxiliary_data: Dict[str, Callable[[], Any]] = {}
         
         # 共享變量存儲
         self._variables: Dict[str, Any] = {}
@@ -87,16 +120,79 @@ class ProcessingContext:
         
         self.logger = get_logger(f"Context.{entity_type}")
     
+    def spawn_chunk(self, data: pd.DataFrame) -> 'ProcessingContext':
+        """
+        建立串流執行用的 chunk 上下文
+        
+        主數據與執行歷史各自獨立；元數據、輔助數據、變量、錯誤、警告與驗證結果
+        與父上下文共用（同一物件），chunk 步驟的輸出會反映到父上下文。
+        
+        Args:
+            data: 數據塊
+            
+        Returns:
+            ProcessingContext: chunk 上下文
+        """
+        child = ProcessingContext.__new__(ProcessingContext)
+        child.__dict__.update(self.__dict__)
+        child.data = data
+        child._data_owner = None
+        child._data_version = 0
+        child._history = []
+        return child
+    
     # === 主數據操作 ===
     
-    def update_data(self, data: pd.DataFrame):
-        """更新主數據"""
+    def update_data(self, data: pd.DataFrame, owner: Optional[str] = None):
+        """
+        更新主數據
+
+        Args:
+            data: 新的主數據
+            owner: 寫入者（步驟名稱）；未提供時由 PipelineStep 於執行後補上
+        """
         self.data = data
+        self._data_version += 1
+        self._data_owner = owner
         self.metadata.update()
     
     def get_data_copy(self) -> pd.DataFrame:
-        """獲取數據副本"""
+        """
+        獲取數據副本
+
+        Copy-on-Write 模式下回傳淺層 view：pandas 於寫入時才複製被修改的欄位，
+        context.data 在 update_data 前維持原狀，失敗回滾改由 checkpoint 負責，
+        不需預先深複製。其餘情況回傳深複製。
+        """
+        if self.copy_on_write and is_copy_on_write_active():
+            return self.data.copy(deep=False)
         return self.data.copy()
+
+    @property
+    def data_version(self) -> int:
+        """主數據版本號（每次 update_data 遞增）"""
+        return self._data_version
+
+    @property
+    def data_owner(self) -> Optional[str]:
+        """最後一次寫入主數據的步驟名稱"""
+        return self._data_owner
+
+    def claim_data(self, owner: str, version: int) -> bool:
+        """
+        登記主數據擁有者（僅在版本號相符且尚無擁有者時生效）
+
+        Args:
+            owner: 步驟名稱
+            version: 呼叫者觀察到的版本號
+
+        Returns:
+            bool: 是否登記成功
+        """
+        if self._data_version != version or self._data_owner is not None:
+            return False
+        self._data_owner = owner
+        return True
     
     # === 輔助數據操作 ===
     
@@ -108,8 +204,33 @@ class ProcessingContext:
             name: 數據名稱
             data: 數據內容
         """
+        self._lazy_auxiliary_data.pop(name, None)
         self._auxiliary_data[name] = data
         self.logger.debug(f"Added auxiliary data: {name} ({len(data)} rows)")
+
+    def add_lazy_auxiliary_data(self, name: str, loader: Callable[[], Any]):
+        """
+        添加延遲載入的輔助數據
+
+        首次透過 get_auxiliary_data 存取時才呼叫 loader 讀入；
+        loader 回傳 None 視為無此數據。
+
+        Args:
+            name: 數據名稱
+            loader: 無參數的載入函數
+        """
+        self._auxiliary_data.pop(name, None)
+        self._lazy_auxiliary_data[name] = loader
+        self.logger.debug(f"Added lazy auxiliary data: {name}")
+
+    def _materialize_auxiliary_data(self, name: str) -> None:
+        """讀入延遲載入的輔助數據"""
+        loader = self._lazy_auxiliary_data.pop(name, None)
+        if loader is None:
+            return
+        data = loader()
+        if data is not None:
+            self._auxiliary_data[name] = data
     
     def get_auxiliary_data(self, name: str) -> Optional[pd.DataFrame]:
         """
@@ -121,15 +242,21 @@ class ProcessingContext:
         Returns:
             Optional[pd.DataFrame]: 數據或None
         """
+        if name in self._lazy_auxiliary_data:
+            self._materialize_auxiliary_data(name)
         return self._auxiliary_data.get(name)
     
     def has_auxiliary_data(self, name: str) -> bool:
         """檢查是否有指定的輔助數據"""
-        return name in self._auxiliary_data
+        return name in self._auxiliary_data or name in self._lazy_auxiliary_data
     
     def list_auxiliary_data(self) -> List[str]:
-        """列出所有輔助數據名稱"""
-        return list(self._auxiliary_data.keys())
+        """列出所有輔助數據名稱（含尚未載入者）"""
+        return list(self._auxiliary_data.keys()) + list(self._lazy_auxiliary_data.keys())
+
+    def is_auxiliary_data_loaded(self, name: str) -> bool:
+        """檢查輔助數據是否已讀入記憶體（延遲載入者在首次存取前為 False）"""
+        return name in self._auxiliary_data
 
     @property
     def auxiliary_data(self) -> Dict[str, pd.DataFrame]:
@@ -139,6 +266,8 @@ class ProcessingContext:
         Returns:
             Dict[str, pd.DataFrame]: 輔助數據字典
         """
+        for name in list(self._lazy_auxiliary_data):
+            self._materialize_auxiliary_data(name)
         return self._auxiliary_data.copy()
 
     def set_auxiliary_data(self, name: str, data: pd.DataFrame):
@@ -328,12 +457,15 @@ class ProcessingContext:
             'processing_date': self.metadata.processing_date,
             'processing_type': self.metadata.processing_type,
             'data_shape': self.data.shape,
-            'auxiliary_data': list(self._auxiliary_data.keys()),
+            'auxiliary_data': self.list_auxiliary_data(),
             'variables': list(self._variables.keys()),
             'errors': len(self.errors),
             'warnings': len(self.warnings),
             'validations': list(self._validations.keys()),
-            'history_steps': len(self._history)
+            'history_steps': len(self._history),
+            'copy_on_write': self.copy_on_write,
+            'data_owner': self._data_owner,
+            'data_version': self._data_version
         }
     
     def __repr__(self) -> str:
@@ -0,0 +1,191 @@
+"""
+Pipeline DAG 排程
+
+依步驟宣告的讀寫鍵（PipelineStep.reads / writes）建立相依圖，
+無衝突的步驟可同時執行。
+
+鍵值格式：
+  - 'data'         主數據
+  - 'aux:<name>'   輔助數據
+  - 'var:<name>'   共享變量
+
+相依規則（i 在 j 之前）：
+  - i 寫入 j 讀取的鍵（讀後寫）
+  - i 讀取 j 寫入的鍵（寫後讀）
+  - i 與 j 寫入同一個鍵
+  - 任一方未宣告讀寫（writes 為 None）時視為屏障，保持原本順序
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .base import PipelineStep, StepResult, StepStatus
+from .context import ProcessingContext
+from accrual_bot.utils.logging import get_logger
+
+DATA_KEY = 'data'
+
+
+def aux_key(name: str) -> str:
+    """輔助數據鍵"""
+    return f"aux:{name}"
+
+
+def var_key(name: str) -> str:
+    """共享變量鍵"""
+    return f"var:{name}"
+
+
+def _conflicts(earlier: Tuple[Optional[FrozenSet[str]], Optional[FrozenSet[str]]],
+               later: Tuple[Optional[FrozenSet[str]], Optional[FrozenSet[str]]]) -> bool:
+    """判斷兩個步驟的讀寫是否衝突"""
+    reads_a, writes_a = earlier
+    reads_b, writes_b = later
+    if writes_a is None or writes_b is None:
+        return True
+    return bool(
+        (writes_a & reads_b) or (reads_a & writes_b) or (writes_a & writes_b)
+    )
+
+
+def build_step_graph(steps: List[PipelineStep]) -> List[Set[int]]:
+    """
+    建立步驟相依圖
+
+    Args:
+        steps: 依原始順序排列的步驟
+
+    Returns:
+        List[Set[int]]: 每個步驟所依賴的前序步驟索引
+    """
+    io = [step.get_io() for step in steps]
+    dependencies: List[Set[int]] = []
+    for j in range(len(steps)):
+        deps = {i for i in range(j) if _conflicts(io[i], io[j])}
+        # 移除可經由其他相依間接達成的邊，讓日誌較易閱讀
+        indirect = set()
+        for i in deps:
+            indirect |= dependencies[i]
+        dependencies.append(deps - indirect)
+    return dependencies
+
+
+def _run_step_in_thread(step: PipelineStep, context: ProcessingContext) -> StepResult:
+    """在工作執行緒中以獨立事件迴圈執行步驟"""
+    return asyncio.run(step(context))
+
+
+class DAGScheduler:
+    """依相依圖並行執行步驟"""
+
+    def __init__(self,
+                 steps: List[PipelineStep],
+                 max_concurrent: int = 5,
+                 stop_on_error: bool = True,
+                 use_threads: bool = True,
+                 step_listener: Optional[Callable[[str, int, str], None]] = None):
+        """
+        初始化排程器
+
+        Args:
+            steps: 步驟列表（原始順序）
+            max_concurrent: 最大同時執行步驟數
+            stop_on_error: 步驟失敗時是否停止排程後續步驟
+            use_threads: 是否將步驟放到工作執行緒執行；
+                         步驟內多為同步 pandas 運算，不放到執行緒時無法真正重疊
+            step_listener: 步驟開始 / 完成時的回調，參數為 (step_name, 序號(1 起), status)
+        """
+        self.steps = steps
+        self.max_concurrent = max(1, max_concurrent)
+        self.stop_on_error = stop_on_error
+        self.use_threads = use_threads
+        self.step_listener = step_listener
+        self.dependencies = build_step_graph(steps)
+        self.logger = get_logger("pipeline.DAGScheduler")
+
+    def describe(self) -> List[Dict[str, object]]:
+        """
+        取得相依圖摘要
+
+        Returns:
+            List[Dict[str, object]]: 每個步驟的名稱與直接相依步驟
+        """
+        return [
+            {'step': step.name, 'depends_on': [self.steps[i].name for i in sorted(deps)]}
+            for step, deps in zip(self.steps, self.dependencies)
+        ]
+
+    async def run(self, context: ProcessingContext) -> List[StepResult]:
+        """
+        執行所有步驟
+
+        Args:
+            context: 處理上下文
+
+        Returns:
+            List[StepResult]: 已執行步驟的結果（依原始步驟順序）
+        """
+        for node in self.describe():
+            self.logger.debug(f"DAG node {node['step']} <- {node['depends_on']}")
+
+        loop = asyncio.get_running_loop()
+        executor = (ThreadPoolExecutor(max_workers=self.max_concurrent,
+                                       thread_name_prefix="pipeline-dag")
+                    if self.use_threads else None)
+
+        pending = set(range(len(self.steps)))
+        finished: Set[int] = set()
+        running: Dict[asyncio.Future, int] = {}
+        results: Dict[int, StepResult] = {}
+        stopped = False
+
+        def start(index: int):
+            step = self.steps[index]
+            self.logger.info(f"Executing step {index + 1}/{len(self.steps)}: {step.name}")
+            if self.step_listener is not None:
+                self.step_listener(step.name, index + 1, 'running')
+            if executor is not None:
+                future = loop.run_in_executor(executor, _run_step_in_thread, step, context)
+            else:
+                future = asyncio.ensure_future(step(context))
+            running[future] = index
+
+        try:
+            while pending or running:
+                if not stopped:
+                    ready = [i for i in sorted(pending) if self.dependencies[i] <= finished]
+                    for index in ready[:self.max_concurrent - len(running)]:
+                        pending.discard(index)
+                        start(index)
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    step = self.steps[index]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = StepResult(
+                            step_name=step.name,
+                            status=StepStatus.FAILED,
+                            error=e,
+                            message=str(e)
+                        )
+                    results[index] = result
+                    finished.add(index)
+                    context.add_history(step.name, result.status.value)
+                    if self.step_listener is not None:
+                        self.step_listener(step.name, index + 1, result.status.value)
+
+                    if result.status == StepStatus.FAILED and self.stop_on_error:
+                        if not stopped:
+                            self.logger.error(f"Stopping pipeline due to failed step: {step.name}")
+                        stopped = True
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        return [results[i] for i in sorted(results)]
@@ -1,3 +1,4 @@
 from .condition_engine import ConditionEngine
+from .sql_join_engine import SQLJoinEngine, get_sql_join_engine, is_sql_join_enabled
 
-__all__ = ['ConditionEngine']
+__all__ = ['ConditionEngine', 'SQLJoinEngine', 'get_sql_join_engine', 'is_sql_join_enabled']
@@ -12,18 +12,66 @@
 設計原則：
 - 引擎本身不含任何 entity 特定邏輯，所有業務規則由 TOML 配置驅動
 - entity_type 僅用於解析 entity 相關的配置引用（如 fa_accounts）
+- 規則於建構時編譯為執行計畫（預先解析 *_key 引用），
+  apply_rules 期間相同 check 僅評估一次（sub-mask memo）
 """
 
+from dataclasses import dataclass, field as dc_field
 from typing import Any, Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
 from accrual_bot.utils.config import config_manager
+from accrual_bot.utils.helpers.data_utils import get_erm_desc_fields
 from accrual_bot.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+# 反向 check → 正向 check；兩者共用同一個 sub-mask
+_NEGATED_CHECKS = {
+    'not_contains': 'contains',
+    'not_equals': 'equals',
+    'not_in_list': 'in_list',
+    'qty_not_matched': 'qty_matched',
+    'not_fa': 'is_fa',
+}
+
+
+def _expand_category_mask(
+    series: pd.Series,
+    category_mask: np.ndarray,
+    na: Optional[bool] = None
+) -> pd.Series:
+    """將類別層級的判斷結果依 codes 展開為列層級 boolean Series（category 欄位快速路徑）
+
+    Args:
+        series: category 欄位
+        category_mask: 各類別的判斷結果（與 categories 對齊）
+        na: 缺值的填入值；None 時保留 NA（同 string 比較語意）
+    """
+    codes = series.cat.codes.to_numpy()
+    missing = codes < 0
+    values = np.zeros(len(codes), dtype=bool)
+    values[~missing] = category_mask[codes[~missing]]
+    if na is None:
+        return pd.Series(pd.arrays.BooleanArray(values, missing), index=series.index)
+    values[missing] = na
+    return pd.Series(values, index=series.index, dtype='boolean')
+
+
+@dataclass
+class CompiledRule:
+    """編譯後的規則（引用已解析、check 已正規化）"""
+    priority: int
+    status_value: str
+    note: str
+    combine: str
+    apply_to: List[str]
+    override_statuses: List[str]
+    checks: List[Dict[str, Any]] = dc_field(default_factory=list)
+
+
 class ConditionEngine:
     """配置驅動的條件引擎
 
@@ -47,8 +95,11 @@ class ConditionEngine:
         self.config_section = config_section
         self.entity_type = entity_type
         self.rules = self._load_rules()
+        self.plan = self._compile_rules(self.rules)
+        distinct = len({self._check_key(c) for r in self.plan for c in r.checks})
         logger.info(f"ConditionEngine 已載入 {len(self.rules)} 條規則 "
-                    f"(來源: {config_section}, entity: {entity_type})")
+                    f"(來源: {config_section}, entity: {entity_type}, "
+                    f"不重複條件: {distinct})")
 
     def _load_rules(self) -> List[Dict[str, Any]]:
         """載入並按 priority 排序的規則列表"""
@@ -63,6 +114,47 @@ class ConditionEngine:
         sorted_rules = sorted(conditions, key=lambda r: r.get('priority', 999))
         return sorted_rules
 
+    def _compile_rules(self, rules: List[Dict[str, Any]]) -> List[CompiledRule]:
+        """將規則編譯為執行計畫
+
+        - 預先解析 status_value_key / pattern_key / value_key / list_key
+        - 無 checks 的規則直接剔除
+        """
+        plan: List[CompiledRule] = []
+        for rule in rules:
+            checks = rule.get('checks', [])
+            if not checks:
+                continue
+            plan.append(CompiledRule(
+                priority=rule.get('priority', 0),
+                status_value=self._resolve_status_value(rule),
+                note=rule.get('note', ''),
+                combine=rule.get('combine', 'and'),
+                apply_to=rule.get('apply_to', ['PO', 'PR']),
+                override_statuses=rule.get('override_statuses', []),
+                checks=[self._compile_check(c) for c in checks],
+            ))
+        return plan
+
+    def _compile_check(self, check: Dict[str, Any]) -> Dict[str, Any]:
+        """將 check 的 *_key 引用替換為解析後的值"""
+        compiled = {
+            k: v for k, v in check.items()
+            if k not in ('pattern_key', 'value_key', 'list_key')
+        }
+        if 'pattern_key' in check and 'pattern' not in check:
+            compiled['pattern'] = self._resolve_pattern(check)
+        if 'value_key' in check and 'value' not in check:
+            compiled['value'] = self._resolve_value(check)
+        if 'list_key' in check and 'values' not in check:
+            compiled['values'] = self._resolve_list(check)
+        return compiled
+
+    @staticmethod
+    def _check_key(check: Dict[str, Any]) -> Tuple:
+        """check 的識別 key，內容相同的 check 得到相同 key"""
+        return tuple(sorted((k, repr(v)) for k, v in check.items()))
+
     def apply_rules(
         self,
         df: pd.DataFrame,
@@ -101,25 +193,22 @@ class ConditionEngine:
                 f"含狀態值，引擎僅處理其餘 {int(no_status.sum()):,} 筆"
             )
 
-        for rule in self.rules:
+        # 本次呼叫的 sub-mask memo：相同 check 只評估一次
+        memo: Dict[Tuple, Optional[pd.Series]] = {}
+
+        for rule in self.plan:
             # 檢查 apply_to 過濾
-            apply_to = rule.get('apply_to', ['PO', 'PR'])
-            if processing_type not in apply_to:
+            if processing_type not in rule.apply_to:
                 continue
 
-            priority = rule.get('priority', 0)
-            status_value = self._resolve_status_value(rule)
-            note = rule.get('note', '')
-            combine = rule.get('combine', 'and')
-            checks = rule.get('checks', [])
-
-            if not checks:
-                continue
+            priority = rule.priority
+            status_value = rule.status_value
+            note = rule.note
 
             # 建構組合 mask
             mask = self._build_combined_mask(
-                df, checks, combine, status_column, context,
-                processing_type=processing_type
+                df, rule.checks, rule.combine, status_column, context,
+                processing_type=processing_type, memo=memo
             )
 
             if mask is None:
@@ -127,7 +216,7 @@ class ConditionEngine:
 
             # 限縮：僅命中「尚無狀態」的列
             # 若規則宣告 override_statuses，則額外納入擁有這些狀態的列
-            override_statuses = rule.get('override_statuses', [])
+            override_statuses = rule.override_statuses
             if override_statuses:
                 overridable = df[status_column].isin(override_statuses)
                 mask = mask & (no_status | overridable)
@@ -153,6 +242,9 @@ class ConditionEngine:
             if update_no_status and 'prebuilt_masks' in context:
                 context['prebuilt_masks']['no_status'] = no_status
 
+        logger.debug(
+            f"[{self.config_section}] 共評估 {len(memo)} 個不重複條件"
+        )
         return df, stats
 
     def _resolve_status_value(self, rule: Dict[str, Any]) -> str:
@@ -170,13 +262,15 @@ class ConditionEngine:
         combine: str,
         status_column: str,
         context: Dict[str, Any],
-        processing_type: str = "PO"
+        processing_type: str = "PO",
+        memo: Optional[Dict[Tuple, Optional[pd.Series]]] = None
     ) -> Optional[pd.Series]:
         """建構多個 check 的組合 mask
 
         Args:
             combine: 'and' 或 'or'
             processing_type: 處理類型，用於替換 field 中的 {TYPE} 佔位符
+            memo: sub-mask 快取；提供時相同 check 僅評估一次
         """
         masks: List[pd.Series] = []
 
@@ -185,7 +279,12 @@ class ConditionEngine:
             if '{TYPE}' in check.get('field', ''):
                 check = {**check, 'field': check['field'].replace('{TYPE}', processing_type)}
 
-            mask = self._evaluate_check(df, check, status_column, context)
+            if memo is None:
+                mask = self._evaluate_check(df, check, status_column, context)
+            else:
+                mask = self._evaluate_memoized(
+                    df, check, status_column, context, memo
+                )
             if mask is not None:
                 masks.append(mask)
 
@@ -203,6 +302,46 @@ class ConditionEngine:
 
         return result
 
+    def _evaluate_memoized(
+        self,
+        df: pd.DataFrame,
+        check: Dict[str, Any],
+        status_column: str,
+        context: Dict[str, Any],
+        memo: Dict[Tuple, Optional[pd.Series]]
+    ) -> Optional[pd.Series]:
+        """帶快取的 check 評估
+
+        - prebuilt_masks 優先（查表成本可忽略，且呼叫端可能更新）
+        - 讀取狀態欄位的 check 會隨規則套用而改變，不快取
+        - 反向 check（not_*）由正向 check 的 sub-mask 取反，共用快取
+        """
+        check_type = check.get('type', '')
+        prebuilt = context.get('prebuilt_masks', {})
+        if check_type in prebuilt and check_type != 'no_status':
+            return prebuilt[check_type]
+
+        if check_type == 'no_status' or check.get('field') in (
+            status_column, 'matched_condition_on_status'
+        ):
+            return self._evaluate_check(df, check, status_column, context)
+
+        key = self._check_key(check)
+        if key in memo:
+            return memo[key]
+
+        positive = _NEGATED_CHECKS.get(check_type)
+        if positive is not None and positive not in prebuilt:
+            base = self._evaluate_memoized(
+                df, {**check, 'type': positive}, status_column, context, memo
+            )
+            result = ~base if base is not None else None
+        else:
+            result = self._evaluate_check(df, check, status_column, context)
+
+        memo[key] = result
+        return result
+
     def _evaluate_check(
         self,
         df: pd.DataFrame,
@@ -293,26 +432,26 @@ class ConditionEngine:
                 return prebuilt['out_of_range']
             in_range = self._compute_erm_in_range(df)
             if in_range is not None:
-                format_err = df['YMs of Item Description'] == '100001,100002'
+                format_err = self._desc_erm_bounds(df)[2]
                 return (~in_range) & (~format_err)
             return None
 
         if check_type == 'desc_erm_le_date':
-            if processing_date and 'YMs of Item Description' in df.columns:
-                return (df['YMs of Item Description']
-                        .str[7:].astype('Int64') <= processing_date)
+            bounds = self._desc_erm_bounds(df)
+            if processing_date and bounds is not None:
+                return bounds[1] <= processing_date
             return None
 
         if check_type == 'desc_erm_gt_date':
-            if processing_date and 'YMs of Item Description' in df.columns:
-                return (df['YMs of Item Description']
-                        .str[:6].astype('Int64') > processing_date)
+            bounds = self._desc_erm_bounds(df)
+            if processing_date and bounds is not None:
+                return bounds[0] > processing_date
             return None
 
         if check_type == 'desc_erm_not_error':
-            if 'YMs of Item Description' in df.columns:
-                return (df['YMs of Item Description']
-                        .str[:6].astype('Int64') != 100001)
+            bounds = self._desc_erm_bounds(df)
+            if bounds is not None:
+                return ~bounds[2]
             return None
 
         # === 帳務類 ===
@@ -364,9 +503,8 @@ class ConditionEngine:
         if check_type == 'format_error':
             if 'format_error' in prebuilt:
                 return prebuilt['format_error']
-            if 'YMs of Item Description' in df.columns:
-                return df['YMs of Item Description'] == '100001,100002'
-            return None
+            bounds = self._desc_erm_bounds(df)
+            return bounds[2] if bounds is not None else None
 
         # === 備註類 ===
         if check_type == 'remark_completed':
@@ -437,7 +575,17 @@ class ConditionEngine:
         if not pattern:
             return None
 
-        return df[field].astype('string').str.contains(pattern, na=na, regex=True)
+        series = df[field]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # 只對類別做正則比對，再依 codes 展開
+            category_mask = (
+                series.cat.categories.astype('string')
+                .str.contains(pattern, na=na, regex=True)
+                .to_numpy(dtype=bool)
+            )
+            return _expand_category_mask(series, category_mask, na=na)
+
+        return series.astype('string').str.contains(pattern, na=na, regex=True)
 
     def _check_equals(
         self,
@@ -458,7 +606,12 @@ class ConditionEngine:
             casted = df[field].astype(cast)
             return casted == type(value)(value) if isinstance(value, (int, float)) else casted == value
 
-        return df[field].astype('string') == str(value)
+        series = df[field]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            category_mask = (series.cat.categories.astype('string') == str(value)).to_numpy(dtype=bool)
+            return _expand_category_mask(series, category_mask)
+
+        return series.astype('string') == str(value)
 
     def _check_in_list(
         self,
@@ -474,6 +627,7 @@ class ConditionEngine:
         if values is None:
             return None
 
+        # category 欄位的 isin 由 pandas 以 codes 比對
         return df[field].isin(values)
 
     # ========== 值解析輔助方法 ==========
@@ -546,15 +700,26 @@ class ConditionEngine:
 
     # ========== ERM 計算輔助方法 ==========
 
+    def _desc_erm_bounds(
+        self, df: pd.DataFrame
+    ) -> Optional[Tuple[pd.Series, pd.Series, pd.Series]]:
+        """取得摘要日期區間的 (起, 迄, 格式錯誤) Series
+
+        優先使用 DateLogicStep 產生的 ERM_DESC_COLUMNS 欄位，
+        缺少時才從 'YMs of Item Description' 字串切片轉換。
+        """
+        return get_erm_desc_fields(df)
+
     def _compute_erm_in_range(self, df: pd.DataFrame) -> Optional[pd.Series]:
         """計算 ERM 是否在摘要日期區間內"""
-        if not all(c in df.columns for c in [
-            'Expected Received Month_轉換格式', 'YMs of Item Description'
-        ]):
+        if 'Expected Received Month_轉換格式' not in df.columns:
+            return None
+
+        bounds = self._desc_erm_bounds(df)
+        if bounds is None:
             return None
 
-        ym_start = df['YMs of Item Description'].str[:6].astype('Int32')
-        ym_end = df['YMs of Item Description'].str[7:].astype('Int32')
+        ym_start, ym_end, _ = bounds
         erm = df['Expected Received Month_轉換格式']
 
         return erm.between(ym_start, ym_end, inclusive='both')
@@ -0,0 +1,319 @@
+"""
+DuckDB SQL 整合引擎
+
+整合步驟（前期底稿、採購底稿、AP Invoice、PPE 合併）的選用 SQL 執行模式。
+DataFrame 以 register 零複製註冊到共用的 in-process DuckDB 連線，
+鍵值 join 與彙總改由 DuckDB 多執行緒 hash join 執行，結果以 Arrow 取回。
+
+設計原則：
+- 只將鍵值與非空遮罩送入 DuckDB，SQL 回傳來源列位置（row position）；
+  實際欄位值仍以位置從原 DataFrame 取出，保留 pandas dtype 與混合型別內容
+- 鍵值一律以字串（Arrow string）比對；空鍵值的處理依各方法對應的 pandas 語意
+- 以 [sql_join] enabled 開關，預設關閉；未啟用時各步驟維持 pandas 實作
+"""
+
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from accrual_bot.utils.config import config_manager
+from accrual_bot.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 位置欄位缺值（未匹配）以 -1 表示
+MISSING_POSITION = -1
+
+
+def is_sql_join_enabled(step_key: Optional[str] = None) -> bool:
+    """
+    判斷是否啟用 SQL 整合模式
+
+    Args:
+        step_key: 步驟配置鍵（如 'previous_workpaper'）；
+            [sql_join] steps 非空時僅列出的步驟啟用
+
+    Returns:
+        bool: 是否啟用
+    """
+    section = config_manager._config_toml.get('sql_join', {})
+    if not section.get('enabled', False):
+        return False
+    steps = section.get('steps', [])
+    return not steps or step_key is None or step_key in steps
+
+
+def take_by_position(values: pd.Series, positions: np.ndarray, index: pd.Index) -> pd.Series:
+    """
+    依來源列位置取值，-1 位置填入缺值（語意同 reindex 未匹配）
+
+    Args:
+        values: 來源欄位
+        positions: 來源列位置陣列
+        index: 結果索引
+
+    Returns:
+        pd.Series: 與 index 對齊的結果
+    """
+    if isinstance(values.dtype, pd.api.extensions.ExtensionDtype):
+        source = values.array
+    else:
+        source = values.to_numpy()
+    taken = pd.api.extensions.take(source, positions, allow_fill=True)
+    return pd.Series(taken, index=index, name=values.name)
+
+
+class SQLJoinEngine:
+    """
+    共用 DuckDB 連線的 SQL join 引擎
+
+    每次查詢使用連線的 cursor（共用同一個 in-process 資料庫），
+    註冊的 DataFrame 於查詢結束後即解除註冊。
+    """
+
+    def __init__(self, threads: int = 4, memory_limit: str = '2GB'):
+        import duckdb
+
+        self.threads = threads
+        self.memory_limit = memory_limit
+        self._conn = duckdb.connect(':memory:')
+        self._conn.execute(f"SET threads TO {int(threads)}")
+        self._conn.execute(f"SET memory_limit='{memory_limit}'")
+        self._lock = threading.Lock()
+        self.query_count = 0
+
+    # ========== 基礎查詢 ==========
+
+    def query_arrow(self, sql: str, frames: Dict[str, object]):
+        """
+        註冊 DataFrame / Arrow Table 並執行 SQL，結果以 Arrow Table 取回
+
+        Args:
+            sql: SQL 語句，以 frames 的鍵作為資料表名稱
+            frames: {資料表名稱: DataFrame 或 pyarrow.Table}
+
+        Returns:
+            pyarrow.Table: 查詢結果
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
+        try:
+            for name, frame in frames.items():
+                cursor.register(name, frame)
+            relation = cursor.execute(sql)
+            # duckdb >= 1.4 以 to_arrow_table 取代 fetch_arrow_table
+            fetch = getattr(relation, 'to_arrow_table', None) or relation.fetch_arrow_table
+            result = fetch()
+            self.query_count += 1
+            return result
+        finally:
+            for name in frames:
+                cursor.unregister(name)
+            cursor.close()
+
+    def query_df(self, sql: str, frames: Dict[str, object]) -> pd.DataFrame:
+        """執行 SQL 並轉為 DataFrame"""
+        return self.query_arrow(sql, frames).to_pandas()
+
+    @staticmethod
+    def _string_keys(keys: pd.Series):
+        """鍵值轉為 Arrow string 陣列（非字串鍵值先轉字串）"""
+        import pyarrow as pa
+
+        try:
+            return pa.array(keys, type=pa.string(), from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return pa.array(keys.astype('string'), type=pa.string(), from_pandas=True)
+
+    @classmethod
+    def _key_table(cls, *keys: pd.Series):
+        """建立鍵值 (k0, k1, ...) + 列位置 rn 的 Arrow Table"""
+        import pyarrow as pa
+
+        columns = {f'k{i}': cls._string_keys(key) for i, key in enumerate(keys)}
+        columns['rn'] = pa.array(np.arange(len(keys[0]), dtype=np.int64))
+        return pa.table(columns)
+
+    @staticmethod
+    def _positions(table, column: str, size: int) -> np.ndarray:
+        """
+        Arrow 結果轉位置陣列（null → -1）
+
+        結果含目標列位置 rn 時依 rn 回填，省去 SQL 端 ORDER BY。
+        """
+        values = (
+            table.column(column)
+            .to_pandas()
+            .fillna(MISSING_POSITION)
+            .to_numpy(dtype=np.int64)
+        )
+        if 'rn' not in table.column_names:
+            return values
+        positions = np.full(size, MISSING_POSITION, dtype=np.int64)
+        positions[table.column('rn').to_numpy()] = values
+        return positions
+
+    # ========== 整合用查詢 ==========
+
+    def lookup_last_valid(
+        self,
+        target_keys: pd.Series,
+        source_keys: pd.Series,
+        source_values: Dict[str, pd.Series],
+    ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        逐欄「同鍵取最後一筆非空值」查找
+
+        語意同 create_mapping_dict + map：各來源欄位各自略過空值，
+        同鍵取最後出現的一筆；空鍵值不匹配。
+
+        Args:
+            target_keys: 目標鍵值
+            source_keys: 來源鍵值
+            source_values: {欄位名稱: 來源欄位}
+
+        Returns:
+            Tuple[Dict[str, np.ndarray], np.ndarray]:
+                ({欄位名稱: 來源列位置}, 目標鍵值是否存在於來源的布林陣列)
+        """
+        import pyarrow as pa
+
+        names = list(source_values)
+        source = self._key_table(source_keys)
+        for i, name in enumerate(names):
+            source = source.append_column(
+                f'v{i}', pa.array(source_values[name].notna().to_numpy())
+            )
+
+        aggregates = ''.join(
+            f', max(rn) FILTER (WHERE v{i}) AS p{i}' for i in range(len(names))
+        )
+        selects = ''.join(f', a.p{i}' for i in range(len(names)))
+        sql = f"""
+            WITH a AS (
+                SELECT k0{aggregates}, max(rn) AS found
+                FROM src WHERE k0 IS NOT NULL GROUP BY k0
+            )
+            SELECT t.rn, a.found{selects}
+            FROM tgt t JOIN a ON t.k0 = a.k0
+        """
+        size = len(target_keys)
+        table = self.query_arrow(sql, {'tgt': self._key_table(target_keys), 'src': source})
+
+        positions = {name: self._positions(table, f'p{i}', size) for i, name in enumerate(names)}
+        found = self._positions(table, 'found', size) != MISSING_POSITION
+        return positions, found
+
+    def latest_per_key(
+        self,
+        target_keys: pd.Series,
+        source_keys: pd.Series,
+        order_values: pd.Series,
+    ) -> np.ndarray:
+        """
+        同鍵取排序值最大（同值取最後一筆）的來源列位置
+
+        語意同 sort_values([key, order]).drop_duplicates(key, keep='last') 後
+        left merge；空鍵值不匹配。
+
+        Args:
+            target_keys: 目標鍵值
+            source_keys: 來源鍵值
+            order_values: 排序欄位（數值）
+
+        Returns:
+            np.ndarray: 目標各列對應的來源列位置（未匹配為 -1）
+        """
+        import pyarrow as pa
+
+        source = self._key_table(source_keys).append_column(
+            'o', pa.array(order_values.to_numpy(dtype=np.float64, na_value=np.nan),
+                          from_pandas=True)
+        )
+        sql = """
+            WITH a AS (
+                SELECT k0, arg_max(rn, (o, rn)) AS p
+                FROM src WHERE k0 IS NOT NULL GROUP BY k0
+            )
+            SELECT t.rn, a.p FROM tgt t JOIN a ON t.k0 = a.k0
+        """
+        table = self.query_arrow(sql, {'tgt': self._key_table(target_keys), 'src': source})
+        return self._positions(table, 'p', len(target_keys))
+
+    def full_outer_positions(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        on: Sequence[str],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        多鍵 full outer join，回傳左右來源列位置
+
+        語意同 pandas merge(how='outer')：空鍵值彼此匹配，
+        結果依鍵值排序、空鍵值置後，同鍵依左右原始順序。
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (左側位置, 右側位置)，未匹配為 -1
+        """
+        keys = range(len(on))
+        conditions = ' AND '.join(f'l.k{i} IS NOT DISTINCT FROM r.k{i}' for i in keys)
+        order_keys = ', '.join(f'coalesce(l.k{i}, r.k{i}) NULLS LAST' for i in keys)
+        sql = f"""
+            SELECT l.rn AS lp, r.rn AS rp
+            FROM lhs l FULL OUTER JOIN rhs r ON {conditions}
+            ORDER BY {order_keys}, l.rn NULLS LAST, r.rn NULLS LAST
+        """
+        table = self.query_arrow(sql, {
+            'lhs': self._key_table(*(left[col] for col in on)),
+            'rhs': self._key_table(*(right[col] for col in on)),
+        })
+        return self._positions(table, 'lp', 0), self._positions(table, 'rp', 0)
+
+    def get_stats(self) -> Dict[str, object]:
+        """取得引擎統計"""
+        return {
+            'threads': self.threads,
+            'memory_limit': self.memory_limit,
+            'query_count': self.query_count,
+        }
+
+    def close(self) -> None:
+        """關閉連線"""
+        self._conn.close()
+
+
+_default_engine: Optional[SQLJoinEngine] = None
+_default_engine_lock = threading.Lock()
+
+
+def get_sql_join_engine() -> SQLJoinEngine:
+    """
+    取得依配置建立的共用 SQL 引擎
+
+    Returns:
+        SQLJoinEngine: 全域引擎實例（配置 [sql_join]）
+    """
+    global _default_engine
+    if _default_engine is None:
+        with _default_engine_lock:
+            if _default_engine is None:
+                section = config_manager._config_toml.get('sql_join', {})
+                _default_engine = SQLJoinEngine(
+                    threads=section.get('threads', 4),
+                    memory_limit=section.get('memory_limit', '2GB'),
+                )
+    return _default_engine
+
+
+def set_sql_join_engine(engine: Optional[SQLJoinEngine]) -> None:
+    """
+    替換共用 SQL 引擎（None 表示下次依配置重新建立）
+
+    Args:
+        engine: 新引擎實例或 None
+    """
+    global _default_engine
+    with _default_engine_lock:
+        _default_engine = engine
@@ -3,17 +3,26 @@ Pipeline 主類
 管理和執行步驟序列
 """
 
-from typing import List, Optional, Dict, Any, Union
+from contextlib import nullcontext
+from typing import AsyncIterator, Callable, List, Optional, Dict, Any, Union
 from dataclasses import dataclass, field
 import asyncio
 import logging
 from datetime import datetime
+from pathlib import Path
 import pandas as pd
 
 from .base import PipelineStep, StepResult, StepStatus, SequentialStep
-from .context import ProcessingContext
+from .context import ProcessingContext, copy_on_write_mode
+from .dag import DAGScheduler
+from .profiler import PipelineProfiler
+from .streaming import ChunkSink, StreamingExecutor
 from accrual_bot.utils.logging import get_logger
 
+# 步驟進度監聽器：(step_name, index, total, status)
+# status 為 'running'（開始執行）或 StepStatus 值（執行完成）
+StepListener = Callable[[str, int, int, str], None]
+
 
 @dataclass
 class PipelineConfig:
@@ -23,9 +32,15 @@ class PipelineConfig:
     entity_type: str = "MOB"
     stop_on_error: bool = True
     parallel_execution: bool = False
+    execution_mode: str = "sequential"  # sequential / dag（dag 依步驟讀寫宣告並行）
+    copy_on_write: bool = False  # 啟用 pandas CoW，步驟取得主數據 view 而非深複製
     max_concurrent_steps: int = 5
     enable_cache: bool = False
     log_level: str = "INFO"
+    profile: bool = False  # 記錄各步驟效能指標並輸出報告（見 core/pipeline/profiler.py）
+    profile_trace: str = "none"  # none / cprofile / pyinstrument
+    profile_deep_memory: bool = False  # 以 memory_usage(deep=True) 計算 object 欄位大小
+    profile_output_dir: Optional[str] = None  # 報告目錄，預設為輸出檔所在目錄
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -34,9 +49,13 @@ class PipelineConfig:
             'entity_type': self.entity_type,
             'stop_on_error': self.stop_on_error,
             'parallel_execution': self.parallel_execution,
+            'execution_mode': self.execution_mode,
+            'copy_on_write': self.copy_on_write,
             'max_concurrent_steps': self.max_concurrent_steps,
             'enable_cache': self.enable_cache,
-            'log_level': self.log_level
+            'log_level': self.log_level,
+            'profile': self.profile,
+            'profile_trace': self.profile_trace
         }
 
 
@@ -61,6 +80,8 @@ class Pipeline:
         self._execution_count = 0
         self._last_execution = None
         self._execution_history = []
+        self._profiler: Optional[PipelineProfiler] = None
+        self._step_listeners: List[StepListener] = []
     
     def add_step(self, step: PipelineStep) -> 'Pipeline':
         """
@@ -124,6 +145,46 @@ class Pipeline:
         self.steps.clear()
         self.logger.debug("Cleared all steps")
     
+    def add_step_listener(self, listener: StepListener) -> 'Pipeline':
+        """
+        註冊步驟進度監聽器
+        
+        每個步驟開始時以 status='running' 呼叫，完成時以結果狀態（success / failed /
+        skipped）呼叫，讓呼叫端即時取得進度而不需等待整個 Pipeline 結束。
+        監聽器拋出的例外只記錄警告，不影響執行。
+        
+        Args:
+            listener: 回調函數，參數為 (step_name, index, total, status)
+            
+        Returns:
+            Pipeline: 自身
+        """
+        self._step_listeners.append(listener)
+        return self
+    
+    def remove_step_listener(self, listener: StepListener) -> bool:
+        """
+        移除步驟進度監聽器
+        
+        Args:
+            listener: 已註冊的回調函數
+            
+        Returns:
+            bool: 是否成功移除
+        """
+        if listener in self._step_listeners:
+            self._step_listeners.remove(listener)
+            return True
+        return False
+    
+    def _notify_step(self, step_name: str, index: int, status: str) -> None:
+        """通知所有監聽器步驟狀態變化"""
+        for listener in self._step_listeners:
+            try:
+                listener(step_name, index, len(self.steps), status)
+            except Exception as e:
+                self.logger.warning(f"Step listener failed for {step_name}: {e}")
+    
     async def execute(self, context: ProcessingContext) -> Dict[str, Any]:
         """
         執行Pipeline
@@ -140,58 +201,67 @@ class Pipeline:
         self.logger.info(f"Starting pipeline execution #{self._execution_count}")
         self.logger.info(f"Context: {context}")
         
-        results = []
-        failed = False
+        if self.config.copy_on_write:
+            context.copy_on_write = True
+        
+        self._profiler = PipelineProfiler.from_config(self.config) if self.config.profile else None
         
         try:
-            if self.config.parallel_execution:
-                # 並行執行模式
-                results = await self._execute_parallel(context)
-            else:
-                # 順序執行模式
-                results = await self._execute_sequential(context)
+            with copy_on_write_mode(True) if context.copy_on_write else nullcontext():
+                results = await self._run_steps(context)
             
-            # 檢查結果
-            failed_steps = [r for r in results if r.status == StepStatus.FAILED]
-            success_steps = [r for r in results if r.status == StepStatus.SUCCESS]
-            skipped_steps = [r for r in results if r.status == StepStatus.SKIPPED]
-            
-            if failed_steps:
-                failed = True
-                self.logger.error(f"Pipeline failed with {len(failed_steps)} failed steps")
-            else:
-                self.logger.info("Pipeline completed successfully")
+            execution_result = self._build_execution_result(start_time, results, context)
+            if self._profiler is not None:
+                self._attach_profile(execution_result, results, context)
+            return execution_result
             
-            # 構建執行結果
-            execution_result = {
+        except Exception as e:
+            self.logger.error(f"Pipeline execution failed: {str(e)}")
+            return {
                 'pipeline': self.config.name,
-                'success': not failed,
+                'success': False,
+                'error': str(e),
                 'start_time': start_time,
                 'end_time': datetime.now(),
-                'duration': (datetime.now() - start_time).total_seconds(),
-                'total_steps': len(self.steps),
-                'executed_steps': len(results),
-                'successful_steps': len(success_steps),
-                'failed_steps': len(failed_steps),
-                'skipped_steps': len(skipped_steps),
-                'results': [r.to_dict() for r in results],
-                'context_summary': context.to_dict(),
-                'errors': context.errors,
-                'warnings': context.warnings
+                'duration': (datetime.now() - start_time).total_seconds()
             }
+    
+    async def execute_streaming(self,
+                                context: ProcessingContext,
+                                chunks: AsyncIterator[pd.DataFrame],
+                                sink: Optional[ChunkSink] = None) -> Dict[str, Any]:
+        """
+        以串流（分塊）模式執行Pipeline
+        
+        chunks 取代主數據載入步驟（Pipeline 不應包含主檔載入步驟，輔助數據需事先放入
+        context）。chunkable 步驟逐塊執行，遇到第一個需要完整數據的步驟時才合併。
+        
+        Args:
+            context: 處理上下文
+            chunks: 主數據塊的非同步產生器（如 CSVSource.iter_chunks()）
+            sink: 結果輸出；全部步驟皆可串流時逐塊呼叫且不保留結果於記憶體
             
-            # 記錄執行歷史
-            self._last_execution = execution_result
-            self._execution_history.append({
-                'timestamp': start_time,
-                'success': not failed,
-                'duration': execution_result['duration']
-            })
+        Returns:
+            Dict[str, Any]: 執行結果（同 execute）
+        """
+        start_time = datetime.now()
+        self._execution_count += 1
+        self.logger.info(f"Starting streaming pipeline execution #{self._execution_count}")
+        
+        if self.config.copy_on_write:
+            context.copy_on_write = True
+        
+        try:
+            executor = StreamingExecutor(self.steps, stop_on_error=self.config.stop_on_error)
+            with copy_on_write_mode(True) if context.copy_on_write else nullcontext():
+                results = await executor.run(context, chunks, sink)
             
+            execution_result = self._build_execution_result(start_time, results, context)
+            execution_result['streaming_plan'] = executor.plan.describe()
             return execution_result
             
         except Exception as e:
-            self.logger.error(f"Pipeline execution failed: {str(e)}")
+            self.logger.error(f"Streaming pipeline execution failed: {str(e)}")
             return {
                 'pipeline': self.config.name,
                 'success': False,
@@ -201,6 +271,61 @@ class Pipeline:
                 'duration': (datetime.now() - start_time).total_seconds()
             }
     
+    def _build_execution_result(self,
+                                start_time: datetime,
+                                results: List[StepResult],
+                                context: ProcessingContext) -> Dict[str, Any]:
+        """彙總步驟結果並記錄執行歷史"""
+        # 檢查結果
+        failed_steps = [r for r in results if r.status == StepStatus.FAILED]
+        success_steps = [r for r in results if r.status == StepStatus.SUCCESS]
+        skipped_steps = [r for r in results if r.status == StepStatus.SKIPPED]
+        
+        failed = bool(failed_steps)
+        if failed:
+            self.logger.error(f"Pipeline failed with {len(failed_steps)} failed steps")
+        else:
+            self.logger.info("Pipeline completed successfully")
+        
+        # 構建執行結果
+        execution_result = {
+            'pipeline': self.config.name,
+            'success': not failed,
+            'start_time': start_time,
+            'end_time': datetime.now(),
+            'duration': (datetime.now() - start_time).total_seconds(),
+            'total_steps': len(self.steps),
+            'executed_steps': len(results),
+            'successful_steps': len(success_steps),
+            'failed_steps': len(failed_steps),
+            'skipped_steps': len(skipped_steps),
+            'results': [r.to_dict() for r in results],
+            'context_summary': context.to_dict(),
+            'errors': context.errors,
+            'warnings': context.warnings
+        }
+        
+        # 記錄執行歷史
+        self._last_execution = execution_result
+        self._execution_history.append({
+            'timestamp': start_time,
+            'success': not failed,
+            'duration': execution_result['duration']
+        })
+        
+        return execution_result
+    
+    async def _run_steps(self, context: ProcessingContext) -> List[StepResult]:
+        """依執行模式分派步驟執行"""
+        if self.config.execution_mode == 'dag':
+            # DAG 執行模式：依步驟讀寫宣告並行
+            return await self._execute_dag(context)
+        if self.config.parallel_execution:
+            # 並行執行模式
+            return await self._execute_parallel(context)
+        # 順序執行模式
+        return await self._execute_sequential(context)
+    
     async def _execute_sequential(self, context: ProcessingContext) -> List[StepResult]:
         """
         順序執行步驟
@@ -215,10 +340,12 @@ class Pipeline:
         
         for i, step in enumerate(self.steps, 1):
             self.logger.info(f"Executing step {i}/{len(self.steps)}: {step.name}")
+            self._notify_step(step.name, i, 'running')
             
             # 執行步驟
-            result = await step(context)
+            result = await self._run_step(step, context)
             results.append(result)
+            self._notify_step(step.name, i, result.status.value)
             
             # 記錄到上下文歷史
             context.add_history(step.name, result.status.value)
@@ -230,6 +357,73 @@ class Pipeline:
         
         return results
     
+    async def _run_step(self, step: PipelineStep, context: ProcessingContext) -> StepResult:
+        """執行單一步驟（啟用效能分析時經由 profiler）"""
+        if self._profiler is not None:
+            return await self._profiler.run_step(step, context)
+        return await step(context)
+    
+    def _attach_profile(self,
+                        execution_result: Dict[str, Any],
+                        results: List[StepResult],
+                        context: ProcessingContext) -> None:
+        """彙總效能紀錄，寫出報告並附加到執行結果與上下文"""
+        profiler = self._profiler
+        try:
+            profiler.record_results(results)
+            meta = context.metadata
+            report = profiler.report(
+                pipeline=self.config.name,
+                entity=meta.entity_type,
+                processing_type=meta.processing_type,
+                processing_date=meta.processing_date,
+                execution_mode=self.config.execution_mode,
+            )
+            basename = (f"{meta.entity_type}_{meta.processing_type}_{meta.processing_date}"
+                        f"_profile_{profiler.started_at:%Y%m%d_%H%M%S}")
+            paths = profiler.write_report(self._profile_output_dir(context, results), basename, report)
+        except Exception as e:
+            self.logger.warning(f"效能報告產生失敗: {e}")
+            return
+        
+        execution_result['profile'] = report
+        execution_result['profile_report_paths'] = paths
+        context.set_variable('profile_report', report)
+        context.set_variable('profile_report_paths', paths)
+    
+    def _profile_output_dir(self, context: ProcessingContext, results: List[StepResult]) -> str:
+        """效能報告目錄：明確設定 > 輸出檔所在目錄 > ./output"""
+        if self.config.profile_output_dir:
+            return self.config.profile_output_dir
+        # 匯出步驟以 metadata['output_path'] 回報輸出檔（如 SPXPRExportStep）
+        for result in reversed(results):
+            path = (result.metadata or {}).get('output_path')
+            if path:
+                return str(Path(path).parent)
+        for name in ('export_output_path', 'export_path'):
+            path = context.get_variable(name)
+            if path:
+                return str(Path(path).parent)
+        return 'output'
+    
+    async def _execute_dag(self, context: ProcessingContext) -> List[StepResult]:
+        """
+        依步驟讀寫宣告建立相依圖並行執行
+        
+        Args:
+            context: 處理上下文
+            
+        Returns:
+            List[StepResult]: 執行結果列表（依步驟順序）
+        """
+        scheduler = DAGScheduler(
+            self.steps,
+            max_concurrent=self.config.max_concurrent_steps,
+            stop_on_error=self.config.stop_on_error,
+            step_listener=self._notify_step if self._step_listeners else None
+        )
+        return await scheduler.run(context)
+    
     async def _execute_parallel(self, context: ProcessingContext) -> List[StepResult]:
         """
         並行執行步驟
@@ -347,6 +541,16 @@ class PipelineBuilder:
         self.config.parallel_execution = parallel
         return self
     
+    def with_execution_mode(self, mode: str) -> 'PipelineBuilder':
+        """設置執行模式（sequential / dag）"""
+        self.config.execution_mode = mode
+        return self
+    
+    def with_copy_on_write(self, enabled: bool = True) -> 'PipelineBuilder':
+        """設置是否啟用 Copy-on-Write 模式"""
+        self.config.copy_on_write = enabled
+        return self
+    
     def with_max_concurrent(self, max_concurrent: int) -> 'PipelineBuilder':
         """設置最大併發數"""
         self.config.max_concurrent_steps = max_concurrent
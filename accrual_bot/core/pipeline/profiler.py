@@ -0,0 +1,381 @@
+"""
+Pipeline 步驟效能分析
+
+啟用 PipelineConfig.profile 後，Pipeline 以 PipelineProfiler 包裝每個步驟的執行，記錄：
+  - 牆鐘時間與 CPU 時間
+  - RSS 變化與尖峰 RSS 增量（步驟期間行程記憶體高水位的上升量）
+  - 主數據輸入/輸出列數、欄數與 context.data、已載入輔助數據的位元組數
+    （延遲載入且尚未讀入的輔助數據只計數，不為量測而載入）
+  - 選用的 cProfile / pyinstrument 追蹤檔
+
+執行結束後報告寫成 JSON、HTML 與 Excel（與輸出檔同目錄），供比對設定調整前後的步驟耗時。
+
+注意：CPU 時間與 RSS 為整個行程的數值，僅在順序執行模式下可歸屬到單一步驟；
+DAG / 並行模式只記錄各步驟牆鐘時間。
+"""
+
+import cProfile
+import html
+import io
+import json
+import os
+import pstats
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import pandas as pd
+
+from accrual_bot.core.datasources.workbook_writer import write_workbook
+from accrual_bot.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from .base import PipelineStep, StepResult
+    from .context import ProcessingContext
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+TRACE_MODES = ('none', 'cprofile', 'pyinstrument')
+REPORT_FORMATS = ('json', 'html', 'xlsx')
+
+_MB = 1024 * 1024
+
+
+def current_rss_mb() -> Optional[float]:
+    """目前行程 RSS（MB），無法取得時回傳 None"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / _MB
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / _MB
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """行程尖峰 RSS（MB），無法取得時回傳 None"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 單位為 KB，macOS 為 bytes
+        return peak / _MB if sys.platform == 'darwin' else peak / 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / _MB
+    return None
+
+
+def frame_bytes(df: Optional[pd.DataFrame], deep: bool = False) -> int:
+    """DataFrame 佔用位元組數（deep=False 時 object 欄位只計指標）"""
+    if df is None or not isinstance(df, pd.DataFrame):
+        return 0
+    return int(df.memory_usage(index=True, deep=deep).sum())
+
+
+def _delta(after: Optional[float], before: Optional[float]) -> Optional[float]:
+    if after is None or before is None:
+        return None
+    return round(after - before, 2)
+
+
+@dataclass
+class StepProfile:
+    """單一步驟的效能紀錄"""
+    step_name: str
+    status: str = ''
+    wall_seconds: float = 0.0
+    cpu_seconds: Optional[float] = None
+    rss_delta_mb: Optional[float] = None
+    peak_rss_delta_mb: Optional[float] = None
+    peak_rss_mb: Optional[float] = None
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    columns_out: Optional[int] = None
+    data_bytes: Optional[int] = None
+    aux_bytes: Optional[int] = None
+    aux_count: Optional[int] = None
+    aux_lazy_count: Optional[int] = None
+    trace_path: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class PipelineProfiler:
+    """
+    Pipeline 步驟效能分析器
+
+    使用範例:
+        profiler = PipelineProfiler(trace='cprofile')
+        result = await profiler.run_step(step, context)
+        paths = profiler.write_report('./output', 'SPX_PO_202512')
+    """
+    trace: str = 'none'
+    deep_memory: bool = False
+    formats: tuple = REPORT_FORMATS
+    profiles: List[StepProfile] = field(default_factory=list)
+    _traces: Dict[str, Any] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        self.logger = get_logger("pipeline.Profiler")
+        self.trace = (self.trace or 'none').lower()
+        if self.trace not in TRACE_MODES:
+            self.logger.warning(f"未知的 trace 模式 '{self.trace}'，改為 none")
+            self.trace = 'none'
+        if self.trace == 'pyinstrument':
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError:
+                self.logger.warning("未安裝 pyinstrument，改用 cprofile")
+                self.trace = 'cprofile'
+        self.started_at = datetime.now()
+
+    @classmethod
+    def from_config(cls, config) -> 'PipelineProfiler':
+        """由 PipelineConfig 建立"""
+        return cls(
+            trace=config.profile_trace,
+            deep_memory=config.profile_deep_memory,
+        )
+
+    async def run_step(self, step: 'PipelineStep', context: 'ProcessingContext') -> 'StepResult':
+        """
+        執行步驟並記錄效能指標
+
+        Args:
+            step: 步驟
+            context: 處理上下文
+
+        Returns:
+            StepResult: 步驟結果（不受分析影響）
+        """
+        profile = StepProfile(step_name=step.name)
+        data = context.data
+        profile.rows_in = len(data) if isinstance(data, pd.DataFrame) else None
+
+        rss_before = current_rss_mb()
+        peak_before = peak_rss_mb()
+        tracer = self._start_trace()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        try:
+            result = await step(context)
+        finally:
+            profile.wall_seconds = round(time.perf_counter() - wall_start, 4)
+            profile.cpu_seconds = round(time.process_time() - cpu_start, 4)
+            self._stop_trace(tracer, step.name)
+
+        peak_after = peak_rss_mb()
+        profile.status = result.status.value
+        profile.rss_delta_mb = _delta(current_rss_mb(), rss_before)
+        profile.peak_rss_delta_mb = _delta(peak_after, peak_before)
+        profile.peak_rss_mb = round(peak_after, 2) if peak_after is not None else None
+        self._measure_context(profile, context)
+        self.profiles.append(profile)
+        return result
+
+    def record_results(self, results: List['StepResult']) -> None:
+        """補記未經 run_step 執行的步驟（DAG / 並行模式只有牆鐘時間）"""
+        recorded = {p.step_name for p in self.profiles}
+        for result in results:
+            if result.step_name not in recorded:
+                self.profiles.append(StepProfile(
+                    step_name=result.step_name,
+                    status=result.status.value,
+                    wall_seconds=round(result.duration or 0.0, 4),
+                ))
+
+    def _measure_context(self, profile: StepProfile, context: 'ProcessingContext') -> None:
+        data = context.data
+        if isinstance(data, pd.DataFrame):
+            profile.rows_out = len(data)
+            profile.columns_out = len(data.columns)
+            profile.data_bytes = frame_bytes(data, self.deep_memory)
+        # 不經 context.auxiliary_data：該屬性會讀入所有延遲載入的輔助數據
+        names = context.list_auxiliary_data()
+        loaded = [name for name in names if context.is_auxiliary_data_loaded(name)]
+        profile.aux_count = len(loaded)
+        profile.aux_lazy_count = len(names) - len(loaded)
+        profile.aux_bytes = sum(
+            frame_bytes(context.get_auxiliary_data(name), self.deep_memory) for name in loaded
+        )
+
+    # ------------------------------------------------------------------
+    # 追蹤
+    # ------------------------------------------------------------------
+
+    def _start_trace(self):
+        if self.trace == 'cprofile':
+            tracer = cProfile.Profile()
+            tracer.enable()
+            return tracer
+        if self.trace == 'pyinstrument':
+            from pyinstrument import Profiler
+            tracer = Profiler(async_mode='enabled')
+            tracer.start()
+            return tracer
+        return None
+
+    def _stop_trace(self, tracer, step_name: str) -> None:
+        if tracer is None:
+            return
+        if isinstance(tracer, cProfile.Profile):
+            tracer.disable()
+        else:
+            tracer.stop()
+        self._traces[step_name] = tracer
+
+    def _dump_traces(self, trace_dir: Path) -> None:
+        trace_dir.mkdir(parents=True, exist_ok=True)
+        by_name = {p.step_name: p for p in self.profiles}
+        for step_name, tracer in self._traces.items():
+            safe_name = "".join(c if c.isalnum() or c in '-_' else '_' for c in step_name)
+            if isinstance(tracer, cProfile.Profile):
+                path = trace_dir / f"{safe_name}.prof"
+                tracer.dump_stats(str(path))
+            else:
+                path = trace_dir / f"{safe_name}.html"
+                path.write_text(tracer.output_html(), encoding='utf-8')
+            if step_name in by_name:
+                by_name[step_name].trace_path = str(path)
+
+    def top_functions(self, step_name: str, limit: int = 15) -> str:
+        """cProfile 追蹤中累計時間最高的函數（文字格式）"""
+        tracer = self._traces.get(step_name)
+        if not isinstance(tracer, cProfile.Profile):
+            return ''
+        stream = io.StringIO()
+        pstats.Stats(tracer, stream=stream).sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+    # ------------------------------------------------------------------
+    # 報告
+    # ------------------------------------------------------------------
+
+    def to_frame(self) -> pd.DataFrame:
+        """各步驟紀錄轉為 DataFrame"""
+        columns = list(StepProfile.__dataclass_fields__)
+        return pd.DataFrame([p.to_dict() for p in self.profiles], columns=columns)
+
+    def report(self, **meta) -> Dict[str, Any]:
+        """
+        彙總報告
+
+        Args:
+            **meta: 附加資訊（pipeline、entity 等）
+
+        Returns:
+            Dict[str, Any]: 可 JSON 序列化的報告
+        """
+        total_wall = sum(p.wall_seconds for p in self.profiles)
+        slowest = max(self.profiles, key=lambda p: p.wall_seconds, default=None)
+        peak = peak_rss_mb()
+        return {
+            **meta,
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'trace': self.trace,
+            'deep_memory': self.deep_memory,
+            'total_wall_seconds': round(total_wall, 4),
+            'total_cpu_seconds': round(sum(p.cpu_seconds or 0.0 for p in self.profiles), 4),
+            'peak_rss_mb': round(peak, 2) if peak is not None else None,
+            'slowest_step': slowest.step_name if slowest else None,
+            'steps': [p.to_dict() for p in self.profiles],
+        }
+
+    def write_report(self, output_dir, basename: str,
+                     report: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """
+        將報告寫成 JSON / HTML / Excel
+
+        Args:
+            output_dir: 輸出目錄
+            basename: 檔名前綴
+            report: 已彙總的報告，None 時重新彙總
+
+        Returns:
+            Dict[str, str]: 格式 -> 檔案路徑
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        report = report or self.report()
+        if self._traces:
+            self._dump_traces(output_dir / f"{basename}_traces")
+            # 帶入追蹤檔路徑
+            report['steps'] = [p.to_dict() for p in self.profiles]
+        paths: Dict[str, str] = {}
+        for fmt in self.formats:
+            path = output_dir / f"{basename}.{fmt}"
+            try:
+                if fmt == 'json':
+                    path.write_text(json.dumps(report, ensure_ascii=False, indent=2, default=str),
+                                    encoding='utf-8')
+                elif fmt == 'html':
+                    path.write_text(render_html_report(report), encoding='utf-8')
+                elif fmt == 'xlsx':
+                    self._write_excel(path, report)
+                else:
+                    continue
+                paths[fmt] = str(path)
+            except Exception as e:
+                self.logger.warning(f"效能報告寫入失敗 ({fmt}): {e}")
+
+        self.logger.info(f"效能報告已寫入: {list(paths.values())}")
+        return paths
+
+    def _write_excel(self, path: Path, report: Dict[str, Any]) -> None:
+        summary = {k: v for k, v in report.items() if k != 'steps'}
+        write_workbook(path, {
+            'Steps': self.to_frame(),
+            'Summary': pd.DataFrame(list(summary.items()), columns=['item', 'value']),
+        })
+
+
+def render_html_report(report: Dict[str, Any]) -> str:
+    """將報告轉為獨立 HTML（含牆鐘時間長條）"""
+    steps = report.get('steps', [])
+    max_wall = max((s['wall_seconds'] for s in steps), default=0) or 1
+    headers = ['step_name', 'status', 'wall_seconds', 'cpu_seconds', 'rss_delta_mb',
+               'peak_rss_delta_mb', 'rows_in', 'rows_out', 'data_bytes', 'aux_bytes']
+
+    def cell(value) -> str:
+        if value is None:
+            return '<td>-</td>'
+        if isinstance(value, int) and not isinstance(value, bool):
+            return f'<td class="num">{value:,}</td>'
+        if isinstance(value, float):
+            return f'<td class="num">{value:,.4g}</td>'
+        return f'<td>{html.escape(str(value))}</td>'
+
+    rows = []
+    for s in steps:
+        width = 100 * s['wall_seconds'] / max_wall
+        bar = f'<td><div class="bar" style="width:{width:.1f}%"></div></td>'
+        rows.append('<tr>' + ''.join(cell(s.get(h)) for h in headers) + bar + '</tr>')
+
+    summary = ''.join(
+        f'<li><b>{html.escape(str(k))}</b>: {html.escape(str(v))}</li>'
+        for k, v in report.items() if k != 'steps'
+    )
+    head = ''.join(f'<th>{h}</th>' for h in headers) + '<th>wall</th>'
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Pipeline Profile</title>'
+        '<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse}'
+        'th,td{border:1px solid #ccc;padding:4px 8px}td.num{text-align:right}'
+        '.bar{background:#4e79a7;height:12px;min-width:1px}td:last-child{width:240px}</style>'
+        f'</head><body><h2>Pipeline Profile</h2><ul>{summary}</ul>'
+        f'<table><thead><tr>{head}</tr></thead><tbody>{"".join(rows)}</tbody></table>'
+        '</body></html>'
+    )
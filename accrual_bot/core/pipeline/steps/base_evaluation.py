@@ -123,7 +123,7 @@ class BaseERMEvaluationStep(PipelineStep):
         start_time = time.time()
 
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             processing_date = context.metadata.processing_date
 
             # 獲取參考數據
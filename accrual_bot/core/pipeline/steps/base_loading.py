@@ -35,6 +35,44 @@ from accrual_bot.core.pipeline.steps.common import (
     create_error_metadata
 )
 from accrual_bot.utils.config import config_manager
+from accrual_bot.utils.helpers.data_utils import compact_dtypes
+
+
+def apply_dtype_compaction(df: pd.DataFrame, logger) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    依 [dtype_compaction] 設定壓縮主資料欄位型別
+
+    Args:
+        df: 主資料
+        logger: 步驟 logger
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: (DataFrame, 壓縮統計)；未啟用時統計為空字典
+    """
+    config = config_manager._config_toml.get('dtype_compaction', {})
+    if not config.get('enabled', False) or df is None or df.empty:
+        return df, {}
+
+    memory_before = df.memory_usage(deep=True).sum()
+    df, converted = compact_dtypes(
+        df,
+        category_columns=config.get('category_columns', []),
+        numeric_columns=config.get('numeric_columns', []),
+        string_storage=config.get('string_storage') or None,
+        max_category_ratio=config.get('max_category_ratio', 0.5),
+    )
+    memory_after = df.memory_usage(deep=True).sum()
+
+    stats = {
+        'converted_columns': converted,
+        'memory_before_mb': round(memory_before / 1024 ** 2, 2),
+        'memory_after_mb': round(memory_after / 1024 ** 2, 2),
+    }
+    logger.info(
+        f"Dtype compaction: {len(converted)} columns, "
+        f"{stats['memory_before_mb']}MB -> {stats['memory_after_mb']}MB"
+    )
+    return df, stats
 
 
 class BaseLoadingStep(PipelineStep):
@@ -154,6 +192,7 @@ class BaseLoadingStep(PipelineStep):
                 raise ValueError(f"Failed to load {required_file_type} data")
 
             df = self._extract_primary_data(loaded_data[required_file_type])
+            df, compaction_stats = apply_dtype_compaction(df, self.logger)
 
             # 從 metadata 取得處理日期（單一來源：UI 使用者選擇 / CLI run_config.toml）
             date = context.metadata.processing_date
@@ -191,6 +230,8 @@ class BaseLoadingStep(PipelineStep):
                 df, date, m, auxiliary_count, ref_count,
                 loaded_data, start_datetime, end_datetime
             )
+            if compaction_stats:
+                metadata['dtype_compaction'] = compaction_stats
 
             return StepResult(
                 step_name=self.name,
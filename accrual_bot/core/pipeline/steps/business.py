@@ -51,7 +51,7 @@ class StatusEvaluationStep(PipelineStep):
         - SPX: 複雜的11個條件判斷（租金、資產驗收等）
         """
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             status_col = context.get_status_column()
             
             # === 核心狀態評估邏輯 ===
@@ -123,7 +123,7 @@ class AccountingAdjustmentStep(PipelineStep):
     async def execute(self, context: ProcessingContext) -> StepResult:
         """執行會計調整"""
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             status_col = context.get_status_column()
             
             # === 會計調整邏輯 ===
@@ -222,7 +222,7 @@ class AccountCodeMappingStep(PipelineStep):
                 )
             
             # 執行映射
-            df = context.data.copy()
+            df = context.get_data_copy()
             
             # 創建映射字典
             mapping_dict = dict(zip(
@@ -272,7 +272,7 @@ class DepartmentConversionStep(PipelineStep):
     async def execute(self, context: ProcessingContext) -> StepResult:
         """執行部門轉換"""
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             
             # 根據實體類型應用不同的轉換規則
             if context.metadata.entity_type == "SPT":
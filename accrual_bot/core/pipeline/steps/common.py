@@ -3,7 +3,7 @@
 適用於所有實體類型的基礎步驟
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
 import functools
 import time
@@ -28,10 +28,14 @@ except ImportError:
 
 from accrual_bot.utils.helpers.data_utils import (create_mapping_dict, 
                                                   safe_string_operation,
-                                                  extract_date_range_from_description
+                                                  extract_date_ranges
                                                   )
 
 from accrual_bot.utils.config.constants import STATUS_VALUES
+from accrual_bot.core.datasources.workbook_writer import write_workbook
+from accrual_bot.core.pipeline.engines.sql_join_engine import (get_sql_join_engine,
+                                                              is_sql_join_enabled,
+                                                              take_by_position)
 
 
 class DataCleaningStep(PipelineStep):
@@ -50,7 +54,7 @@ class DataCleaningStep(PipelineStep):
     async def execute(self, context: ProcessingContext) -> StepResult:
         """執行數據清理"""
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             
             # 清理指定列的NaN值
             if self.columns_to_clean:
@@ -115,7 +119,7 @@ class DateFormattingStep(PipelineStep):
     async def execute(self, context: ProcessingContext) -> StepResult:
         """執行日期格式化"""
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             formatted_count = 0
             
             for col, format_str in self.date_columns.items():
@@ -184,7 +188,7 @@ class DateParsingStep(PipelineStep):
         4. 添加解析結果到新列
         """
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             
             # === 詳細實現邏輯 ===
             # 1. 轉換Expected Receive Month為YYYYMM格式
@@ -346,7 +350,7 @@ class ExportStep(PipelineStep):
             if self.format == "excel":
                 filename = f"{self.output_path}/{entity}_{proc_type}_{timestamp}.xlsx"
                 os.makedirs(os.path.dirname(filename), exist_ok=True)
-                context.data.to_excel(filename, index=False)
+                write_workbook(filename, {'Sheet1': context.data})
             elif self.format == "csv":
                 filename = f"{self.output_path}/{entity}_{proc_type}_{timestamp}.csv"
                 os.makedirs(os.path.dirname(filename), exist_ok=True)
@@ -410,7 +414,7 @@ class DataIntegrationStep(PipelineStep):
                 )
             
             # 合併數據
-            df = context.data.copy()
+            df = context.get_data_copy()
             merged_df = pd.merge(
                 df,
                 aux_data,
@@ -457,6 +461,11 @@ class ProductFilterStep(PipelineStep):
     輸出: Filtered DataFrame
     """
     
+    reads = ('data',)
+    writes = ('data',)
+
+    chunkable = True
+    
     def __init__(self, 
                  name: str = "ProductFilter",
                  product_pattern: Optional[str] = None,
@@ -475,7 +484,7 @@ class ProductFilterStep(PipelineStep):
         start_datetime = datetime.now()
         
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             original_count = len(df)
             
             self.logger.info(f"Filtering products with pattern: {self.product_pattern}")
@@ -638,6 +647,11 @@ class PreviousWorkpaperIntegrationStep(PipelineStep):
     輸入: DataFrame + Previous WP (PO and PR)
     輸出: DataFrame with previous workpaper info
     """
+    
+    reads = ('data', 'aux:previous', 'aux:previous_pr', 'var:file_paths')
+    writes = ('data',)
+
+    chunkable = True
 
     def __init__(self, name: str = "PreviousWorkpaperIntegration", **kwargs):
         super().__init__(name, description="Integrate previous workpaper", **kwargs)
@@ -650,6 +664,10 @@ class PreviousWorkpaperIntegrationStep(PipelineStep):
         self.po_mappings = config.get('po_mappings', {}).get('fields', [])
         self.pr_mappings = config.get('pr_mappings', {}).get('fields', [])
         self.reviewer_config = config.get('reviewer_mapping', {})
+        # 批次映射：一次 reindex 帶入所有欄位；False 時回退逐欄 map
+        self.bulk_mapping = config.get('bulk_mapping', True)
+        # SQL 模式：鍵值 join 改由共用 DuckDB 連線執行（[sql_join]）
+        self.sql_join = is_sql_join_enabled('previous_workpaper')
 
         self.logger.debug(
             f"Loaded mapping config: {len(self.po_mappings)} PO mappings, "
@@ -660,7 +678,7 @@ class PreviousWorkpaperIntegrationStep(PipelineStep):
         """執行前期底稿整合"""
         start_time = time.time()
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             previous_wp = context.get_auxiliary_data('previous')
             previous_wp_pr = context.get_auxiliary_data('previous_pr')
             m = context.metadata.processing_date % 100
@@ -714,7 +732,8 @@ class PreviousWorkpaperIntegrationStep(PipelineStep):
                 duration=duration,
                 metadata={
                     'po_integrated': previous_wp is not None,
-                    'pr_integrated': previous_wp_pr is not None
+                    'pr_integrated': previous_wp_pr is not None,
+                    'sql_join': self.sql_join
                 }
             )
 
@@ -765,20 +784,112 @@ class PreviousWorkpaperIntegrationStep(PipelineStep):
             self.logger.warning(f"Cannot resolve key column for {key_type}")
             return df
 
-        # 應用所有映射
+        # 過濾 Entity 限制
+        applicable = []
         for mapping in mappings:
-            # 檢查 Entity 限制
             allowed_entities = mapping.get('entities', [])
             if allowed_entities and entity and entity not in allowed_entities:
                 self.logger.debug(f"Skipping '{mapping['target']}' - not applicable for {entity}")
                 continue
+            applicable.append(mapping)
+
+        if self.bulk_mapping:
+            return self._apply_bulk_mappings(df, source_df, applicable, df_key, source_key)
 
+        # 應用所有映射
+        for mapping in applicable:
             df = self._apply_single_mapping(
                 df, source_df, mapping, df_key, source_key
             )
 
         return df
 
+    def _apply_bulk_mappings(
+        self,
+        df: pd.DataFrame,
+        source_df: pd.DataFrame,
+        mappings: List[Dict],
+        df_key: str,
+        source_key: str
+    ) -> pd.DataFrame:
+        """
+        批次欄位映射
+
+        一次解析所有來源欄位，以鍵值去重後建立索引查找表，
+        再以單次 reindex 對齊目標鍵值，取代逐欄建立 dict 再 map。
+        去重採 groupby.last()（略過空值），與逐欄 create_mapping_dict
+        「先濾除空值、同鍵取最後一筆」的語意一致。
+        """
+        from accrual_bot.utils.helpers.column_utils import ColumnResolver
+
+        resolved = []
+        for mapping in mappings:
+            source_col = ColumnResolver.resolve(source_df, mapping['source'])
+            if source_col is None:
+                self.logger.debug(f"Source column '{mapping['source']}' not found, skipping")
+                continue
+            resolved.append((mapping, source_col))
+
+        if not resolved:
+            return df
+
+        source_cols = list(dict.fromkeys(col for _, col in resolved if col != source_key))
+        if self.sql_join:
+            aligned, found = self._align_with_sql(df, source_df, source_cols, df_key, source_key)
+        else:
+            lookup = (
+                source_df[[source_key] + source_cols]
+                .groupby(source_key, sort=False, dropna=False)
+                .last()
+            )
+            aligned = lookup.reindex(df[df_key].to_numpy())
+            aligned.index = df.index
+            found = df[df_key].isin(lookup.index)
+
+        for mapping, source_col in resolved:
+            target_col = mapping['target']
+            if source_col == source_key:
+                mapped = df[df_key].where(found)
+            else:
+                mapped = aligned[source_col]
+
+            if mapping.get('fill_na', True):
+                df[target_col] = mapped.fillna(pd.NA)
+            elif target_col in df.columns:
+                # 允許覆蓋 - 先映射，然後用原值填充空值
+                df[target_col] = mapped.fillna(df[target_col])
+            else:
+                df[target_col] = mapped
+
+        self.logger.debug(
+            f"Bulk mapped {len(resolved)} fields for {int(found.sum())} matched rows"
+        )
+        return df
+
+    @staticmethod
+    def _align_with_sql(
+        df: pd.DataFrame,
+        source_df: pd.DataFrame,
+        source_cols: List[str],
+        df_key: str,
+        source_key: str
+    ) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        以 DuckDB 計算各來源欄位「同鍵最後一筆非空值」的列位置，再依位置取值
+
+        Returns:
+            Tuple[pd.DataFrame, pd.Series]: (與 df 對齊的來源欄位, 鍵值是否存在於來源)
+        """
+        positions, found = get_sql_join_engine().lookup_last_valid(
+            df[df_key], source_df[source_key],
+            {col: source_df[col] for col in source_cols}
+        )
+        aligned = pd.DataFrame(
+            {col: take_by_position(source_df[col], positions[col], df.index) for col in source_cols},
+            index=df.index
+        )
+        return aligned, pd.Series(found, index=df.index)
+
     def _apply_single_mapping(
         self,
         df: pd.DataFrame,
@@ -909,16 +1020,24 @@ class ProcurementIntegrationStep(PipelineStep):
     輸出: DataFrame with procurement info
     """
     
+    reads = ('data', 'aux:procurement_po', 'aux:procurement_pr', 'var:file_paths')
+    writes = ('data',)
+
+    chunkable = True
+    
     def __init__(self, name: str = "ProcurementIntegration", **kwargs):
         super().__init__(name, description="Integrate procurement workpaper", **kwargs)
+        self.po_match_stats: Dict[str, int] = {}
+        self.sql_join = is_sql_join_enabled('procurement')
     
     async def execute(self, context: ProcessingContext) -> StepResult:
         """執行採購底稿整合"""
         start_time = time.time()
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             procurement = context.get_auxiliary_data('procurement_po')
             procurement_pr = context.get_auxiliary_data('procurement_pr')
+            self.po_match_stats = {}
             
             if procurement is None and procurement_pr is None:
                 self.logger.warning("No procurement data available, skipping")
@@ -955,7 +1074,9 @@ class ProcurementIntegrationStep(PipelineStep):
                 message="Procurement integrated successfully",
                 metadata={
                     'po_integrated': procurement is not None,
-                    'pr_integrated': procurement_pr is not None
+                    'pr_integrated': procurement_pr is not None,
+                    'po_match_stats': self.po_match_stats,
+                    'sql_join': self.sql_join
                 }
             )
             
@@ -972,9 +1093,13 @@ class ProcurementIntegrationStep(PipelineStep):
             )
     
     def _process_procurement_po(self, df: pd.DataFrame, procurement: pd.DataFrame) -> pd.DataFrame:
-        """處理採購 PO 底稿"""
-        # 調用父類邏輯處理基本的採購底稿整合
-        # 這裡需要實現類似 BasePOProcessor.process_procurement_workpaper 的邏輯
+        """
+        處理採購 PO 底稿
+
+        以兩段鍵值查找取得採購備註：先以 PO Line 對齊，未匹配者再以 PR Line
+        補值（combine_first）；是否存在於採購底稿則以鍵值 Index 雜湊判斷。
+        各鍵值的匹配筆數記錄於 self.po_match_stats，供 StepResult metadata 使用。
+        """
         try:
             if procurement is None or procurement.empty:
                 self.logger.info("採購底稿為空，跳過處理")
@@ -992,51 +1117,46 @@ class ProcurementIntegrationStep(PipelineStep):
                     'pr_line': 'PR Line'
                 }
             )
-            
+
+            has_po_key = 'PO Line' in df.columns
+            has_pr_key = 'PR Line' in df.columns
+
             # 通過PO Line獲取備註
-            if 'PO Line' in df.columns:
-                procurement_mapping = create_mapping_dict(
-                    procurement_wp_renamed, 'PO Line', 'Remark by PR Team'
-                )
-                df['Remarked by Procurement'] = df['PO Line'].map(procurement_mapping)
-                
-                noted_mapping = create_mapping_dict(
-                    procurement_wp_renamed, 'PO Line', 'Noted by PR'
-                )
-                df['Noted by Procurement'] = df['PO Line'].map(noted_mapping)
-            
-            # 通過PR Line獲取備註（如果PO Line沒有匹配到）
-            if 'PR Line' in df.columns:
-                pr_procurement_mapping = create_mapping_dict(
-                    procurement_wp_renamed, 'PR Line', 'Remark by PR Team'
-                )
-                
-                # 只更新尚未匹配的記錄
-                df['Remarked by Procurement'] = \
-                    (df.apply(lambda x: pr_procurement_mapping.get(x['PR Line'], None) 
-                              if x['Remarked by Procurement'] is pd.NA else x['Remarked by Procurement'], axis=1))
-            
-            # 設置FN備註為採購備註
-            # df['Remarked by FN'] = df['Remarked by Procurement']
-            
+            by_po, in_po_wp = self._lookup_values(
+                df, procurement_wp_renamed, 'PO Line', ['Remark by PR Team', 'Noted by PR']
+            )
+            remark_by_po = by_po['Remark by PR Team']
+            if has_po_key:
+                df['Noted by Procurement'] = by_po['Noted by PR']
+
+            # 通過PR Line獲取備註（僅補 PO Line 沒有匹配到的記錄）
+            by_pr, in_pr_wp = self._lookup_values(
+                df, procurement_wp_renamed, 'PR Line', ['Remark by PR Team']
+            )
+            remark_by_pr = by_pr['Remark by PR Team']
+            if has_po_key or has_pr_key:
+                df['Remarked by Procurement'] = remark_by_po.combine_first(remark_by_pr)
+
+            matched_po = remark_by_po.notna()
+            matched_pr = remark_by_pr.notna() & ~matched_po
+
             # 標記不在採購底稿中的PO
-            if 'PO Line' in df.columns and 'PR Line' in df.columns:
-                po_list = procurement_wp_renamed.get('PO Line', pd.Series([])).tolist()
-                pr_list = procurement_wp_renamed.get('PR Line', pd.Series([])).tolist()
-                
-                mask_not_in_wp = (
-                    (~df['PO Line'].isin(po_list)) & 
-                    (~df['PR Line'].isin(pr_list))
-                )
+            mask_not_in_wp = ~in_po_wp & ~in_pr_wp
+            if has_po_key and has_pr_key:
                 df.loc[mask_not_in_wp, 'PO狀態'] = STATUS_VALUES['NOT_IN_PROCUREMENT']
-            
-            # 獲取採購備註
-            if 'Remarked by Procurement' in procurement.columns and 'PO Line' in df.columns:
-                procurement_mapping = dict(zip(procurement['PO Line'], procurement['Remarked by Procurement']))
-                df['Remarked by Procurement'] = df['PO Line'].map(procurement_mapping)
-            if 'remarked_by_procurement' in procurement.columns and 'PO Line' in df.columns:
-                procurement_mapping = dict(zip(procurement['po_line'], procurement['remarked_by_procurement']))
-                df['Remarked by Procurement'] = df['PO Line'].map(procurement_mapping)
+
+            self.po_match_stats = {
+                'total': len(df),
+                'matched_by_po_line': int(matched_po.sum()),
+                'matched_by_pr_line': int(matched_pr.sum()),
+                'unmatched': int((~matched_po & ~matched_pr).sum()),
+                'not_in_procurement_wp': int(mask_not_in_wp.sum()),
+            }
+            self.logger.info(
+                f"採購備註匹配: PO Line {self.po_match_stats['matched_by_po_line']}, "
+                f"PR Line 補值 {self.po_match_stats['matched_by_pr_line']}, "
+                f"未匹配 {self.po_match_stats['unmatched']}"
+            )
             
             # 移除 SPT 模組給的狀態（SPX 有自己的狀態邏輯）
             if 'PO狀態' in df.columns:
@@ -1047,6 +1167,56 @@ class ProcurementIntegrationStep(PipelineStep):
         except Exception as e:
             self.logger.error(f"處理採購底稿時出錯: {str(e)}", exc_info=True)
             raise ValueError("處理採購底稿時出錯")
+
+    def _lookup_values(self, df: pd.DataFrame, source: pd.DataFrame, key_col: str,
+                       value_cols: List[str]) -> Tuple[Dict[str, pd.Series], pd.Series]:
+        """
+        以單一鍵值查找多個來源欄位，並回傳鍵值是否存在於來源
+
+        SQL 模式下鍵值 join 由 DuckDB 執行（空鍵值不匹配），否則逐欄 reindex。
+        """
+        if not self.sql_join or key_col not in df.columns or key_col not in source.columns:
+            values = {col: self._lookup_by_key(df, source, key_col, col) for col in value_cols}
+            return values, self._key_membership(df, source, key_col)
+
+        present = [col for col in value_cols if col in source.columns]
+        positions, found = get_sql_join_engine().lookup_last_valid(
+            df[key_col], source[key_col], {col: source[col] for col in present}
+        )
+        values = {
+            col: (take_by_position(source[col], positions[col], df.index).astype(object)
+                  if col in positions else pd.Series(np.nan, index=df.index, dtype=object))
+            for col in value_cols
+        }
+        return values, pd.Series(found, index=df.index)
+
+    @staticmethod
+    def _lookup_by_key(df: pd.DataFrame, source: pd.DataFrame,
+                       key_col: str, value_col: str) -> pd.Series:
+        """
+        以單一鍵值向量化查找來源欄位值
+
+        語意同 create_mapping_dict + map：先濾除空值，同鍵取最後一筆。
+        缺少鍵值或值欄位時回傳全空 Series（與 df 索引對齊）。
+        """
+        if key_col not in df.columns or key_col not in source.columns or value_col not in source.columns:
+            return pd.Series(np.nan, index=df.index, dtype=object)
+
+        lookup = (
+            source.loc[source[value_col].notna(), [key_col, value_col]]
+            .drop_duplicates(subset=key_col, keep='last')
+            .set_index(key_col)[value_col]
+        )
+        result = lookup.reindex(df[key_col].to_numpy())
+        result.index = df.index
+        return result.astype(object)
+
+    @staticmethod
+    def _key_membership(df: pd.DataFrame, source: pd.DataFrame, key_col: str) -> pd.Series:
+        """判斷 df 鍵值是否存在於來源鍵值（雜湊 Index 查找）"""
+        if key_col not in df.columns or key_col not in source.columns:
+            return pd.Series(False, index=df.index)
+        return df[key_col].isin(pd.Index(source[key_col]).unique())
     
     def _process_procurement_pr(self, df: pd.DataFrame, procurement_pr: pd.DataFrame) -> pd.DataFrame:
         """處理採購 PR 底稿"""
@@ -1104,17 +1274,33 @@ class DateLogicStep(PipelineStep):
     
     輸入: DataFrame
     輸出: DataFrame with processed date columns
+        (YMs of Item Description + ERM_DESC_COLUMNS 整數起迄欄位)
     """
     
-    def __init__(self, name: str = "DateLogic", **kwargs):
+    reads = ('data', 'var:file_paths')
+    writes = ('data',)
+
+    chunkable = True
+
+    # 跨 run 共用的摘要日期解析快取 {描述: (起, 迄)}；超過上限時清空重建
+    _description_memo: Dict[str, Tuple[int, int]] = {}
+    DESCRIPTION_MEMO_MAX_SIZE = 500_000
+    
+    def __init__(self, name: str = "DateLogic", use_description_memo: bool = True, **kwargs):
+        """
+        Args:
+            name: 步驟名稱
+            use_description_memo: 是否使用跨 run 的描述解析快取（同月重跑、逐月描述重複時可省去重新解析）
+        """
         super().__init__(name, description="Process date logic", **kwargs)
         self.regex_patterns = config_manager.get_regex_patterns()
+        self.use_description_memo = use_description_memo
     
     async def execute(self, context: ProcessingContext) -> StepResult:
         """執行日期邏輯處理"""
         start_time = time.time()
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             
             self.logger.info("Processing date logic...")
             
@@ -1211,17 +1397,31 @@ class DateLogicStep(PipelineStep):
                     errors='coerce'
                 ).dt.strftime('%Y%m').fillna('0').astype('Int32')
             
-            # 解析Item Description中的日期範圍
+            # 解析Item Description中的日期範圍（批次解析，同時產生整數起迄欄位）
             if 'Item Description' in df_copy.columns:
-                df_copy['YMs of Item Description'] = df_copy['Item Description'].apply(
-                    lambda x: extract_date_range_from_description(x, logger=self.logger)
+                ranges = extract_date_ranges(
+                    df_copy['Item Description'],
+                    memo=self._get_description_memo(),
+                    logger=self.logger
                 )
+                for col in ranges.columns:
+                    df_copy[col] = ranges[col]
             
             return df_copy
             
         except Exception as e:
             self.logger.error(f"解析描述中的日期時出錯: {str(e)}", exc_info=True)
             raise ValueError("解析日期時出錯")
+
+    def _get_description_memo(self) -> Optional[Dict[str, Tuple[int, int]]]:
+        """取得描述解析快取；停用時回傳 None"""
+        if not self.use_description_memo:
+            return None
+        memo = DateLogicStep._description_memo
+        if len(memo) > self.DESCRIPTION_MEMO_MAX_SIZE:
+            self.logger.debug(f"描述解析快取超過上限 ({len(memo):,})，清空重建")
+            memo.clear()
+        return memo
 # =============================================================================
 # 輔助工具類別
 # =============================================================================
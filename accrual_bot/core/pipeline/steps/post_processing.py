@@ -108,7 +108,7 @@ class BasePostProcessingStep(PipelineStep):
         start_datetime = datetime.now()
         
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             input_count = len(df)
             input_columns = len(df.columns)
             
@@ -0,0 +1,313 @@
+"""
+Pipeline 串流（分塊）執行模式
+
+主數據過大無法一次載入時，以 DataFrame chunk 的非同步產生器取代主數據載入，
+標記為 chunkable 的列內步驟逐塊執行，記憶體用量只與 chunk 大小相關。
+
+步驟分類（依原始順序）：
+  - 上下文步驟：宣告不讀寫 'data'（如關單清單載入），於串流開始前對父上下文執行一次
+  - 串流步驟：chunkable = True，逐塊執行；chunk_key 指定需完整群組的鍵欄位
+  - 收斂步驟：第一個非 chunkable 步驟（如 PO 層級彙總）起，各塊結果合併為完整 DataFrame，
+    之後所有步驟以一般順序模式執行
+
+注意：
+  - 輔助數據需事先放入上下文（chunk 上下文與父上下文共用輔助數據、變量、錯誤與警告）
+  - chunk_key 對齊假設同鍵資料在輸入中連續（ERP 匯出依單號排序）
+  - 無收斂步驟且提供 sink 時，每塊結果直接交給 sink，不保留於記憶體
+"""
+
+import inspect
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .base import PipelineStep, StepResult, StepStatus
+from .context import ProcessingContext
+from .dag import DATA_KEY
+from accrual_bot.utils.logging import get_logger
+
+ChunkSink = Callable[[pd.DataFrame], Union[None, Awaitable[None]]]
+
+
+async def iter_dataframe_chunks(df: pd.DataFrame, chunk_size: int) -> AsyncIterator[pd.DataFrame]:
+    """
+    將記憶體中的 DataFrame 依列數切塊（測試或小型資料使用）
+
+    Args:
+        df: 來源數據
+        chunk_size: 每塊列數
+
+    Yields:
+        pd.DataFrame: 數據塊
+    """
+    for start in range(0, len(df), max(1, chunk_size)):
+        yield df.iloc[start:start + chunk_size]
+
+
+async def align_chunks(chunks: AsyncIterator[pd.DataFrame], key: str) -> AsyncIterator[pd.DataFrame]:
+    """
+    調整 chunk 邊界，讓同一 key 的連續列落在同一塊
+
+    每塊尾端與最後一列同鍵的連續列延到下一塊輸出。
+
+    Args:
+        chunks: 原始數據塊
+        key: 群組鍵欄位
+
+    Yields:
+        pd.DataFrame: 對齊後的數據塊
+    """
+    carry: Optional[pd.DataFrame] = None
+    async for chunk in chunks:
+        if carry is not None and not carry.empty:
+            chunk = pd.concat([carry, chunk])
+        carry = None
+        if key not in chunk.columns or chunk.empty:
+            yield chunk
+            continue
+
+        keys = chunk[key]
+        last = keys.iloc[-1]
+        same = keys.isna().to_numpy() if pd.isna(last) else (keys == last).to_numpy()
+        # 尾端連續同鍵區塊的起點
+        breaks = np.flatnonzero(~same)
+        split = int(breaks[-1]) + 1 if len(breaks) else 0
+        if split:
+            yield chunk.iloc[:split]
+        carry = chunk.iloc[split:]
+
+    if carry is not None and not carry.empty:
+        yield carry
+
+
+def _is_context_step(step: PipelineStep) -> bool:
+    """宣告了讀寫且不涉及主數據的步驟"""
+    reads, writes = step.get_io()
+    return writes is not None and DATA_KEY not in reads and DATA_KEY not in writes
+
+
+@dataclass
+class StreamingPlan:
+    """串流執行計畫"""
+    context_steps: List[PipelineStep] = field(default_factory=list)
+    chunk_steps: List[PipelineStep] = field(default_factory=list)
+    tail_steps: List[PipelineStep] = field(default_factory=list)
+    chunk_key: Optional[str] = None
+
+    def describe(self) -> Dict[str, object]:
+        return {
+            'context_steps': [s.name for s in self.context_steps],
+            'chunk_steps': [s.name for s in self.chunk_steps],
+            'tail_steps': [s.name for s in self.tail_steps],
+            'chunk_key': self.chunk_key,
+        }
+
+
+def plan_streaming(steps: List[PipelineStep]) -> StreamingPlan:
+    """
+    依步驟宣告建立串流執行計畫
+
+    上下文步驟若讀取先前串流步驟寫入的鍵，則無法提前執行，視為收斂點。
+
+    Args:
+        steps: 步驟列表（原始順序）
+
+    Returns:
+        StreamingPlan: 執行計畫
+    """
+    plan = StreamingPlan()
+    streamed_writes = set()
+    for step in steps:
+        if plan.tail_steps:
+            plan.tail_steps.append(step)
+        elif _is_context_step(step) and not (step.get_io()[0] & streamed_writes):
+            plan.context_steps.append(step)
+        elif step.chunkable:
+            plan.chunk_steps.append(step)
+            streamed_writes |= set(step.get_io()[1] or ())
+        else:
+            plan.tail_steps.append(step)
+
+    keys = list(dict.fromkeys(s.chunk_key for s in plan.chunk_steps if s.chunk_key))
+    plan.chunk_key = keys[0] if keys else None
+    if len(keys) > 1:
+        get_logger("pipeline.Streaming").warning(
+            f"Multiple chunk keys {keys}; aligning chunks on '{plan.chunk_key}' only"
+        )
+    return plan
+
+
+class StreamingExecutor:
+    """依串流計畫逐塊執行步驟"""
+
+    def __init__(self, steps: List[PipelineStep], stop_on_error: bool = True):
+        """
+        初始化執行器
+
+        Args:
+            steps: 步驟列表（原始順序）
+            stop_on_error: 步驟失敗時是否停止
+        """
+        self.plan = plan_streaming(steps)
+        self.stop_on_error = stop_on_error
+        self.logger = get_logger("pipeline.Streaming")
+
+    async def run(self,
+                  context: ProcessingContext,
+                  chunks: AsyncIterator[pd.DataFrame],
+                  sink: Optional[ChunkSink] = None) -> List[StepResult]:
+        """
+        執行串流計畫
+
+        Args:
+            context: 父上下文（輔助數據需事先載入）
+            chunks: 主數據塊的非同步產生器
+            sink: 結果輸出；無收斂步驟時逐塊呼叫，否則以完整結果呼叫一次
+
+        Returns:
+            List[StepResult]: 各步驟結果（串流步驟為各塊彙總）
+        """
+        plan = self.plan
+        self.logger.info(f"Streaming plan: {plan.describe()}")
+
+        results = await self._run_sequential(plan.context_steps, context)
+        if self._should_stop(results):
+            return results
+
+        if plan.chunk_key:
+            chunks = align_chunks(chunks, plan.chunk_key)
+
+        materialize = bool(plan.tail_steps) or sink is None
+        outputs: List[pd.DataFrame] = []
+        chunk_results: Dict[str, List[StepResult]] = {s.name: [] for s in plan.chunk_steps}
+        chunk_rows: Dict[str, int] = {s.name: 0 for s in plan.chunk_steps}
+        n_chunks = 0
+        emitted = 0
+        stopped = False
+        empty_output: Optional[pd.DataFrame] = None
+
+        async for chunk in chunks:
+            n_chunks += 1
+            chunk_context = context.spawn_chunk(chunk)
+            for step in plan.chunk_steps:
+                if chunk_context.data is None or chunk_context.data.empty:
+                    # 此塊已被前面的步驟（如篩選）清空，後續步驟的輸入驗證會拒絕空數據
+                    chunk_results[step.name].append(StepResult(
+                        step_name=step.name, status=StepStatus.SKIPPED, message="Empty chunk"
+                    ))
+                    continue
+                result = await step(chunk_context)
+                chunk_results[step.name].append(result)
+                if chunk_context.data is not None:
+                    chunk_rows[step.name] += len(chunk_context.data)
+                if result.status == StepStatus.FAILED and self.stop_on_error:
+                    self.logger.error(f"Stopping stream due to failed step {step.name} in chunk {n_chunks}")
+                    stopped = True
+                    break
+            if stopped:
+                break
+
+            data = self._continue_index(chunk_context.data, emitted)
+            if data.empty:
+                # 空塊欄位可能少於其他塊，不參與合併 / 輸出
+                if empty_output is None:
+                    empty_output = data
+                continue
+            emitted += len(data)
+            if materialize:
+                outputs.append(data)
+            else:
+                await self._emit(sink, data)
+            self.logger.debug(f"Chunk {n_chunks} processed ({len(chunk)} rows in)")
+
+        for step in plan.chunk_steps:
+            if chunk_results[step.name]:
+                result = self._merge_results(step, chunk_results[step.name], chunk_rows[step.name])
+                results.append(result)
+                context.add_history(step.name, result.status.value)
+
+        if materialize:
+            if not outputs and empty_output is not None:
+                outputs.append(empty_output)
+            context.update_data(self._concat_chunks(outputs), owner='streaming')
+            outputs.clear()
+        self.logger.info(f"Streamed {n_chunks} chunks through {len(plan.chunk_steps)} steps")
+
+        if stopped:
+            return results
+
+        results.extend(await self._run_sequential(plan.tail_steps, context))
+        if sink is not None and materialize and not self._should_stop(results):
+            await self._emit(sink, context.data)
+        return results
+
+    async def _run_sequential(self, steps: List[PipelineStep],
+                              context: ProcessingContext) -> List[StepResult]:
+        """順序執行（上下文步驟與收斂後步驟）"""
+        results = []
+        for step in steps:
+            result = await step(context)
+            results.append(result)
+            context.add_history(step.name, result.status.value)
+            if result.status == StepStatus.FAILED and self.stop_on_error:
+                self.logger.error(f"Stopping pipeline due to failed step: {step.name}")
+                break
+        return results
+
+    def _should_stop(self, results: List[StepResult]) -> bool:
+        return self.stop_on_error and any(r.status == StepStatus.FAILED for r in results)
+
+    @staticmethod
+    def _concat_chunks(outputs: List[pd.DataFrame]) -> pd.DataFrame:
+        """合併各塊結果"""
+        if not outputs:
+            return pd.DataFrame()
+        data = pd.concat(outputs)
+        # pandas 會把全為缺失值的 object 欄位串接成 NaN，還原各塊原本的缺失值（如 pd.NA）
+        for col in data.columns[data.dtypes == object]:
+            parts = [o[col] for o in outputs if col in o.columns]
+            if len(parts) == len(outputs) and all(p.dtype == object for p in parts) \
+                    and data[col].isna().all():
+                data[col] = np.concatenate([p.to_numpy() for p in parts])
+        return data
+
+    @staticmethod
+    def _continue_index(data: pd.DataFrame, offset: int) -> pd.DataFrame:
+        """步驟重設索引（reset_index）時，讓各塊索引接續，與整批執行結果一致"""
+        index = data.index
+        if offset and isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1:
+            data = data.set_axis(pd.RangeIndex(offset, offset + len(data)), axis=0)
+        return data
+
+    @staticmethod
+    async def _emit(sink: ChunkSink, data: pd.DataFrame) -> None:
+        outcome = sink(data)
+        if inspect.isawaitable(outcome):
+            await outcome
+
+    @staticmethod
+    def _merge_results(step: PipelineStep, results: List[StepResult], rows: int) -> StepResult:
+        """彙總同一步驟在各塊的結果"""
+        statuses = [r.status for r in results]
+        if StepStatus.FAILED in statuses:
+            status = StepStatus.FAILED
+        elif StepStatus.SUCCESS in statuses:
+            status = StepStatus.SUCCESS
+        else:
+            status = statuses[-1]
+        failed = next((r for r in results if r.status == StepStatus.FAILED), None)
+        return StepResult(
+            step_name=step.name,
+            status=status,
+            error=failed.error if failed else None,
+            message=failed.message if failed else f"Streamed {len(results)} chunks",
+            duration=sum(r.duration or 0 for r in results),
+            metadata={
+                'streaming': True,
+                'chunks': len(results),
+                'output_rows': rows,
+                'chunk_statuses': {s.value: statuses.count(s) for s in StepStatus if s in statuses},
+            }
+        )
@@ -1,19 +1,33 @@
 """
 Runner Module - Pipeline 執行管理
 
-提供配置載入和逐步執行功能
+提供配置載入、逐步執行和多行程批次執行功能
 """
 
 from .config_loader import (
     load_run_config,
     load_file_paths,
+    apply_profiling_config,
     RunConfig,
 )
 from .step_executor import StepByStepExecutor
+from .batch_runner import (
+    BatchJob,
+    BatchResult,
+    BatchRunner,
+    run_batch_job,
+    load_batch_jobs,
+)
 
 __all__ = [
     'load_run_config',
     'load_file_paths',
+    'apply_profiling_config',
     'RunConfig',
     'StepByStepExecutor',
+    'BatchJob',
+    'BatchResult',
+    'BatchRunner',
+    'run_batch_job',
+    'load_batch_jobs',
 ]
@@ -0,0 +1,317 @@
+"""
+Batch Runner - 以多行程並行執行多個實體的 Pipeline
+
+月結時 SPX PO/PR、SPT PO/PR、SCT PO/PR 彼此獨立，但都是 CPU 密集的 pandas 運算，
+在同一個 asyncio loop 上會被 GIL 序列化。BatchRunner 將每個工作
+（entity, processing_type, processing_date, file_paths）送到 worker 行程，
+worker 以 UnifiedPipelineService.build_pipeline 建立 Pipeline 執行，
+只回傳結果摘要與輸出路徑（不回傳 DataFrame）。
+
+Worker 以 initializer 預先載入配置與服務，同一 worker 的後續工作不需重新載入。
+
+Classes:
+    BatchJob: 單一 Pipeline 工作
+    BatchRunner: 多行程批次執行器
+
+Functions:
+    run_batch_job: 在目前行程執行單一工作（worker 進入點）
+    load_batch_jobs: 從 run_config.toml 的 [batch] 區段載入工作清單
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+import tomllib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from accrual_bot.runner.config_loader import get_config_dir, load_file_paths
+from accrual_bot.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 匯出步驟以 metadata['output_path'] 回報輸出檔；未回報 metadata 的步驟改以下列上下文變量記錄
+OUTPUT_PATH_VARIABLES = (
+    'export_output_path',
+    'export_path',
+    'data_shape_summary_path',
+)
+
+# worker 行程內預先建立的服務（由 _init_worker 設定）
+_worker_service = None
+
+
+@dataclass
+class BatchJob:
+    """單一 Pipeline 工作"""
+    entity: str
+    processing_type: str
+    processing_date: int
+    # None 時由 worker 依 paths.toml 解析
+    file_paths: Optional[Dict[str, Any]] = None
+    # 僅 PROCUREMENT 使用: PO/PR/COMBINED
+    source_type: str = ""
+
+    @property
+    def label(self) -> str:
+        return f"{self.entity}_{self.processing_type}_{self.processing_date}"
+
+
+@dataclass
+class BatchResult:
+    """批次執行結果"""
+    jobs: List[Dict[str, Any]] = field(default_factory=list)
+    duration: float = 0.0
+    max_workers: int = 1
+
+    @property
+    def success(self) -> bool:
+        return all(job['success'] for job in self.jobs)
+
+    @property
+    def failed_jobs(self) -> List[str]:
+        return [job['job'] for job in self.jobs if not job['success']]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'success': self.success,
+            'duration': self.duration,
+            'max_workers': self.max_workers,
+            'failed_jobs': self.failed_jobs,
+            'jobs': self.jobs,
+        }
+
+
+def _init_worker() -> None:
+    """Worker 初始化：預先載入配置與 Pipeline 服務"""
+    global _worker_service
+    import warnings
+    warnings.filterwarnings("ignore")
+
+    from accrual_bot.tasks.pipeline_service import UnifiedPipelineService
+    from accrual_bot.utils.config import config_manager  # noqa: F401  觸發配置載入
+    _worker_service = UnifiedPipelineService()
+
+
+def _get_service():
+    if _worker_service is None:
+        _init_worker()
+    return _worker_service
+
+
+def _collect_output_paths(context, step_results: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    收集輸出檔路徑
+
+    Args:
+        context: 處理上下文
+        step_results: pipeline 執行結果的 results（StepResult.to_dict）
+
+    Returns:
+        Dict[str, str]: {步驟名稱或變量名稱: 路徑}，同一路徑只列一次
+    """
+    paths = {}
+    for step_result in step_results:
+        value = (step_result.get('metadata') or {}).get('output_path')
+        if value:
+            paths[step_result['step_name']] = str(value)
+    recorded = set(paths.values())
+    for name in OUTPUT_PATH_VARIABLES:
+        value = context.get_variable(name)
+        if value and str(value) not in recorded:
+            paths[name] = str(value)
+    return paths
+
+
+def run_batch_job(job: BatchJob) -> Dict[str, Any]:
+    """
+    執行單一工作並回傳摘要（可序列化，供行程間傳遞）
+
+    Args:
+        job: 工作定義
+
+    Returns:
+        Dict[str, Any]: 結果摘要（job、success、duration、步驟統計、錯誤、輸出路徑）
+    """
+    from accrual_bot.core.pipeline import ProcessingContext
+
+    start = time.perf_counter()
+    summary: Dict[str, Any] = {
+        'job': job.label,
+        'entity': job.entity,
+        'processing_type': job.processing_type,
+        'processing_date': job.processing_date,
+        'pid': os.getpid(),
+        'success': False,
+        'output_paths': {},
+        'errors': [],
+    }
+    try:
+        file_paths = job.file_paths
+        if file_paths is None:
+            file_paths = load_file_paths(job.entity, job.processing_type, job.processing_date)
+
+        pipeline = _get_service().build_pipeline(
+            job.entity,
+            job.processing_type,
+            file_paths,
+            processing_date=job.processing_date,
+            source_type=job.source_type or None,
+        )
+
+        context = ProcessingContext(
+            data=pd.DataFrame(),
+            entity_type=job.entity,
+            processing_date=job.processing_date,
+            processing_type=job.processing_type
+        )
+        context.set_variable('file_paths', file_paths)
+        if job.source_type:
+            context.set_variable('source_type', job.source_type)
+
+        result = asyncio.run(pipeline.execute(context))
+
+        summary.update({
+            'pipeline': result.get('pipeline'),
+            'success': result.get('success', False),
+            'total_steps': result.get('total_steps', 0),
+            'successful_steps': result.get('successful_steps', 0),
+            'failed_steps': result.get('failed_steps', 0),
+            'skipped_steps': result.get('skipped_steps', 0),
+            'steps': [
+                {'step_name': r['step_name'], 'status': r['status'], 'duration': r['duration']}
+                for r in result.get('results', [])
+            ],
+            'errors': [str(e) for e in result.get('errors', [])] or (
+                [result['error']] if result.get('error') else []
+            ),
+            'output_paths': _collect_output_paths(context, result.get('results', [])),
+        })
+    except Exception as e:
+        logger.error(f"批次工作 {job.label} 執行失敗: {e}", exc_info=True)
+        summary['errors'] = [str(e)]
+
+    summary['duration'] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+class BatchRunner:
+    """
+    多行程批次執行器
+
+    使用範例:
+        runner = BatchRunner(max_workers=4)
+        result = runner.run([
+            BatchJob('SPX', 'PO', 202512),
+            BatchJob('SPX', 'PR', 202512),
+        ])
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, start_method: str = "spawn"):
+        """
+        初始化執行器
+
+        Args:
+            max_workers: worker 行程數；None 時為 CPU 數，<= 1 時在目前行程依序執行
+            start_method: 行程啟動方式，預設 spawn（與 Windows 行為一致，避免 fork 複製日誌執行緒）
+        """
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.start_method = start_method
+
+    def run(self, jobs: List[BatchJob]) -> BatchResult:
+        """
+        執行所有工作
+
+        Args:
+            jobs: 工作清單
+
+        Returns:
+            BatchResult: 各工作摘要（依輸入順序）
+        """
+        start = time.perf_counter()
+        workers = max(1, min(self.max_workers, len(jobs)))
+        logger.info(f"批次執行 {len(jobs)} 個工作，worker 數: {workers}")
+
+        if workers <= 1:
+            summaries = [run_batch_job(job) for job in jobs]
+        else:
+            summaries = self._run_in_pool(jobs, workers)
+
+        result = BatchResult(jobs=summaries, duration=round(time.perf_counter() - start, 3),
+                             max_workers=workers)
+        logger.info(f"批次執行完成，耗時 {result.duration:.2f} 秒，失敗: {result.failed_jobs}")
+        return result
+
+    async def run_async(self, jobs: List[BatchJob]) -> BatchResult:
+        """非同步版本：於背景執行緒等待行程池，不阻塞事件迴圈"""
+        return await asyncio.to_thread(self.run, jobs)
+
+    def _run_in_pool(self, jobs: List[BatchJob], workers: int) -> List[Dict[str, Any]]:
+        summaries: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        mp_context = multiprocessing.get_context(self.start_method)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                 initializer=_init_worker) as pool:
+            futures = {pool.submit(run_batch_job, job): i for i, job in enumerate(jobs)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    summaries[i] = future.result()
+                except Exception as e:
+                    # worker 行程異常終止（如記憶體不足）
+                    logger.error(f"批次工作 {jobs[i].label} 的 worker 異常: {e}")
+                    summaries[i] = {
+                        'job': jobs[i].label, 'success': False, 'duration': 0.0,
+                        'output_paths': {}, 'errors': [str(e)],
+                    }
+                logger.info(f"{jobs[i].label}: {'成功' if summaries[i]['success'] else '失敗'}")
+        return summaries
+
+
+def parse_job_spec(spec: str, processing_date: int) -> BatchJob:
+    """
+    解析工作字串，格式為 ENTITY:TYPE[:SOURCE_TYPE]（如 SPX:PO、SPT:PROCUREMENT:COMBINED）
+
+    Args:
+        spec: 工作字串
+        processing_date: 處理日期 (YYYYMM)
+
+    Returns:
+        BatchJob: 工作定義
+    """
+    parts = [p.strip().upper() for p in spec.split(":")]
+    if len(parts) not in (2, 3) or not all(parts):
+        raise ValueError(f"工作格式錯誤: '{spec}'，應為 ENTITY:TYPE[:SOURCE_TYPE]")
+    return BatchJob(
+        entity=parts[0],
+        processing_type=parts[1],
+        processing_date=processing_date,
+        source_type=parts[2] if len(parts) == 3 else "",
+    )
+
+
+def load_batch_jobs(config_path: Optional[Path] = None) -> Tuple[List[BatchJob], Optional[int]]:
+    """
+    從 run_config.toml 的 [batch] 區段載入工作清單
+
+    Args:
+        config_path: 配置檔案路徑，預設為 config/run_config.toml
+
+    Returns:
+        Tuple[List[BatchJob], Optional[int]]: 工作清單與 max_workers（未設定為 None）
+    """
+    if config_path is None:
+        config_path = get_config_dir() / "run_config.toml"
+
+    with open(config_path, "rb") as f:
+        config = tomllib.load(f)
+
+    batch = config.get("batch", {})
+    processing_date = batch.get("processing_date") or config.get("run", {}).get("processing_date", 202512)
+    jobs = [parse_job_spec(spec, processing_date) for spec in batch.get("jobs", [])]
+    # max_workers = 0 表示依 CPU 數
+    return jobs, batch.get("max_workers") or None
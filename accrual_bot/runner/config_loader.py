@@ -4,6 +4,7 @@ Config Loader - 載入執行配置和路徑配置
 Functions:
     load_run_config: 載入 run_config.toml
     load_file_paths: 載入並解析 paths.toml
+    apply_profiling_config: 套用 [profiling] 設定到 Pipeline
 """
 
 import re
@@ -32,6 +33,7 @@ class RunConfig:
     # Debug 設定
     step_by_step: bool = False
     save_checkpoints: bool = True
+    checkpoint_format: str = "parquet"  # 'parquet' 或 'arrow'
     verbose: bool = False
 
     # Resume 設定
@@ -43,6 +45,11 @@ class RunConfig:
     output_dir: str = "./output"
     auto_export: bool = True
 
+    # Profiling 設定
+    profiling_enabled: bool = False
+    profiling_trace: str = "none"  # 'none', 'cprofile' 或 'pyinstrument'
+    profiling_deep_memory: bool = False
+
 
 def get_config_dir() -> Path:
     """取得配置檔案目錄（workspace 環境變數優先）"""
@@ -77,6 +84,7 @@ def load_run_config(config_path: Optional[Path] = None) -> RunConfig:
     debug = config.get("debug", {})
     resume = config.get("resume", {})
     output = config.get("output", {})
+    profiling = config.get("profiling", {})
 
     return RunConfig(
         # 基本設定
@@ -88,6 +96,7 @@ def load_run_config(config_path: Optional[Path] = None) -> RunConfig:
         # Debug 設定
         step_by_step=debug.get("step_by_step", False),
         save_checkpoints=debug.get("save_checkpoints", True),
+        checkpoint_format=debug.get("checkpoint_format", "parquet"),
         verbose=debug.get("verbose", False),
         # Resume 設定
         resume_enabled=resume.get("enabled", False),
@@ -96,9 +105,28 @@ def load_run_config(config_path: Optional[Path] = None) -> RunConfig:
         # Output 設定
         output_dir=output.get("output_dir", "./output"),
         auto_export=output.get("auto_export", True),
+        # Profiling 設定
+        profiling_enabled=profiling.get("enabled", False),
+        profiling_trace=profiling.get("trace", "none"),
+        profiling_deep_memory=profiling.get("deep_memory", False),
     )
 
 
+def apply_profiling_config(pipeline, config: RunConfig) -> None:
+    """
+    將 run_config.toml 的 [profiling] 設定套用到 Pipeline
+
+    Args:
+        pipeline: Pipeline 實例
+        config: 執行配置
+    """
+    pipeline.config.profile = config.profiling_enabled
+    pipeline.config.profile_trace = config.profiling_trace
+    pipeline.config.profile_deep_memory = config.profiling_deep_memory
+    if config.profiling_enabled:
+        logger.info(f"已啟用步驟效能分析 (trace={config.profiling_trace})")
+
+
 def load_file_paths(
     entity: str,
     processing_type: str,
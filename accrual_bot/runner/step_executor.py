@@ -29,7 +29,8 @@ class StepByStepExecutor:
         pipeline: Pipeline,
         context: ProcessingContext,
         save_checkpoints: bool = True,
-        checkpoint_dir: str = "./checkpoints"
+        checkpoint_dir: str = "./checkpoints",
+        checkpoint_format: str = "parquet"
     ):
         """
         初始化逐步執行器
@@ -39,11 +40,15 @@ class StepByStepExecutor:
             context: 處理上下文
             save_checkpoints: 是否儲存 checkpoint
             checkpoint_dir: checkpoint 儲存目錄
+            checkpoint_format: checkpoint 儲存格式 (parquet/arrow)
         """
         self.pipeline = pipeline
         self.context = context
         self.save_checkpoints = save_checkpoints
-        self.checkpoint_manager = CheckpointManager(checkpoint_dir) if save_checkpoints else None
+        self.checkpoint_manager = (
+            CheckpointManager(checkpoint_dir, checkpoint_format=checkpoint_format)
+            if save_checkpoints else None
+        )
 
         self.results: List[StepResult] = []
         self.start_time: Optional[datetime] = None
@@ -35,6 +35,7 @@ from accrual_bot.core.pipeline.steps.common import (
     StepMetadataBuilder,
     create_error_metadata
 )
+from accrual_bot.core.datasources import write_workbook
 from accrual_bot.utils.config import config_manager
 from accrual_bot.utils.logging import get_logger
 
@@ -314,9 +315,7 @@ class DataShapeSummaryStep(PipelineStep):
         filename = f"DataShape_Summary_{entity}_{proc_type}_{date}_{timestamp}.xlsx"
         output_path = self.output_dir / filename
 
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            for sheet_name, df in summaries.items():
-                df.to_excel(writer, sheet_name=sheet_name)
+        write_workbook(output_path, summaries, index=True)
 
         self.logger.info(f"資料驗證摘要已導出: {output_path}")
         context.set_variable('data_shape_summary_path', str(output_path))
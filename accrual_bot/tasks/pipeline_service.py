@@ -128,6 +128,32 @@ class UnifiedPipelineService:
         else:
             raise ValueError(f"不支援的處理類型: {entity}/{proc_type}")
 
+    def get_file_config(
+        self,
+        file_key: str,
+        file_path: str,
+        entity: str,
+        proc_type: str,
+        source_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        取得單一檔案的讀取設定（與 build_pipeline 使用相同的參數解析）
+
+        Args:
+            file_key: 檔案識別 key（如 'raw_po'）
+            file_path: 檔案路徑
+            entity: Entity 名稱
+            proc_type: 處理類型
+            source_type: 子類型 (僅 PROCUREMENT 使用)
+
+        Returns:
+            {'path': 檔案路徑, 'params': 讀取參數}（無配置參數時 params 為空字典）
+        """
+        entry = self._enrich_file_paths({file_key: file_path}, entity, proc_type, source_type)[file_key]
+        if isinstance(entry, dict):
+            return {'path': entry['path'], 'params': dict(entry.get('params') or {})}
+        return {'path': entry, 'params': {}}
+
     def _get_orchestrator(self, entity: str):
         """
         獲取對應的 orchestrator
@@ -196,7 +222,10 @@ class UnifiedPipelineService:
             if params_config and isinstance(params_config, dict):
                 enriched_paths = {}
                 for file_key, file_path in file_paths.items():
-                    if file_key in params_config:
+                    if isinstance(file_path, dict):
+                        # 已含 params（如 runner.load_file_paths 的解析結果）
+                        enriched_paths[file_key] = file_path
+                    elif file_key in params_config:
                         enriched_paths[file_key] = {
                             'path': file_path,
                             'params': params_config[file_key]
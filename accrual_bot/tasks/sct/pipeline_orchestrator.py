@@ -51,6 +51,9 @@ class SCTPipelineOrchestrator:
 
     def __init__(self):
         self.config = config_manager._config_toml.get('pipeline', {}).get('sct', {})
+        # sequential（預設）或 dag：依步驟讀寫宣告並行執行
+        self.execution_mode = self.config.get('execution_mode', 'sequential')
+        self.copy_on_write = self.config.get('copy_on_write', False)
         self.entity_type = 'SCT'
         self.logger = get_logger(__name__)
 
@@ -73,7 +76,9 @@ class SCTPipelineOrchestrator:
             name="SCT_PO_Processing",
             description="SCT PO data processing pipeline",
             entity_type=self.entity_type,
-            stop_on_error=True
+            stop_on_error=True,
+            execution_mode=self.execution_mode,
+            copy_on_write=self.copy_on_write
         )
 
         pipeline = Pipeline(pipeline_config)
@@ -123,7 +128,9 @@ class SCTPipelineOrchestrator:
             name="SCT_PR_Processing",
             description="SCT PR data processing pipeline",
             entity_type=self.entity_type,
-            stop_on_error=True
+            stop_on_error=True,
+            execution_mode=self.execution_mode,
+            copy_on_write=self.copy_on_write
         )
 
         pipeline = Pipeline(pipeline_config)
@@ -174,7 +181,9 @@ class SCTPipelineOrchestrator:
             name="SCT_Variance_Analysis",
             description="SCT PO variance analysis pipeline",
             entity_type=self.entity_type,
-            stop_on_error=True
+            stop_on_error=True,
+            execution_mode=self.execution_mode,
+            copy_on_write=self.copy_on_write
         )
 
         pipeline = Pipeline(pipeline_config)
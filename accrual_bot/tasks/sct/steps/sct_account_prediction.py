@@ -59,6 +59,8 @@ class SCTAccountPredictionStep(PipelineStep):
     - matched_conditions: 匹配條件描述
     """
 
+    chunkable = True
+
     def __init__(self, name: str = "SCTAccountPrediction", **kwargs):
         super().__init__(
             name=name,
@@ -107,7 +109,7 @@ class SCTAccountPredictionStep(PipelineStep):
         start_time = time.time()
 
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             original_count = len(df)
 
             self.logger.info("開始 SCT 會計科目預測處理")
@@ -77,7 +77,7 @@ class SCTAssetStatusUpdateStep(PipelineStep):
         start_time = time.time()
 
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             processing_date = context.metadata.processing_date
 
             self.logger.info(
@@ -39,6 +39,8 @@ class SCTColumnAdditionStep(PipelineStep):
     輸出: DataFrame with additional columns
     """
 
+    chunkable = True
+
     def __init__(self, name: str = "SCTColumnAddition", **kwargs):
         super().__init__(name, description="Add SCT-specific columns", **kwargs)
 
@@ -48,7 +50,7 @@ class SCTColumnAdditionStep(PipelineStep):
         start_datetime = datetime.now()
 
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             input_count = len(df)
             m = context.metadata.processing_date % 100
 
@@ -22,6 +22,7 @@ from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
 from accrual_bot.core.pipeline.context import ProcessingContext
 from accrual_bot.core.pipeline.engines import ConditionEngine
 from accrual_bot.utils.config import config_manager
+from accrual_bot.utils.helpers.data_utils import get_erm_desc_fields
 
 
 @dataclass
@@ -71,6 +72,8 @@ class SCTERMLogicStep(PipelineStep):
     - ERM 條件由配置引擎依 priority 順序執行
     """
 
+    chunkable = True
+
     def __init__(self, name: str = "SCTERMLogic", **kwargs):
         super().__init__(
             name=name,
@@ -94,7 +97,7 @@ class SCTERMLogicStep(PipelineStep):
         """執行 ERM 邏輯"""
         start_time = time.time()
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             processing_date = context.metadata.processing_date
 
             # 獲取參考數據
@@ -189,8 +192,7 @@ class SCTERMLogicStep(PipelineStep):
         no_status = (df[status_column].isna()) | (df[status_column] == '') | (df[status_column] == 'nan')
 
         # 日期範圍條件
-        ym_start = df['YMs of Item Description'].str[:6].astype('Int32')
-        ym_end = df['YMs of Item Description'].str[7:].astype('Int32')
+        ym_start, ym_end, format_error = get_erm_desc_fields(df)
         erm = df['Expected Received Month_轉換格式']
 
         in_date_range = erm.between(ym_start, ym_end, inclusive='both')
@@ -230,9 +232,8 @@ class SCTERMLogicStep(PipelineStep):
         procurement_not_error = df['Remarked by Procurement'] != 'error'
         out_of_date_range = (
             (in_date_range == False) &
-            (df['YMs of Item Description'] != '100001,100002')
+            (~format_error)
         )
-        format_error = df['YMs of Item Description'] == '100001,100002'
 
         return SCTERMConditions(
             no_status=no_status,
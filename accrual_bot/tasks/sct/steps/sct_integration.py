@@ -13,6 +13,11 @@ from accrual_bot.core.pipeline.steps.common import (
     StepMetadataBuilder, 
     create_error_metadata
 )
+from accrual_bot.core.pipeline.engines.sql_join_engine import (
+    get_sql_join_engine,
+    is_sql_join_enabled,
+    take_by_position
+)
 
 
 class APInvoiceIntegrationStep(PipelineStep):
@@ -26,16 +31,19 @@ class APInvoiceIntegrationStep(PipelineStep):
     輸入: DataFrame + AP Invoice auxiliary data
     輸出: DataFrame with VOUCHER_NUMBER column
     """
+
+    chunkable = True
     
     def __init__(self, name: str = "APInvoiceIntegration", **kwargs):
         super().__init__(name, description="Integrate AP Invoice VOUCHER_NUMBER", **kwargs)
+        self.sql_join = is_sql_join_enabled('ap_invoice')
     
     async def execute(self, context: ProcessingContext) -> StepResult:
         """執行 AP Invoice 整合"""
         start_time = time.time()
         start_datetime = datetime.now()
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             input_count = len(df)
             df_ap = context.get_auxiliary_data('ap_invoice')
             yyyymm = context.metadata.processing_date
@@ -72,23 +80,26 @@ class APInvoiceIntegrationStep(PipelineStep):
             df_ap['match_type'] = df_ap['Match Type'].fillna('system_filled')
             df_ap['voucher_number'] = df_ap['VOUCHER_NUMBER'].fillna('system_filled')
             
-            # 只保留期間在 yyyymm 之前的 AP 發票
-            df_ap = (
-                df_ap.loc[df_ap['period'] <= yyyymm, :]
-                .sort_values(by=['po_line', 'period'])
-                .drop_duplicates(subset='po_line', keep='last')
-                .reset_index(drop=True)
-            )
-            
-            # 合併到主 DataFrame
-            df = df.merge(
-                df_ap[['po_line', 'voucher_number']], 
-                left_on='PO Line', 
-                right_on='po_line', 
-                how='left'
-            )
-            
-            df.drop(columns=['po_line'], inplace=True)
+            if self.sql_join:
+                df = self._merge_latest_voucher_sql(df, df_ap, yyyymm)
+            else:
+                # 只保留期間在 yyyymm 之前的 AP 發票
+                df_ap = (
+                    df_ap.loc[df_ap['period'] <= yyyymm, :]
+                    .sort_values(by=['po_line', 'period'])
+                    .drop_duplicates(subset='po_line', keep='last')
+                    .reset_index(drop=True)
+                )
+                
+                # 合併到主 DataFrame
+                df = df.merge(
+                    df_ap[['po_line', 'voucher_number']], 
+                    left_on='PO Line', 
+                    right_on='po_line', 
+                    how='left'
+                )
+                
+                df.drop(columns=['po_line'], inplace=True)
             
             context.update_data(df)
             
@@ -105,6 +116,7 @@ class APInvoiceIntegrationStep(PipelineStep):
                         .set_time_info(start_datetime, end_datetime)
                         .add_custom('matched_records', int(matched_count))
                         .add_custom('total_records', len(df))
+                        .add_custom('sql_join', self.sql_join)
                         .build())
             
             return StepResult(
@@ -126,6 +138,21 @@ class APInvoiceIntegrationStep(PipelineStep):
                 message=str(e)
             )
     
+    @staticmethod
+    def _merge_latest_voucher_sql(df: pd.DataFrame, df_ap: pd.DataFrame, yyyymm: int) -> pd.DataFrame:
+        """
+        SQL 模式：以 DuckDB 取各 po_line 在 yyyymm 之前最新期間的 VOUCHER_NUMBER
+
+        語意同排序去重後 left merge（同期間取最後一筆）。
+        """
+        eligible = df_ap.loc[df_ap['period'] <= yyyymm].reset_index(drop=True)
+        df = df.reset_index(drop=True)
+        positions = get_sql_join_engine().latest_per_key(
+            df['PO Line'], eligible['po_line'], eligible['period']
+        )
+        df['voucher_number'] = take_by_position(eligible['voucher_number'], positions, df.index)
+        return df
+
     async def validate_input(self, context: ProcessingContext) -> bool:
         """驗證輸入"""
         if context.data is None or context.data.empty:
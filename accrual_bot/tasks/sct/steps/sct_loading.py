@@ -18,7 +18,7 @@ import pandas as pd
 
 from accrual_bot.core.pipeline.context import ProcessingContext
 from accrual_bot.core.pipeline.steps.base_loading import BaseLoadingStep
-from accrual_bot.core.datasources import DataSourceFactory
+from accrual_bot.core.datasources import DataSourceFactory, get_shared_frame_cache
 from accrual_bot.utils.config import config_manager
 from accrual_bot.utils.helpers import get_ref_on_colab
 
@@ -107,7 +107,8 @@ class SCTBaseDataLoadingStep(BaseLoadingStep):
             # 一般環境：從檔案載入
             if Path(ref_data_path).exists():
                 source = DataSourceFactory.create_from_file(str(ref_data_path))
-                ref_ac = await source.read(dtype=str)
+                source.attach_cache(get_shared_frame_cache())
+                ref_ac = await source.read_with_cache(dtype=str)
                 context.add_auxiliary_data('reference_account', ref_ac.iloc[:, 1:3].copy())
                 context.add_auxiliary_data(
                     'reference_liability', ref_ac.loc[:, ['Account', 'Liability']].copy()
@@ -160,7 +161,7 @@ class SCTBaseDataLoadingStep(BaseLoadingStep):
         """添加 raw_data_snapshot 供 DataShapeSummaryStep 使用"""
         shape_summary_cfg = config_manager._config_toml.get('data_shape_summary', {})
         if shape_summary_cfg.get('enabled', False):
-            context.add_auxiliary_data('raw_data_snapshot', context.data.copy())
+            context.add_auxiliary_data('raw_data_snapshot', context.get_data_copy())
 
 
 # ========== 具體子類（公開 API） ==========
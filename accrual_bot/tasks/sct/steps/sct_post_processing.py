@@ -253,6 +253,7 @@ class SCTPostProcessingStep(BasePostProcessingStep):
             '檔案日期', 'Expected Received Month_轉換格式',
             'YMs of Item Description',
             'expected_received_month_轉換格式', 'yms_of_item_description',
+            'erm_desc_start', 'erm_desc_end', 'erm_desc_format_error',
             'PR Product Code Check', 'pr_product_code_check',
             'matched_condition_on_status',
         ])
@@ -21,6 +21,7 @@ from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
 from accrual_bot.core.pipeline.context import ProcessingContext
 from accrual_bot.core.pipeline.engines import ConditionEngine
 from accrual_bot.utils.config import config_manager
+from accrual_bot.utils.helpers.data_utils import get_erm_desc_fields
 
 
 class SCTPRERMLogicStep(PipelineStep):
@@ -41,6 +42,8 @@ class SCTPRERMLogicStep(PipelineStep):
     - Accr. Amount 直接使用 Entry Amount
     """
 
+    chunkable = True
+
     def __init__(self, name: str = "SCTPRERMLogic", **kwargs):
         super().__init__(
             name=name,
@@ -65,7 +68,7 @@ class SCTPRERMLogicStep(PipelineStep):
         start_time = time.time()
 
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             processing_date = context.metadata.processing_date
 
             # 獲取參考數據
@@ -182,7 +185,7 @@ class SCTPRERMLogicStep(PipelineStep):
         )
 
         # 格式錯誤
-        format_error = df['YMs of Item Description'] == '100001,100002'
+        format_error = get_erm_desc_fields(df)[2]
         mask_format_error = no_status & format_error
         df.loc[mask_format_error, status_column] = '格式錯誤，退單'
 
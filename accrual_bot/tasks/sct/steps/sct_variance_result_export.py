@@ -17,6 +17,7 @@ import pandas as pd
 
 from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
 from accrual_bot.core.pipeline.context import ProcessingContext
+from accrual_bot.core.datasources import WorkbookWriter
 from accrual_bot.utils.config import config_manager
 from accrual_bot.utils.logging import get_logger
 
@@ -235,9 +236,9 @@ class SCTVarianceResultExportStep(PipelineStep):
             filename = f"SCT_差異分析報表_{processing_date}_{timestamp}.xlsx"
             export_path = os.path.join(output_dir, filename)
 
-            with pd.ExcelWriter(export_path, engine='openpyxl') as writer:
+            with WorkbookWriter.from_config(export_path) as writer:
                 # Sheet 1: 差異明細
-                result_df.to_excel(writer, sheet_name=detail_sheet, index=False)
+                writer.write_sheet(detail_sheet, result_df)
 
                 # Sheet 2: 分析摘要
                 summary_data = []
@@ -254,9 +255,7 @@ class SCTVarianceResultExportStep(PipelineStep):
 
                 if summary_data:
                     summary_df = pd.DataFrame(summary_data)
-                    summary_df.to_excel(
-                        writer, sheet_name=summary_sheet, index=False
-                    )
+                    writer.write_sheet(summary_sheet, summary_df)
 
             return export_path
 
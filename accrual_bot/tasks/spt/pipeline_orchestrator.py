@@ -66,6 +66,9 @@ class SPTPipelineOrchestrator:
 
     def __init__(self):
         self.config = config_manager._config_toml.get('pipeline', {}).get('spt', {})
+        # sequential（預設）或 dag：依步驟讀寫宣告並行執行
+        self.execution_mode = self.config.get('execution_mode', 'sequential')
+        self.copy_on_write = self.config.get('copy_on_write', False)
         self.entity_type = 'SPT'
         self.logger = get_logger(__name__)
 
@@ -88,7 +91,9 @@ class SPTPipelineOrchestrator:
             name="SPT_PO_Processing",
             description="SPT PO data processing pipeline",
             entity_type=self.entity_type,
-            stop_on_error=True
+            stop_on_error=True,
+            execution_mode=self.execution_mode,
+            copy_on_write=self.copy_on_write
         )
 
         pipeline = Pipeline(pipeline_config)
@@ -139,7 +144,9 @@ class SPTPipelineOrchestrator:
             name="SPT_PR_Processing",
             description="SPT PR data processing pipeline",
             entity_type=self.entity_type,
-            stop_on_error=True
+            stop_on_error=True,
+            execution_mode=self.execution_mode,
+            copy_on_write=self.copy_on_write
         )
 
         pipeline = Pipeline(pipeline_config)
@@ -238,7 +245,9 @@ class SPTPipelineOrchestrator:
             name=f"SPT_PROCUREMENT_{source_type}_Processing",
             description=f"SPT Procurement {source_type} processing pipeline",
             entity_type=self.entity_type,
-            stop_on_error=True
+            stop_on_error=True,
+            execution_mode=self.execution_mode,
+            copy_on_write=self.copy_on_write
         )
 
         pipeline = Pipeline(pipeline_config)
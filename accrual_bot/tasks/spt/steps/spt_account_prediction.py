@@ -99,7 +99,7 @@ class SPTAccountPredictionStep(PipelineStep):
         start_time = time.time()
         
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             original_count = len(df)
             
             self.logger.info("開始會計科目預測處理")
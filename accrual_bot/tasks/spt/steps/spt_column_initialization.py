@@ -31,7 +31,7 @@ class ColumnInitializationStep(PipelineStep):
         start_datetime = datetime.now()
 
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
 
             if self._is_pr(context):
                 self.status_column = "PR狀態"
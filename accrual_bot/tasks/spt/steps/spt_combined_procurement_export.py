@@ -12,6 +12,7 @@ from pathlib import Path
 
 from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
 from accrual_bot.core.pipeline.context import ProcessingContext
+from accrual_bot.core.datasources import WorkbookWriter
 
 
 class CombinedProcurementExportStep(PipelineStep):
@@ -90,25 +91,17 @@ class CombinedProcurementExportStep(PipelineStep):
 
             for attempt in range(self.retry_count):
                 try:
-                    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+                    with WorkbookWriter.from_config(output_path) as writer:
                         # 匯出 PO sheet
                         if po_result is not None and not po_result.empty:
-                            po_result.to_excel(
-                                writer,
-                                sheet_name='PO',
-                                index=self.include_index
-                            )
+                            writer.write_sheet('PO', po_result, index=self.include_index)
                             export_summary['po_exported'] = True
                             export_summary['po_rows'] = len(po_result)
                             self.logger.info(f"✓ Exported PO sheet: {len(po_result)} rows")
 
                         # 匯出 PR sheet
                         if pr_result is not None and not pr_result.empty:
-                            pr_result.to_excel(
-                                writer,
-                                sheet_name='PR',
-                                index=self.include_index
-                            )
+                            writer.write_sheet('PR', pr_result, index=self.include_index)
                             export_summary['pr_exported'] = True
                             export_summary['pr_rows'] = len(pr_result)
                             self.logger.info(f"✓ Exported PR sheet: {len(pr_result)} rows")
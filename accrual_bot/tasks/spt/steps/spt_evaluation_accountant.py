@@ -120,7 +120,7 @@ class SPTStatusLabelStep(PipelineStep):
         start_datetime = datetime.now()
 
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             input_count = len(df)
 
             self.logger.info("=" * 60)
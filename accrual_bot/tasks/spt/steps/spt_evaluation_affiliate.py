@@ -93,7 +93,7 @@ class CommissionDataUpdateStep(PipelineStep):
                     time.time() - start_time
                 )
             
-            df = context.data.copy()
+            df = context.get_data_copy()
             input_count = len(df)
             
             self.logger.info("=" * 60)
@@ -509,7 +509,7 @@ class PayrollDetectionStep(PipelineStep):
                     time.time() - start_time
                 )
             
-            df = context.data.copy()
+            df = context.get_data_copy()
             input_count = len(df)
             
             self.logger.info("=" * 60)
@@ -7,6 +7,7 @@ import numpy as np
 from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
 from accrual_bot.core.pipeline.context import ProcessingContext
 from accrual_bot.utils.config import config_manager
+from accrual_bot.utils.helpers.data_utils import get_erm_desc_fields
 from accrual_bot.core.pipeline.steps.common import StepMetadataBuilder
 
 
@@ -81,7 +82,7 @@ class SPTERMLogicStep(PipelineStep):
         """執行 ERM 邏輯"""
         start_time = time.time()
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             processing_date = context.metadata.processing_date
             
             # 獲取參考數據
@@ -181,8 +182,7 @@ class SPTERMLogicStep(PipelineStep):
         no_status = (df[status_column].isna()) | (df[status_column] == 'nan')
         
         # 日期範圍條件
-        ym_start = df['YMs of Item Description'].str[:6].astype('Int32')
-        ym_end = df['YMs of Item Description'].str[7:].astype('Int32')
+        ym_start, ym_end, format_error = get_erm_desc_fields(df)
         erm = df['Expected Received Month_轉換格式']
         
         in_date_range = erm.between(ym_start, ym_end, inclusive='both')
@@ -222,9 +222,8 @@ class SPTERMLogicStep(PipelineStep):
         procurement_not_error = df['Remarked by Procurement'] != 'error'
         out_of_date_range = (
             (in_date_range == False) & 
-            (df['YMs of Item Description'] != '100001,100002')
+            (~format_error)
         )
-        format_error = df['YMs of Item Description'] == '100001,100002'
         
         return ERMConditions(
             no_status=no_status,
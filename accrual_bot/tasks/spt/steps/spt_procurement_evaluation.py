@@ -12,6 +12,7 @@ from datetime import datetime
 from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
 from accrual_bot.core.pipeline.context import ProcessingContext
 from accrual_bot.utils.config import config_manager
+from accrual_bot.utils.helpers.data_utils import get_erm_desc_fields
 
 
 class SPTProcurementStatusEvaluationStep(PipelineStep):
@@ -54,7 +55,7 @@ class SPTProcurementStatusEvaluationStep(PipelineStep):
         start_datetime = datetime.now()
 
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             file_date = context.metadata.processing_date  # 結帳月份 YYYYMM
 
             self.logger.info(f"Evaluating procurement status with {len(self.conditions)} conditions...")
@@ -154,9 +155,10 @@ class SPTProcurementStatusEvaluationStep(PipelineStep):
             return {}
 
         try:
+            ym_start, ym_end, _ = get_erm_desc_fields(df)
             return {
-                'ym_start': df[ym_col].str[:6].astype('Int32'),
-                'ym_end': df[ym_col].str[7:].astype('Int32'),
+                'ym_start': ym_start,
+                'ym_end': ym_end,
                 'erm': df[erm_col],
             }
         except Exception as e:
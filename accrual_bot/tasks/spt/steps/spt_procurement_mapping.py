@@ -52,7 +52,7 @@ class ProcurementPreviousMappingStep(PipelineStep):
         start_datetime = datetime.now()
 
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             prev_df = context.get_auxiliary_data('procurement_previous')
 
             if prev_df is None or prev_df.empty:
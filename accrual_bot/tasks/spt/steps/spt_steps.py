@@ -39,7 +39,7 @@ class SPTStatusStep(PipelineStep):
         3. 跨月處理邏輯
         """
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             status_col = context.get_status_column()
             
             # 獲取處理日期
@@ -179,7 +179,7 @@ class SPTDepartmentStep(PipelineStep):
         4. 特殊部門映射
         """
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             
             # 初始化部門代碼
             df['Department_Code'] = df['Department'].astype(str).str[:3]
@@ -272,7 +272,7 @@ class SPTAccrualStep(PipelineStep):
         3. 跨月項目特殊處理
         """
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             status_col = context.get_status_column()
             
             # 初始化預估欄位
@@ -727,6 +727,9 @@ class SPTPostProcessingStep(BasePostProcessingStep):
             'YMs of Item Description',
             'expected_received_month_轉換格式', 
             'yms_of_item_description',
+            'erm_desc_start',
+            'erm_desc_end',
+            'erm_desc_format_error',
 
             'PR Product Code Check',
             'pr_product_code_check',
@@ -61,6 +61,9 @@ class SPXPipelineOrchestrator:
 
     def __init__(self):
         self.config = config_manager._config_toml.get('pipeline', {}).get('spx', {})
+        # sequential（預設）或 dag：依步驟讀寫宣告並行執行
+        self.execution_mode = self.config.get('execution_mode', 'sequential')
+        self.copy_on_write = self.config.get('copy_on_write', False)
         self.entity_type = 'SPX'
 
     def build_po_pipeline(
@@ -82,7 +85,9 @@ class SPXPipelineOrchestrator:
             name="SPX_PO_Processing",
             description="SPX PO data processing pipeline",
             entity_type=self.entity_type,
-            stop_on_error=True
+            stop_on_error=True,
+            execution_mode=self.execution_mode,
+            copy_on_write=self.copy_on_write
         )
 
         pipeline = Pipeline(pipeline_config)
@@ -135,7 +140,9 @@ class SPXPipelineOrchestrator:
             name="SPX_PR_Processing",
             description="SPX PR data processing pipeline",
             entity_type=self.entity_type,
-            stop_on_error=True
+            stop_on_error=True,
+            execution_mode=self.execution_mode,
+            copy_on_write=self.copy_on_write
         )
 
         pipeline = Pipeline(pipeline_config)
@@ -187,7 +194,9 @@ class SPXPipelineOrchestrator:
             name="SPX_PPE_Processing",
             description="SPX PPE contract depreciation period calculation",
             entity_type=self.entity_type,
-            stop_on_error=True
+            stop_on_error=True,
+            execution_mode=self.execution_mode,
+            copy_on_write=self.copy_on_write
         )
 
         pipeline = Pipeline(pipeline_config)
@@ -236,7 +245,9 @@ class SPXPipelineOrchestrator:
             name="SPX_PPE_DESC_Processing",
             description="SPX PO/PR description extraction with contract period mapping",
             entity_type=self.entity_type,
-            stop_on_error=True
+            stop_on_error=True,
+            execution_mode=self.execution_mode,
+            copy_on_write=self.copy_on_write
         )
 
         pipeline = Pipeline(pipeline_config)
@@ -12,6 +12,7 @@ import numpy as np
 from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
 from accrual_bot.core.pipeline.context import ProcessingContext
 from accrual_bot.utils.config import config_manager
+from accrual_bot.utils.helpers.data_utils import get_erm_desc_fields
 from accrual_bot.core.pipeline.steps.common import StepMetadataBuilder
 
 
@@ -35,6 +36,8 @@ class StatusStage1Step(PipelineStep):
     輸出: DataFrame with initial status
     """
 
+    chunkable = True
+
     def __init__(self, name: str = "StatusStage1", **kwargs):
         super().__init__(name, description="Evaluate status stage 1", **kwargs)
 
@@ -47,7 +50,7 @@ class StatusStage1Step(PipelineStep):
         start_time = time.time()
         
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             df_spx_closing = context.get_auxiliary_data('closing_list')
             processing_date = context.metadata.processing_date
             
@@ -566,6 +569,8 @@ class SPXERMLogicStep(PipelineStep):
     - DataFrame with PO/PR狀態, 是否估計入帳, and accounting fields
     """
 
+    chunkable = True
+
     def __init__(self, name: str = "SPX_ERM_Logic", **kwargs):
         super().__init__(
             name=name,
@@ -587,7 +592,7 @@ class SPXERMLogicStep(PipelineStep):
         """執行 ERM 邏輯"""
         start_time = time.time()
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             processing_date = context.metadata.processing_date
             
             # 獲取參考數據
@@ -687,8 +692,7 @@ class SPXERMLogicStep(PipelineStep):
         no_status = (df[status_column].isna()) | (df[status_column] == '') | (df[status_column] == 'nan')
         
         # 日期範圍條件
-        ym_start = df['YMs of Item Description'].str[:6].astype('Int32')
-        ym_end = df['YMs of Item Description'].str[7:].astype('Int32')
+        ym_start, ym_end, format_error = get_erm_desc_fields(df)
         erm = df['Expected Received Month_轉換格式']
         
         in_date_range = erm.between(ym_start, ym_end, inclusive='both')
@@ -728,9 +732,8 @@ class SPXERMLogicStep(PipelineStep):
         procurement_not_error = df['Remarked by Procurement'] != 'error'
         out_of_date_range = (
             (in_date_range == False) & 
-            (df['YMs of Item Description'] != '100001,100002')
+            (~format_error)
         )
-        format_error = df['YMs of Item Description'] == '100001,100002'
         
         return ERMConditions(
             no_status=no_status,
@@ -1098,7 +1101,7 @@ class PPEContractDateUpdateStep(PipelineStep):
         start_time = datetime.now()
         
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             
             # 更新合約日期
             df_updated = self._update_contract_dates(df)
@@ -1202,7 +1205,7 @@ class PPEMonthDifferenceStep(PipelineStep):
         start_time = datetime.now()
         
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             
             # 獲取當前月份
             current_month = (self.current_month or 
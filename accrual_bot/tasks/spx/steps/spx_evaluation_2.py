@@ -77,7 +77,7 @@ class DepositStatusUpdateStep(PipelineStep):
         start_datetime = datetime.now()
         
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             input_count = len(df)
             processing_date = context.metadata.processing_date
             current_month = processing_date  # YYYYMM 格式
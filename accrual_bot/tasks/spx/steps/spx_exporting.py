@@ -13,7 +13,8 @@ from accrual_bot.core.pipeline.steps.common import (
 )
 from accrual_bot.core.datasources import (
     DataSourceFactory,
-    DataSourcePool
+    DataSourcePool,
+    WorkbookWriter
 )
 
 
@@ -27,6 +28,9 @@ class SPXExportStep(PipelineStep):
     輸出: Excel file path
     """
     
+    # 與主數據一起輸出的輔助數據（含 index）
+    AUXILIARY_SHEETS = ('locker_non_discount', 'locker_discount', 'kiosk_data')
+    
     def __init__(self, 
                  name: str = "SPXExport",
                  output_dir: str = "output",
@@ -38,10 +42,13 @@ class SPXExportStep(PipelineStep):
         """執行導出"""
         start_time = time.time()
         try:
-            df = context.data.copy()
+            # '<NA>' 值由 WorkbookWriter 寫出時視為空白，不需先複製整份數據
+            df_export = context.data
             
-            # 清理 <NA> 值
-            df_export = df.replace('<NA>', pd.NA)
+            auxiliary = {name: context.get_auxiliary_data(name) for name in self.AUXILIARY_SHEETS}
+            missing = [name for name, aux_df in auxiliary.items() if aux_df is None]
+            if missing:
+                raise ValueError(f"Missing auxiliary data for export: {', '.join(missing)}")
             
             # 生成文件名
             processing_date = context.metadata.processing_date
@@ -64,15 +71,10 @@ class SPXExportStep(PipelineStep):
                 counter += 1
             
             # 導出 Excel
-            # df_export.to_excel(output_path, index=False)
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                df_export.to_excel(writer, sheet_name='PO', index=False)
-                context.get_auxiliary_data('locker_non_discount').to_excel(writer, 
-                                                                           sheet_name='locker_non_discount')
-                context.get_auxiliary_data('locker_discount').to_excel(writer, 
-                                                                       sheet_name='locker_discount')
-                context.get_auxiliary_data('kiosk_data').to_excel(writer, 
-                                                                  sheet_name='kiosk_data')
+            with WorkbookWriter.from_config(output_path) as writer:
+                writer.write_sheet('PO', df_export)
+                for sheet_name, aux_df in auxiliary.items():
+                    writer.write_sheet(sheet_name, aux_df, index=True)
             
             self.logger.info(f"Data exported to: {output_path}")
             duration = time.time() - start_time
@@ -85,7 +87,8 @@ class SPXExportStep(PipelineStep):
                 metadata={
                     'output_path': output_path,
                     'rows_exported': len(df_export),
-                    'columns_exported': len(df_export.columns)
+                    'columns_exported': len(df_export.columns),
+                    'sidecar_paths': [str(p) for p in writer.sidecar_paths]
                 }
             )
             
@@ -120,7 +123,7 @@ class AccountingOPSExportingStep(PipelineStep):
        - accounting_workpaper: 會計前期底稿
        - ops_validation: OPS 驗收檔案底稿
        - validation_comparison: 比對結果
-    2. 使用 datasources 模組的 ExcelSource 統一寫入
+    2. 使用 datasources 模組的 WorkbookWriter 統一寫入
     3. 輸出到單一 Excel 檔案的多個 sheet
     4. 自動生成檔案名稱（含時間戳），避免覆蓋
     5. 提供詳細的執行 metadata
@@ -309,7 +312,7 @@ class AccountingOPSExportingStep(PipelineStep):
                 else:
                     self.logger.warning(f"Optional data not found: {data_name}")
             else:
-                data_dict[data_name] = df.copy()
+                data_dict[data_name] = df
                 self.logger.info(f"Retrieved {data_name}: {df.shape}")
         
         if missing_data:
@@ -368,7 +371,7 @@ class AccountingOPSExportingStep(PipelineStep):
         data_dict: Dict[str, pd.DataFrame]
     ) -> List[str]:
         """
-        使用 pd.ExcelWriter 寫入 Excel（多 sheet）
+        使用 WorkbookWriter 逐列寫入 Excel（多 sheet 一次完成）
         
         Args:
             output_path: 輸出檔案路徑
@@ -380,57 +383,19 @@ class AccountingOPSExportingStep(PipelineStep):
         sheets_written = []
         
         try:
-            # 使用 pd.ExcelWriter 確保多 sheet 寫入的正確性
-            # 這裡暫時不使用 datasources，因為 ExcelSource 的 write() 
-            # 方法在多 sheet 寫入時可能不夠靈活
-            
-            # 方案 1: 直接使用 pd.ExcelWriter（推薦，更可靠）
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+            # '<NA>' 值由 WorkbookWriter 寫出時視為空白，不需逐 sheet replace 複製
+            with WorkbookWriter.from_config(output_path) as writer:
                 for data_name, df in data_dict.items():
                     sheet_name = self.sheet_names.get(data_name, data_name)
                     
-                    # 清理 <NA> 值
-                    df_export = df.replace('<NA>', pd.NA)
-                    
-                    # 寫入 sheet
-                    df_export.to_excel(
-                        writer,
-                        sheet_name=sheet_name,
-                        index=self.include_index
-                    )
+                    writer.write_sheet(sheet_name, df, index=self.include_index)
                     
                     sheets_written.append(sheet_name)
                     self.logger.info(
-                        f"Wrote sheet '{sheet_name}': {len(df_export)} rows, "
-                        f"{len(df_export.columns)} columns"
+                        f"Wrote sheet '{sheet_name}': {len(df)} rows, "
+                        f"{len(df.columns)} columns"
                     )
             
-            # 方案 2: 使用 datasources（如果需要）
-            # 注意：需要依序寫入多個 sheet
-            # source = DataSourceFactory.create_from_file(
-            #     str(output_path),
-            #     engine='openpyxl'
-            # )
-            # self.pool.add_source('output_excel', source)
-            # 
-            # for i, (data_name, df) in enumerate(data_dict.items()):
-            #     sheet_name = self.sheet_names.get(data_name, data_name)
-            #     df_export = df.replace('<NA>', pd.NA)
-            #     
-            #     # 第一個 sheet 使用覆寫模式，後續使用追加模式
-            #     mode = 'w' if i == 0 else 'a'
-            #     
-            #     success = await source.write(
-            #         df_export,
-            #         sheet_name=sheet_name,
-            #         index=self.include_index,
-            #         mode=mode,
-            #         if_sheet_exists='replace'
-            #     )
-            #     
-            #     if success:
-            #         sheets_written.append(sheet_name)
-            
             return sheets_written
             
         except Exception as e:
@@ -575,22 +540,19 @@ class SPXPRExportStep(PipelineStep):
             self.logger.info(f"📤 開始導出 {entity_type} {processing_type} 處理結果")
             self.logger.info("=" * 70)
             
-            # 階段 1: 獲取數據
-            df = context.data.copy()
+            # 階段 1: 獲取數據（寫出不修改數據，直接使用 context.data）
+            df_export = context.data
             
-            if df.empty:
+            if df_export is None or df_export.empty:
                 raise ValueError("主數據為空，無法導出")
             
-            # 階段 2: 清理數據
-            df_export = self._clean_data(df)
-            
-            # 階段 3: 生成輸出路徑
+            # 階段 2: 生成輸出路徑
             output_path = self._generate_output_path(context)
             
-            # 階段 4: 確保輸出目錄存在
+            # 階段 3: 確保輸出目錄存在
             self._ensure_output_directory()
             
-            # 階段 5: 寫入 Excel
+            # 階段 4: 寫入 Excel
             self._write_to_excel(output_path, df_export)
             
             # 計算執行時間
@@ -650,30 +612,6 @@ class SPXPRExportStep(PipelineStep):
                 metadata=error_metadata
             )
     
-    def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """
-        清理數據，準備導出
-        
-        清理操作：
-        1. 替換 <NA> 為 pandas NA
-        2. 移除完全空白的行（可選）
-        
-        Args:
-            df: 原始數據
-            
-        Returns:
-            pd.DataFrame: 清理後的數據
-        """
-        self.logger.debug("清理導出數據...")
-        
-        # 替換 <NA> 值
-        df_clean = df.replace('<NA>', pd.NA)
-        
-        # 記錄清理結果
-        self.logger.debug(f"  ✓ 數據清理完成：{len(df_clean)} 行")
-        
-        return df_clean
-    
     def _generate_output_path(self, context: ProcessingContext) -> Path:
         """
         生成輸出檔案路徑
@@ -724,7 +662,7 @@ class SPXPRExportStep(PipelineStep):
         """
         寫入 Excel 檔案
         
-        使用 pd.ExcelWriter 確保數據正確寫入
+        使用 WorkbookWriter 逐列寫入；'<NA>' 值寫出時視為空白
         
         Args:
             output_path: 輸出檔案路徑
@@ -733,12 +671,8 @@ class SPXPRExportStep(PipelineStep):
         self.logger.debug(f"寫入 Excel：{output_path}")
         
         try:
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                df.to_excel(
-                    writer,
-                    sheet_name=self.sheet_name,
-                    index=self.include_index
-                )
+            with WorkbookWriter.from_config(output_path) as writer:
+                writer.write_sheet(self.sheet_name, df, index=self.include_index)
             
             self.logger.debug(
                 f"  ✓ 成功寫入 sheet '{self.sheet_name}'："
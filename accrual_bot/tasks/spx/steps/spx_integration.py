@@ -18,6 +18,12 @@ from accrual_bot.core.pipeline.steps.common import (
     StepMetadataBuilder, 
     create_error_metadata
 )
+from accrual_bot.core.pipeline.engines.sql_join_engine import (
+    MISSING_POSITION,
+    get_sql_join_engine,
+    is_sql_join_enabled,
+    take_by_position
+)
 from accrual_bot import GoogleSheetsImporter
 from accrual_bot.utils.helpers.data_utils import (classify_description, 
                                                   give_account_by_keyword,
@@ -36,6 +42,11 @@ class ColumnAdditionStep(PipelineStep):
     輸出: DataFrame with additional columns
     """
     
+    reads = ('data',)
+    writes = ('data', 'var:processing_month')
+
+    chunkable = True
+    
     def __init__(self, name: str = "ColumnAddition", **kwargs):
         super().__init__(name, description="Add SPX-specific columns", **kwargs)
     
@@ -45,7 +56,7 @@ class ColumnAdditionStep(PipelineStep):
         start_datetime = datetime.now()
 
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             input_count = len(df)
             m = context.metadata.processing_date % 100
             
@@ -273,15 +284,21 @@ class APInvoiceIntegrationStep(PipelineStep):
     輸出: DataFrame with GL DATE column
     """
     
+    reads = ('data', 'aux:ap_invoice')
+    writes = ('data',)
+
+    chunkable = True
+    
     def __init__(self, name: str = "APInvoiceIntegration", **kwargs):
         super().__init__(name, description="Integrate AP Invoice GL DATE", **kwargs)
+        self.sql_join = is_sql_join_enabled('ap_invoice')
     
     async def execute(self, context: ProcessingContext) -> StepResult:
         """執行 AP Invoice 整合"""
         start_time = time.time()
         start_datetime = datetime.now()
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             input_count = len(df)
             df_ap = context.get_auxiliary_data('ap_invoice')
             yyyymm = context.metadata.processing_date
@@ -317,24 +334,27 @@ class APInvoiceIntegrationStep(PipelineStep):
             
             df_ap['match_type'] = df_ap['Match Type'].fillna('system_filled')
             
-            # 只保留期間在 yyyymm 之前的 AP 發票
-            df_ap = (
-                df_ap.loc[df_ap['period'] <= yyyymm, :]
-                .sort_values(by=['po_line', 'period'])
-                .drop_duplicates(subset='po_line', keep='last')
-                .reset_index(drop=True)
-            )
-            
-            # 合併到主 DataFrame
-            df = df.merge(
-                df_ap[['po_line', 'period', 'match_type']], 
-                left_on='PO Line', 
-                right_on='po_line', 
-                how='left'
-            )
-            
-            df['GL DATE'] = df['period']
-            df.drop(columns=['po_line', 'period'], inplace=True)
+            if self.sql_join:
+                df = self._merge_latest_period_sql(df, df_ap, yyyymm)
+            else:
+                # 只保留期間在 yyyymm 之前的 AP 發票
+                df_ap = (
+                    df_ap.loc[df_ap['period'] <= yyyymm, :]
+                    .sort_values(by=['po_line', 'period'])
+                    .drop_duplicates(subset='po_line', keep='last')
+                    .reset_index(drop=True)
+                )
+                
+                # 合併到主 DataFrame
+                df = df.merge(
+                    df_ap[['po_line', 'period', 'match_type']], 
+                    left_on='PO Line', 
+                    right_on='po_line', 
+                    how='left'
+                )
+                
+                df['GL DATE'] = df['period']
+                df.drop(columns=['po_line', 'period'], inplace=True)
             
             context.update_data(df)
             
@@ -351,6 +371,7 @@ class APInvoiceIntegrationStep(PipelineStep):
                         .set_time_info(start_datetime, end_datetime)
                         .add_custom('matched_records', int(matched_count))
                         .add_custom('total_records', len(df))
+                        .add_custom('sql_join', self.sql_join)
                         .build())
             
             return StepResult(
@@ -372,6 +393,23 @@ class APInvoiceIntegrationStep(PipelineStep):
                 message=str(e)
             )
     
+    @staticmethod
+    def _merge_latest_period_sql(df: pd.DataFrame, df_ap: pd.DataFrame, yyyymm: int) -> pd.DataFrame:
+        """
+        SQL 模式：以 DuckDB 取各 po_line 在 yyyymm 之前最新期間的 AP 發票
+
+        語意同排序去重後 left merge（同期間取最後一筆），
+        結果欄位 match_type / GL DATE 依來源列位置取值。
+        """
+        eligible = df_ap.loc[df_ap['period'] <= yyyymm].reset_index(drop=True)
+        df = df.reset_index(drop=True)
+        positions = get_sql_join_engine().latest_per_key(
+            df['PO Line'], eligible['po_line'], eligible['period']
+        )
+        df['match_type'] = take_by_position(eligible['match_type'], positions, df.index)
+        df['GL DATE'] = take_by_position(eligible['period'], positions, df.index)
+        return df
+
     async def validate_input(self, context: ProcessingContext) -> bool:
         """驗證輸入"""
         if context.data is None or context.data.empty:
@@ -401,6 +439,9 @@ class ClosingListIntegrationStep(PipelineStep):
     參考: async_data_importer.import_spx_closing_list()
     """
     
+    reads = ()
+    writes = ('aux:closing_list',)
+    
     def __init__(self, name: str = "ClosingListIntegration", **kwargs):
         super().__init__(name, description="Integrate closing list from Google Sheets", **kwargs)
         self.sheets_importer = None
@@ -409,9 +450,7 @@ class ClosingListIntegrationStep(PipelineStep):
         """執行關單清單整合"""
         start_time = time.time()
         try:
-            df = context.data.copy()
-            processing_date = context.metadata.processing_date
-            
+            # 只產生 closing_list 輔助數據，不修改主數據（DAG 模式下可與其他步驟並行）
             self.logger.info("Getting SPX closing list from Google Sheets...")
             
             # 準備配置
@@ -427,13 +466,12 @@ class ClosingListIntegrationStep(PipelineStep):
                 context.add_auxiliary_data('closing_list', df_spx_closing)
                 self.logger.info(f"Loaded {len(df_spx_closing)} closing records")
             
-            context.update_data(df)
             duration = time.time() - start_time
             
             return StepResult(
                 step_name=self.name,
                 status=StepStatus.SUCCESS,
-                data=df,
+                data=context.data,
                 message=f"Closing list integrated: {len(df_spx_closing) if df_spx_closing is not None else 0} records",
                 duration=duration,
                 metadata={
@@ -564,6 +602,39 @@ class ClosingListIntegrationStep(PipelineStep):
         return True
     
 
+# 櫃體種類的正則表達式模式
+# A~K類櫃體，後面非英文字母數字組合，但允許中文字符； whatever + locker ${type} + nonEng/digit
+#  e.g. 2025/12 SVP_SPX 門市智取櫃工程SPX locker XA 第二期款項 #SP-C-Leasehold； 後面是空白非英數->caught
+#       2025/12 SVP_SPX 門市智取櫃工程SPX locker XA第一期款項 #SP-C-Leasehold； 後面是中文非英數->caught
+LOCKER_TYPE_PATTERNS = {
+    'A': r'locker\s*A(?![A-Za-z0-9])',
+    'B': r'locker\s*B(?![A-Za-z0-9])',
+    'C': r'locker\s*C(?![A-Za-z0-9])',
+    'D': r'locker\s*D(?![A-Za-z0-9])',
+    'E': r'locker\s*E(?![A-Za-z0-9])',
+    'F': r'locker\s*F(?![A-Za-z0-9])',
+    'G': r'locker\s*G(?![A-Za-z0-9])',
+    'H': r'locker\s*H(?![A-Za-z0-9])',
+    'I': r'locker\s*I(?![A-Za-z0-9])',
+    'J': r'locker\s*J(?![A-Za-z0-9])',
+    'K': r'locker\s*K(?![A-Za-z0-9])',
+    'DA': r'locker\s*控制主[櫃|機]',
+    '控制系統': r'locker\s*控制系統',
+    'XA': r'locker\s*XA(?![A-Za-z0-9])',
+    'XB': r'locker\s*XB(?![A-Za-z0-9])',
+    'XC': r'locker\s*XC(?![A-Za-z0-9])',
+    'XD': r'locker\s*XD(?![A-Za-z0-9])',
+    'XE': r'locker\s*XE(?![A-Za-z0-9])',
+    'XF': r'locker\s*XF(?![A-Za-z0-9])',
+    'XA30': r'locker\s*XA30(?![A-Za-z0-9])',
+    'XC30': r'locker\s*XC30(?![A-Za-z0-9])',
+    'XG': r'locker\s*XG(?![A-Za-z0-9])',
+    '裝運費': r'locker\s*安裝運費',
+    '超出櫃體安裝費': r'locker\s*超出櫃體安裝費',
+    '超出櫃體運費': r'locker\s*超出櫃體運費'
+}
+
+
 class ValidationDataProcessingStep(PipelineStep):
     """
     驗收數據處理步驟
@@ -588,7 +659,7 @@ class ValidationDataProcessingStep(PipelineStep):
         """執行驗收數據處理"""
         start_time = time.time()
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             processing_date = context.metadata.processing_date
             
             # 從 context 獲取驗收文件路徑
@@ -938,7 +1009,7 @@ class ValidationDataProcessingStep(PipelineStep):
             self.logger.info(f"從 '{target_str}' 成功提取折扣率: {rate}")
             return rate
 
-        self.logger.debug(f"在 '{target_str}' 中未找到符合 'N折' 格式的內容。")
+        self.logger.debug("在 '%s' 中未找到符合 'N折' 格式的內容。", target_str)
         return None
     
     def _apply_validation_data(self, df: pd.DataFrame, locker_non_discount: Dict, 
@@ -990,7 +1061,12 @@ class ValidationDataProcessingStep(PipelineStep):
                                  locker_suppliers: List[str], discount_rate: float = None,
                                  is_discount: bool = False) -> pd.DataFrame:
         """
-        應用智取櫃驗收數據
+        應用智取櫃驗收數據（向量化）
+
+        1. 以 isin 篩選候選列（PO#、供應商、Item Description 關鍵字）
+        2. 以單一組合正則（依 locker_priority_order）str.extract 櫃體種類
+        3. 驗收數據攤平為 (PO#, cabinet_type) 長表後 merge 回寫
+
         Args:
             df: PO DataFrame
             locker_data: 智取櫃驗收數據 {PO#: {A:value, B:value, ...}}
@@ -1003,116 +1079,119 @@ class ValidationDataProcessingStep(PipelineStep):
         """
         if not locker_data:
             return df
-        
-        # 定義櫃體種類的正則表達式模式
-        patterns = {
-            # A~K類櫃體，後面非英文字母數字組合，但允許中文字符； whatever + locker ${type} + nonEng/digit
-            #  e.g. 2025/12 SVP_SPX 門市智取櫃工程SPX locker XA 第二期款項 #SP-C-Leasehold； 後面是空白非英數->caught
-            #       2025/12 SVP_SPX 門市智取櫃工程SPX locker XA第一期款項 #SP-C-Leasehold； 後面是中文非英數->caught
-            'A': r'locker\s*A(?![A-Za-z0-9])',
-            'B': r'locker\s*B(?![A-Za-z0-9])',
-            'C': r'locker\s*C(?![A-Za-z0-9])',
-            'D': r'locker\s*D(?![A-Za-z0-9])',
-            'E': r'locker\s*E(?![A-Za-z0-9])',
-            'F': r'locker\s*F(?![A-Za-z0-9])',
-            'G': r'locker\s*G(?![A-Za-z0-9])',
-            'H': r'locker\s*H(?![A-Za-z0-9])',
-            'I': r'locker\s*I(?![A-Za-z0-9])',
-            'J': r'locker\s*J(?![A-Za-z0-9])',
-            'K': r'locker\s*K(?![A-Za-z0-9])',
-            'DA': r'locker\s*控制主[櫃|機]',
-            '控制系統': r'locker\s*控制系統',
-            'XA': r'locker\s*XA(?![A-Za-z0-9])',
-            'XB': r'locker\s*XB(?![A-Za-z0-9])',
-            'XC': r'locker\s*XC(?![A-Za-z0-9])',
-            'XD': r'locker\s*XD(?![A-Za-z0-9])',
-            'XE': r'locker\s*XE(?![A-Za-z0-9])',
-            'XF': r'locker\s*XF(?![A-Za-z0-9])',
-            'XA30': r'locker\s*XA30(?![A-Za-z0-9])',
-            'XC30': r'locker\s*XC30(?![A-Za-z0-9])',
-            'XG': r'locker\s*XG(?![A-Za-z0-9])',
-            '裝運費': r'locker\s*安裝運費',
-            '超出櫃體安裝費': r'locker\s*超出櫃體安裝費',
-            '超出櫃體運費': r'locker\s*超出櫃體運費'
-        }
-        
-        # 遍歷DataFrame
-        for idx, row in df.iterrows():
-            try:
-                po_number = row.get('PO#')
-                item_desc = str(row.get('Item Description', ''))
-                po_supplier = str(row.get('PO Supplier', ''))
-                
-                # 檢查條件; 不符合的資料該圈將被跳過
-                # 檢查PO#是否在字典keys中
-                if po_number not in locker_data:
-                    continue
-                # 檢查Item Description是否包含"門市智取櫃"
-                if '門市智取櫃' not in item_desc:
-                    continue
-                # 對於非折扣驗收，檢查是否不包含"減價"
-                if not is_discount and '減價' in item_desc:
-                    continue
-                # 檢查PO Supplier是否在配置的suppliers中
-                if locker_suppliers and po_supplier not in locker_suppliers:
-                    continue
-                
-                # 提取櫃體種類
-                cabinet_type = None
-                priority_order = config_manager._config_toml.get('spx').get('locker_priority_order')
-                
-                for ctype in priority_order:
-                    if ctype in patterns:
-                        if re.search(patterns[ctype], item_desc, re.IGNORECASE):
-                            cabinet_type = ctype
-                            break
-                
-                if cabinet_type and cabinet_type in locker_data[po_number]:
-                    current_value = df.at[idx, '本期驗收數量/金額']
-                    if current_value == 0:  # 只有當前值為0時才設置新值
-                        validation_value = locker_data[po_number][cabinet_type]
-                        df.at[idx, '本期驗收數量/金額'] = validation_value
-                        
-                        # 如果是折扣驗收，記錄折扣率
-                        if is_discount and discount_rate:
-                            df.at[idx, '折扣率'] = discount_rate
-                
-            except Exception as e:
-                self.logger.debug(f"Error processing locker validation for row {idx}: {str(e)}")
-                continue
-        
+
+        item_desc = self._column_as_str(df, 'Item Description')
+        candidate = (
+            df['PO#'].isin(list(locker_data.keys()))
+            & item_desc.str.contains('門市智取櫃', regex=False)
+        )
+        # 對於非折扣驗收，排除包含"減價"的品項
+        if not is_discount:
+            candidate &= ~item_desc.str.contains('減價', regex=False)
+        if locker_suppliers:
+            candidate &= self._column_as_str(df, 'PO Supplier').isin(locker_suppliers)
+        # 只有當前值為0時才設置新值
+        candidate &= df['本期驗收數量/金額'] == 0
+
+        if not candidate.any():
+            return df
+
+        # 提取櫃體種類
+        priority_order = config_manager._config_toml.get('spx').get('locker_priority_order')
+        cabinet_type = self._extract_cabinet_type(item_desc[candidate], priority_order)
+
+        # 以列位置回寫，不依賴 index 名稱或唯一性
+        matched = pd.DataFrame({
+            'row_pos': np.flatnonzero(candidate.to_numpy()),
+            'PO#': df.loc[candidate, 'PO#'].to_numpy(),
+            'cabinet_type': cabinet_type.to_numpy(),
+        }).dropna(subset=['cabinet_type'])
+        if matched.empty:
+            return df
+
+        # 驗收數據攤平為長表: (PO#, cabinet_type, validation_value)
+        validation_long = (
+            pd.DataFrame.from_dict(locker_data, orient='index')
+            .rename_axis('PO#')
+            .reset_index()
+            .melt(id_vars='PO#', var_name='cabinet_type', value_name='validation_value')
+            # from_dict 會補齊缺少的 (PO#, 櫃體) 組合為 NaN，只保留實際有驗收數據的組合
+            .dropna(subset=['validation_value'])
+        )
+        matched = matched.merge(validation_long, on=['PO#', 'cabinet_type'], how='inner')
+        if matched.empty:
+            return df
+
+        row_pos = matched['row_pos'].to_numpy()
+        df.iloc[row_pos, df.columns.get_loc('本期驗收數量/金額')] = matched['validation_value'].to_numpy()
+
+        # 如果是折扣驗收，記錄折扣率
+        if is_discount and discount_rate:
+            if '折扣率' not in df.columns:
+                df['折扣率'] = np.nan
+            df.iloc[row_pos, df.columns.get_loc('折扣率')] = discount_rate
+
+        self.logger.debug(
+            "Locker validation (%s) applied to %d rows",
+            'discount' if is_discount else 'non-discount', len(matched)
+        )
         return df
     
     def _apply_kiosk_validation(self, df: pd.DataFrame, kiosk_data: Dict, 
                                 kiosk_suppliers: List[str]) -> pd.DataFrame:
-        """應用繳費機驗收數據"""
+        """應用繳費機驗收數據（向量化）"""
         if not kiosk_data:
             return df
-        
-        for idx, row in df.iterrows():
-            try:
-                po_number = row.get('PO#')
-                item_desc = str(row.get('Item Description', ''))
-                po_supplier = str(row.get('PO Supplier', ''))
-                
-                # 檢查條件
-                if po_number not in kiosk_data:
-                    continue
-                if '門市繳費機' not in item_desc:
-                    continue
-                if kiosk_suppliers and po_supplier not in kiosk_suppliers:
-                    continue
-                
-                current_value = df.at[idx, '本期驗收數量/金額']
-                if current_value == 0:
-                    validation_value = kiosk_data[po_number]
-                    df.at[idx, '本期驗收數量/金額'] = validation_value
-                
-            except Exception as e:
-                self.logger.debug(f"Error processing kiosk validation for row {idx}: {str(e)}")
-                continue
-        
+
+        candidate = (
+            df['PO#'].isin(list(kiosk_data.keys()))
+            & self._column_as_str(df, 'Item Description').str.contains('門市繳費機', regex=False)
+            & (df['本期驗收數量/金額'] == 0)
+        )
+        if kiosk_suppliers:
+            candidate &= self._column_as_str(df, 'PO Supplier').isin(kiosk_suppliers)
+
+        if candidate.any():
+            df.loc[candidate, '本期驗收數量/金額'] = df.loc[candidate, 'PO#'].map(kiosk_data)
+
         return df
+
+    @staticmethod
+    def _column_as_str(df: pd.DataFrame, column: str) -> pd.Series:
+        """取得欄位的字串形式；欄位不存在時回傳空字串"""
+        if column not in df.columns:
+            return pd.Series('', index=df.index, dtype='object')
+        return df[column].astype(str)
+
+    @staticmethod
+    def _extract_cabinet_type(item_desc: pd.Series, priority_order: List[str]) -> pd.Series:
+        """
+        以單一組合正則提取櫃體種類
+
+        每個櫃體種類包成一個 lookahead 分支並依 priority_order 排列，
+        regex 於字串開頭依序嘗試分支，因此第一個命中的分支即為優先序最高者
+        （與逐一 re.search 的結果一致，而非字串中最先出現的種類）。
+
+        Args:
+            item_desc: Item Description
+            priority_order: 櫃體種類優先順序
+
+        Returns:
+            pd.Series: 櫃體種類，未命中為 NA
+        """
+        types = [t for t in priority_order if t in LOCKER_TYPE_PATTERNS]
+        if not types or item_desc.empty:
+            return pd.Series(pd.NA, index=item_desc.index, dtype='object')
+
+        combined = '^(?:' + '|'.join(
+            f'(?=.*?({LOCKER_TYPE_PATTERNS[t]}))' for t in types
+        ) + ')'
+        extracted = item_desc.str.extract(combined, flags=re.IGNORECASE | re.DOTALL)
+        extracted.columns = types
+
+        hit = extracted.notna()
+        cabinet_type = hit.idxmax(axis=1).where(hit.any(axis=1))
+        return cabinet_type
     
     def _modify_relevant_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """修改相關欄位"""
@@ -1231,7 +1310,7 @@ class DataReformattingStep(PipelineStep):
         """執行數據格式化"""
         start_time = time.time()
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             
             self.logger.info("Reformatting data...")
             
@@ -1353,6 +1432,7 @@ class DataReformattingStep(PipelineStep):
         """移除臨時計算列"""
         temp_columns = ['檔案日期', 'Expected Received Month_轉換格式', 'YMs of Item Description',
                         'expected_received_month_轉換格式', 'yms_of_item_description',
+                        'erm_desc_start', 'erm_desc_end', 'erm_desc_format_error',
                         'PR Product Code Check', 'pr_product_code_check',
                         ]
         
@@ -1558,7 +1638,7 @@ class PRDataReformattingStep(DataReformattingStep):
         """執行數據格式化"""
         start_time = time.time()
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             
             self.logger.info("Reformatting data...")
             
@@ -1714,6 +1794,7 @@ class PRDataReformattingStep(DataReformattingStep):
         """移除臨時計算列"""
         temp_columns = ['檔案日期', 'Expected Received Month_轉換格式', 'YMs of Item Description',
                         'expected_received_month_轉換格式', 'yms_of_item_description',
+                        'erm_desc_start', 'erm_desc_end', 'erm_desc_format_error',
                         'remarked_by_procurement_pr', 'noted_by_procurement_pr', 'remarked_by_上月_fn_pr',
                         'PR Product Code Check', 'pr_product_code_check',
                         ]
@@ -1918,6 +1999,7 @@ class PPEDataMergeStep(PipelineStep):
                  **kwargs):
         super().__init__(name, description="Merge PPE contract data", **kwargs)
         self.merge_keys = merge_keys or ['address']
+        self.sql_join = is_sql_join_enabled('ppe_merge')
     
     async def execute(self, context: ProcessingContext) -> StepResult:
         """執行數據合併"""
@@ -1928,13 +2010,16 @@ class PPEDataMergeStep(PipelineStep):
             df_renewal = context.get_auxiliary_data('renewal_list_clean')
             
             # 合併數據
-            df_merged = pd.merge(
-                df_filing,
-                df_renewal,
-                on=self.merge_keys,
-                how='outer',
-                suffixes=('_filing', '_renewal')
-            )
+            if self.sql_join:
+                df_merged = self._outer_merge_sql(df_filing, df_renewal)
+            else:
+                df_merged = pd.merge(
+                    df_filing,
+                    df_renewal,
+                    on=self.merge_keys,
+                    how='outer',
+                    suffixes=('_filing', '_renewal')
+                )
             
             # 移除重複
             df_merged = df_merged.drop_duplicates().reset_index(drop=True)
@@ -1947,6 +2032,7 @@ class PPEDataMergeStep(PipelineStep):
                         .set_row_counts(len(df_filing), len(df_merged))
                         .set_time_info(start_time, datetime.now())
                         .add_custom('merge_keys', self.merge_keys)
+                        .add_custom('sql_join', self.sql_join)
                         .build())
             
             return StepResult(
@@ -1967,6 +2053,31 @@ class PPEDataMergeStep(PipelineStep):
                 message=str(e)
             )
         
+    def _outer_merge_sql(self, df_filing: pd.DataFrame, df_renewal: pd.DataFrame) -> pd.DataFrame:
+        """
+        SQL 模式：以 DuckDB full outer join 取得左右列位置後組合結果
+
+        欄位順序、鍵值排序與重名欄位後綴同 pd.merge(how='outer')。
+        """
+        left_pos, right_pos = get_sql_join_engine().full_outer_positions(
+            df_filing, df_renewal, self.merge_keys
+        )
+        # 位置 -1 不在 RangeIndex 中，reindex 後即為缺值列
+        left = df_filing.reset_index(drop=True).reindex(left_pos)
+        right = df_renewal.reset_index(drop=True).reindex(right_pos)
+        left.index = right.index = pd.RangeIndex(len(left_pos))
+
+        right_only = left_pos == MISSING_POSITION
+        for key in self.merge_keys:
+            left[key] = left[key].mask(right_only, right[key])
+
+        overlap = set(left.columns).intersection(right.columns).difference(self.merge_keys)
+        left = left.rename(columns={col: f'{col}_filing' for col in overlap})
+        right = right.drop(columns=self.merge_keys).rename(
+            columns={col: f'{col}_renewal' for col in overlap}
+        )
+        return pd.concat([left, right], axis=1)
+
     async def validate_input(self, context: ProcessingContext) -> bool:
         """驗證輸入"""
         if context.data is None or context.data.empty:
@@ -11,12 +11,14 @@ from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
 from accrual_bot.core.pipeline.context import ProcessingContext
 from accrual_bot.core.datasources import (
     DataSourceFactory, 
-    DataSourcePool
+    DataSourcePool,
+    get_shared_frame_cache
 )
 from accrual_bot.core.pipeline.steps.common import (
     StepMetadataBuilder, 
     create_error_metadata
 )
+from accrual_bot.core.pipeline.steps.base_loading import apply_dtype_compaction
 from accrual_bot.utils.config import config_manager
 from accrual_bot.utils.helpers import get_ref_on_colab
 from accrual_bot.data.importers.google_sheets_importer import GoogleSheetsImporter
@@ -119,6 +121,7 @@ class SPXDataLoadingStep(PipelineStep):
                 raise ValueError("Failed to load raw PO data")
             
             df = self._extract_raw_po_data(loaded_data['raw_po'])
+            df, compaction_stats = apply_dtype_compaction(df, self.logger)
 
             # 從 metadata 取得處理日期（單一來源：UI 使用者選擇 / CLI run_config.toml）
             date = context.metadata.processing_date
@@ -177,6 +180,8 @@ class SPXDataLoadingStep(PipelineStep):
                         .add_custom('loaded_files', list(loaded_data.keys()))
                         .add_custom('files_loaded_count', len(loaded_data))
                         .build())
+            if compaction_stats:
+                metadata['dtype_compaction'] = compaction_stats
             
             return StepResult(
                 step_name=self.name,
@@ -393,7 +398,8 @@ class SPXDataLoadingStep(PipelineStep):
             # 載入科目映射/負債科目映射 (SPT 的參考數據)
             if Path(ref_data_path).exists():
                 source = DataSourceFactory.create_from_file(str(ref_data_path))
-                ref_ac = await source.read(dtype=str)
+                source.attach_cache(get_shared_frame_cache())
+                ref_ac = await source.read_with_cache(dtype=str)
                 context.add_auxiliary_data('reference_account', ref_ac.iloc[:, 1:3].copy())
                 context.add_auxiliary_data('reference_liability', ref_ac.loc[:, ['Account', 'Liability']].copy())
                 await source.close()
@@ -1366,6 +1372,7 @@ class SPXPRDataLoadingStep(PipelineStep):
                 raise ValueError("Failed to load raw PR data")
             
             df = self._extract_raw_pr_data(loaded_data['raw_pr'])
+            df, compaction_stats = apply_dtype_compaction(df, self.logger)
 
             # 從 metadata 取得處理日期（單一來源：UI 使用者選擇 / CLI run_config.toml）
             date = context.metadata.processing_date
@@ -1423,6 +1430,8 @@ class SPXPRDataLoadingStep(PipelineStep):
                 .add_custom('files_loaded_count', len(loaded_data))
                 .build()
             )
+            if compaction_stats:
+                metadata['dtype_compaction'] = compaction_stats
             
             return StepResult(
                 step_name=self.name,
@@ -1650,7 +1659,8 @@ class SPXPRDataLoadingStep(PipelineStep):
             # 載入科目映射/負債科目映射
             if Path(ref_data_path).exists():
                 source = DataSourceFactory.create_from_file(str(ref_data_path))
-                ref_ac = await source.read(dtype=str)
+                source.attach_cache(get_shared_frame_cache())
+                ref_ac = await source.read_with_cache(dtype=str)
                 
                 # 儲存參考數據到 Context
                 context.add_auxiliary_data(
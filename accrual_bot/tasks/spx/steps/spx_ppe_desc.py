@@ -22,6 +22,7 @@ import pandas as pd
 from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
 from accrual_bot.core.pipeline.context import ProcessingContext
 from accrual_bot.core.pipeline.steps.common import StepMetadataBuilder
+from accrual_bot.core.datasources import WorkbookWriter
 from accrual_bot.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -426,7 +427,7 @@ class DescriptionExtractionStep(PipelineStep):
 
         try:
             # 處理 PO
-            df_po = context.data.copy()
+            df_po = context.get_data_copy()
             df_po = _process_description(df_po)
             context.update_data(df_po)
             self.logger.info(f"PO 說明欄位提取完成: {len(df_po)} 筆")
@@ -503,7 +504,7 @@ class ContractPeriodMappingStep(PipelineStep):
                 raise ValueError("年限表資料為空")
 
             # 處理 PO
-            df_po = _process_contract_period(context.data.copy(), df_dep)
+            df_po = _process_contract_period(context.get_data_copy(), df_dep)
             po_matched = df_po['months_diff'].notna().sum()
             context.update_data(df_po)
             self.logger.info(
@@ -585,15 +586,11 @@ class PPEDescExportStep(PipelineStep):
         start_time = time.time()
 
         try:
-            df_po = context.data.copy()
+            # '<NA>' 值由 WorkbookWriter 寫出時視為空白
+            df_po = context.data
             df_pr = context.get_auxiliary_data('pr_data')
             df_dep = context.get_auxiliary_data('contract_periods')
 
-            # 清理 <NA>
-            df_po = df_po.replace('<NA>', pd.NA)
-            if df_pr is not None:
-                df_pr = df_pr.replace('<NA>', pd.NA)
-
             # 生成檔名
             processing_date = context.metadata.processing_date
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -613,12 +610,12 @@ class PPEDescExportStep(PipelineStep):
                 counter += 1
 
             # 匯出 Excel
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                df_po.to_excel(writer, sheet_name='PO', index=False)
+            with WorkbookWriter.from_config(output_path) as writer:
+                writer.write_sheet('PO', df_po)
                 if df_pr is not None:
-                    df_pr.to_excel(writer, sheet_name='PR', index=False)
+                    writer.write_sheet('PR', df_pr)
                 if df_dep is not None:
-                    df_dep.to_excel(writer, sheet_name='年限表', index=False)
+                    writer.write_sheet('年限表', df_dep)
 
             self.logger.info(f"匯出完成: {output_path}")
 
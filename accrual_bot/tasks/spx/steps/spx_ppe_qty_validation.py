@@ -3,7 +3,6 @@
 用於比對會計前期底稿與 OPS 驗收檔案的 locker 類型數量
 """
 
-import re
 import time
 from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
@@ -46,6 +45,13 @@ class AccountingOPSValidationStep(PipelineStep):
         '超出櫃體安裝費', '超出櫃體運費', '裝運費'
     ]
     
+    # locker_type 正規化（依序替換）：會計摘要寫法 -> OPS 欄位名稱
+    LOCKER_TYPE_REPLACEMENTS = (
+        ('主機', '主櫃'),
+        ('控制主櫃', 'DA'),
+        ('安裝運費', '裝運費'),  # PO摘要寫"安裝運費"，驗收底稿寫"裝運費"
+    )
+    
     def __init__(
         self,
         name: str = "AccountingOPSValidation",
@@ -262,24 +268,12 @@ class AccountingOPSValidationStep(PipelineStep):
                 f"found in OPS data"
             )
         
-        # 聚合：計算每個 PO 單號中非空金額欄位的數量
-        # agg_dict = {col: lambda x: x.notna().sum() for col in existing_amount_cols}
-        # df_agg = df_ops.groupby('PO單號', as_index=False).agg(agg_dict)
-        def convert_type(df):
-            df_copy = df.copy()
-            col = ['PO單號', 'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 
-                   'DA', '控制系統', 'XA', 'XB', 'XC', 'XD', 'XE', 'XF', 'XA30', 'XC30', 'XG', 
-                   '超出櫃體安裝費', '超出櫃體運費', '裝運費']
-            df_copy = (df_copy[col]
-                       .set_index('PO單號')
-                       .astype('string')
-                       .fillna('0')
-                       .replace('', '0')
-                       .map(lambda x: '0' if 'REF' in x else x)
-                       .astype('Float64'))
-            return df_copy.reset_index()
-            
-        df_agg = convert_type(df_ops).groupby('PO單號', as_index=False)[self.amount_columns].sum()
+        # 欄位式轉換後以單一 groupby 聚合
+        df_agg = (self._to_locker_numbers(df_ops, existing_amount_cols)
+                  .groupby(df_ops['PO單號'])
+                  .sum()
+                  .astype('Float64')
+                  .reset_index())
         
         # 計算總 locker 數量（所有金額欄位的總和）不含費用
         exclude_fee_cols = [col for col in existing_amount_cols if '費' not in col]
@@ -288,7 +282,7 @@ class AccountingOPSValidationStep(PipelineStep):
         # 轉長表格方便核對
         df_agg_wide = df_agg.melt(
             id_vars='PO單號',
-            value_vars=self.amount_columns,
+            value_vars=existing_amount_cols,
             var_name='locker_type',
             value_name='num/amt'
         ).rename(columns={'PO單號': 'po_number'})
@@ -302,6 +296,34 @@ class AccountingOPSValidationStep(PipelineStep):
         
         return df_result, df_agg_wide
     
+    @staticmethod
+    def _to_locker_numbers(df_ops: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """
+        將 OPS locker / 費用欄位轉為數值
+        
+        空值、空字串與含 "REF" 的儲存格視為 0；已是數值型別的欄位不經過字串轉換。
+        OPS 欄位只有少數幾種數量 / 金額，先 factorize 只轉換不重複值，再依代碼還原整欄。
+        
+        Args:
+            df_ops: OPS 資料
+            columns: 要轉換的欄位
+            
+        Returns:
+            pd.DataFrame: 轉換後的 float 欄位（與 df_ops 相同 index）
+        """
+        converted = {}
+        for col in columns:
+            values = df_ops[col]
+            if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                converted[col] = values.to_numpy(dtype=float, na_value=0.0)
+                continue
+            codes, uniques = pd.factorize(values)  # 空值代碼為 -1
+            text = pd.Series(uniques, dtype=object).astype('string')
+            is_zero = (text == '') | text.str.contains('REF', regex=False)
+            numbers = pd.to_numeric(text.mask(is_zero, '0')).to_numpy(dtype=float)
+            converted[col] = np.append(numbers, 0.0)[codes]
+        return pd.DataFrame(converted, index=df_ops.index)
+    
     def _extract_locker_type(self, df_accounting: pd.DataFrame) -> pd.DataFrame:
         """
         從會計資料的 Item Description 提取 locker_type
@@ -315,24 +337,17 @@ class AccountingOPSValidationStep(PipelineStep):
         if 'Item Description' not in df_accounting.columns and 'item_description' not in df_accounting.columns:
             raise ValueError("Column 'Item Description/item_description' not found in accounting data")
         
-        def extract_locker_info(text):
-            """提取 locker 資訊"""
-            if not isinstance(text, str):
-                return None
-            
-            match = re.search(self.locker_pattern, text)
-            if match:
-                return match.group(1).strip()
-            return None
-        
-        # 提取 locker_type
+        # 提取 locker_type：單次 str.extract，替換表只套用在不重複值上
         key_col = df_accounting.filter(regex='(?i)Item Description|Item_Description').columns[0]
-        df_accounting['locker_type'] = (df_accounting[key_col]
-                                        .apply(extract_locker_info)
-                                        .str.replace('主機', '主櫃')
-                                        .str.replace('控制主櫃', 'DA')
-                                        .str.replace('安裝運費', '裝運費')  # PO摘要寫"安裝運費"，驗收底稿寫"裝運費"
-                                        )
+        descriptions = df_accounting[key_col]
+        if descriptions.dtype == object or isinstance(descriptions.dtype, pd.StringDtype):
+            # 非字串的儲存格由 str.extract 回傳 NaN
+            extracted = descriptions.str.extract(self.locker_pattern, expand=False).str.strip()
+        else:
+            extracted = pd.Series(np.nan, index=df_accounting.index, dtype=object)
+        codes, uniques = pd.factorize(extracted)
+        mapped = np.array([self._normalize_locker_type(v) for v in uniques] + [np.nan], dtype=object)
+        df_accounting['locker_type'] = pd.Series(mapped[codes], index=df_accounting.index, dtype=object)
         
         # 統計提取結果
         extracted_count = df_accounting['locker_type'].notna().sum()
@@ -343,6 +358,13 @@ class AccountingOPSValidationStep(PipelineStep):
         
         return df_accounting
     
+    @classmethod
+    def _normalize_locker_type(cls, locker_type: str) -> str:
+        """依序套用 LOCKER_TYPE_REPLACEMENTS（子字串替換）"""
+        for old, new in cls.LOCKER_TYPE_REPLACEMENTS:
+            locker_type = locker_type.replace(old, new)
+        return locker_type
+    
     def _aggregate_accounting_data(
         self,
         df_accounting: pd.DataFrame
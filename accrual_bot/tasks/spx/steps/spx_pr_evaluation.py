@@ -23,6 +23,7 @@ import numpy as np
 from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
 from accrual_bot.core.pipeline.context import ProcessingContext
 from accrual_bot.utils.config import config_manager
+from accrual_bot.utils.helpers.data_utils import get_erm_desc_fields
 from accrual_bot.core.pipeline.steps.common import StepMetadataBuilder
 
 
@@ -58,6 +59,8 @@ class SPXPRERMLogicStep(PipelineStep):
     - DataFrame with PR狀態, 是否估計入帳, and simplified accounting fields
     """
 
+    chunkable = True
+
     def __init__(self, name: str = "SPX_PR_ERM_Logic", **kwargs):
         super().__init__(
             name=name,
@@ -81,7 +84,7 @@ class SPXPRERMLogicStep(PipelineStep):
         start_time = time.time()
 
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             processing_date = context.metadata.processing_date
 
             # 獲取參考數據
@@ -250,7 +253,7 @@ class SPXPRERMLogicStep(PipelineStep):
         )
 
         # 格式錯誤
-        format_error = df['YMs of Item Description'] == '100001,100002'
+        format_error = get_erm_desc_fields(df)[2]
         mask_format_error = no_status & format_error
         df.loc[mask_format_error, status_column] = '格式錯誤，退單'
 
@@ -38,7 +38,7 @@ class SPXDepositCheckStep(PipelineStep):
         3. 押金項目不預估
         """
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             
             # 押金識別
             deposit_mask = (
@@ -129,7 +129,7 @@ class SPXClosingListIntegrationStep(PipelineStep):
         3. 更新關單狀態
         """
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             
             # 獲取關單清單
             closing_list = context.get_auxiliary_data('closing_list')
@@ -213,7 +213,7 @@ class SPXRentProcessingStep(PipelineStep):
         4. 租金期間解析
         """
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             config = context.get_entity_config()
             
             # 租金科目
@@ -355,7 +355,7 @@ class SPXAssetValidationStep(PipelineStep):
         3. 其他設備驗收
         """
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             config = context.get_entity_config()
             
             # 獲取供應商列表
@@ -481,7 +481,7 @@ class SPXComplexStatusStep(PipelineStep):
         4-11. 其他複雜條件
         """
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             status_col = context.get_status_column()
             processing_date = context.metadata.processing_date
             
@@ -609,7 +609,7 @@ class SPXPPEProcessingStep(PipelineStep):
         3. 設置折舊相關資訊
         """
         try:
-            df = context.data.copy()
+            df = context.get_data_copy()
             config = context.get_entity_config()
             
             # FA科目列表
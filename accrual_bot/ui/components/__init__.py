@@ -14,6 +14,7 @@ from .step_preview import render_step_preview
 from .file_uploader import render_file_uploader
 from .progress_tracker import render_progress_tracker, render_step_status_table
 from .data_preview import render_data_preview, render_auxiliary_data_tabs, render_statistics_metrics
+from .profile_report import render_profile_report
 
 __all__ = [
     "render_entity_selector",
@@ -27,4 +28,5 @@ __all__ = [
     "render_data_preview",
     "render_auxiliary_data_tabs",
     "render_statistics_metrics",
+    "render_profile_report",
 ]
@@ -5,9 +5,11 @@ File Uploader Component
 """
 
 import streamlit as st
-from typing import Dict, List
+from typing import Any, Callable, Dict, List
 from accrual_bot.ui.config import REQUIRED_FILES, OPTIONAL_FILES, FILE_LABELS, SUPPORTED_FILE_FORMATS
 from accrual_bot.ui.services.file_handler import FileHandler
+from accrual_bot.ui.services.unified_pipeline_service import UnifiedPipelineService
+from accrual_bot.ui.services.upload_ingest import INGEST_FAILED, INGEST_READY
 
 
 def render_file_uploader(entity: str, proc_type: str, file_handler: FileHandler) -> Dict[str, str]:
@@ -44,15 +46,22 @@ def render_file_uploader(entity: str, proc_type: str, file_handler: FileHandler)
         st.warning("此組合沒有定義檔案需求")
         return {}
 
+    # 背景解析使用與 pipeline 載入步驟相同的讀取參數
+    service = UnifiedPipelineService()
+
+    def resolve_params(file_key: str, file_path: str) -> Dict[str, Any]:
+        return service.get_file_config(file_key, file_path, entity, proc_type, source_type or None)['params']
+
     # 必填檔案區
     st.markdown("### 必填檔案 ⭐")
-    _render_file_section(required_files, file_handler, required=True)
+    _render_file_section(required_files, file_handler, required=True, resolve_params=resolve_params)
 
     # 選填檔案區
     if optional_files:
         st.markdown("### 選填檔案")
         with st.expander("📂 展開選填檔案上傳", expanded=False):
-            _render_file_section(optional_files, file_handler, required=False)
+            _render_file_section(optional_files, file_handler, required=False,
+                                 resolve_params=resolve_params)
 
     # 驗證摘要
     _render_validation_summary(required_files)
@@ -60,7 +69,8 @@ def render_file_uploader(entity: str, proc_type: str, file_handler: FileHandler)
     return st.session_state.file_upload.file_paths
 
 
-def _render_file_section(file_keys: List[str], file_handler: FileHandler, required: bool):
+def _render_file_section(file_keys: List[str], file_handler: FileHandler, required: bool,
+                         resolve_params: Callable[[str, str], Dict[str, Any]] = None):
     """
     渲染檔案上傳區段
 
@@ -68,7 +78,10 @@ def _render_file_section(file_keys: List[str], file_handler: FileHandler, requir
         file_keys: 檔案 key 清單
         file_handler: FileHandler 實例
         required: 是否必填
+        resolve_params: 取得檔案讀取參數的函數，提供時於驗證通過後啟動背景解析
     """
+    upload_state = st.session_state.file_upload
+
     for file_key in file_keys:
         label = FILE_LABELS.get(file_key, file_key)
 
@@ -80,36 +93,71 @@ def _render_file_section(file_keys: List[str], file_handler: FileHandler, requir
         )
 
         if uploaded_file:
+            # 同一個上傳檔案在頁面重新執行時不重複儲存、驗證與解析
+            previous = upload_state.uploaded_files.get(file_key)
+            if (file_key in upload_state.file_paths and previous is not None
+                    and getattr(previous, 'file_id', None) == getattr(uploaded_file, 'file_id', None)
+                    and getattr(uploaded_file, 'file_id', None) is not None):
+                st.success(f"✅ 檔案已上傳: {uploaded_file.name}")
+                _render_ingest_status(file_handler, file_key)
+                continue
+
             # 儲存檔案
             try:
                 file_path = file_handler.save_uploaded_file(uploaded_file, file_key)
 
-                # 驗證檔案
+                # 驗證檔案（只讀取工作表名稱與標題列）
                 errors = file_handler.validate_file(file_path, file_key)
 
                 if errors:
                     st.error(f"❌ {errors[0]}")
                     # 從 session state 移除
-                    if file_key in st.session_state.file_upload.file_paths:
-                        del st.session_state.file_upload.file_paths[file_key]
+                    if file_key in upload_state.file_paths:
+                        del upload_state.file_paths[file_key]
+                    file_handler.ingestor.discard(file_key)
                 else:
                     st.success(f"✅ 檔案已上傳: {uploaded_file.name}")
                     # 儲存到 session state
-                    st.session_state.file_upload.file_paths[file_key] = file_path
-                    st.session_state.file_upload.uploaded_files[file_key] = uploaded_file
+                    upload_state.file_paths[file_key] = file_path
+                    upload_state.uploaded_files[file_key] = uploaded_file
+
+                    # 背景完整解析，與其他設定操作重疊
+                    if resolve_params is not None:
+                        file_handler.start_ingest(file_key, file_path, resolve_params(file_key, file_path))
 
                     # 顯示檔案資訊
                     file_info = file_handler.get_file_info(file_path)
                     st.caption(f"大小: {file_info['size_mb']:.2f} MB")
+                    _render_ingest_status(file_handler, file_key)
 
             except Exception as e:
                 st.error(f"❌ 上傳失敗: {str(e)}")
         else:
             # 清除已上傳的檔案
-            if file_key in st.session_state.file_upload.file_paths:
-                del st.session_state.file_upload.file_paths[file_key]
-            if file_key in st.session_state.file_upload.uploaded_files:
-                del st.session_state.file_upload.uploaded_files[file_key]
+            if file_key in upload_state.file_paths:
+                del upload_state.file_paths[file_key]
+            if file_key in upload_state.uploaded_files:
+                del upload_state.uploaded_files[file_key]
+            file_handler.ingestor.discard(file_key)
+
+
+def _render_ingest_status(file_handler: FileHandler, file_key: str):
+    """
+    顯示背景解析狀態
+
+    Args:
+        file_handler: FileHandler 實例
+        file_key: 檔案 key
+    """
+    record = file_handler.ingestor.get(file_key)
+    if record is None:
+        return
+    if record.status == INGEST_READY:
+        st.caption(f"⚡ 已預先解析: {record.rows:,} 列 × {record.columns} 欄（{record.duration:.1f} 秒）")
+    elif record.status == INGEST_FAILED:
+        st.caption("⚠️ 預先解析失敗，將於執行時解析")
+    else:
+        st.caption("⏳ 背景解析中...")
 
 
 def _render_validation_summary(required_files: List[str]):
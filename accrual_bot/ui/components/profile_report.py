@@ -0,0 +1,70 @@
+"""
+Profile Report Component
+
+步驟效能分析報告元件。
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+import streamlit as st
+
+
+def render_profile_report(report: Dict[str, Any], report_paths: Optional[Dict[str, str]] = None):
+    """
+    渲染步驟效能分析報告
+
+    Args:
+        report: PipelineProfiler.report() 產生的報告
+        report_paths: 報告檔案路徑（格式 -> 路徑）
+    """
+    steps = report.get('steps') if report else None
+    if not steps:
+        return
+
+    st.subheader("⏱️ 步驟效能分析")
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("總牆鐘時間", f"{report.get('total_wall_seconds', 0):.2f} 秒")
+    with col2:
+        st.metric("總 CPU 時間", f"{report.get('total_cpu_seconds', 0):.2f} 秒")
+    with col3:
+        peak = report.get('peak_rss_mb')
+        st.metric("尖峰 RSS", f"{peak:,.0f} MB" if peak is not None else "-")
+    with col4:
+        st.metric("最慢步驟", report.get('slowest_step') or "-")
+
+    df = pd.DataFrame(steps)
+    for col in ('data_bytes', 'aux_bytes'):
+        if col in df.columns:
+            df[col.replace('_bytes', '_mb')] = (df[col] / (1024 ** 2)).round(2)
+    display_cols = [c for c in (
+        'step_name', 'status', 'wall_seconds', 'cpu_seconds', 'rss_delta_mb',
+        'peak_rss_delta_mb', 'rows_in', 'rows_out', 'data_mb', 'aux_mb'
+    ) if c in df.columns]
+
+    st.bar_chart(df.set_index('step_name')['wall_seconds'], horizontal=True)
+    st.dataframe(df[display_cols], use_container_width=True, hide_index=True)
+
+    if report_paths:
+        mimes = {
+            'json': 'application/json',
+            'html': 'text/html',
+            'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        }
+        cols = st.columns(len(report_paths))
+        for col, (fmt, path) in zip(cols, report_paths.items()):
+            with col:
+                try:
+                    st.download_button(
+                        label=f"📥 效能報告 ({fmt.upper()})",
+                        data=Path(path).read_bytes(),
+                        file_name=Path(path).name,
+                        mime=mimes.get(fmt, 'application/octet-stream'),
+                        use_container_width=True,
+                        key=f"profile_report_{fmt}",
+                    )
+                except FileNotFoundError:
+                    st.caption(f"找不到報告檔: {path}")
@@ -60,3 +60,5 @@ class ResultState:
     statistics: Dict[str, Any] = field(default_factory=dict)      # 統計資訊
     execution_time: float = 0.0                                    # 執行時間 (秒)
     checkpoint_path: Optional[str] = None                          # Checkpoint 儲存路徑
+    profile_report: Dict[str, Any] = field(default_factory=dict)  # 步驟效能分析報告
+    profile_report_paths: Dict[str, str] = field(default_factory=dict)  # 效能報告檔案路徑
@@ -15,8 +15,8 @@ sys.path.insert(0, str(project_root))
 
 from accrual_bot.ui.app import init_session_state, get_navigation_status
 from accrual_bot.ui.components import render_progress_tracker, render_step_status_table
-from accrual_bot.ui.services import UnifiedPipelineService, StreamlitPipelineRunner
-from accrual_bot.ui.utils import AsyncBridge
+from accrual_bot.ui.services import get_pipeline_worker
+from accrual_bot.ui.services.pipeline_worker import DEFAULT_JOB_TIMEOUT
 from accrual_bot.ui.models.state_models import ExecutionStatus
 
 # 初始化 session state
@@ -83,16 +83,9 @@ if start_button and execution.status != ExecutionStatus.RUNNING:
     execution.failed_steps = []
     execution.error_message = ""
 
-    # 執行 pipeline
+    # 執行 pipeline（交給常駐 worker，保持配置與參考數據暖機）
     try:
-        service = UnifiedPipelineService()
-        runner = StreamlitPipelineRunner(service)
-
-        # 設定回調
-        def log_callback(message: str):
-            execution.logs.append(message)
-
-        def progress_callback(step_name: str, current: int, total: int, status: str = 'running'):
+        def progress_callback(step_name: str, status: str = 'running'):
             """進度回調：更新執行狀態"""
             execution.current_step = step_name if status == 'running' else ""
 
@@ -110,17 +103,19 @@ if start_button and execution.status != ExecutionStatus.RUNNING:
                 if step_name in execution.completed_steps:
                     execution.completed_steps.remove(step_name)
 
-        runner.set_log_callback(log_callback)
-        runner.set_progress_callback(progress_callback)
-
-        # 執行
-        st.info("⏳ 正在執行 pipeline...")
+        # 已在上傳時背景解析的檔案直接交給載入步驟（讀取 Parquet，不重新解析）
+        file_paths = upload.file_paths
+        file_handler = st.session_state.get('file_handler')
+        if file_handler is not None:
+            with st.spinner("等待上傳檔案背景解析完成..."):
+                file_handler.ingestor.wait(list(file_paths), timeout=DEFAULT_JOB_TIMEOUT)
+            file_paths = file_handler.ingestor.handoff_file_paths(file_paths)
 
         # 準備參數
         execute_params = {
             'entity': config.entity,
             'proc_type': config.processing_type,
-            'file_paths': upload.file_paths,
+            'file_paths': file_paths,
             'processing_date': config.processing_date,
         }
 
@@ -128,7 +123,39 @@ if start_button and execution.status != ExecutionStatus.RUNNING:
         if config.processing_type == 'PROCUREMENT':
             execute_params['source_type'] = config.procurement_source_type
 
-        result = AsyncBridge.run_async(runner.execute(**execute_params))
+        worker = get_pipeline_worker()
+        job = worker.submit(**execute_params)
+
+        # 每個步驟完成即更新進度，不需等待整個 pipeline 結束
+        with st.status("⏳ 正在執行 pipeline...", expanded=True) as status_box:
+            live_progress = st.empty()
+            while True:
+                # 超時自工作開始執行起算，排隊等待不計入；超時的工作（含其他 session 的）會被放棄
+                worker.abandon_timed_out(DEFAULT_JOB_TIMEOUT)
+                finished = job.done()
+                for event in job.poll_events():
+                    if event['type'] == 'log':
+                        execution.logs.append(event['message'])
+                    elif event['type'] == 'progress':
+                        progress_callback(event['step'], event['status'])
+                        if event['status'] == 'running':
+                            status_box.update(label=f"⏳ [{event['index']}/{event['total']}] {event['step']}")
+                with live_progress.container():
+                    render_progress_tracker(
+                        current_step=execution.current_step,
+                        completed_steps=execution.completed_steps,
+                        failed_steps=execution.failed_steps,
+                        total_steps=len(config.enabled_steps),
+                        start_time=execution.start_time
+                    )
+                if finished:
+                    break
+                time.sleep(0.2)
+            live_progress.empty()
+            status_box.update(label="Pipeline 執行結束", state="complete", expanded=False)
+
+        # 被放棄的工作拋出 TimeoutError
+        result = job.wait(timeout=0)
 
         execution.end_time = time.time()
 
@@ -138,6 +165,9 @@ if start_button and execution.status != ExecutionStatus.RUNNING:
             st.session_state.result.output_data = result['context'].data
             st.session_state.result.auxiliary_data = result['context'].auxiliary_data
             st.session_state.result.execution_time = result['execution_time']
+            pipeline_result = result.get('pipeline_result') or {}
+            st.session_state.result.profile_report = pipeline_result.get('profile') or {}
+            st.session_state.result.profile_report_paths = pipeline_result.get('profile_report_paths') or {}
 
             # 差異分析專用：儲存文字結果到 session_state
             ctx = result['context']
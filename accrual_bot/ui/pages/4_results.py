@@ -14,7 +14,9 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from accrual_bot.ui.app import init_session_state, get_navigation_status
-from accrual_bot.ui.components import render_data_preview, render_auxiliary_data_tabs, render_statistics_metrics
+from accrual_bot.ui.components import (
+    render_data_preview, render_auxiliary_data_tabs, render_statistics_metrics, render_profile_report
+)
 from accrual_bot.ui.utils.ui_helpers import format_duration
 from accrual_bot.ui.models.state_models import ExecutionStatus
 
@@ -193,6 +195,11 @@ if result.statistics:
     st.markdown("---")
     render_statistics_metrics(result.statistics)
 
+# 步驟效能分析（run_config.toml [profiling] 啟用時）
+if result.profile_report:
+    st.markdown("---")
+    render_profile_report(result.profile_report, result.profile_report_paths)
+
 # 操作按鈕
 st.markdown("---")
 col1, col2 = st.columns([1, 4])
@@ -31,6 +31,22 @@ st.markdown("---")
 
 st.info("💡 Checkpoint 功能允許您從中斷點繼續執行 pipeline，節省重複處理的時間。")
 
+# 輸入檔案快取（與 checkpoint 目錄無關，放在目錄檢查之前）
+with st.expander("🗄️ 輸入檔案快取", expanded=False):
+    from accrual_bot.core.datasources.ingest_cache import get_ingest_cache
+
+    ingest_cache = get_ingest_cache()
+    cache_stats = ingest_cache.get_stats()
+    st.caption(f"目錄路徑: {cache_stats['cache_dir']}（{'啟用' if cache_stats['enabled'] else '停用'}）")
+    cache_col1, cache_col2, cache_col3 = st.columns([1, 1, 1])
+    cache_col1.metric("快取條目", cache_stats['entries'])
+    cache_col2.metric("快取大小", f"{cache_stats['size_bytes'] / (1024 * 1024):.2f} MB")
+    with cache_col3:
+        if st.button("🗑️ 清除輸入快取", use_container_width=True):
+            removed = ingest_cache.purge()
+            st.success(f"已清除 {removed} 筆輸入快取")
+            st.rerun()
+
 # Checkpoint 目錄
 checkpoint_dir = os.path.join(os.getcwd(), "checkpoints")
 
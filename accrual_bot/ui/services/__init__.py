@@ -1,15 +1,19 @@
 """
 UI Services
 
-提供 UI 使用的核心服務層，包含 pipeline 服務、執行器、檔案處理等。
+提供 UI 使用的核心服務層，包含 pipeline 服務、執行器、常駐 worker、檔案處理等。
 """
 
 from .unified_pipeline_service import UnifiedPipelineService
 from .pipeline_runner import StreamlitPipelineRunner
 from .file_handler import FileHandler
+from .pipeline_worker import PipelineJob, PipelineWorker, get_pipeline_worker
 
 __all__ = [
     "UnifiedPipelineService",
     "StreamlitPipelineRunner",
     "FileHandler",
+    "PipelineJob",
+    "PipelineWorker",
+    "get_pipeline_worker",
 ]
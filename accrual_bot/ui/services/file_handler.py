@@ -2,14 +2,19 @@
 File Handler
 
 處理檔案上傳、驗證與暫存管理。
+
+驗證只讀取工作表名稱與標題列，不解析資料列；完整解析交由
+UploadIngestor 在背景執行一次，結果直接交給 pipeline 載入步驟。
 """
 
 import os
 import tempfile
 import shutil
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any
 import pandas as pd
 
+from accrual_bot.ui.services.upload_ingest import UploadIngestor
+
 
 class FileHandler:
     """處理檔案上傳與暫存"""
@@ -26,6 +31,7 @@ class FileHandler:
             os.makedirs(temp_dir, exist_ok=True)
         else:
             self.temp_dir = tempfile.mkdtemp(prefix="accrual_bot_ui_")
+        self.ingestor = UploadIngestor()
 
     def save_uploaded_file(self, uploaded_file: Any, file_key: str) -> str:
         """
@@ -72,22 +78,59 @@ class FileHandler:
             errors.append(f"{file_key}: 檔案為空")
             return errors
 
-        # 檢查檔案格式
+        # 檢查檔案格式（只讀取工作表名稱與標題列）
+        if not file_path.endswith(('.csv', '.xlsx', '.xls')):
+            errors.append(f"{file_key}: 不支援的檔案格式")
+            return errors
+
         try:
-            if file_path.endswith('.csv'):
-                # 嘗試讀取前 5 行
-                pd.read_csv(file_path, nrows=5)
-            elif file_path.endswith(('.xlsx', '.xls')):
-                # 嘗試讀取前 5 行
-                pd.read_excel(file_path, nrows=5)
-            else:
-                errors.append(f"{file_key}: 不支援的檔案格式")
+            info = self.inspect_file(file_path)
+            if not info['sheet_names']:
+                errors.append(f"{file_key}: 檔案沒有任何工作表")
 
         except Exception as e:
             errors.append(f"{file_key}: 無法讀取檔案 - {str(e)}")
 
         return errors
 
+    def inspect_file(self, file_path: str) -> Dict[str, List[Any]]:
+        """
+        讀取檔案結構（工作表名稱與第一個工作表的標題列），不解析資料列
+
+        .xlsx 以 openpyxl read-only 模式串流讀取第一列；.csv 只讀取標題。
+
+        Args:
+            file_path: 檔案路徑
+
+        Returns:
+            {'sheet_names': 工作表名稱清單, 'columns': 標題列}
+
+        Raises:
+            Exception: 檔案無法開啟或格式錯誤
+        """
+        if file_path.endswith('.csv'):
+            columns = pd.read_csv(file_path, nrows=0).columns.tolist()
+            return {'sheet_names': [os.path.basename(file_path)], 'columns': columns}
+
+        if file_path.endswith('.xlsx'):
+            from openpyxl import load_workbook
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                sheet_names = list(workbook.sheetnames)
+                columns: List[Any] = []
+                if sheet_names:
+                    first_row = next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+                    columns = [value for value in first_row if value is not None]
+                return {'sheet_names': sheet_names, 'columns': columns}
+            finally:
+                workbook.close()
+
+        # .xls（xlrd）
+        with pd.ExcelFile(file_path) as excel_file:
+            sheet_names = list(excel_file.sheet_names)
+            columns = excel_file.parse(sheet_names[0], nrows=0).columns.tolist() if sheet_names else []
+        return {'sheet_names': sheet_names, 'columns': columns}
+
     def validate_all_files(self, file_paths: dict) -> List[str]:
         """
         驗證所有檔案
@@ -125,6 +168,18 @@ class FileHandler:
             'filename': os.path.basename(file_path),
         }
 
+    def start_ingest(self, file_key: str, file_path: str,
+                     params: Optional[Dict[str, Any]] = None) -> None:
+        """
+        在背景完整解析已通過驗證的檔案（見 UploadIngestor）
+
+        Args:
+            file_key: 檔案識別 key
+            file_path: 檔案路徑
+            params: 與載入步驟相同的讀取參數
+        """
+        self.ingestor.submit(file_key, file_path, params)
+
     def cleanup(self):
         """清理暫存檔案"""
         if os.path.exists(self.temp_dir):
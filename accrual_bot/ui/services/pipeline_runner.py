@@ -10,6 +10,7 @@ from typing import Dict, Any, Optional, Callable
 import pandas as pd
 
 from accrual_bot.core.pipeline import ProcessingContext, Pipeline
+from accrual_bot.runner.config_loader import apply_profiling_config, load_run_config
 from accrual_bot.ui.services.unified_pipeline_service import UnifiedPipelineService
 from accrual_bot.ui.models.state_models import ExecutionStatus
 
@@ -88,6 +89,7 @@ class StreamlitPipelineRunner:
             )
 
             self._log(f"Pipeline 建立完成，共 {len(pipeline.steps)} 個步驟")
+            self._apply_profiling(pipeline)
 
             # 建立 ProcessingContext
             context = ProcessingContext(
@@ -109,7 +111,7 @@ class StreamlitPipelineRunner:
             return {
                 'success': result.get('success', False),
                 'context': context,
-                'step_results': {r.get('step', ''): r for r in result.get('results', [])},
+                'step_results': {r.get('step_name', ''): r for r in result.get('results', [])},
                 'error': result.get('error') if not result.get('success') else None,
                 'execution_time': execution_time,
                 'pipeline_result': result
@@ -132,6 +134,9 @@ class StreamlitPipelineRunner:
         """
         執行 pipeline 並回報進度
 
+        透過 Pipeline 步驟監聽器在每個步驟開始 / 完成時即時回報，
+        而非等整個 pipeline 結束後才一次更新。
+
         Args:
             pipeline: Pipeline 物件
             context: ProcessingContext
@@ -139,26 +144,30 @@ class StreamlitPipelineRunner:
         Returns:
             執行結果
         """
-        total_steps = len(pipeline.steps)
-
-        # 預先記錄所有步驟（讓 UI 知道即將執行的步驟）
-        for idx, step in enumerate(pipeline.steps, start=1):
-            self._log(f"[{idx}/{total_steps}] 執行步驟: {step.name}")
-
-        # 使用 Pipeline 原生的 execute() 方法
-        # 注意：這會一次性執行所有步驟，無法實時回調每個步驟的進度
-        # 但可以避免 event loop 衝突
-        result = await pipeline.execute(context)
-
-        # 執行完成後，根據結果更新進度
-        if self.progress_callback and 'results' in result:
-            for idx, step_result in enumerate(result['results'], start=1):
-                step_name = step_result.get('step', f'Step {idx}')
-                is_success = step_result.get('status') == 'success'
-                status = 'completed' if is_success else 'failed'
-                self.progress_callback(step_name, idx, total_steps, status=status)
-
-        return result
+        def on_step(step_name: str, index: int, total: int, status: str):
+            if status == 'running':
+                self._log(f"[{index}/{total}] 執行步驟: {step_name}")
+                ui_status = 'running'
+            else:
+                ui_status = 'completed' if status == 'success' else 'failed'
+            if self.progress_callback:
+                self.progress_callback(step_name, index, total, status=ui_status)
+
+        pipeline.add_step_listener(on_step)
+        try:
+            return await pipeline.execute(context)
+        finally:
+            pipeline.remove_step_listener(on_step)
+
+    def _apply_profiling(self, pipeline: Pipeline):
+        """套用 run_config.toml 的 [profiling] 設定（讀取失敗時維持關閉）"""
+        try:
+            apply_profiling_config(pipeline, load_run_config())
+        except Exception as e:
+            self._log(f"無法讀取效能分析設定，略過: {e}")
+            return
+        if pipeline.config.profile:
+            self._log("已啟用步驟效能分析")
 
     def _log(self, message: str):
         """記錄日誌"""
@@ -0,0 +1,336 @@
+"""
+Pipeline Worker
+
+常駐背景執行緒，讓 Streamlit UI 重複執行 pipeline 時不需重新暖機。
+
+AsyncBridge.run_async 每次執行都會建立新的執行緒與 event loop，
+並重新建立 UnifiedPipelineService。PipelineWorker 則在程序內常駐：
+
+- 單一 event loop 與 UnifiedPipelineService 跨執行重用
+- 配置、orchestrator 模組與共用 DataFrame 快取（參考檔）在第一次暖機後保持載入
+- 工作經由佇列提交，每個步驟開始 / 完成時即時推送進度事件給 UI
+- 超時自工作開始執行起算（不含佇列等待）；超時的工作會被放棄，
+  由新的 worker 執行緒接手佇列，避免一次卡住的執行擋住所有 session
+
+使用範例:
+    worker = get_pipeline_worker()
+    job = worker.submit(entity='SPX', proc_type='PO', file_paths=paths, processing_date=202512)
+    while not job.done():
+        worker.abandon_timed_out(DEFAULT_JOB_TIMEOUT)
+        for event in job.poll_events():
+            ...
+    result = job.wait(timeout=0)
+"""
+
+import asyncio
+import itertools
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from accrual_bot.ui.services.pipeline_runner import StreamlitPipelineRunner
+from accrual_bot.ui.services.unified_pipeline_service import UnifiedPipelineService
+from accrual_bot.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_JOB_TIMEOUT = 600
+
+_STOP = object()
+
+
+class PipelineJob:
+    """提交給 PipelineWorker 的單次執行"""
+
+    def __init__(self, job_id: int, params: Dict[str, Any]):
+        """
+        初始化工作
+
+        Args:
+            job_id: 工作編號
+            params: StreamlitPipelineRunner.execute 的參數
+        """
+        self.job_id = job_id
+        self.params = params
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+        self._events: 'queue.Queue[Dict[str, Any]]' = queue.Queue()
+        self._done = threading.Event()
+
+    def emit(self, event_type: str, **payload) -> None:
+        """推送事件（由 worker 執行緒呼叫）"""
+        self._events.put({'type': event_type, 'time': time.time(), **payload})
+
+    def poll_events(self) -> List[Dict[str, Any]]:
+        """
+        取出目前累積的事件（不阻塞）
+
+        Returns:
+            List[Dict[str, Any]]: 事件列表，type 為 'log' / 'progress' / 'done'
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def done(self) -> bool:
+        """是否已執行完成（成功、失敗或已放棄）"""
+        return self._done.is_set()
+
+    def elapsed(self) -> float:
+        """自 worker 開始執行起算的秒數（不含佇列等待；尚未開始時為 0）"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def wait(self, timeout: Optional[float] = DEFAULT_JOB_TIMEOUT) -> Dict[str, Any]:
+        """
+        等待執行完成並取得結果
+
+        Args:
+            timeout: 超時秒數，None 表示不限
+
+        Returns:
+            Dict[str, Any]: StreamlitPipelineRunner.execute 的結果
+
+        Raises:
+            TimeoutError: 等待超時
+            Exception: worker 執行時拋出的例外
+        """
+        if not self._done.wait(timeout):
+            waited = time.time() - self.submitted_at
+            raise TimeoutError(f"Pipeline 執行超時（已等待 {waited // 60:.0f} 分鐘）")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def _finish(self, result: Optional[Dict[str, Any]] = None,
+                error: Optional[BaseException] = None) -> None:
+        # 已放棄的工作在卡住的執行緒結束後不再覆寫結果
+        if self._done.is_set():
+            return
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self.emit('done', success=error is None and bool(result and result.get('success')))
+        self._done.set()
+
+
+class PipelineWorker:
+    """常駐 pipeline 執行緒：保持暖機，依序執行佇列中的工作"""
+
+    def __init__(self, service_factory: Callable[[], UnifiedPipelineService] = UnifiedPipelineService):
+        """
+        初始化 worker（尚未啟動）
+
+        Args:
+            service_factory: 建立 UnifiedPipelineService 的函式（只在暖機時呼叫一次）
+        """
+        self.service_factory = service_factory
+        self.service: Optional[UnifiedPipelineService] = None
+        self.jobs_completed = 0
+        self.warmup_seconds: Optional[float] = None
+        self._jobs: 'queue.Queue[Any]' = queue.Queue()
+        self._ids = itertools.count(1)
+        self._thread: Optional[threading.Thread] = None
+        self._current_job: Optional[PipelineJob] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ lifecycle
+    def start(self) -> 'PipelineWorker':
+        """啟動 worker 執行緒（已啟動時不做任何事）"""
+        with self._lock:
+            if self.is_alive():
+                return self
+            self._ready.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._jobs,), name="pipeline-worker", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 5) -> None:
+        """
+        停止 worker（等待執行中的工作完成）
+
+        Args:
+            timeout: 等待執行緒結束的秒數
+        """
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._jobs.put(_STOP)
+        thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        """worker 執行緒是否仍在運行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待暖機完成
+
+        Args:
+            timeout: 超時秒數
+
+        Returns:
+            bool: 是否已完成暖機
+        """
+        return self._ready.wait(timeout)
+
+    # ------------------------------------------------------------------ jobs
+    def submit(self, **params) -> PipelineJob:
+        """
+        提交一次 pipeline 執行
+
+        Args:
+            **params: StreamlitPipelineRunner.execute 的參數
+                      （entity / proc_type / file_paths / processing_date / source_type）
+
+        Returns:
+            PipelineJob: 工作控制代碼
+        """
+        self.start()
+        job = PipelineJob(next(self._ids), params)
+        self._jobs.put(job)
+        return job
+
+    def abandon(self, job: PipelineJob) -> None:
+        """
+        放棄工作：以 TimeoutError 結束，執行中時改由新的 worker 執行緒接手佇列
+
+        執行中的 coroutine 無法從外部中止；卡住的執行緒（daemon）在該工作結束後
+        自行停止，其結果不再寫回工作。
+
+        Args:
+            job: 要放棄的工作
+        """
+        if job.done():
+            return
+        job._finish(error=TimeoutError(
+            f"Pipeline 執行超時（已執行 {job.elapsed() // 60:.0f} 分鐘），已放棄此次執行"
+        ))
+        with self._lock:
+            if self._current_job is not job:
+                # 尚在佇列中的工作由 worker 取出時略過
+                return
+            stuck_jobs, self._jobs = self._jobs, queue.Queue()
+            self._current_job = None
+            self._thread = None
+        logger.warning(f"Pipeline job #{job.job_id} 超時，重新啟動 worker 執行緒")
+        while True:
+            try:
+                pending = stuck_jobs.get_nowait()
+            except queue.Empty:
+                break
+            if pending is not _STOP:
+                self._jobs.put(pending)
+        stuck_jobs.put(_STOP)
+        self.start()
+
+    def abandon_timed_out(self, timeout: float = DEFAULT_JOB_TIMEOUT) -> Optional[PipelineJob]:
+        """
+        放棄執行超過 timeout 秒的工作（自開始執行起算，不含佇列等待）
+
+        任何 session 輪詢時皆可呼叫，提交卡住工作的 session 離開後佇列仍會被釋放。
+
+        Args:
+            timeout: 超時秒數
+
+        Returns:
+            Optional[PipelineJob]: 被放棄的工作，沒有時為 None
+        """
+        job = self._current_job
+        if job is None or job.elapsed() <= timeout:
+            return None
+        self.abandon(job)
+        return job
+
+    def _run(self, jobs: 'queue.Queue[Any]') -> None:
+        """worker 主迴圈：同一個 event loop 執行佇列中的所有工作"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self._warm_up()
+            while True:
+                job = jobs.get()
+                if job is _STOP:
+                    break
+                if job.done():
+                    continue
+                self._run_job(loop, job)
+        finally:
+            self._ready.set()
+            loop.close()
+
+    def _warm_up(self) -> None:
+        """載入配置、建立 service 並準備共用快取"""
+        start = time.perf_counter()
+        try:
+            from accrual_bot.core.datasources import get_shared_frame_cache
+            from accrual_bot.utils.config import config_manager  # noqa: F401  觸發配置載入
+
+            self.service = self.service_factory()
+            self.service.get_available_entities()
+            get_shared_frame_cache()
+        except Exception as e:
+            # 暖機失敗不影響後續執行，第一個工作會再嘗試建立 service
+            logger.warning(f"Pipeline worker 暖機失敗: {e}")
+        self.warmup_seconds = time.perf_counter() - start
+        self._ready.set()
+        logger.info(f"Pipeline worker 暖機完成，耗時 {self.warmup_seconds:.2f} 秒")
+
+    def _run_job(self, loop: asyncio.AbstractEventLoop, job: PipelineJob) -> None:
+        """執行單一工作並把進度轉為事件"""
+        with self._lock:
+            self._current_job = job
+            job.started_at = time.time()
+        try:
+            if self.service is None:
+                self.service = self.service_factory()
+            runner = StreamlitPipelineRunner(self.service)
+            runner.set_log_callback(lambda message: job.emit('log', message=message))
+            runner.set_progress_callback(
+                lambda step_name, current, total, status='running': job.emit(
+                    'progress', step=step_name, index=current, total=total, status=status
+                )
+            )
+            result = loop.run_until_complete(runner.execute(**job.params))
+        except Exception as e:
+            logger.error(f"Pipeline job #{job.job_id} 執行失敗: {e}")
+            job._finish(error=e)
+        else:
+            job._finish(result=result)
+        finally:
+            with self._lock:
+                if self._current_job is job:
+                    self._current_job = None
+            self.jobs_completed += 1
+
+
+_worker: Optional[PipelineWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_pipeline_worker() -> PipelineWorker:
+    """
+    取得程序內共用的 PipelineWorker（必要時啟動）
+
+    Streamlit 每次互動都會重新執行頁面腳本，但模組在程序內只載入一次，
+    因此同一個 worker 在多次執行間保持暖機。
+
+    Returns:
+        PipelineWorker: 已啟動的 worker
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = PipelineWorker()
+        return _worker.start()
@@ -0,0 +1,170 @@
+"""
+Upload Ingest
+
+上傳檔案的預先解析階段。
+
+上傳時只檢查工作表名稱與標題列（FileHandler.inspect_file），完整解析則在背景執行，
+與使用者設定其他檔案 / 參數的時間重疊。解析經由與載入步驟相同的 DataSource 與讀取參數，
+結果寫入輸入檔案快取（IngestCache，以「檔案內容雜湊 + 讀取參數」為鍵的 Parquet）。
+
+執行 pipeline 時以 handoff_file_paths() 將已解析的檔案標記為 ingest_cache=True，
+載入步驟以相同參數 read() 時直接讀取 Parquet，不再重新解析 Excel / CSV。
+載入步驟若以其他參數讀取（例如 AP invoice 指定 sheet / header），則照常解析。
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from accrual_bot.core.datasources import DataSourceFactory
+from accrual_bot.utils.helpers.file_utils import calculate_file_hash
+from accrual_bot.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 會經過輸入檔案快取的格式
+INGESTIBLE_SUFFIXES = ('.xlsx', '.xls', '.csv')
+
+INGEST_PENDING = 'pending'
+INGEST_READY = 'ready'
+INGEST_FAILED = 'failed'
+
+
+@dataclass
+class IngestRecord:
+    """單一上傳檔案的預先解析狀態"""
+    file_key: str
+    file_path: str
+    params: Dict[str, Any]
+    signature: tuple
+    future: Optional[Future] = None
+    upload_hash: Optional[str] = None              # 上傳檔案內容雜湊
+    rows: Optional[int] = None
+    columns: Optional[int] = None
+    duration: Optional[float] = None
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+
+    @property
+    def status(self) -> str:
+        """pending / ready / failed"""
+        if self.future is None or not self.future.done():
+            return INGEST_PENDING
+        return INGEST_FAILED if self.error else INGEST_READY
+
+
+class UploadIngestor:
+    """在背景將上傳檔案解析為 Parquet 並交給 pipeline 載入步驟"""
+
+    # 類級別的線程池，所有 session 共用
+    _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="upload-ingest")
+
+    def __init__(self):
+        self._records: Dict[str, IngestRecord] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, file_key: str, file_path: str, params: Optional[Dict[str, Any]] = None
+               ) -> Optional[IngestRecord]:
+        """
+        提交背景解析（同一檔案未變動時不重複提交）
+
+        Args:
+            file_key: 檔案識別 key
+            file_path: 上傳檔案暫存路徑
+            params: 與載入步驟相同的讀取參數（paths.toml 的 params）
+
+        Returns:
+            Optional[IngestRecord]: 解析紀錄；不支援的格式返回 None
+        """
+        path = Path(file_path)
+        if path.suffix.lower() not in INGESTIBLE_SUFFIXES:
+            return None
+        params = dict(params or {})
+        stat = path.stat()
+        signature = (str(path), stat.st_size, stat.st_mtime_ns, repr(sorted(params.items())))
+
+        with self._lock:
+            record = self._records.get(file_key)
+            if record is not None and record.signature == signature:
+                return record
+            record = IngestRecord(file_key=file_key, file_path=str(path),
+                                  params=params, signature=signature)
+            record.future = self._executor.submit(self._ingest, record)
+            self._records[file_key] = record
+        return record
+
+    def _ingest(self, record: IngestRecord) -> None:
+        """完整解析一次並寫入輸入檔案快取"""
+        start = time.perf_counter()
+        try:
+            record.upload_hash = calculate_file_hash(record.file_path)
+            df = asyncio.run(self._read(record))
+            record.rows, record.columns = df.shape
+            logger.info(f"上傳檔案預先解析完成: {record.file_key} {df.shape}")
+        except Exception as e:
+            record.error = str(e)
+            logger.warning(f"上傳檔案預先解析失敗，將由載入步驟解析: {record.file_key}: {e}")
+        finally:
+            record.duration = time.perf_counter() - start
+
+    @staticmethod
+    async def _read(record: IngestRecord):
+        source = DataSourceFactory.create_from_file(
+            record.file_path, **record.params, ingest_cache=True
+        )
+        try:
+            return await source.read()
+        finally:
+            await source.close()
+
+    def get(self, file_key: str) -> Optional[IngestRecord]:
+        """取得檔案的解析紀錄"""
+        return self._records.get(file_key)
+
+    def discard(self, file_key: str) -> None:
+        """移除檔案的解析紀錄（檔案被移除時呼叫）"""
+        with self._lock:
+            self._records.pop(file_key, None)
+
+    def wait(self, file_keys: Optional[List[str]] = None, timeout: Optional[float] = None) -> bool:
+        """
+        等待背景解析完成
+
+        Args:
+            file_keys: 要等待的檔案，None 表示全部
+            timeout: 超時秒數
+
+        Returns:
+            bool: 是否全部完成（成功或失敗）
+        """
+        records = [r for key, r in self._records.items() if file_keys is None or key in file_keys]
+        futures = [r.future for r in records if r.future is not None]
+        _, not_done = wait(futures, timeout=timeout)
+        return not not_done
+
+    def handoff_file_paths(self, file_paths: Dict[str, str]) -> Dict[str, Any]:
+        """
+        將已完成解析的檔案轉為含讀取參數的設定，交給 pipeline 載入步驟
+
+        Args:
+            file_paths: UI 的檔案路徑字典
+
+        Returns:
+            Dict[str, Any]: 已解析檔案為 {'path', 'params'}（params 含 ingest_cache=True），
+                            其餘維持原路徑字串
+        """
+        handoff: Dict[str, Any] = {}
+        for file_key, file_path in file_paths.items():
+            record = self._records.get(file_key)
+            if record is not None and record.file_path == file_path and record.status == INGEST_READY:
+                handoff[file_key] = {
+                    'path': file_path,
+                    'params': {**record.params, 'ingest_cache': True},
+                }
+            else:
+                handoff[file_key] = file_path
+        return handoff
@@ -21,6 +21,7 @@ __all__ = [
     'STATUS_VALUES',
     'REGEX_PATTERNS',
     'DEFAULT_DATE_RANGE',
+    'ERM_DESC_COLUMNS',
     'EXCEL_FORMAT',
     'CONCURRENT_SETTINGS',
     'GOOGLE_SHEETS',
@@ -33,6 +34,8 @@ __all__ = [
     'logger_manager',
     'get_logger',
     'get_structured_logger',
+    'WarningAggregator',
+    'flush_logs',
     
     # helpers模組
     'get_resource_path',
@@ -57,6 +60,8 @@ __all__ = [
     'format_numeric_columns',
     'parse_date_string',
     'extract_date_range_from_description',
+    'extract_date_ranges',
+    'get_erm_desc_fields',
     'convert_date_format_in_string',
     'extract_pattern_from_string',
     'safe_numeric_operation',
@@ -66,4 +71,5 @@ __all__ = [
     'concat_dataframes_safely',
     'parallel_apply',
     'memory_efficient_operation',
+    'compact_dtypes',
 ]
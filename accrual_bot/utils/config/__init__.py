@@ -18,6 +18,7 @@ __all__ = [
     'STATUS_VALUES',
     'REGEX_PATTERNS',
     'DEFAULT_DATE_RANGE',
+    'ERM_DESC_COLUMNS',
     'EXCEL_FORMAT',
     'CONCURRENT_SETTINGS',
     'GOOGLE_SHEETS',
@@ -72,6 +72,13 @@ REGEX_PATTERNS = {
 # 預設日期範圍（用於格式錯誤時）
 DEFAULT_DATE_RANGE = '100001,100002'
 
+# 摘要日期區間的整數欄位（由 DateLogicStep 與 'YMs of Item Description' 一併產生）
+ERM_DESC_COLUMNS = {
+    'START': 'erm_desc_start',
+    'END': 'erm_desc_end',
+    'FORMAT_ERROR': 'erm_desc_format_error'
+}
+
 # Excel 格式化相關
 EXCEL_FORMAT = {
     'ENCODING': 'utf-8-sig',
@@ -28,6 +28,8 @@ from .data_utils import (
     format_numeric_columns,
     parse_date_string,
     extract_date_range_from_description,
+    extract_date_ranges,
+    get_erm_desc_fields,
     convert_date_format_in_string,
     extract_pattern_from_string,
     safe_numeric_operation,
@@ -37,6 +39,7 @@ from .data_utils import (
     concat_dataframes_safely,
     parallel_apply,
     memory_efficient_operation,
+    compact_dtypes,
     classify_description,
     give_account_by_keyword,
     get_ref_on_colab
@@ -72,6 +75,8 @@ __all__ = [
     'format_numeric_columns',
     'parse_date_string',
     'extract_date_range_from_description',
+    'extract_date_ranges',
+    'get_erm_desc_fields',
     'convert_date_format_in_string',
     'extract_pattern_from_string',
     'safe_numeric_operation',
@@ -81,6 +86,7 @@ __all__ = [
     'concat_dataframes_safely',
     'parallel_apply',
     'memory_efficient_operation',
+    'compact_dtypes',
     'classify_description',
     'give_account_by_keyword',
     'get_ref_on_colab',
@@ -11,7 +11,10 @@ import concurrent.futures
 import logging
 import tomllib
 
-from ..config.constants import REGEX_PATTERNS, DEFAULT_DATE_RANGE
+from ..config.constants import REGEX_PATTERNS, DEFAULT_DATE_RANGE, ERM_DESC_COLUMNS
+from ..logging.logger import WarningAggregator
+
+_module_logger = logging.getLogger('accrual_bot.data_utils')
 
 
 toml_path = None
@@ -279,7 +282,8 @@ def _validate_date_format(date_str: str, has_day: bool = False) -> bool:
 def extract_date_range_from_description(
     description: str, 
     patterns: Optional[Dict[str, str]] = None,
-    logger: Optional[logging.Logger] = None
+    logger: Optional[logging.Logger] = None,
+    warnings: Optional[WarningAggregator] = None
 ) -> str:
     """
     從描述中提取日期範圍
@@ -287,6 +291,9 @@ def extract_date_range_from_description(
     Args:
         description: 描述文字，可能包含日期範圍資訊
         patterns: 自訂正規表達式模式字典（可選）
+        logger: 日誌記錄器（可選，預設為模組記錄器）
+        warnings: 逐列警告彙總器（可選）；提供時空值 / 格式無效只計數，
+            由呼叫端 flush 成一行彙總，適合逐列 apply 的情境
         
     Returns:
         str: 日期範圍字符串 (格式: "YYYYMM,YYYYMM")，
@@ -300,11 +307,22 @@ def extract_date_range_from_description(
     """
     if patterns is None:
         patterns = DATE_PATTERNS
+    if logger is None:
+        logger = _module_logger
+
+    def warn_invalid(value: str) -> None:
+        if warnings is not None:
+            warnings.add("日期格式無效", value)
+        else:
+            logger.warning("日期格式無效: %s", value)
     
     try:
         # 處理空值
         if pd.isna(description) or not description or str(description).strip() == '':
-            logger.warning("描述為空，返回預設日期範圍")
+            if warnings is not None:
+                warnings.add("描述為空，返回預設日期範圍")
+            else:
+                logger.warning("描述為空，返回預設日期範圍")
             return DEFAULT_DATE_RANGE
         
         desc_str = str(description).strip()
@@ -319,7 +337,7 @@ def extract_date_range_from_description(
                 end_date = end_full[:7].replace('/', '')
                 return f"{start_date},{end_date}"
             else:
-                logger.warning(f"日期格式無效: {start_full} 或 {end_full}")
+                warn_invalid(f"{start_full}-{end_full}")
         
         # 2. 日期範圍（月）：YYYY/MM - YYYY/MM
         if match := re.search(patterns['DATE_YM_TO_YM'], desc_str):
@@ -329,7 +347,7 @@ def extract_date_range_from_description(
                 end_date = end_ym.replace('/', '')
                 return f"{start_date},{end_date}"
             else:
-                logger.warning(f"日期格式無效: {start_ym} 或 {end_ym}")
+                warn_invalid(f"{start_ym}-{end_ym}")
         
         # 3. 單一日期（含日）：YYYY/MM/DD
         if match := re.search(patterns['DATE_YMD'], desc_str):
@@ -338,7 +356,7 @@ def extract_date_range_from_description(
                 single_date = date_full[:7].replace('/', '')
                 return f"{single_date},{single_date}"
             else:
-                logger.warning(f"日期格式無效: {date_full}")
+                warn_invalid(date_full)
         
         # 4. 單一日期（月）：YYYY/MM
         if match := re.search(patterns['DATE_YM'], desc_str):
@@ -347,20 +365,217 @@ def extract_date_range_from_description(
                 single_date = date_ym.replace('/', '')
                 return f"{single_date},{single_date}"
             else:
-                logger.warning(f"日期格式無效: {date_ym}")
+                warn_invalid(date_ym)
         
         # 無法匹配任何格式
         # logger.warning(f"無法從描述中提取日期: {desc_str}")
         return DEFAULT_DATE_RANGE
             
     except (ValueError, AttributeError, IndexError) as e:
-        logger.warning(f"解析日期時發生錯誤: {description}, 錯誤: {e}")
+        logger.warning("解析日期時發生錯誤: %s, 錯誤: %s", description, e)
         return DEFAULT_DATE_RANGE
     except Exception as e:
-        logger.warning(f"未預期的錯誤: {description}, 錯誤: {e}", exc_info=True)
+        logger.warning("未預期的錯誤: %s, 錯誤: %s", description, e, exc_info=True)
         return DEFAULT_DATE_RANGE
 
 
+# (pattern key, 是否含日, 是否為區間)；順序由最具體到最一般，與逐筆版本一致
+_DATE_PATTERN_ORDER = [
+    ('DATE_YMD_TO_YMD', True, True),
+    ('DATE_YM_TO_YM', False, True),
+    ('DATE_YMD', True, False),
+    ('DATE_YM', False, False),
+]
+
+
+def _parse_year_months(dates: pd.Series, has_day: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    向量化版 _validate_date_format 並轉為 YYYYMM 整數
+
+    日期字串重複度極高，僅對不重複值做解析後再展開。
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (是否有效, YYYYMM)
+    """
+    codes, uniques = pd.factorize(dates, use_na_sentinel=True)
+    uniques = pd.Series(uniques, dtype='object')
+
+    parts = uniques.str.extract(r'^(\d+)/(\d+)(?:/(\d+))?(?:/|$)')
+    year = pd.to_numeric(parts[0], errors='coerce')
+    month = pd.to_numeric(parts[1], errors='coerce')
+    valid = year.between(1900, 9999) & month.between(1, 12)
+    if has_day:
+        day = pd.to_numeric(parts[2], errors='coerce')
+        valid &= day.between(1, 31) | parts[2].isna()
+
+    # YYYY/MM[/DD] -> YYYYMM（與逐筆版本相同的字串處理）
+    year_month = uniques.str[:7] if has_day else uniques
+    ym = pd.to_numeric(year_month.str.replace('/', '', regex=False), errors='coerce')
+    valid &= ym.notna()
+
+    # 末尾附加無效值，使未命中 (code == -1) 取得 False
+    valid_u = np.append(valid.to_numpy(dtype=bool), False)
+    ym_u = np.append(ym.fillna(0).to_numpy(dtype='int64'), 0)
+    return valid_u[codes], ym_u[codes]
+
+
+def _extract_date_ranges_unique(
+    descriptions: pd.Series,
+    patterns: Dict[str, str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """對不重複的描述逐個 pattern 以 str.extract 批次解析，回傳 (起, 迄) YYYYMM 陣列"""
+    default_start, default_end = (int(x) for x in DEFAULT_DATE_RANGE.split(','))
+    n = len(descriptions)
+    start = np.full(n, default_start, dtype='int64')
+    end = np.full(n, default_end, dtype='int64')
+
+    text = descriptions.astype(str).str.strip()
+    pending = (text != '').to_numpy(copy=True)  # CoW 下 to_numpy 為唯讀 view
+
+    for key, has_day, is_range in _DATE_PATTERN_ORDER:
+        pattern = patterns.get(key)
+        if not pattern or not pending.any():
+            continue
+
+        positions = np.flatnonzero(pending)
+        extracted = text.iloc[positions].str.extract(pattern)
+        valid_start, ym_start = _parse_year_months(extracted[0], has_day)
+        if is_range:
+            valid_end, ym_end = _parse_year_months(extracted[1], has_day)
+        else:
+            valid_end, ym_end = valid_start, ym_start
+
+        valid = valid_start & valid_end
+        hit = positions[valid]
+        start[hit] = ym_start[valid]
+        end[hit] = ym_end[valid]
+        pending[hit] = False
+
+    return start, end
+
+
+def extract_date_ranges(
+    descriptions: pd.Series,
+    patterns: Optional[Dict[str, str]] = None,
+    memo: Optional[Dict[str, Tuple[int, int]]] = None,
+    logger: Optional[logging.Logger] = None
+) -> pd.DataFrame:
+    """
+    批次從描述中提取日期範圍（extract_date_range_from_description 的向量化版本）
+
+    僅對不重複的描述值解析，每個 DATE_PATTERNS 以一次 Series.str.extract 處理，
+    月份/日期驗證以陣列運算完成。
+
+    Args:
+        descriptions: 描述欄位（如 Item Description）
+        patterns: 自訂正規表達式模式字典（可選）
+        memo: 跨呼叫的解析快取 {描述: (起, 迄)}；提供時會讀取並寫回
+        logger: 日誌記錄器（可選），用於輸出彙總資訊（空描述筆數以一行 warning 彙總）
+
+    Returns:
+        pd.DataFrame: 與 descriptions 同 index，欄位為
+            - 'YMs of Item Description': "YYYYMM,YYYYMM" 字串
+            - ERM_DESC_COLUMNS['START'] / ['END']: Int32 起迄年月
+            - ERM_DESC_COLUMNS['FORMAT_ERROR']: bool，無法解析（格式錯誤）旗標
+        無法解析者為 DEFAULT_DATE_RANGE (100001,100002)
+
+    Examples:
+        >>> extract_date_ranges(pd.Series(["2024/01-2024/12", "無日期"]))
+          YMs of Item Description  erm_desc_start  erm_desc_end  erm_desc_format_error
+        0           202401,202412          202401        202412                  False
+        1           100001,100002          100001        100002                   True
+    """
+    if patterns is None:
+        patterns = DATE_PATTERNS
+
+    default_start, default_end = (int(x) for x in DEFAULT_DATE_RANGE.split(','))
+    codes, uniques = pd.factorize(descriptions, use_na_sentinel=True)
+    uniques = pd.Series(uniques, dtype='object')
+
+    start = np.full(len(uniques), default_start, dtype='int64')
+    end = np.full(len(uniques), default_end, dtype='int64')
+
+    if memo is not None:
+        cached = uniques.map(memo)
+        todo = cached.isna().to_numpy()
+        for pos in np.flatnonzero(~todo):
+            start[pos], end[pos] = cached.iat[pos]
+    else:
+        todo = np.ones(len(uniques), dtype=bool)
+
+    if todo.any():
+        new_start, new_end = _extract_date_ranges_unique(uniques[todo], patterns)
+        start[todo] = new_start
+        end[todo] = new_end
+        if memo is not None:
+            memo.update(zip(uniques[todo], zip(new_start.tolist(), new_end.tolist())))
+
+    # 展開回原始列；末尾附加預設範圍，使 NA 描述 (code == -1) 取得預設值
+    start = np.append(start, default_start)
+    end = np.append(end, default_end)
+    ym_text = (pd.Series(start).astype(str) + ',' + pd.Series(end).astype(str)).to_numpy()
+    row_start, row_end, row_text = start[codes], end[codes], ym_text[codes]
+    format_error = (row_start == default_start) & (row_end == default_end)
+
+    result = pd.DataFrame({
+        'YMs of Item Description': row_text,
+        ERM_DESC_COLUMNS['START']: pd.array(row_start, dtype='Int32'),
+        ERM_DESC_COLUMNS['END']: pd.array(row_end, dtype='Int32'),
+        ERM_DESC_COLUMNS['FORMAT_ERROR']: format_error,
+    }, index=descriptions.index)
+
+    if logger is not None:
+        # 空描述（NA 或空白）以一行彙總，取代逐列警告；NA (code == -1) 對應末尾的 True
+        blank = np.append((uniques.astype(str).str.strip() == '').to_numpy(), True)[codes]
+        if blank.any():
+            logger.warning("描述為空，返回預設日期範圍: %s 筆", f"{int(blank.sum()):,}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "日期區間解析完成: %s 筆 (不重複 %s，新解析 %s)，無法解析 %s 筆",
+                f"{len(descriptions):,}", f"{len(uniques):,}",
+                f"{int(todo.sum()):,}", f"{int(format_error.sum()):,}"
+            )
+
+    return result
+
+
+def get_erm_desc_fields(
+    df: pd.DataFrame
+) -> Optional[Tuple[pd.Series, pd.Series, pd.Series]]:
+    """
+    取得摘要日期區間的 (起, 迄, 格式錯誤) 欄位
+
+    優先使用 extract_date_ranges 產生的 ERM_DESC_COLUMNS 欄位；
+    缺少時（如舊版 checkpoint）才從 'YMs of Item Description' 字串切片轉換。
+
+    Args:
+        df: 含摘要日期區間欄位的 DataFrame
+
+    Returns:
+        Optional[Tuple]: (Int32 起年月, Int32 迄年月, bool 格式錯誤)；
+        兩種欄位皆不存在時回傳 None
+    """
+    start_col = ERM_DESC_COLUMNS['START']
+    end_col = ERM_DESC_COLUMNS['END']
+    flag_col = ERM_DESC_COLUMNS['FORMAT_ERROR']
+    default_start, default_end = (int(x) for x in DEFAULT_DATE_RANGE.split(','))
+
+    if start_col in df.columns and end_col in df.columns:
+        ym_start, ym_end = df[start_col], df[end_col]
+        if flag_col in df.columns:
+            return ym_start, ym_end, df[flag_col]
+        format_error = ((ym_start == default_start) & (ym_end == default_end)).fillna(False)
+        return ym_start, ym_end, format_error.astype(bool)
+
+    if 'YMs of Item Description' in df.columns:
+        ym = df['YMs of Item Description']
+        return (pd.to_numeric(ym.str[:6], errors='coerce').astype('Int32'),
+                pd.to_numeric(ym.str[7:], errors='coerce').astype('Int32'),
+                (ym == DEFAULT_DATE_RANGE).fillna(False).astype(bool))
+
+    return None
+
+
 def convert_date_format_in_string(text: str, from_pattern: str = r'(\d{4})/(\d{2})', 
                                   to_pattern: str = r'\1\2') -> str:
     """
@@ -619,7 +834,71 @@ def memory_efficient_operation(df: pd.DataFrame, operation: callable,
         
     except Exception as e:
         raise ValueError(f"記憶體高效操作時出錯: {str(e)}")
-    
+
+
+def _is_text_column(series: pd.Series) -> bool:
+    """是否為字串類欄位（object / string）"""
+    return series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+
+
+def compact_dtypes(df: pd.DataFrame,
+                   category_columns: Optional[List[str]] = None,
+                   numeric_columns: Optional[List[str]] = None,
+                   string_storage: Optional[str] = None,
+                   max_category_ratio: float = 0.5) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """
+    依 schema 壓縮欄位型別以降低記憶體（就地轉換並回傳同一 DataFrame）
+
+    - category_columns: 低基數欄位轉 category；唯一值比例超過 max_category_ratio 者略過
+    - numeric_columns: 金額字串轉 float64；僅在無資料遺失（無法解析的值）時轉換。
+      不降為整數型別，後續以 astype('Float64') 運算的結果與字串來源一致；
+      後續仍以字串比較的欄位（如 Billed Quantity != '0'）不可列入
+    - string_storage: 'pyarrow' 時其餘純字串 object 欄位轉 string[pyarrow]
+
+    Args:
+        df: DataFrame
+        category_columns: 轉 category 的欄位
+        numeric_columns: 轉數值的欄位
+        string_storage: 其餘字串欄位的儲存方式
+        max_category_ratio: category 唯一值比例上限
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, str]]: (DataFrame, {欄位: 新型別})
+    """
+    converted: Dict[str, str] = {}
+    if df is None or df.empty:
+        return df, converted
+
+    for col in category_columns or []:
+        if col not in df.columns or not _is_text_column(df[col]):
+            continue
+        if df[col].nunique(dropna=True) > max(1, len(df) * max_category_ratio):
+            continue
+        df[col] = df[col].astype('category')
+        converted[col] = 'category'
+
+    for col in numeric_columns or []:
+        if col not in df.columns or not _is_text_column(df[col]):
+            continue
+        raw = df[col]
+        numeric = pd.to_numeric(raw, errors='coerce')
+        # 有無法解析的值（如含千分位）則維持原型別，避免資料遺失
+        if numeric.notna().sum() != raw.notna().sum():
+            continue
+        numeric = numeric.astype('float64')
+        df[col] = numeric
+        converted[col] = str(numeric.dtype)
+
+    if string_storage == 'pyarrow':
+        for col in df.columns:
+            if col in converted or df[col].dtype != object:
+                continue
+            if pd.api.types.infer_dtype(df[col], skipna=True) == 'string':
+                df[col] = df[col].astype('string[pyarrow]')
+                converted[col] = 'string[pyarrow]'
+
+    return df, converted
+
 def classify_description(description: str) -> str:
     """
     Classifies a description string into a category based on regex patterns.
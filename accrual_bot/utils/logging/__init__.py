@@ -2,12 +2,22 @@
 日誌處理模組
 """
 
-from .logger import Logger, StructuredLogger, logger_manager, get_logger, get_structured_logger
+from .logger import (
+    Logger,
+    StructuredLogger,
+    WarningAggregator,
+    logger_manager,
+    get_logger,
+    get_structured_logger,
+    flush_logs
+)
 
 __all__ = [
     'Logger',
     'StructuredLogger', 
+    'WarningAggregator',
     'logger_manager',
     'get_logger',
-    'get_structured_logger'
+    'get_structured_logger',
+    'flush_logs'
 ]
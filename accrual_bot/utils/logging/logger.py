@@ -7,16 +7,20 @@
 2. 增強日誌格式 - 包含模組名、函數名、行號等詳細信息
 3. 支援彩色輸出（可選）
 4. 支援日誌文件輪轉
+5. 控制台 / 檔案輸出改由 QueueListener 背景執行緒寫出，pipeline 執行緒只負責入列
+6. 逐列警告彙總（WarningAggregator），避免熱路徑逐筆格式化與寫檔
 """
 
 import os
 import sys
+import atexit
 import logging
 import threading
-from typing import Optional, Dict, Any
+from queue import SimpleQueue
+from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from logging.handlers import RotatingFileHandler  # 文件大小轮转
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener  # 文件大小轮转
 
 from ..config.config_manager import config_manager
 
@@ -106,6 +110,8 @@ class Logger:
     - 詳細的日誌格式
     - 支援彩色輸出
     - 支援日誌文件輪轉
+    - 佇列式輸出：root logger 只掛 QueueHandler，實際寫出由 QueueListener 背景執行緒負責
+      （config.ini [LOGGING] queue = False 可回退為同步輸出）
     """
     
     _instance = None
@@ -146,6 +152,8 @@ class Logger:
 
             self._loggers: Dict[str, logging.Logger] = {}
             self._handlers: Dict[str, logging.Handler] = {}
+            self._queue_handler: Optional[QueueHandler] = None
+            self._listener: Optional[QueueListener] = None
             self._setup_logging()
             self._initialized = True
     
@@ -162,8 +170,11 @@ class Logger:
             # 是否使用彩色輸出
             use_color = config_manager.get('LOGGING', 'color', True)
             
+            # 是否經由背景執行緒輸出
+            use_queue = config_manager.get_boolean('LOGGING', 'queue', True)
+            
             # 創建根日誌記錄器（不使用 basicConfig 避免重複）
-            self._setup_root_logger(log_level, console_format, use_color)
+            self._setup_root_logger(log_level, console_format, use_color, use_queue)
             
         except Exception as e:
             # 如果設置失敗，使用預設配置
@@ -171,9 +182,13 @@ class Logger:
             # 使用fallback logger記錄錯誤（避免print）
             sys.stderr.write(f"日誌設置失敗，使用預設配置: {e}\n")
     
-    def _setup_root_logger(self, log_level: str, console_format: str, use_color: bool = True) -> None:
+    def _setup_root_logger(self, log_level: str, console_format: str, use_color: bool = True,
+                           use_queue: bool = False) -> None:
         """設置根日誌記錄器
         默認INFO層級(配置檔config.ini設定)
+
+        root logger 層級取控制台與檔案層級的較低者，子記錄器不另設層級（繼承 root），
+        低於此層級的呼叫在 isEnabledFor 即返回，不建立 LogRecord。
         """
         # 只在需要時創建root logger（減少重複創建）
         if 'root' not in self._loggers:
@@ -193,6 +208,9 @@ class Logger:
         else:
             root_logger = self._loggers['root']
         
+        if use_queue:
+            self._start_queue_listener(root_logger)
+        
         # 控制台處理器（帶顏色）
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(getattr(logging, log_level.upper(), logging.INFO))
@@ -204,8 +222,7 @@ class Logger:
             use_color=use_color
         )
         console_handler.setFormatter(console_formatter)
-        root_logger.addHandler(console_handler)
-        self._handlers['console'] = console_handler
+        self._attach_output_handler(root_logger, 'console', console_handler)
         
         # 檔案處理器（如果配置了日誌路徑）
         log_path = config_manager.get('PATHS', 'log_path')
@@ -215,6 +232,56 @@ class Logger:
             except Exception as e:
                 # 避免print，使用stderr記錄錯誤
                 sys.stderr.write(f"設置檔案日誌處理器失敗: {e}\n")
+        
+        self._sync_root_level(root_logger)
+    
+    def _start_queue_listener(self, root_logger: logging.Logger) -> None:
+        """以 QueueHandler 取代 root 上的輸出處理器，並啟動背景寫出執行緒"""
+        if self._listener is not None:
+            return
+        log_queue = SimpleQueue()
+        self._queue_handler = QueueHandler(log_queue)
+        # respect_handler_level：各輸出處理器仍依自身層級過濾
+        self._listener = QueueListener(log_queue, respect_handler_level=True)
+        self._listener.start()
+        root_logger.addHandler(self._queue_handler)
+        atexit.register(self._stop_queue_listener)
+    
+    def _stop_queue_listener(self) -> None:
+        """停止背景執行緒（會先寫出佇列中剩餘的紀錄）"""
+        listener = self._listener
+        if listener is not None and listener._thread is not None:
+            listener.stop()
+    
+    def _output_handlers(self) -> List[logging.Handler]:
+        """實際負責寫出的處理器（佇列模式下為 listener 持有的處理器）"""
+        if self._listener is not None:
+            return list(self._listener.handlers)
+        root = self._loggers.get('root')
+        return list(root.handlers) if root else []
+    
+    def _attach_output_handler(self, logger: logging.Logger, name: str, handler: logging.Handler) -> None:
+        """掛上輸出處理器：佇列模式交給 listener，否則直接掛到 logger"""
+        if self._listener is not None and self._queue_handler in logger.handlers:
+            self._listener.handlers = self._listener.handlers + (handler,)
+        else:
+            logger.addHandler(handler)
+        self._handlers[name] = handler
+    
+    def _sync_root_level(self, root_logger: logging.Logger) -> None:
+        """root 層級設為各輸出處理器層級的最小值"""
+        levels = [h.level for h in self._output_handlers() if h.level > logging.NOTSET]
+        if levels:
+            root_logger.setLevel(min(levels))
+    
+    def flush(self) -> None:
+        """等待佇列中的紀錄全部寫出（佇列模式），並 flush 各處理器"""
+        with Logger._logger_lock:
+            if self._listener is not None and self._listener._thread is not None:
+                self._listener.stop()
+                self._listener.start()
+            for handler in self._output_handlers():
+                handler.flush()
     
     def _setup_file_handler(self, logger: logging.Logger, log_path: str) -> None:
         """
@@ -222,7 +289,8 @@ class Logger:
         - 原始file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
         - 使用RotatingFileHandler取代
 
-        默認DEBUG層級
+        默認DEBUG層級（config.ini [LOGGING] file_level 可調整；設為 INFO 時
+        debug 呼叫不再產生紀錄，熱路徑上的日誌成本趨近於零）
         
         Args:
             logger: 日誌記錄器
@@ -250,7 +318,8 @@ class Logger:
                 encoding='utf-8'
             )
             
-            file_handler.setLevel(logging.DEBUG)  # 檔案記錄所有級別
+            file_level = config_manager.get('LOGGING', 'file_level', 'DEBUG')
+            file_handler.setLevel(getattr(logging, str(file_level).upper(), logging.DEBUG))
             
             # 文件使用更詳細的格式（包含進程ID、線程ID）
             file_formatter = logging.Formatter(
@@ -259,8 +328,8 @@ class Logger:
             )
             file_handler.setFormatter(file_formatter)
             
-            logger.addHandler(file_handler)
-            self._handlers['file'] = file_handler
+            self._attach_output_handler(logger, 'file', file_handler)
+            self._sync_root_level(logger)
             
         except Exception as e:
             # 避免print，使用stderr記錄錯誤
@@ -289,8 +358,8 @@ class Logger:
                     return self._loggers['root']
                 else:
                     # 創建子記錄器，但不添加處理器（使用繼承機制）
+                    # 層級亦繼承 root，低於輸出層級的呼叫直接略過
                     logger = logging.getLogger(f'accrual_bot.{name}')
-                    logger.setLevel(logging.DEBUG)
                     # 不手動添加處理器，讓子記錄器自然繼承父記錄器的設置
                     self._loggers[name] = logger
             
@@ -324,10 +393,14 @@ class Logger:
             if name in self._handlers:
                 handler = self._handlers[name]
                 
-                # 從所有記錄器中移除處理器
+                # 從所有記錄器及背景寫出執行緒中移除處理器
                 for logger in self._loggers.values():
                     if handler in logger.handlers:
                         logger.removeHandler(handler)
+                if self._listener is not None and handler in self._listener.handlers:
+                    self._listener.handlers = tuple(
+                        h for h in self._listener.handlers if h is not handler
+                    )
                 
                 # 關閉處理器
                 handler.close()
@@ -364,7 +437,8 @@ class Logger:
                 'loggers_count': len(self._loggers),
                 'handlers_count': len(self._handlers),
                 'logger_names': list(self._loggers.keys()),
-                'handler_names': list(self._handlers.keys())
+                'handler_names': list(self._handlers.keys()),
+                'queue_enabled': self._listener is not None
             }
     
     def _setup_fallback_logger(self) -> None:
@@ -399,6 +473,14 @@ class Logger:
     def cleanup(self) -> None:
         """清理日誌資源"""
         with Logger._logger_lock:
+            # 先停止背景執行緒，確保佇列中的紀錄已寫出
+            self._stop_queue_listener()
+            root = self._loggers.get('root')
+            if root is not None and self._queue_handler in root.handlers:
+                root.removeHandler(self._queue_handler)
+            self._listener = None
+            self._queue_handler = None
+            
             # 關閉所有處理器
             for handler in self._handlers.values():
                 try:
@@ -546,6 +628,79 @@ class StructuredLogger:
         self.logger.info(msg)
 
 
+class WarningAggregator:
+    """
+    逐列警告彙總器
+    
+    熱路徑上逐列呼叫 add() 只做計數並保留少量範例，不格式化字串、不寫檔；
+    flush() 時每類訊息只輸出一行「訊息: N 筆」。可作為 context manager 使用，離開時自動 flush。
+    
+    Example:
+        with WarningAggregator(logger) as warnings:
+            for desc in descriptions:
+                if not desc:
+                    warnings.add("描述為空，返回預設日期範圍")
+        # => WARNING 描述為空，返回預設日期範圍: 1,234 筆
+    """
+    
+    def __init__(self, logger: Optional[logging.Logger] = None,
+                 level: int = logging.WARNING, max_examples: int = 3):
+        """
+        Args:
+            logger: 輸出用的日誌記錄器，None 時使用 accrual_bot root logger
+            level: 彙總訊息的日誌級別
+            max_examples: 每類訊息保留的範例數量
+        """
+        self.logger = logger or logging.getLogger('accrual_bot')
+        self.level = level
+        self.max_examples = max_examples
+        self._counts: Dict[str, int] = {}
+        self._examples: Dict[str, List[Any]] = {}
+    
+    def add(self, message: str, example: Any = None) -> None:
+        """
+        記錄一筆警告
+        
+        Args:
+            message: 訊息類別（固定字串，作為彙總鍵值）
+            example: 觸發警告的值（可選，僅保留前 max_examples 筆）
+        """
+        self._counts[message] = self._counts.get(message, 0) + 1
+        if example is not None:
+            examples = self._examples.setdefault(message, [])
+            if len(examples) < self.max_examples:
+                examples.append(example)
+    
+    @property
+    def counts(self) -> Dict[str, int]:
+        """各類訊息目前累計的筆數"""
+        return dict(self._counts)
+    
+    def flush(self) -> Dict[str, int]:
+        """
+        輸出彙總訊息並清空計數
+        
+        Returns:
+            Dict[str, int]: 本次輸出的各類訊息筆數
+        """
+        counts, self._counts = self._counts, {}
+        examples, self._examples = self._examples, {}
+        if self.logger.isEnabledFor(self.level):
+            for message, count in counts.items():
+                if message in examples:
+                    self.logger.log(self.level, "%s: %s 筆（例: %s）",
+                                    message, f"{count:,}", examples[message])
+                else:
+                    self.logger.log(self.level, "%s: %s 筆", message, f"{count:,}")
+        return counts
+    
+    def __enter__(self) -> 'WarningAggregator':
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.flush()
+
+
 # 全域日誌管理器實例
 logger_manager = Logger()
 
@@ -575,3 +730,8 @@ def get_structured_logger(name: str = None) -> StructuredLogger:
         StructuredLogger: 結構化日誌記錄器
     """
     return StructuredLogger(name)
+
+
+def flush_logs() -> None:
+    """等待背景執行緒寫出所有已入列的日誌（讀取日誌檔前呼叫）"""
+    logger_manager.flush()
@@ -24,7 +24,7 @@ current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
 from accrual_bot.core.pipeline import ProcessingContext
-from accrual_bot.runner import load_run_config, load_file_paths, StepByStepExecutor
+from accrual_bot.runner import load_run_config, load_file_paths, apply_profiling_config, StepByStepExecutor
 from accrual_bot.tasks.spt import SPTPipelineOrchestrator
 from accrual_bot.tasks.spx import SPXPipelineOrchestrator
 from accrual_bot.tasks.sct import SCTPipelineOrchestrator
@@ -90,7 +90,8 @@ async def main() -> Dict[str, Any]:
             entity=config.entity,
             processing_type=config.processing_type,
             processing_date=config.processing_date,
-            save_checkpoints=config.save_checkpoints
+            save_checkpoints=config.save_checkpoints,
+            checkpoint_format=config.checkpoint_format
         )
         _print_result_summary(result)
         return result
@@ -145,6 +146,7 @@ async def main() -> Dict[str, Any]:
         raise ValueError(f"不支援的處理類型: {config.processing_type}")
 
     logger.info(f"Pipeline 建立完成: {pipeline.config.name}, 共 {len(pipeline.steps)} 個步驟")
+    apply_profiling_config(pipeline, config)
 
     # 5. 建立處理上下文
     # 初始化空 DataFrame，由第一個步驟載入資料
@@ -169,7 +171,8 @@ async def main() -> Dict[str, Any]:
         executor = StepByStepExecutor(
             pipeline=pipeline,
             context=context,
-            save_checkpoints=config.save_checkpoints
+            save_checkpoints=config.save_checkpoints,
+            checkpoint_format=config.checkpoint_format
         )
         result = await executor.run()
     else:
@@ -218,6 +221,10 @@ def _print_result_summary(result: Dict[str, Any]):
             if output_path:
                 print(f"輸出路徑: {output_path}")
 
+        profile_paths = context.get_variable("profile_report_paths")
+        if profile_paths:
+            print(f"效能報告: {profile_paths.get('html') or next(iter(profile_paths.values()))}")
+
     print("=" * 60 + "\n")
 
 
@@ -227,7 +234,8 @@ async def resume_from_checkpoint(
     entity: str,
     processing_type: str,
     processing_date: int,
-    save_checkpoints: bool = True
+    save_checkpoints: bool = True,
+    checkpoint_format: str = "parquet"
 ) -> Dict[str, Any]:
     """
     從 checkpoint 恢復執行
@@ -239,6 +247,7 @@ async def resume_from_checkpoint(
         processing_type: 處理類型 (PO/PR/PPE/PROCUREMENT)
         processing_date: 處理日期 (YYYYMM)
         save_checkpoints: 是否儲存 checkpoint
+        checkpoint_format: 新 checkpoint 的儲存格式 (parquet/arrow)；載入時自動判斷
 
     Returns:
         Dict[str, Any]: 執行結果
@@ -266,7 +275,7 @@ async def resume_from_checkpoint(
     logger.info(f"起始步驟: {from_step}")
 
     # 1. 載入 checkpoint
-    checkpoint_manager = CheckpointManager("./checkpoints")
+    checkpoint_manager = CheckpointManager("./checkpoints", checkpoint_format=checkpoint_format)
     context = checkpoint_manager.load_checkpoint(checkpoint_name)
 
     # 2. 載入檔案路徑
@@ -6,7 +6,7 @@
 """
 
 import asyncio
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Union
 from pathlib import Path
 import pandas as pd
 
@@ -165,6 +165,73 @@ def run_accounting_ops_validation(
     return context, data
 
 
+def run_accounting_ops_validation_months(
+    accounting_files: Dict[int, str],
+    ops_file: Union[str, Dict[int, str]],
+    ops_params: Optional[Dict[str, Any]] = None,
+    stop_on_error: bool = False,
+    **kwargs
+) -> Dict[int, Tuple[ProcessingContext, Dict[str, pd.DataFrame]]]:
+    """
+    一次執行多個月份的會計與 OPS 底稿比對驗證
+    
+    各月份依序呼叫 run_accounting_ops_validation。多個月份共用同一份 OPS 底稿時，
+    OPS 讀取參數預設加上 ingest_cache=True：第一個月份解析後寫入輸入檔案快取（Parquet），
+    其餘月份直接載入，不再重複解析 Excel。
+    
+    Args:
+        accounting_files: 處理日期 (YYYYMM) -> 會計底稿檔案路徑
+        ops_file: 共用的 OPS 驗收檔案路徑，或 處理日期 -> OPS 驗收檔案路徑
+        ops_params: OPS 底稿讀取參數，預設為 None 使用標準配置
+        stop_on_error: 任一月份失敗時是否中止，預設為 False（記錄錯誤後繼續下一個月份）
+        **kwargs: 其餘傳給 run_accounting_ops_validation 的參數
+    
+    Returns:
+        Dict[int, Tuple[ProcessingContext, Dict[str, pd.DataFrame]]]: 
+            處理日期 -> run_accounting_ops_validation 的結果（僅包含成功的月份）
+    
+    Examples:
+        >>> results = run_accounting_ops_validation_months(
+        ...     accounting_files={
+        ...         202510: 'path/to/202509_PO_FN.xlsx',
+        ...         202511: 'path/to/202510_PO_FN.xlsx',
+        ...         202512: 'path/to/202511_PO_FN.xlsx',
+        ...     },
+        ...     ops_file='path/to/ops.xlsx'
+        ... )
+        >>> comparison_df = results[202512][1]['validation_comparison']
+    
+    Raises:
+        Exception: stop_on_error=True 時，第一個失敗月份的錯誤
+    """
+    ops_params = {'ingest_cache': True, **(ops_params or _get_default_ops_params())}
+    
+    results: Dict[int, Tuple[ProcessingContext, Dict[str, pd.DataFrame]]] = {}
+    failed: Dict[int, str] = {}
+    for processing_date in sorted(accounting_files):
+        month_ops_file = ops_file[processing_date] if isinstance(ops_file, dict) else ops_file
+        try:
+            results[processing_date] = run_accounting_ops_validation(
+                accounting_file=accounting_files[processing_date],
+                ops_file=month_ops_file,
+                processing_date=processing_date,
+                ops_params=ops_params,
+                **kwargs
+            )
+        except Exception as e:
+            if stop_on_error:
+                raise
+            failed[processing_date] = str(e)
+            logger.error(f"{processing_date} 比對驗證失敗: {e}")
+    
+    logger.info(
+        f"多月份比對驗證完成: 成功 {len(results)} 個月份, 失敗 {len(failed)} 個月份"
+        + (f" {sorted(failed)}" if failed else "")
+    )
+    
+    return results
+
+
 # ==================== 內部輔助函數 ====================
 
 def _validate_files(accounting_file: str, ops_file: str):
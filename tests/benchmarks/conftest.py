@@ -0,0 +1,42 @@
+"""
+效能基準測試設定
+
+tests/benchmarks 下的測試耗時較長，預設 pytest 執行時略過。
+以下任一情況啟用：
+    python -m pytest tests/benchmarks/... -m slow
+    python -m pytest tests/benchmarks/test_month_end_benchmark.py   # 明確指定基準目錄 / 檔案
+    RUN_BENCHMARKS=1 python -m pytest
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+
+
+def _is_benchmark_path(path: Path) -> bool:
+    return path == BENCHMARK_DIR or BENCHMARK_DIR in path.parents
+
+
+def _benchmarks_enabled(config) -> bool:
+    if os.environ.get('RUN_BENCHMARKS', '').lower() in ('1', 'true', 'yes'):
+        return True
+    markexpr = config.getoption('markexpr', default='') or ''
+    if 'slow' in markexpr and 'not slow' not in markexpr:
+        return True
+    root = Path(str(config.invocation_params.dir))
+    for arg in config.args:
+        path = (root / arg.split('::')[0]).resolve()
+        if _is_benchmark_path(path):
+            return True
+    return False
+
+
+def pytest_collection_modifyitems(config, items):
+    if _benchmarks_enabled(config):
+        return
+    skip = pytest.mark.skip(reason="效能基準預設不執行；以 -m slow、指定 tests/benchmarks 或 RUN_BENCHMARKS=1 啟用")
+    for item in items:
+        if _is_benchmark_path(Path(str(item.fspath)).resolve()):
+            item.add_marker(skip)
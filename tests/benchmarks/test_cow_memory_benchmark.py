@@ -0,0 +1,120 @@
+"""
+Copy-on-Write 模式記憶體比較
+
+以測試資料產生器建立合成 SPX PO 資料，於獨立子行程分別以一般模式與
+Copy-on-Write 模式執行 SPX PO pipeline（略過需實際檔案的載入 / 匯出步驟），
+比較尖峰 RSS 與執行時間，並確認兩種模式產出一致。
+
+執行方式：
+    COW_BENCH_ROWS=100000 python -m pytest tests/benchmarks/test_cow_memory_benchmark.py -v -s -m slow
+    python -m tests.benchmarks.test_cow_memory_benchmark 100000 1   # 單次執行（列數、是否啟用 CoW）
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+N_ROWS = int(os.environ.get("COW_BENCH_ROWS", 5000))
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SKIPPED_STEPS = ('SPXDataLoading', 'SPXExport', 'DataShapeSummary')
+
+
+def _build_context(n_rows: int):
+    """建立已完成載入階段的 SPX PO 上下文"""
+    from accrual_bot.core.pipeline.context import ProcessingContext
+    from tests.fixtures.test_data_generators import create_spx_po_df
+
+    np.random.seed(0)  # 固定亂數，兩個子行程產出可比對
+    df = create_spx_po_df(n_rows)
+    df['Product Code'] = 'LG_SPX_' + df['Product Code']
+    df['PO Line'] = df['PO#'] + '-' + df['Line#']
+    df['Expected Receive Month'] = 'Dec-25'
+    df['Department'] = '001'
+
+    previous = df.loc[::2, ['PO#', 'Line#', 'PO Line']].copy()
+    previous['Remarked by FN'] = 'remark'
+    previous['Noted by FN'] = 'note'
+
+    context = ProcessingContext(df, 'SPX', 202512, 'PO')
+    context.set_variable('processing_date', 202512)
+    context.set_variable('processing_month', 12)
+    context.set_variable('file_paths', {'raw_po': 'synthetic'})
+    context.add_auxiliary_data('previous', previous)
+    context.add_auxiliary_data('reference_account', pd.DataFrame({'Account': ['100000'], 'Account Desc': ['Cash']}))
+    context.add_auxiliary_data('reference_liability', pd.DataFrame({'Account': ['100000'], 'Liability': ['200000']}))
+    return context
+
+
+def run_pipeline(n_rows: int, copy_on_write: bool) -> dict:
+    """執行一次 SPX PO pipeline 並回傳尖峰 RSS、耗時與結果摘要"""
+    from accrual_bot.tasks.spx import SPXPipelineOrchestrator
+
+    pipeline = SPXPipelineOrchestrator().build_po_pipeline({})
+    for name in SKIPPED_STEPS:
+        pipeline.remove_step(name)
+    pipeline.config.stop_on_error = False
+    pipeline.config.copy_on_write = copy_on_write
+
+    context = _build_context(n_rows)
+    start = time.perf_counter()
+    result = asyncio.run(pipeline.execute(context))
+    seconds = time.perf_counter() - start
+
+    digest = int(pd.util.hash_pandas_object(context.data.astype(str), index=True).sum())
+    return {
+        'copy_on_write': copy_on_write,
+        'rows': n_rows,
+        'seconds': round(seconds, 3),
+        'peak_rss_mb': _peak_rss_mb(),
+        'failed_steps': [r['step_name'] for r in result['results'] if r['status'] == 'failed'],
+        'columns': list(context.data.columns),
+        'digest': digest,
+    }
+
+
+def _peak_rss_mb():
+    """行程尖峰 RSS（MB）；resource 模組不存在（Windows）時改用 psutil，皆無法取得時為 None"""
+    from accrual_bot.core.pipeline.profiler import peak_rss_mb
+
+    peak = peak_rss_mb()
+    return round(peak, 1) if peak is not None else None
+
+
+def _run_in_subprocess(n_rows: int, copy_on_write: bool, cwd: Path) -> dict:
+    """於獨立子行程執行，避免尖峰 RSS 互相干擾"""
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    proc = subprocess.run(
+        [sys.executable, '-m', 'tests.benchmarks.test_cow_memory_benchmark',
+         str(n_rows), '1' if copy_on_write else '0'],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.slow
+class TestCopyOnWriteMemoryBenchmark:
+    """一般模式與 Copy-on-Write 模式比較"""
+
+    def test_peak_rss(self, tmp_path):
+        """尖峰 RSS 比較，並確認兩模式輸出一致"""
+        baseline = _run_in_subprocess(N_ROWS, False, tmp_path)
+        cow = _run_in_subprocess(N_ROWS, True, tmp_path)
+
+        print(f"\n[{N_ROWS} rows] peak RSS: copy={baseline['peak_rss_mb']}MB "
+              f"({baseline['seconds']}s), cow={cow['peak_rss_mb']}MB ({cow['seconds']}s)")
+        assert baseline['failed_steps'] == cow['failed_steps'] == []
+        assert baseline['columns'] == cow['columns']
+        assert baseline['digest'] == cow['digest']
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else N_ROWS
+    use_cow = len(sys.argv) > 2 and sys.argv[2] == '1'
+    print(json.dumps(run_pipeline(rows, use_cow)))
@@ -0,0 +1,78 @@
+"""
+日誌輸出成本比較
+
+以相同的逐列 debug / warning 呼叫量測 pipeline 執行緒上的日誌成本：
+同步輸出（queue = False）、佇列輸出（QueueHandler / QueueListener）、
+以及檔案層級設為 INFO 時 debug 呼叫被直接略過的情況。
+
+執行方式：
+    LOGGING_BENCH_CALLS=200000 python -m pytest tests/benchmarks/test_logging_overhead_benchmark.py -v -s -m slow
+"""
+import logging
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from accrual_bot.utils.logging.logger import Logger
+
+N_CALLS = int(os.environ.get("LOGGING_BENCH_CALLS", 20000))
+
+
+def _make_logger(log_dir, use_queue: bool, file_level: str) -> Logger:
+    """以指定設定重建 Logger 單例（控制台層級固定為 INFO）"""
+    settings = {
+        ('LOGGING', 'level'): 'INFO',
+        ('LOGGING', 'file_level'): file_level,
+        ('LOGGING', 'color'): False,
+        ('PATHS', 'log_path'): str(log_dir),
+    }
+    with patch('accrual_bot.utils.logging.logger.config_manager') as mock_cm:
+        mock_cm.get.side_effect = lambda section, key, fallback=None: settings.get((section, key), fallback)
+        mock_cm.get_boolean.return_value = use_queue
+        return Logger()
+
+
+def _reset_logger() -> None:
+    with Logger._lock:
+        if Logger._instance is not None:
+            Logger._instance.cleanup()
+            Logger._instance = None
+            Logger._initialized = False
+
+
+def _time_hot_path(log_dir, use_queue: bool, file_level: str) -> float:
+    """量測逐列 debug 呼叫在呼叫端執行緒上的耗時（不含背景寫出）"""
+    _reset_logger()
+    manager = _make_logger(log_dir, use_queue, file_level)
+    # 控制台輸出不列入比較，只保留檔案
+    manager.remove_handler('console')
+    logger = manager.get_logger('bench')
+    try:
+        start = time.perf_counter()
+        for i in range(N_CALLS):
+            logger.debug("row %d: 描述為空，返回預設日期範圍", i)
+        return time.perf_counter() - start
+    finally:
+        manager.flush()
+        _reset_logger()
+
+
+@pytest.mark.slow
+class TestLoggingOverheadBenchmark:
+    """同步 / 佇列 / 層級略過的日誌成本比較"""
+
+    def test_hot_path_overhead(self, tmp_path):
+        """佇列輸出快於同步寫檔；INFO 層級下 debug 呼叫近乎零成本"""
+        sync_debug = _time_hot_path(tmp_path / 'sync', use_queue=False, file_level='DEBUG')
+        queued_debug = _time_hot_path(tmp_path / 'queue', use_queue=True, file_level='DEBUG')
+        queued_info = _time_hot_path(tmp_path / 'info', use_queue=True, file_level='INFO')
+
+        per_call = {k: v / N_CALLS * 1e6 for k, v in
+                    {'sync': sync_debug, 'queue': queued_debug, 'info': queued_info}.items()}
+        print(f"\n[{N_CALLS} debug calls] sync={sync_debug:.3f}s ({per_call['sync']:.1f}µs/call), "
+              f"queue={queued_debug:.3f}s ({per_call['queue']:.1f}µs/call), "
+              f"INFO level={queued_info:.3f}s ({per_call['info']:.2f}µs/call)")
+        assert queued_info < queued_debug
+        assert queued_info < sync_debug / 10
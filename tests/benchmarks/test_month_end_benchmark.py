@@ -0,0 +1,337 @@
+"""
+月結規模效能基準
+
+以 create_month_end_dataset 產生 SPX / SPT / SCT 的 PO、PR 合成月結資料（預設 1 萬 / 10 萬列），
+量測原始 CSV 載入、DateLogic、ConditionEngine.apply_rules、前期底稿整合、科目預測、匯出，
+以及各 orchestrator 完整 pipeline 的耗時與尖峰 RSS。結果可存為基準檔並與之比較，讓效能退化一目了然。
+
+完整 pipeline 略過需實際檔案的載入步驟與需連線 Google Sheets 的關單清單步驟，
+改以 CSV 載入量測取代載入成本、以合成關單清單取代線上資料；匯出步驟寫入暫存目錄。
+命令列模式下每個（實體, 類型, 列數）組合於獨立子行程執行，避免尖峰 RSS 與解析快取互相干擾。
+baselines/month_end_baseline.json 記錄 1 萬 / 10 萬列；10 萬列尖峰 RSS 約 1 GB，
+100 萬列需約 10 GB 記憶體，未列入預設規模與基準檔，需要時以 --rows 1000000 另行量測。
+
+執行方式：
+    MONTH_END_BENCH_ROWS=10000 python -m pytest tests/benchmarks/test_month_end_benchmark.py -v -s -m slow
+    python -m tests.benchmarks.test_month_end_benchmark --rows 10000 100000 --save
+    python -m tests.benchmarks.test_month_end_benchmark --rows 1000000            # 記憶體足夠時
+    python -m tests.benchmarks.test_month_end_benchmark --rows 100000 --compare
+    python -m tests.benchmarks.test_month_end_benchmark --case SPX PO 100000   # 單一組合，輸出 JSON
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pytest
+
+N_ROWS = int(os.environ.get("MONTH_END_BENCH_ROWS", 1000))
+DEFAULT_SCALES = (10_000, 100_000)
+PROCESSING_DATE = 202512
+REPO_ROOT = Path(__file__).resolve().parents[2]
+BASELINE_PATH = Path(__file__).resolve().parent / 'baselines' / 'month_end_baseline.json'
+
+CASES = (('SPX', 'PO'), ('SPX', 'PR'), ('SPT', 'PO'), ('SPT', 'PR'), ('SCT', 'PO'), ('SCT', 'PR'))
+
+# 需實際檔案或線上資料的步驟
+SKIPPED_STEPS = ('ClosingListIntegration', 'DataShapeSummary')
+
+# 量測項目 → 對應步驟名稱判斷
+STEP_METRICS = {
+    'date_logic': lambda name: name == 'DateLogic',
+    'previous_workpaper': lambda name: name == 'PreviousWorkpaperIntegration',
+    'account_prediction': lambda name: name.endswith('AccountPrediction'),
+    'export': lambda name: name.endswith('Export'),
+}
+
+# 耗時超過基準此倍數視為退化；低於下限的量測值雜訊過大，不列入比較
+REGRESSION_THRESHOLD = 1.3
+MIN_COMPARABLE_SECONDS = 0.05
+
+
+def _build_pipeline(entity: str, proc_type: str, output_dir: Path):
+    """建立 orchestrator pipeline，移除載入與線上資料步驟，匯出改寫入 output_dir"""
+    from accrual_bot.tasks.sct import SCTPipelineOrchestrator
+    from accrual_bot.tasks.spt import SPTPipelineOrchestrator
+    from accrual_bot.tasks.spx import SPXPipelineOrchestrator
+
+    orchestrator = {
+        'SPX': SPXPipelineOrchestrator,
+        'SPT': SPTPipelineOrchestrator,
+        'SCT': SCTPipelineOrchestrator,
+    }[entity]()
+    if proc_type == 'PO':
+        pipeline = orchestrator.build_po_pipeline({})
+    else:
+        pipeline = orchestrator.build_pr_pipeline({})
+
+    for step in list(pipeline.steps):
+        if step.name.endswith('DataLoading') or step.name in SKIPPED_STEPS:
+            pipeline.remove_step(step.name)
+        elif hasattr(step, 'output_dir'):
+            step.output_dir = type(step.output_dir)(output_dir)
+    pipeline.config.stop_on_error = False
+    return pipeline
+
+
+def _time_condition_engines(pipeline) -> Dict[str, float]:
+    """包裝各步驟的 ConditionEngine.apply_rules，累計呼叫次數與耗時"""
+    timings = {'seconds': 0.0, 'calls': 0}
+    for step in pipeline.steps:
+        engine = getattr(step, 'engine', None)
+        if engine is None or not hasattr(engine, 'apply_rules'):
+            continue
+
+        def timed(*args, _apply_rules=engine.apply_rules, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _apply_rules(*args, **kwargs)
+            finally:
+                timings['seconds'] += time.perf_counter() - start
+                timings['calls'] += 1
+
+        engine.apply_rules = timed
+    return timings
+
+
+async def _load_csv(csv_path: Path) -> pd.DataFrame:
+    from accrual_bot.core.datasources.config import DataSourceConfig, DataSourceType
+    from accrual_bot.core.datasources.csv_source import CSVSource
+
+    source = CSVSource(DataSourceConfig(
+        source_type=DataSourceType.CSV,
+        connection_params={'file_path': str(csv_path), 'dtype': str},
+    ))
+    return await source.read()
+
+
+def _build_context(df: pd.DataFrame, auxiliary: Dict[str, pd.DataFrame], entity: str, proc_type: str):
+    from accrual_bot.core.pipeline.context import ProcessingContext
+
+    context = ProcessingContext(df, entity, PROCESSING_DATE, proc_type)
+    context.set_variable('processing_date', PROCESSING_DATE)
+    context.set_variable('processing_month', PROCESSING_DATE % 100)
+    context.set_variable('file_paths', {f'raw_{proc_type.lower()}': 'synthetic'})
+    for name, data in auxiliary.items():
+        context.add_auxiliary_data(name, data)
+    if entity == 'SPX' and proc_type == 'PO':
+        # 櫃體 / Kiosk 驗收資料需實際檔案；匯出仍需寫出對應工作表
+        for name in ('locker_non_discount', 'locker_discount', 'kiosk_data'):
+            context.add_auxiliary_data(name, pd.DataFrame())
+    return context
+
+
+def run_case(entity: str, proc_type: str, n_rows: int, output_dir: Path) -> dict:
+    """執行單一（實體, 類型, 列數）組合並回傳量測摘要"""
+    from tests.fixtures.test_data_generators import (
+        create_month_end_auxiliary,
+        create_month_end_dataset,
+    )
+
+    output_dir = Path(output_dir)
+    raw = create_month_end_dataset(entity, proc_type, n_rows, PROCESSING_DATE)
+    auxiliary = create_month_end_auxiliary(raw, entity, proc_type, PROCESSING_DATE)
+
+    csv_path = output_dir / f'{entity}_{proc_type}_{n_rows}_raw.csv'
+    raw.to_csv(csv_path, index=False)
+    del raw
+    start = time.perf_counter()
+    df = asyncio.run(_load_csv(csv_path))
+    metrics = {'load_csv': time.perf_counter() - start}
+
+    pipeline = _build_pipeline(entity, proc_type, output_dir)
+    engine_timings = _time_condition_engines(pipeline)
+    context = _build_context(df, auxiliary, entity, proc_type)
+    del df
+
+    start = time.perf_counter()
+    result = asyncio.run(pipeline.execute(context))
+    metrics['pipeline'] = time.perf_counter() - start
+
+    steps = {r['step_name']: r['duration'] for r in result['results']}
+    for metric, matches in STEP_METRICS.items():
+        durations = [seconds for name, seconds in steps.items() if matches(name)]
+        if durations:
+            metrics[metric] = sum(durations)
+    if engine_timings['calls']:
+        metrics['condition_engine'] = engine_timings['seconds']
+
+    return {
+        'entity': entity,
+        'processing_type': proc_type,
+        'rows': n_rows,
+        'output_rows': len(context.data),
+        'metrics': {k: round(v, 3) for k, v in metrics.items()},
+        'steps': {k: round(v, 3) for k, v in steps.items()},
+        'condition_engine_calls': engine_timings['calls'],
+        'peak_rss_mb': _peak_rss_mb(),
+        'failed_steps': [r['step_name'] for r in result['results'] if r['status'] == 'failed'],
+    }
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """行程尖峰 RSS（MB）；resource 模組不存在（Windows）時改用 psutil，皆無法取得時為 None"""
+    from accrual_bot.core.pipeline.profiler import peak_rss_mb
+
+    peak = peak_rss_mb()
+    return round(peak, 1) if peak is not None else None
+
+
+def _run_in_subprocess(entity: str, proc_type: str, n_rows: int, cwd: Path) -> dict:
+    """於獨立子行程執行單一組合"""
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    proc = subprocess.run(
+        [sys.executable, '-m', 'tests.benchmarks.test_month_end_benchmark',
+         '--case', entity, proc_type, str(n_rows)],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def case_key(summary: dict) -> str:
+    return f"{summary['entity']}_{summary['processing_type']}_{summary['rows']}"
+
+
+def machine_info() -> dict:
+    """記錄基準產生環境，跨機器比較時僅供參考"""
+    return {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'cpu_count': os.cpu_count(),
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict:
+    if not path.exists():
+        return {'machine': {}, 'results': {}}
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def save_baseline(summaries: List[dict], path: Path = BASELINE_PATH) -> None:
+    """將量測結果合併寫入基準檔（同一組合覆蓋舊值；各步驟耗時一併保存供追查）"""
+    baseline = load_baseline(path)
+    baseline['machine'] = machine_info()
+    for summary in summaries:
+        baseline['results'][case_key(summary)] = {
+            'metrics': summary['metrics'],
+            'steps': summary['steps'],
+            'peak_rss_mb': summary['peak_rss_mb'],
+        }
+    baseline['results'] = dict(sorted(baseline['results'].items()))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+
+
+def find_regressions(summary: dict, baseline: dict,
+                     threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """與基準比較，回傳耗時超過門檻倍數的項目描述；基準無此組合時回傳空清單"""
+    reference = baseline.get('results', {}).get(case_key(summary))
+    if not reference:
+        return []
+    regressions = []
+    for metric, seconds in summary['metrics'].items():
+        base = reference['metrics'].get(metric)
+        if base is None or max(base, seconds) < MIN_COMPARABLE_SECONDS:
+            continue
+        if seconds > base * threshold:
+            regressions.append(f"{case_key(summary)} {metric}: {base:.3f}s → {seconds:.3f}s "
+                               f"(x{seconds / max(base, 1e-9):.2f})")
+    return regressions
+
+
+def format_summary(summary: dict) -> str:
+    metrics = ', '.join(f'{k}={v:.3f}s' for k, v in summary['metrics'].items())
+    peak = summary['peak_rss_mb']
+    return f"[{case_key(summary)}] {metrics}, peak RSS={'n/a' if peak is None else f'{peak}MB'}"
+
+
+@pytest.mark.slow
+class TestMonthEndBenchmark:
+    """月結規模各實體 pipeline 效能量測"""
+
+    @pytest.mark.parametrize('entity, proc_type', CASES)
+    def test_pipeline(self, entity, proc_type, tmp_path):
+        """完整 pipeline 無失敗步驟，並列出各量測項目與基準比較結果"""
+        summary = run_case(entity, proc_type, N_ROWS, tmp_path)
+
+        print('\n' + format_summary(summary))
+        for line in find_regressions(summary, load_baseline()):
+            print(f'  regression: {line}')
+        assert summary['failed_steps'] == []
+        assert summary['output_rows'] > 0
+        assert {'load_csv', 'pipeline', 'date_logic', 'previous_workpaper'} <= set(summary['metrics'])
+        if entity != 'SCT':
+            assert 'export' in summary['metrics']
+
+    def test_find_regressions(self):
+        """超過門檻者列為退化，雜訊下限以下與基準缺漏者略過"""
+        summary = {'entity': 'SPX', 'processing_type': 'PO', 'rows': 10,
+                   'metrics': {'pipeline': 2.0, 'date_logic': 0.04, 'export': 1.0}}
+        baseline = {'results': {'SPX_PO_10': {'metrics': {'pipeline': 1.0, 'date_logic': 0.01}}}}
+
+        regressions = find_regressions(summary, baseline)
+
+        assert len(regressions) == 1
+        assert regressions[0].startswith('SPX_PO_10 pipeline')
+        assert find_regressions(summary, {'results': {}}) == []
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='月結規模效能基準')
+    parser.add_argument('--rows', type=int, nargs='+', default=list(DEFAULT_SCALES), help='列數規模')
+    parser.add_argument('--entities', nargs='+', default=['SPX', 'SPT', 'SCT'], help='實體')
+    parser.add_argument('--types', nargs='+', default=['PO', 'PR'], help='處理類型')
+    parser.add_argument('--save', action='store_true', help='將結果寫入基準檔')
+    parser.add_argument('--compare', action='store_true', help='與基準檔比較，退化時以代碼 1 結束')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help='退化倍數門檻')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help='基準檔路徑')
+    parser.add_argument('--case', nargs=3, metavar=('ENTITY', 'TYPE', 'ROWS'),
+                        help='於本行程執行單一組合並輸出 JSON（子行程入口）')
+    args = parser.parse_args(argv)
+
+    if args.case:
+        entity, proc_type, rows = args.case
+        with tempfile.TemporaryDirectory() as tmp:
+            print(json.dumps(run_case(entity, proc_type, int(rows), Path(tmp)), ensure_ascii=False))
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    summaries, regressions = [], []
+    for rows in args.rows:
+        for entity, proc_type in CASES:
+            if entity not in args.entities or proc_type not in args.types:
+                continue
+            with tempfile.TemporaryDirectory() as tmp:
+                summary = _run_in_subprocess(entity, proc_type, rows, Path(tmp))
+            summaries.append(summary)
+            print(format_summary(summary), flush=True)
+            if summary['failed_steps']:
+                print(f"  failed steps: {summary['failed_steps']}")
+            if args.compare:
+                found = find_regressions(summary, baseline, args.threshold)
+                regressions.extend(found)
+                for line in found:
+                    print(f'  regression: {line}')
+
+    if args.save:
+        save_baseline(summaries, args.baseline)
+        print(f'baseline saved: {args.baseline}')
+    if args.compare:
+        print(f'{len(regressions)} regression(s) over x{args.threshold}')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+會計與 OPS 底稿比對（AccountingOPSValidationStep）效能比較
+
+以一年份（12 個驗收月份）的合成 OPS 驗收明細與會計底稿，比較逐儲存格 / 逐列的
+舊寫法與欄位式（str.contains 遮罩 + pd.to_numeric、單次 str.extract）實作，
+確認兩者結果一致，並量測逐月執行整年比對驗證的時間。
+
+執行方式：
+    OPS_BENCH_ROWS=20000 python -m pytest tests/benchmarks/test_ops_memo_validation_benchmark.py -v -s -m slow
+"""
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from accrual_bot.core.pipeline.base import StepStatus
+from accrual_bot.core.pipeline.context import ProcessingContext
+from accrual_bot.tasks.spx.steps.spx_ppe_qty_validation import AccountingOPSValidationStep
+
+ROWS_PER_MONTH = int(os.environ.get("OPS_BENCH_ROWS", 2000))
+MONTHS = pd.date_range('2025-01-01', periods=12, freq='MS')
+PROCESSING_DATES = [202502 + i for i in range(11)] + [202601]
+
+LOCKER_COLUMNS = [
+    'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K',
+    'DA', '控制系統', 'XA', 'XB', 'XC', 'XD', 'XE', 'XF', 'XA30', 'XC30', 'XG',
+    '超出櫃體安裝費', '超出櫃體運費', '裝運費'
+]
+AMOUNT_COLUMNS = [col for col in LOCKER_COLUMNS if col != '控制系統']
+DESCRIPTION_TYPES = ['A', 'B', 'C', 'XA', 'XA30', '控制主機', '控制主櫃', '安裝運費', '超出櫃體運費']
+
+
+def _legacy_aggregate_ops(step: AccountingOPSValidationStep, df_ops: pd.DataFrame):
+    """舊寫法：astype('string') 後逐儲存格 map 判斷 REF"""
+    existing_amount_cols = [col for col in step.amount_columns if col in df_ops.columns]
+    df_num = (df_ops[['PO單號'] + LOCKER_COLUMNS]
+              .set_index('PO單號')
+              .astype('string')
+              .fillna('0')
+              .replace('', '0')
+              .map(lambda x: '0' if 'REF' in x else x)
+              .astype('Float64')
+              .reset_index())
+    df_agg = df_num.groupby('PO單號', as_index=False)[step.amount_columns].sum()
+    exclude_fee_cols = [col for col in existing_amount_cols if '費' not in col]
+    df_agg['ops_locker_count'] = df_agg[exclude_fee_cols].sum(axis=1)
+    df_agg_wide = df_agg.melt(
+        id_vars='PO單號', value_vars=step.amount_columns,
+        var_name='locker_type', value_name='num/amt'
+    ).rename(columns={'PO單號': 'po_number'})
+    df_result = df_agg[['PO單號', 'ops_locker_count']].rename(columns={'PO單號': 'po_number'})
+    return df_result, df_agg_wide
+
+
+def _legacy_extract_locker_type(step: AccountingOPSValidationStep, descriptions: pd.Series) -> pd.Series:
+    """舊寫法：逐列 re.search 後三次 str.replace"""
+    def extract_locker_info(text):
+        if not isinstance(text, str):
+            return None
+        match = re.search(step.locker_pattern, text)
+        return match.group(1).strip() if match else None
+
+    return (descriptions.apply(extract_locker_info)
+            .str.replace('主機', '主櫃')
+            .str.replace('控制主櫃', 'DA')
+            .str.replace('安裝運費', '裝運費'))
+
+
+def _best_of(func, rounds: int = 2) -> float:
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.fixture(scope='module')
+def ops_year() -> pd.DataFrame:
+    """一年份 OPS 驗收明細（欄位值為字串，含空白 / REF / 空值）"""
+    rng = np.random.default_rng(42)
+    n_rows = ROWS_PER_MONTH * len(MONTHS)
+    n_pos = max(n_rows // 4, 1)
+    df = pd.DataFrame({
+        'PO單號': rng.choice([f'PO{i:07d}' for i in range(n_pos)], n_rows),
+        '驗收月份': np.repeat(MONTHS, ROWS_PER_MONTH),
+    })
+    cell_values = np.array(['', '1', '2', '3', '0', 'REF#PO', None], dtype=object)
+    for col in LOCKER_COLUMNS:
+        df[col] = rng.choice(cell_values, n_rows, p=[0.5, 0.2, 0.1, 0.05, 0.05, 0.05, 0.05])
+    return df
+
+
+@pytest.fixture(scope='module')
+def accounting(ops_year) -> pd.DataFrame:
+    """對應 OPS 單號的會計底稿（Item Description 含 locker 類型）"""
+    rng = np.random.default_rng(7)
+    po_numbers = ops_year['PO單號'].unique()
+    n_rows = len(po_numbers) * 3
+    types = rng.choice(DESCRIPTION_TYPES, n_rows)
+    return pd.DataFrame({
+        'po_number': np.repeat(po_numbers, 3),
+        'item_description': [f'門市智取櫃工程SPX locker {t} 第一期款項 #tag' for t in types],
+        '累計至本期驗收數量/金額': rng.choice(['1', '2', '3', ''], n_rows),
+    })
+
+
+@pytest.mark.slow
+class TestOPSMemoValidationBenchmark:
+    """舊寫法與欄位式實作的效能比較"""
+
+    def test_aggregate_ops_data(self, ops_year):
+        """OPS locker 欄位轉數值與依單號聚合"""
+        step = AccountingOPSValidationStep(amount_columns=AMOUNT_COLUMNS)
+
+        legacy = _best_of(lambda: _legacy_aggregate_ops(step, ops_year))
+        current = _best_of(lambda: step._aggregate_ops_data(ops_year))
+        print(f"\n[{len(ops_year)} OPS rows] aggregate: legacy={legacy:.3f}s, "
+              f"columnar={current:.3f}s ({legacy / current:.1f}x)")
+
+        expected = _legacy_aggregate_ops(step, ops_year)
+        result = step._aggregate_ops_data(ops_year)
+        pd.testing.assert_frame_equal(result[0], expected[0])
+        pd.testing.assert_frame_equal(result[1], expected[1])
+
+    def test_extract_locker_type(self, accounting):
+        """會計底稿 locker_type 提取"""
+        step = AccountingOPSValidationStep()
+        descriptions = accounting['item_description']
+
+        legacy = _best_of(lambda: _legacy_extract_locker_type(step, descriptions))
+        current = _best_of(lambda: step._extract_locker_type(accounting.copy()))
+        print(f"\n[{len(accounting)} accounting rows] extract: legacy={legacy:.3f}s, "
+              f"columnar={current:.3f}s ({legacy / current:.1f}x)")
+
+        expected = _legacy_extract_locker_type(step, descriptions)
+        result = step._extract_locker_type(accounting.copy())['locker_type']
+        assert result.fillna('<NA>').tolist() == expected.fillna('<NA>').tolist()
+
+    @pytest.mark.asyncio
+    async def test_validate_year_by_month(self, ops_year, accounting):
+        """同一份 OPS 底稿逐月執行整年比對驗證"""
+        step = AccountingOPSValidationStep(amount_columns=AMOUNT_COLUMNS)
+
+        start = time.perf_counter()
+        for processing_date in PROCESSING_DATES:
+            context = ProcessingContext(
+                data=pd.DataFrame(),
+                entity_type='SPX',
+                processing_date=processing_date,
+                processing_type='PPE',
+            )
+            context.add_auxiliary_data('accounting_workpaper', accounting)
+            context.add_auxiliary_data('ops_validation', ops_year)
+            result = await step.execute(context)
+            assert result.status == StepStatus.SUCCESS
+        elapsed = time.perf_counter() - start
+
+        print(f"\n[{len(ops_year)} OPS rows x {len(PROCESSING_DATES)} months] "
+              f"validate: {elapsed:.3f}s ({elapsed / len(PROCESSING_DATES):.3f}s/month)")
@@ -4,6 +4,15 @@ import pandas as pd
 from unittest.mock import Mock, AsyncMock, patch
 from accrual_bot.core.pipeline.context import ProcessingContext
 from accrual_bot.utils.config import config_manager
+from accrual_bot.core.datasources.ingest_cache import IngestCache, set_ingest_cache
+
+
+@pytest.fixture(autouse=True)
+def _disable_ingest_cache():
+    """測試預設停用輸入檔案快取，避免寫入工作目錄並互相影響"""
+    set_ingest_cache(IngestCache(enabled=False))
+    yield
+    set_ingest_cache(None)
 
 
 @pytest.fixture
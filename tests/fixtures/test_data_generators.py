@@ -197,3 +197,246 @@ def create_erm_scenario(scenario: str) -> pd.DataFrame:
         df['Entry Prepay Amount'] = ['5000', '10000', '0', '0']
 
     return df
+
+
+# ---------------------------------------------------------------------------
+# 月結規模合成資料（效能基準測試用）
+# ---------------------------------------------------------------------------
+
+_MONTH_ABBR = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+# 依真實摘要常見寫法整理：起迄年月、單月、起迄日期、無日期、錯誤日期
+_ITEM_DESCRIPTION_TEMPLATES = (
+    '{ym}-{ym2} SPX 倉庫租金',
+    '{ym} 門市租金',
+    'SVP_SPX 智取櫃 Locker 租賃 {ym}-{ym2}',
+    '{ym} SPX 裝修工程 第一期款項',
+    '{ymd}-{ymd2} 物流運費',
+    '{ym} Kiosk 繳費機 維護費',
+    '{ym} 押金 Deposit',
+    '{ym} 訂金',
+    '{ym} 分潤合作',
+    '{ym} Shopee commission',
+    '{ym} AMS commission',
+    '{ym} Payroll',
+    'Office supplies 文具採購',
+    '2025/13 服務費',
+)
+_DESCRIPTION_SITES = ('', ' #中和倉', ' #台中門市', ' #高雄門市', ' #桃園轉運中心', ' #新竹門市')
+
+_MONTH_END_SUPPLIERS = (
+    'TW_台灣松下銷售股份有限公司', 'TW_博辰科技股份有限公司', 'TW_立保科技股份有限公司',
+    'TW_台灣電力股份有限公司', 'TW_新竹物流股份有限公司', 'TW_統一超商股份有限公司',
+    'TW_測試供應商股份有限公司',
+)
+_MONTH_END_REQUESTERS = (
+    'Angel Li (李佳宣)', 'Zoey Li (李涵郁)', 'Kei Chen (陳謹婷)', 'Judy Hsu (許淳方)',
+    'Sherry Wu (吳欣怡)', 'Chen Hung I (陳虹沂)', 'Test User',
+)
+_MONTH_END_ACCOUNTS = ('520036', '620000', '650003', '530016', '199999', '151101', '640000')
+_MONTH_END_DEPARTMENTS = (
+    '001', 'S01 - Marketing & Publishing', 'G42 - Corporate Infrastructure', 'G07 - Project', 'L01 - Logistics',
+)
+# HRIS 產出的單號前綴（SPX 與 SPT 同為 SPTTW）
+_ENTITY_COMPANY = {'SPX': 'SPTTW', 'SPT': 'SPTTW', 'SCT': 'SCTTW'}
+
+
+def _shift_month(yyyymm: int, offset: int) -> tuple:
+    """年月位移，回傳 (年, 月)"""
+    total = (yyyymm // 100) * 12 + (yyyymm % 100 - 1) + offset
+    return total // 12, total % 12 + 1
+
+
+def _item_description_vocabulary(processing_date: int) -> np.ndarray:
+    """展開所有摘要樣板 × 起始月份 × 期間長度組合"""
+    vocab = []
+    for template in _ITEM_DESCRIPTION_TEMPLATES:
+        for offset in range(-6, 3):
+            for span in range(4):
+                y1, m1 = _shift_month(processing_date, offset)
+                y2, m2 = _shift_month(processing_date, offset + span)
+                vocab.append(template.format(
+                    ym=f'{y1}/{m1:02d}', ym2=f'{y2}/{m2:02d}',
+                    ymd=f'{y1}/{m1:02d}/01', ymd2=f'{y2}/{m2:02d}/28',
+                ))
+    return np.array(sorted(set(vocab)), dtype=object)
+
+
+def create_month_end_dataset(
+    entity: str = 'SPX',
+    proc_type: str = 'PO',
+    n_rows: int = 10000,
+    processing_date: int = 202512,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    產生月結規模的原始 PO/PR 資料（效能基準測試用）
+
+    與上方小型產生器不同，所有欄位以向量化方式產生，百萬列亦可在數秒內完成；
+    單據含多個明細行，摘要依真實寫法混合起迄年月、單月、起迄日期、無日期與錯誤日期，
+    產品代碼依實體混入 SPX / 非 SPX 前綴，讓 ProductFilter 與狀態判斷走到各分支。
+
+    Args:
+        entity: 'SPX' / 'SPT' / 'SCT'
+        proc_type: 'PO' / 'PR'
+        n_rows: 列數
+        processing_date: 結帳年月 (YYYYMM)
+        seed: 亂數種子，相同參數產出相同資料
+    """
+    rng = np.random.default_rng(seed)
+    company = _ENTITY_COMPANY.get(entity, entity)
+
+    # 單據號碼：每張單據 1~8 行明細，號碼連續
+    lines_per_doc = rng.integers(1, 9, size=n_rows)
+    doc_no = np.repeat(np.arange(n_rows), lines_per_doc)[:n_rows]
+    line_no = pd.Series(doc_no).groupby(doc_no).cumcount().to_numpy() + 1
+    doc_ids = pd.Series(doc_no).map(lambda i: f'{company}-{proc_type}{i:08d}')
+
+    descriptions = _item_description_vocabulary(processing_date)
+    sites = np.array(_DESCRIPTION_SITES, dtype=object)
+    item_description = (
+        pd.Series(descriptions[rng.integers(0, len(descriptions), n_rows)])
+        + sites[rng.integers(0, len(sites), n_rows)]
+    )
+
+    codes = pd.Series(rng.integers(0, 500, n_rows)).map('{:03d}'.format)
+    other = rng.random(n_rows) < 0.1
+    if entity == 'SPX':
+        product_code = np.where(other, 'LG_OTHER_', 'LG_SPX_') + codes
+    elif entity == 'SPT':
+        product_code = np.where(other, 'LG_SPX_', 'SPT') + codes
+    else:
+        product_code = f'{entity}' + codes
+
+    entry_qty = rng.integers(1, 500, n_rows)
+    # 收貨進度：未收 / 部分 / 全收；請款不超過收貨
+    received_ratio = rng.choice([0.0, 0.5, 1.0], size=n_rows, p=[0.3, 0.2, 0.5])
+    received_qty = np.floor(entry_qty * received_ratio).astype(int)
+    billed_qty = np.floor(received_qty * rng.choice([0.0, 1.0], size=n_rows, p=[0.4, 0.6])).astype(int)
+    unit_price = rng.uniform(100, 10000, n_rows).round(2)
+
+    erm_offset = rng.integers(-6, 3, n_rows)
+    erm = pd.Series([
+        f'{_MONTH_ABBR[m - 1]}-{y % 100:02d}'
+        for y, m in (_shift_month(processing_date, o) for o in range(-6, 3))
+    ])[erm_offset + 6].to_numpy()
+
+    df = pd.DataFrame({
+        f'{proc_type}#': doc_ids,
+        'Line#': line_no.astype(str),
+        'GL#': rng.choice(_MONTH_END_ACCOUNTS, n_rows),
+        'Product Code': product_code,
+        'Item Description': item_description,
+        f'{proc_type} Supplier': rng.choice(_MONTH_END_SUPPLIERS, n_rows),
+        'Requester': rng.choice(_MONTH_END_REQUESTERS, n_rows),
+        'Department': rng.choice(_MONTH_END_DEPARTMENTS, n_rows),
+        'Entry Quantity': entry_qty.astype(str),
+        'Billed Quantity': billed_qty.astype(str),
+        'Unit Price': unit_price.astype(str),
+        'Entry Amount': (entry_qty * unit_price).round(2).astype(str),
+        'Entry Billed Amount': (billed_qty * unit_price).round(2).astype(str),
+        'Currency': rng.choice(['TWD', 'TWD', 'TWD', 'USD'], n_rows),
+        'Expected Receive Month': erm,
+    })
+    if proc_type == 'PO':
+        df.insert(1, 'PR#', doc_ids.str.replace('-PO', '-PR', regex=False))
+        df['Received Quantity'] = received_qty.astype(str)
+        df['Entry Prepay Amount'] = '0'
+    else:
+        # PR 匯出檔另有的流程欄位
+        df['PR Link'] = 'https://pr.example.com/' + doc_ids
+        df['Region'] = 'TW'
+        df['Description'] = item_description
+        df['Status'] = rng.choice(['Approved', 'Pending', 'Closed'], n_rows)
+        df['Total Amount'] = df['Entry Amount']
+        df['Last Action Date'] = '2025/12/15'
+        df['PIA'] = pd.NA
+        df['Category'] = 'General'
+        df['RGN'] = 'TW'
+        df['PO Number'] = pd.NA
+    return df
+
+
+def create_month_end_auxiliary(
+    df: pd.DataFrame,
+    entity: str = 'SPX',
+    proc_type: str = 'PO',
+    processing_date: int = 202512,
+    seed: int = 0,
+) -> dict:
+    """
+    依 create_month_end_dataset 的主資料產生對應的輔助資料
+
+    前期底稿與採購底稿各涵蓋約一半明細行，AP Invoice 涵蓋約三成 PO 明細，
+    SPX 另附約 1% 單據的關單清單；鍵值格式與 ColumnAdditionStep 產生的
+    PO Line / PR Line 一致。
+
+    Returns:
+        dict: 輔助資料名稱 → DataFrame（previous / previous_pr / procurement_po /
+        procurement_pr / ap_invoice / closing_list / reference_account / reference_liability）
+    """
+    rng = np.random.default_rng(seed + 1)
+    id_col = f'{proc_type}#'
+    line_key = df[id_col] + '-' + df['Line#']
+    n_rows = len(df)
+
+    sampled = rng.random(n_rows) < 0.5
+    previous = pd.DataFrame({
+        f'{proc_type} Line': line_key[sampled].to_numpy(),
+        'Remarked by FN': rng.choice(['已完成', '未完成', 'Check 收貨', pd.NA], int(sampled.sum())),
+        'Noted by FN': 'note',
+    })
+    procurement = pd.DataFrame({
+        f'{proc_type} Line': line_key[~sampled].to_numpy(),
+        'Remarked by Procurement': rng.choice(['已完成', '未完成', 'Pending'], int((~sampled).sum())),
+        'Noted by Procurement': 'note',
+    })
+
+    aux = {
+        'previous' if proc_type == 'PO' else 'previous_pr': previous,
+        'procurement_po' if proc_type == 'PO' else 'procurement_pr': procurement,
+        'reference_account': pd.DataFrame({
+            'Account': list(_MONTH_END_ACCOUNTS),
+            'Account Desc': [f'Account {a}' for a in _MONTH_END_ACCOUNTS],
+        }),
+        'reference_liability': pd.DataFrame({
+            'Account': list(_MONTH_END_ACCOUNTS),
+            'Liability': ['200000'] * len(_MONTH_END_ACCOUNTS),
+        }),
+    }
+
+    if proc_type == 'PO':
+        invoiced = rng.random(n_rows) < 0.3
+        doc = df.loc[invoiced, id_col].str.split('-', n=1, expand=True)
+        periods = [
+            f'{_MONTH_ABBR[m - 1]}-{y % 100:02d}'
+            for y, m in (_shift_month(processing_date, o) for o in range(-3, 1))
+        ]
+        aux['ap_invoice'] = pd.DataFrame({
+            'Company': doc[0].to_numpy(),
+            'PO Number': doc[1].to_numpy(),
+            'PO_LINE_NUMBER': df.loc[invoiced, 'Line#'].to_numpy(),
+            'Period': rng.choice(periods, int(invoiced.sum())),
+            'Match Type': rng.choice(['ITEM_TO_RECEIPT', 'ITEM_TO_PO', pd.NA], int(invoiced.sum())),
+            'VOUCHER_NUMBER': [f'V{i:08d}' for i in range(int(invoiced.sum()))],
+        })
+
+    if entity == 'SPX':
+        # 關單清單單號不含前綴；整張關與指定行號關各半，已關單者有 FN 註記
+        docs = df[id_col].drop_duplicates()
+        docs = docs[rng.random(len(docs)) < 0.01].str.split('-', n=1).str[1].to_numpy()
+        n_docs = len(docs)
+        aux['closing_list'] = pd.DataFrame({
+            'date': '2025/12/01',
+            'type': '關單',
+            'po_no': docs if proc_type == 'PO' else pd.NA,
+            'requester': rng.choice(_MONTH_END_REQUESTERS, n_docs),
+            'supplier': rng.choice(_MONTH_END_SUPPLIERS, n_docs),
+            'line_no': rng.choice(['ALL', 'Line 1', 'Line 1、2'], n_docs),
+            'reason': '專案取消',
+            'new_pr_no': docs if proc_type == 'PR' else [f'PR{i:08d}' for i in range(n_docs)],
+            'remark': pd.NA,
+            'done_by_fn': rng.choice(['V', pd.NA], n_docs),
+        })
+    return aux
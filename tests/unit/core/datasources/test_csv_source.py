@@ -133,6 +133,15 @@ class TestCSVSource:
         total_rows = sum(len(c) for c in chunks)
         assert total_rows == 5
 
+    @pytest.mark.asyncio
+    async def test_iter_chunks_streams_with_continuous_index(self, csv_source):
+        sizes, index = [], []
+        async for chunk in csv_source.iter_chunks(chunk_size=2):
+            sizes.append(len(chunk))
+            index.extend(chunk.index.tolist())
+        assert sizes == [2, 2, 1]
+        assert index == [0, 1, 2, 3, 4]
+
     @pytest.mark.asyncio
     async def test_append_data_to_existing(self, csv_source, sample_csv):
         new_data = pd.DataFrame({
@@ -160,6 +160,7 @@ class TestDataSourceConfigSerialization:
             'source_type', 'connection_params', 'cache_enabled',
             'lazy_load', 'encoding', 'chunk_size',
             'cache_ttl_seconds', 'cache_max_items', 'cache_eviction_policy',
+            'cache_max_bytes', 'cache_copy_on_read',
         }
         assert set(d.keys()) == expected_keys
         # source_type 應為字串值
@@ -0,0 +1,117 @@
+"""
+DuckDBSource 單元測試（連接池 / 資源設定 / Arrow 讀取）
+"""
+
+import pytest
+import pandas as pd
+import pyarrow as pa
+
+from accrual_bot.core.datasources.duckdb_source import DuckDBSource, DuckDBConnectionPool
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'sample.duckdb')
+
+
+@pytest.fixture
+async def file_source(db_path):
+    source = DuckDBSource.create_file_db(db_path, threads=2, memory_limit='256MB')
+    await source.write(pd.DataFrame({'id': range(10), 'name': list('abcdefghij')}), table_name='t')
+    yield source
+    await source.close()
+
+
+@pytest.mark.unit
+class TestDuckDBFilePool:
+    """文件數據庫連接池測試"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_reads_reuse_connection(self, file_source):
+        for i in range(20):
+            df = await file_source.read(f"SELECT * FROM t WHERE id = {i % 10}")
+            assert len(df) == 1
+
+        stats = file_source.get_metadata()['pool']
+        assert stats['created'] == 1
+        assert stats['reused'] >= 20
+        # 健康檢查為延遲執行，連續操作不應觸發
+        assert stats['health_checks'] == 0
+
+    @pytest.mark.asyncio
+    async def test_resource_settings_from_connection_params(self, file_source):
+        df = await file_source.read(
+            "SELECT current_setting('threads') AS threads, current_setting('memory_limit') AS mem"
+        )
+        assert int(df.loc[0, 'threads']) == 2
+        assert df.loc[0, 'mem'].startswith('244')  # 256MB = 244.1 MiB
+
+    @pytest.mark.asyncio
+    async def test_failed_operation_forces_health_check(self, file_source):
+        with pytest.raises(Exception):
+            await file_source.execute("SELECT * FROM missing_table")
+        await file_source.read("SELECT 1 AS x")
+
+        assert file_source.get_metadata()['pool']['health_checks'] >= 1
+
+    @pytest.mark.asyncio
+    async def test_close_releases_pool(self, db_path):
+        source = DuckDBSource.create_file_db(db_path)
+        await source.write(pd.DataFrame({'a': [1]}), table_name='t')
+        await source.close()
+
+        assert source._pool.get_stats()['closed'] is True
+        with pytest.raises(RuntimeError):
+            source._pool.acquire()
+
+    @pytest.mark.asyncio
+    async def test_pool_size_zero_uses_temporary_connections(self, db_path):
+        source = DuckDBSource.create_file_db(db_path, pool_size=0)
+        await source.write(pd.DataFrame({'a': [1, 2]}), table_name='t')
+        df = await source.read("SELECT * FROM t")
+        await source.close()
+
+        assert len(df) == 2
+        assert 'pool' not in source.get_metadata()
+
+
+@pytest.mark.unit
+class TestDuckDBConnectionPool:
+    """DuckDBConnectionPool 測試"""
+
+    def test_acquire_timeout_when_exhausted(self, db_path):
+        pool = DuckDBConnectionPool(db_path, pool_size=1)
+        conn = pool.acquire()
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.05)
+        pool.release(conn)
+        assert pool.acquire(timeout=0.05) is conn
+        pool.close()
+
+    def test_stale_connection_is_checked(self, db_path):
+        pool = DuckDBConnectionPool(db_path, pool_size=1, health_check_interval=0)
+        with pool.connection():
+            pass
+        with pool.connection() as conn:
+            assert conn.execute("SELECT 1").fetchone() == (1,)
+        assert pool.get_stats()['health_checks'] == 1
+        pool.close()
+
+
+@pytest.mark.unit
+class TestDuckDBReadArrow:
+    """Arrow 讀取測試"""
+
+    @pytest.mark.asyncio
+    async def test_read_arrow_returns_table(self, file_source):
+        table = await file_source.read_arrow("SELECT * FROM t ORDER BY id", limit=3)
+        assert isinstance(table, pa.Table)
+        assert table.column('id').to_pylist() == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_read_arrow_default_table(self, db_path):
+        source = DuckDBSource.create_file_db(db_path, table_name='t')
+        await source.write(pd.DataFrame({'a': [1, 2, 3]}))
+        table = await source.read_arrow()
+        await source.close()
+        assert table.num_rows == 3
@@ -5,8 +5,12 @@ ExcelSource 單元測試
 import pytest
 import pandas as pd
 from pathlib import Path
+from unittest.mock import patch
 
-from accrual_bot.core.datasources.excel_source import ExcelSource
+from accrual_bot.core.datasources.excel_source import (
+    ExcelSource,
+    resolve_excel_engine,
+)
 from accrual_bot.core.datasources.config import DataSourceConfig, DataSourceType
 
 
@@ -258,3 +262,77 @@ class TestExcelSource:
 
         source = ExcelSource(_make_config(str(fp)))
         await source.close()  # 不應拋出例外
+
+
+@pytest.mark.unit
+class TestExcelSourceEngine:
+    """讀取引擎選擇與 fallback 測試"""
+
+    def test_resolve_auto_without_calamine(self):
+        """未安裝 calamine 時 auto 解析為 openpyxl"""
+        with patch("accrual_bot.core.datasources.excel_source.is_calamine_available",
+                   return_value=False):
+            assert resolve_excel_engine("auto") == "openpyxl"
+            assert resolve_excel_engine("calamine") == "openpyxl"
+            assert resolve_excel_engine(None) == "openpyxl"
+
+    def test_resolve_auto_with_calamine(self):
+        """已安裝 calamine 時 auto 優先使用 calamine"""
+        with patch("accrual_bot.core.datasources.excel_source.is_calamine_available",
+                   return_value=True):
+            assert resolve_excel_engine("auto") == "calamine"
+            assert resolve_excel_engine("openpyxl") == "openpyxl"
+
+    def test_resolve_invalid_engine(self):
+        """不支援的引擎拋出 ValueError"""
+        with pytest.raises(ValueError):
+            resolve_excel_engine("xlrd")
+
+    def test_engine_in_metadata(self, tmp_path):
+        """明確指定 openpyxl 時 metadata 記錄實際引擎"""
+        fp = tmp_path / "test.xlsx"
+        _create_sample_excel(fp)
+
+        source = ExcelSource(_make_config(str(fp), engine="openpyxl"))
+
+        assert source.engine == "openpyxl"
+        assert source.get_metadata()["engine"] == "openpyxl"
+
+    @pytest.mark.asyncio
+    async def test_read_falls_back_to_openpyxl(self, tmp_path):
+        """calamine 讀取失敗時改用 openpyxl 重試"""
+        fp = tmp_path / "test.xlsx"
+        expected = _create_sample_excel(fp)
+
+        source = ExcelSource(_make_config(str(fp), engine="openpyxl"))
+        source.engine = "calamine"
+        original = pd.read_excel
+        engines = []
+
+        def fake_read_excel(*args, engine=None, **kwargs):
+            engines.append(engine)
+            if engine == "calamine":
+                raise ImportError("python-calamine not installed")
+            return original(*args, engine=engine, **kwargs)
+
+        with patch("accrual_bot.core.datasources.excel_source.pd.read_excel",
+                   side_effect=fake_read_excel):
+            result = await source.read()
+
+        assert engines == ["calamine", "openpyxl"]
+        pd.testing.assert_frame_equal(result, expected)
+
+    @pytest.mark.asyncio
+    async def test_read_all_sheets_opens_workbook_once(self, tmp_path):
+        """read_all_sheets() 只開啟一次活頁簿並套用讀取參數"""
+        fp = tmp_path / "multi.xlsx"
+        _create_multi_sheet_excel(fp)
+
+        source = ExcelSource(_make_config(str(fp), engine="openpyxl"))
+        with patch("accrual_bot.core.datasources.excel_source.pd.ExcelFile",
+                   wraps=pd.ExcelFile) as excel_file:
+            result = await source.read_all_sheets(dtype=str)
+
+        assert excel_file.call_count == 1
+        assert set(result.keys()) == {"First", "Second"}
+        assert result["First"]["col_a"].tolist() == ["1", "2"]
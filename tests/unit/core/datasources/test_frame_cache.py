@@ -0,0 +1,180 @@
+"""
+DataFrameCache 單元測試
+"""
+
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from accrual_bot.core.datasources.config import DataSourceConfig, DataSourceType
+from accrual_bot.core.datasources.csv_source import CSVSource
+from accrual_bot.core.datasources.factory import DataSourcePool
+from accrual_bot.core.datasources.frame_cache import DataFrameCache
+
+
+def _frame(n: int = 100) -> pd.DataFrame:
+    return pd.DataFrame({"a": [f"value_{i}" for i in range(n)]})
+
+
+def _frame_size(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True).sum())
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    fp = tmp_path / "ref.csv"
+    pd.DataFrame({"Account": ["100", "200"], "Liability": ["A", "B"]}).to_csv(fp, index=False)
+    return fp
+
+
+def _make_source(file_path, **config_kwargs) -> CSVSource:
+    return CSVSource(DataSourceConfig(
+        source_type=DataSourceType.CSV,
+        connection_params={"file_path": str(file_path), "dtype": str},
+        **config_kwargs,
+    ))
+
+
+@pytest.mark.unit
+class TestDataFrameCache:
+    """DataFrameCache LRU / 位元組預算 / copy-on-read 測試"""
+
+    def test_get_miss_and_hit(self):
+        """未命中與命中計數"""
+        cache = DataFrameCache()
+        assert cache.get("k") is None
+
+        cache.put("k", _frame())
+        assert cache.get("k") is not None
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        """超過位元組預算時驅逐最久未使用的條目"""
+        df = _frame()
+        cache = DataFrameCache(max_bytes=_frame_size(df) * 2)
+        cache.put("a", df)
+        cache.put("b", df)
+        cache.get("a")          # a 成為最近使用
+        cache.put("c", df)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.evictions == 1
+        assert cache.total_bytes == _frame_size(df) * 2
+
+    def test_evicts_by_item_count(self):
+        """超過條目上限時驅逐"""
+        cache = DataFrameCache(max_bytes=None, max_items=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, _frame(5))
+
+        assert len(cache) == 2
+        assert "a" not in cache
+
+    def test_oversized_entry_not_stored(self):
+        """單一條目超過預算時不寫入"""
+        cache = DataFrameCache(max_bytes=10)
+        assert cache.put("k", _frame()) is False
+        assert len(cache) == 0
+
+    def test_copy_on_read(self):
+        """copy_on_read=True 時修改返回值不影響快取"""
+        cache = DataFrameCache(copy_on_read=True)
+        cache.put("k", _frame(3))
+
+        first = cache.get("k")
+        first.loc[0, "a"] = "changed"
+
+        assert cache.get("k").loc[0, "a"] == "value_0"
+
+    def test_no_copy_on_read_returns_shared_object(self):
+        """copy_on_read=False 時返回同一物件"""
+        df = _frame(3)
+        cache = DataFrameCache(copy_on_read=False)
+        cache.put("k", df)
+
+        assert cache.get("k") is df
+
+    def test_ttl_expiration(self):
+        """過期條目視為未命中並移除"""
+        cache = DataFrameCache()
+        with patch("accrual_bot.core.datasources.frame_cache.time.monotonic", return_value=100.0):
+            cache.put("k", _frame(), ttl_seconds=10)
+        with patch("accrual_bot.core.datasources.frame_cache.time.monotonic", return_value=111.0):
+            assert cache.get("k") is None
+
+        assert cache.expirations == 1
+        assert cache.total_bytes == 0
+
+    def test_invalidate_prefix(self):
+        """invalidate() 只移除指定前綴的條目"""
+        cache = DataFrameCache()
+        cache.put("src1:a", _frame(2))
+        cache.put("src1:b", _frame(2))
+        cache.put("src2:a", _frame(2))
+
+        assert cache.invalidate("src1:") == 2
+        assert list(cache._entries) == ["src2:a"]
+
+
+@pytest.mark.unit
+class TestDataSourceReadWithCache:
+    """DataSource.read_with_cache 與共用快取測試"""
+
+    @pytest.mark.asyncio
+    async def test_counters_in_metadata(self, csv_file):
+        """命中 / 未命中計數出現在 get_metadata()"""
+        source = _make_source(csv_file)
+        await source.read_with_cache()
+        await source.read_with_cache()
+
+        stats = source.get_metadata()["cache"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["shared"] is False
+
+    @pytest.mark.asyncio
+    async def test_caller_mutation_does_not_leak(self, csv_file):
+        """首次讀取的返回值被修改時不影響快取"""
+        source = _make_source(csv_file)
+        first = await source.read_with_cache()
+        first.loc[0, "Account"] = "999"
+
+        second = await source.read_with_cache()
+        assert second.loc[0, "Account"] == "100"
+
+    @pytest.mark.asyncio
+    async def test_shared_cache_across_pools(self, csv_file):
+        """多個 DataSourcePool 共用快取時相同檔案只解析一次"""
+        shared = DataFrameCache()
+        pool_a, pool_b = DataSourcePool(cache=shared), DataSourcePool(cache=shared)
+        source_a, source_b = _make_source(csv_file), _make_source(csv_file)
+        pool_a.add_source("ref", source_a)
+        pool_b.add_source("ref", source_b)
+
+        with patch.object(CSVSource, "read", wraps=source_a.read) as read:
+            await source_a.read_with_cache()
+            await source_b.read_with_cache()
+
+        assert read.call_count == 1
+        assert pool_b.get_cache_stats()["hits"] == 1
+        assert source_b.get_cache_stats()["shared"] is True
+
+    @pytest.mark.asyncio
+    async def test_clear_cache_only_affects_own_entries(self, csv_file, tmp_path):
+        """clear_cache() 不移除共用快取中其他數據源的條目"""
+        other_file = tmp_path / "other.csv"
+        pd.DataFrame({"x": ["1"]}).to_csv(other_file, index=False)
+        shared = DataFrameCache()
+        source_a, source_b = _make_source(csv_file), _make_source(other_file)
+        source_a.attach_cache(shared)
+        source_b.attach_cache(shared)
+        await source_a.read_with_cache()
+        await source_b.read_with_cache()
+
+        source_a.clear_cache()
+
+        assert len(shared) == 1
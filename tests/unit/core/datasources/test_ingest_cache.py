@@ -0,0 +1,191 @@
+"""
+IngestCache 單元測試
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from accrual_bot.core.datasources.config import DataSourceConfig, DataSourceType
+from accrual_bot.core.datasources.csv_source import CSVSource
+from accrual_bot.core.datasources.excel_source import ExcelSource
+from accrual_bot.core.datasources.ingest_cache import IngestCache, default_cache_dir, resolve_ingest_cache
+
+
+def _make_config(source_type: DataSourceType, file_path, **kwargs) -> DataSourceConfig:
+    return DataSourceConfig(
+        source_type=source_type,
+        connection_params={"file_path": str(file_path), **kwargs},
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return IngestCache(cache_dir=str(tmp_path / "cache"), max_size_mb=10)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    fp = tmp_path / "raw.csv"
+    pd.DataFrame({"PO#": ["PO1", "PO2", "PO3"], "Amount": ["10", "", "30"]}).to_csv(fp, index=False)
+    return fp
+
+
+@pytest.mark.unit
+class TestIngestCache:
+    """IngestCache 鍵值、存取與驅逐測試"""
+
+    def test_key_depends_on_content_and_params(self, cache, csv_file):
+        """鍵值隨檔案內容與讀取參數變化"""
+        key = cache.make_key(csv_file, {"dtype": "str"})
+
+        assert key == cache.make_key(csv_file, {"dtype": "str"})
+        assert key != cache.make_key(csv_file, {"dtype": "str", "usecols": ["PO#"]})
+
+        csv_file.write_text("PO#,Amount\nPO9,99\n")
+        assert key != cache.make_key(csv_file, {"dtype": "str"})
+
+    def test_key_missing_file_returns_none(self, cache, tmp_path):
+        """檔案不存在時不產生鍵值"""
+        assert cache.make_key(tmp_path / "missing.csv", {}) is None
+
+    def test_put_get_roundtrip_restores_nan(self, cache):
+        """讀回的 object 欄位缺失值為 NaN"""
+        df = pd.DataFrame({"a": ["x", np.nan, "z"], "b": [1.0, 2.0, np.nan]})
+
+        assert cache.put("k1", df) is True
+        result = cache.get("k1")
+
+        pd.testing.assert_frame_equal(result, df)
+        assert isinstance(result["a"].iloc[1], float)
+        assert cache.hits == 1
+
+    def test_get_miss(self, cache):
+        """不存在的鍵值計為未命中"""
+        assert cache.get("missing") is None
+        assert cache.misses == 1
+
+    def test_put_unsupported_frame_is_skipped(self, cache):
+        """無法以 Parquet 表示的資料不快取"""
+        assert cache.put("k1", pd.DataFrame({0: ["a"], 1: ["b"]})) is False
+        assert cache.put("k2", pd.DataFrame({"mixed": [1, "a"]})) is False
+        assert cache.get_stats()["entries"] == 0
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        """超過大小上限時移除最久未使用的條目"""
+        df = pd.DataFrame({"a": [str(i) * 50 for i in range(2000)]})
+        probe = IngestCache(cache_dir=str(tmp_path / "probe"))
+        probe.put("probe", df)
+        entry_size = (tmp_path / "probe" / "probe.parquet").stat().st_size
+
+        cache = IngestCache(cache_dir=str(tmp_path / "cache"),
+                            max_size_mb=(entry_size * 2.5) / (1024 * 1024))
+        cache.put("old", df)
+        cache.put("mid", df)
+        # 調整 mtime 確保順序，再讀取 old 使其成為最近使用
+        os.utime(cache._entry_path("old"), ns=(1, 1))
+        os.utime(cache._entry_path("mid"), ns=(2, 2))
+        cache.get("old")
+        cache.put("new", df)
+
+        assert cache._entry_path("old").exists()
+        assert not cache._entry_path("mid").exists()
+        assert cache._entry_path("new").exists()
+        assert cache.evictions == 1
+
+    def test_purge(self, cache):
+        """purge() 刪除所有條目"""
+        cache.put("k1", pd.DataFrame({"a": [1]}))
+        cache.put("k2", pd.DataFrame({"a": [2]}))
+
+        assert cache.purge() == 2
+        assert cache.get_stats()["entries"] == 0
+
+    def test_disabled_cache(self, tmp_path):
+        """停用時不讀寫"""
+        cache = IngestCache(cache_dir=str(tmp_path / "cache"), enabled=False)
+
+        assert cache.put("k1", pd.DataFrame({"a": [1]})) is False
+        assert cache.get("k1") is None
+
+    def test_resolve_ingest_cache(self, cache):
+        """connection_params['ingest_cache'] 解析"""
+        assert resolve_ingest_cache(cache) is cache
+        assert resolve_ingest_cache(False) is None
+        # conftest 已將全域快取停用
+        assert resolve_ingest_cache(None) is None
+
+    def test_default_dir_independent_of_cwd(self, tmp_path, monkeypatch):
+        """未指定目錄時使用使用者快取目錄，不隨目前工作目錄改變"""
+        monkeypatch.setattr(sys, "platform", "linux")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+        monkeypatch.chdir(tmp_path)
+
+        assert IngestCache().cache_dir == tmp_path / "xdg" / "accrual_bot" / "ingest"
+        assert IngestCache(cache_dir="").cache_dir == default_cache_dir()
+
+    def test_default_dir_windows(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(sys, "platform", "win32")
+        monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+
+        assert default_cache_dir() == tmp_path / "accrual_bot" / "cache" / "ingest"
+
+
+@pytest.mark.unit
+class TestIngestCacheSources:
+    """ExcelSource / CSVSource 整合輸入快取"""
+
+    @pytest.mark.asyncio
+    async def test_csv_second_read_hits_cache(self, cache, csv_file):
+        """第二次讀取相同檔案與參數時不重新解析"""
+        first = await CSVSource(_make_config(
+            DataSourceType.CSV, csv_file, dtype=str, ingest_cache=cache)).read()
+
+        with patch("accrual_bot.core.datasources.csv_source.pd.read_csv") as read_csv:
+            second = await CSVSource(_make_config(
+                DataSourceType.CSV, csv_file, dtype=str, ingest_cache=cache)).read()
+
+        read_csv.assert_not_called()
+        pd.testing.assert_frame_equal(first, second)
+        assert cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_csv_different_params_miss(self, cache, csv_file):
+        """讀取參數不同時視為不同條目"""
+        await CSVSource(_make_config(
+            DataSourceType.CSV, csv_file, dtype=str, ingest_cache=cache)).read()
+        result = await CSVSource(_make_config(
+            DataSourceType.CSV, csv_file, usecols=["PO#"], ingest_cache=cache)).read()
+
+        assert list(result.columns) == ["PO#"]
+        assert cache.get_stats()["entries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_excel_second_read_hits_cache(self, cache, tmp_path):
+        """Excel 依工作表與參數快取"""
+        fp = tmp_path / "prev.xlsx"
+        pd.DataFrame({"PO#": ["PO1", "PO2"], "Memo": ["a", None]}).to_excel(
+            fp, index=False, engine="openpyxl")
+
+        source = ExcelSource(_make_config(DataSourceType.EXCEL, fp, ingest_cache=cache))
+        first = await source.read(dtype=str)
+        with patch("accrual_bot.core.datasources.excel_source.pd.read_excel") as read_excel:
+            second = await source.read(dtype=str)
+
+        read_excel.assert_not_called()
+        pd.testing.assert_frame_equal(first, second)
+
+    @pytest.mark.asyncio
+    async def test_cached_result_is_independent(self, cache, csv_file):
+        """修改讀回的資料不影響快取內容"""
+        source = CSVSource(_make_config(DataSourceType.CSV, csv_file, dtype=str, ingest_cache=cache))
+        first = await source.read()
+        first.loc[0, "PO#"] = "changed"
+
+        second = await source.read()
+
+        assert second.loc[0, "PO#"] == "PO1"
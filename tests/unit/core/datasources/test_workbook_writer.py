@@ -0,0 +1,212 @@
+"""
+WorkbookWriter 單元測試
+"""
+
+import gc
+import tracemalloc
+from datetime import date
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from accrual_bot.utils.config import config_manager
+from accrual_bot.core.datasources.workbook_writer import (
+    EXCEL_MAX_ROWS,
+    WorkbookWriter,
+    get_export_settings,
+    write_workbook,
+)
+
+
+@pytest.fixture
+def mixed_df():
+    return pd.DataFrame({
+        "PO#": ["PO1", "PO2", "PO3"],
+        "Entry Amount": [100.5, np.nan, 300.0],
+        "Entry Quantity": [1, 2, 3],
+        "Status": ["已完成", "<NA>", None],
+        "Accrual": [True, False, True],
+        "Expected Date": pd.to_datetime(["2025-01-31", None, "2025-03-15 08:30:00"], format="ISO8601"),
+        "Link": ["https://example.com/po/1", "=SUM(A1:A2)", "0012"],
+    })
+
+
+def _read_back(path, sheet_name=0, **kwargs) -> pd.DataFrame:
+    return pd.read_excel(path, sheet_name=sheet_name, engine="openpyxl", **kwargs)
+
+
+@pytest.mark.unit
+class TestWorkbookWriter:
+    """xlsxwriter 逐列寫出測試"""
+
+    def test_roundtrip_matches_openpyxl_export(self, tmp_path, mixed_df):
+        """與 pandas openpyxl 匯出（先 replace '<NA>'）讀回結果一致"""
+        # openpyxl 會把 '=' 開頭字串寫成公式，不納入比對（見 test_strings_written_verbatim）
+        df = mixed_df.drop(columns=["Link"])
+        new_path = tmp_path / "new.xlsx"
+        old_path = tmp_path / "old.xlsx"
+        with WorkbookWriter(new_path) as writer:
+            writer.write_sheet("PO", df)
+        with pd.ExcelWriter(old_path, engine="openpyxl") as writer:
+            df.replace("<NA>", pd.NA).to_excel(writer, sheet_name="PO", index=False)
+
+        pd.testing.assert_frame_equal(_read_back(new_path), _read_back(old_path))
+
+    def test_strings_written_verbatim(self, tmp_path, mixed_df):
+        """字串不會被轉為公式、超連結或數字"""
+        path = tmp_path / "out.xlsx"
+        with WorkbookWriter(path) as writer:
+            writer.write_sheet("PO", mixed_df)
+
+        result = _read_back(path, dtype={"Link": str})
+        assert result["Link"].tolist() == ["https://example.com/po/1", "=SUM(A1:A2)", "0012"]
+        assert result["Status"].isna().tolist() == [False, True, True]
+
+    def test_multiple_sheets_with_index(self, tmp_path, mixed_df):
+        """多 sheet 依序寫出；index=True 時 index 寫為第一欄"""
+        aux = pd.DataFrame({"count": [3, 5]}, index=pd.Index(["A", "B"], name="locker"))
+        path = tmp_path / "out.xlsx"
+        with WorkbookWriter(path) as writer:
+            writer.write_sheet("PO", mixed_df)
+            writer.write_sheet("locker", aux, index=True)
+
+        assert writer.sheets_written == ["PO", "locker"]
+        assert pd.ExcelFile(path).sheet_names == ["PO", "locker"]
+        result = _read_back(path, sheet_name="locker")
+        assert result.columns.tolist() == ["locker", "count"]
+        assert result["locker"].tolist() == ["A", "B"]
+
+    def test_mixed_object_column(self, tmp_path):
+        """object 欄位混合型別：數字、日期照型別寫出，不支援的型別以文字寫出"""
+        df = pd.DataFrame({"value": ["text", 12, date(2025, 1, 31), {"k": 1}]})
+        path = tmp_path / "out.xlsx"
+        with WorkbookWriter(path) as writer:
+            writer.write_sheet("Sheet1", df)
+
+        values = _read_back(path)["value"].tolist()
+        assert values[0] == "text"
+        assert values[1] == 12
+        assert pd.Timestamp(values[2]) == pd.Timestamp("2025-01-31")
+        assert values[3] == "{'k': 1}"
+
+    def test_empty_frame_writes_header(self, tmp_path):
+        path = tmp_path / "out.xlsx"
+        with WorkbookWriter(path) as writer:
+            writer.write_sheet("Empty", pd.DataFrame(columns=["a", "b"]))
+
+        result = _read_back(path)
+        assert result.columns.tolist() == ["a", "b"]
+        assert result.empty
+
+    def test_block_rows_roundtrip(self, tmp_path, mixed_df):
+        """分批轉換儲存格值時，跨批次的列仍依序寫出"""
+        path = tmp_path / "out.xlsx"
+        with WorkbookWriter(path, block_rows=2) as writer:
+            writer.write_sheet("PO", mixed_df)
+
+        expected = _read_back(path)
+        with WorkbookWriter(tmp_path / "single.xlsx") as writer:
+            writer.write_sheet("PO", mixed_df)
+        pd.testing.assert_frame_equal(expected, _read_back(tmp_path / "single.xlsx"))
+
+    def test_cell_memory_bounded_by_block_rows(self, tmp_path):
+        """暫存的儲存格物件以 block_rows 為上限，不隨列數線性成長"""
+        def peak_mb(n_rows):
+            df = pd.DataFrame({
+                "PO#": [f"PO{i}" for i in range(n_rows)],
+                "Entry Amount": np.arange(n_rows) * 1.5,
+                "Status": ["<NA>", "x"] * (n_rows // 2),
+            })
+            with WorkbookWriter(tmp_path / f"out_{n_rows}.xlsx", block_rows=500) as writer:
+                gc.collect()
+                tracemalloc.start()
+                try:
+                    writer.write_sheet("PO", df)
+                    return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                finally:
+                    tracemalloc.stop()
+
+        peak_mb(500)  # 暖機：排除首次寫入的一次性配置
+        small, large = peak_mb(2_000), peak_mb(16_000)
+        # 列數 8 倍；整欄轉換時尖峰約 5 倍，分批時僅多出每列 1 byte 的 NA 遮罩
+        assert large < small * 2, (small, large)
+
+    def test_row_limit_raises(self, tmp_path):
+        """超過 Excel 列數上限時明確報錯"""
+        df = pd.DataFrame({"a": np.zeros(EXCEL_MAX_ROWS, dtype=np.int8)})
+        with WorkbookWriter(tmp_path / "out.xlsx") as writer:
+            with pytest.raises(ValueError, match="sidecar"):
+                writer.write_sheet("Big", df)
+
+    def test_invalid_options(self, tmp_path):
+        with pytest.raises(ValueError, match="匯出引擎"):
+            WorkbookWriter(tmp_path / "out.xlsx", engine="xlwt")
+        with pytest.raises(ValueError, match="sidecar"):
+            WorkbookWriter(tmp_path / "out.xlsx", sidecar="json")
+
+    def test_close_raises_os_error(self, tmp_path):
+        """無法建立輸出檔時拋出原始 OSError（供匯出步驟重試）"""
+        writer = WorkbookWriter(tmp_path / "missing" / "out.xlsx")
+        writer.write_sheet("PO", pd.DataFrame({"a": [1]}))
+        with pytest.raises(FileNotFoundError):
+            writer.close()
+
+    def test_openpyxl_engine(self, tmp_path, mixed_df):
+        """engine='openpyxl' 退回 pandas ExcelWriter"""
+        path = tmp_path / "out.xlsx"
+        with WorkbookWriter(path, engine="openpyxl") as writer:
+            writer.write_sheet("PO", mixed_df)
+
+        assert _read_back(path)["Status"].isna().tolist() == [False, True, True]
+
+
+@pytest.mark.unit
+class TestWorkbookSidecar:
+    """CSV / Parquet sidecar 輸出測試"""
+
+    def test_csv_sidecar(self, tmp_path, mixed_df):
+        path = tmp_path / "SPX_PO.xlsx"
+        with WorkbookWriter(path, sidecar="csv") as writer:
+            writer.write_sheet("PO", mixed_df)
+
+        assert writer.sidecar_paths == [tmp_path / "SPX_PO_PO.csv"]
+        result = pd.read_csv(writer.sidecar_paths[0], encoding="utf-8-sig")
+        assert result["PO#"].tolist() == ["PO1", "PO2", "PO3"]
+        assert result["Status"].isna().tolist() == [False, True, True]
+
+    def test_parquet_sidecar_mixed_object_column(self, tmp_path):
+        """混合型別 object 欄位改以字串存入 Parquet"""
+        df = pd.DataFrame({"PO#": ["PO1", "PO2"], "mixed": ["a", 1]})
+        with WorkbookWriter(tmp_path / "out.xlsx", sidecar="parquet") as writer:
+            writer.write_sheet("PO", df)
+
+        result = pd.read_parquet(writer.sidecar_paths[0])
+        assert result["mixed"].tolist() == ["a", "1"]
+
+
+@pytest.mark.unit
+class TestWorkbookConfig:
+    """[export] 配置讀取測試"""
+
+    def test_settings_from_config(self):
+        with patch.dict(config_manager._config_toml,
+                        {"export": {"engine": "openpyxl", "sidecar": "parquet"}}):
+            settings = get_export_settings()
+
+        assert settings == {"engine": "openpyxl", "constant_memory": True, "sidecar": "parquet"}
+
+    def test_empty_sidecar_disabled(self):
+        with patch.dict(config_manager._config_toml,
+                        {"export": {"sidecar": ""}}):
+            assert get_export_settings()["sidecar"] is None
+
+    def test_write_workbook_per_sheet_index(self, tmp_path):
+        path = tmp_path / "out.xlsx"
+        df = pd.DataFrame({"a": [1, 2]}, index=pd.Index(["x", "y"], name="key"))
+        sheets = write_workbook(path, {"with_index": df, "plain": df}, index={"with_index": True})
+
+        assert sheets == ["with_index", "plain"]
+        assert _read_back(path, sheet_name="with_index").columns.tolist() == ["key", "a"]
+        assert _read_back(path, sheet_name="plain").columns.tolist() == ["a"]
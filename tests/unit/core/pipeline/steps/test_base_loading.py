@@ -4,7 +4,7 @@ from unittest.mock import Mock, AsyncMock, patch, call
 import pandas as pd
 from typing import Tuple
 
-from accrual_bot.core.pipeline.steps.base_loading import BaseLoadingStep
+from accrual_bot.core.pipeline.steps.base_loading import BaseLoadingStep, apply_dtype_compaction
 from accrual_bot.core.pipeline.context import ProcessingContext
 from accrual_bot.core.pipeline.base import StepStatus
 
@@ -324,3 +324,43 @@ class TestBaseLoadingStep:
         assert isinstance(date, int)
         assert isinstance(month, int)
         assert 1 <= month <= 12
+
+
+@pytest.mark.unit
+class TestApplyDtypeCompaction:
+    """apply_dtype_compaction 設定驅動測試"""
+
+    @pytest.fixture
+    def df(self):
+        return pd.DataFrame({
+            'Department': ['001', '002'] * 50,
+            'Entry Amount': ['100', '250'] * 50,
+        })
+
+    def test_disabled_returns_unchanged(self, df):
+        with patch('accrual_bot.core.pipeline.steps.base_loading.config_manager') as cm:
+            cm._config_toml = {'dtype_compaction': {'enabled': False}}
+            result, stats = apply_dtype_compaction(df, Mock())
+        assert stats == {}
+        assert result['Department'].dtype == object
+
+    def test_enabled_reports_stats(self, df):
+        config = {
+            'enabled': True,
+            'category_columns': ['Department'],
+            'numeric_columns': ['Entry Amount'],
+            'string_storage': '',
+        }
+        with patch('accrual_bot.core.pipeline.steps.base_loading.config_manager') as cm:
+            cm._config_toml = {'dtype_compaction': config}
+            result, stats = apply_dtype_compaction(df, Mock())
+        assert stats['converted_columns'] == {'Department': 'category', 'Entry Amount': 'float64'}
+        assert stats['memory_after_mb'] <= stats['memory_before_mb']
+        assert isinstance(result['Department'].dtype, pd.CategoricalDtype)
+
+    def test_default_numeric_columns_exclude_string_compared(self):
+        """評估步驟以字串比較的欄位（Billed Quantity != '0' 等）不可列入預設數值轉換"""
+        from accrual_bot.utils.config import config_manager
+        numeric_columns = config_manager._config_toml['dtype_compaction']['numeric_columns']
+        string_compared = {'Entry Quantity', 'Received Quantity', 'Billed Quantity', 'Entry Prepay Amount'}
+        assert not string_compared & set(numeric_columns)
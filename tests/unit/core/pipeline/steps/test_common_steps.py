@@ -580,6 +580,82 @@ class TestProcurementIntegrationStep:
         result = await step.execute(ctx)
         assert result.is_success
 
+    def test_po_remark_falls_back_to_pr_line(self):
+        """PO Line 未匹配時以 PR Line 補值，並保留 PO Line 優先"""
+        df = pd.DataFrame({
+            'PO Line': ['P001-1', 'P002-1', 'P003-1', 'P004-1'],
+            'PR Line': ['R001-1', 'R002-1', 'R003-1', 'R004-1'],
+        })
+        procurement = pd.DataFrame({
+            'PO Line': ['P001-1', 'P001-1', None, 'P004-1'],
+            'PR Line': ['R001-1', 'R001-1', 'R002-1', 'R009-1'],
+            'Remarked by Procurement': ['舊備註', '新備註', 'PR 備註', None],
+            'Noted by Procurement': ['N1', None, 'N2', 'N4'],
+        })
+        step = ProcurementIntegrationStep()
+        result = step._process_procurement_po(df, procurement)
+
+        assert result['Remarked by Procurement'].tolist()[:2] == ['新備註', 'PR 備註']
+        assert pd.isna(result.loc[2, 'Remarked by Procurement'])
+        assert pd.isna(result.loc[3, 'Remarked by Procurement'])
+        assert result['Noted by Procurement'].tolist()[0] == 'N1'
+        assert result.loc[3, 'Noted by Procurement'] == 'N4'
+        assert step.po_match_stats == {
+            'total': 4,
+            'matched_by_po_line': 1,
+            'matched_by_pr_line': 1,
+            'unmatched': 2,
+            'not_in_procurement_wp': 1,
+        }
+        # 不在採購底稿的狀態會被移除（SPX 有自己的狀態邏輯）
+        assert result['PO狀態'].isna().all()
+
+    @pytest.mark.asyncio
+    async def test_match_stats_in_metadata(self):
+        """StepResult metadata 應包含各鍵值匹配統計"""
+        df = pd.DataFrame({
+            'PO Line': ['P001-1', 'P002-1'],
+            'PR Line': ['R001-1', 'R002-1'],
+        })
+        procurement = pd.DataFrame({
+            'PO Line': ['P001-1'],
+            'PR Line': ['R001-1'],
+            'Remarked by Procurement': ['已確認'],
+        })
+        ctx = _make_context(df)
+        ctx.add_auxiliary_data('procurement_po', procurement)
+        ctx.set_variable('file_paths', {'raw_po': '/tmp/po.xlsx'})
+        step = ProcurementIntegrationStep()
+        result = await step.execute(ctx)
+
+        stats = result.metadata['po_match_stats']
+        assert stats['matched_by_po_line'] == 1
+        assert stats['unmatched'] == 1
+        assert result.data['Remarked by Procurement'].tolist()[0] == '已確認'
+
+    def test_sql_join_matches_pandas(self):
+        """SQL 模式的備註查找與匹配統計應與 pandas 實作一致"""
+        df = pd.DataFrame({
+            'PO Line': ['P001-1', 'P002-1', 'P003-1', 'P004-1'],
+            'PR Line': ['R001-1', 'R002-1', 'R003-1', 'R004-1'],
+        })
+        procurement = pd.DataFrame({
+            'PO Line': ['P001-1', 'P001-1', 'P009-1', 'P004-1'],
+            'PR Line': ['R001-1', 'R001-1', 'R002-1', 'R009-1'],
+            'Remarked by Procurement': ['舊備註', '新備註', 'PR 備註', None],
+            'Noted by Procurement': ['N1', None, 'N2', 'N4'],
+        })
+        pandas_step = ProcurementIntegrationStep()
+        pandas_step.sql_join = False
+        sql_step = ProcurementIntegrationStep()
+        sql_step.sql_join = True
+
+        expected = pandas_step._process_procurement_po(df.copy(), procurement)
+        result = sql_step._process_procurement_po(df.copy(), procurement)
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert sql_step.po_match_stats == pandas_step.po_match_stats
+
 
 # ---- DateLogicStep 測試 ----
 
@@ -648,3 +724,18 @@ class TestDateLogicStep:
             step = DateLogicStep()
             result = await step.execute(ctx)
         assert result.is_success
+
+    def test_parse_date_adds_integer_columns(self):
+        """解析摘要日期應同時產生整數起迄欄位"""
+        df = pd.DataFrame({
+            'Item Description': ['租金 2025/01-2025/03', '無日期'],
+        })
+        with patch('accrual_bot.core.pipeline.steps.common.config_manager') as mock_cm:
+            mock_cm.get_regex_patterns.return_value = {}
+            step = DateLogicStep(use_description_memo=False)
+        result = step.parse_date_from_description(df)
+        assert result['YMs of Item Description'].tolist() == [
+            '202501,202503', '100001,100002'
+        ]
+        assert result['erm_desc_start'].tolist() == [202501, 100001]
+        assert result['erm_desc_end'].tolist() == [202503, 100002]
@@ -315,3 +315,67 @@ class TestPreviousWorkpaperIntegration:
 
         assert result.status.name == 'SKIPPED'
         assert result.message == "No previous workpaper data"
+
+    # ========== 批次映射測試 ==========
+
+    @pytest.fixture
+    def previous_wp_duplicated(self):
+        """含重複鍵值與空值的前期底稿"""
+        return pd.DataFrame({
+            'PO Line': ['PO001', 'PO001', 'PO002', 'PO002', 'PO004'],
+            'Remarked by FN': ['Old 1', 'New 1', 'Remark 2', None, 'Remark 4'],
+            'Remarked by Procurement': [None, 'PQ 1', 'PQ 2', 'PQ 2b', None],
+            'Noted by FN': ['Note 1', None, None, None, 'Note 4'],
+            'Liability': ['110001', '110009', '110002', '110002', '110004'],
+        })
+
+    def test_bulk_mapping_matches_legacy(self, step, previous_wp_duplicated):
+        """批次映射結果應與逐欄 map 一致（含重複鍵與空值）"""
+        df = pd.DataFrame({'PO Line': ['PO001', 'PO002', 'PO003', 'PO004', 'PO001']})
+
+        step.bulk_mapping = True
+        bulk = step._process_previous_po(df.copy(), previous_wp_duplicated.copy(), 202512)
+        step.bulk_mapping = False
+        legacy = step._process_previous_po(df.copy(), previous_wp_duplicated.copy(), 202512)
+
+        pd.testing.assert_frame_equal(bulk, legacy, check_dtype=False)
+        assert bulk.loc[0, 'Remarked by 上月 FN'] == 'New 1'
+        assert bulk.loc[1, 'Remarked by 上月 FN'] == 'Remark 2'
+        assert bulk.loc[1, 'Remarked by 上月 Procurement'] == 'PQ 2b'
+
+    def test_bulk_mapping_respects_entity_filter(self, step, previous_wp_standard):
+        """批次映射應保留 entities 限制"""
+        step.po_mappings = step.po_mappings + [
+            {'source': 'liability', 'target': 'previ_Liability', 'fill_na': True, 'entities': ['SPX']},
+        ]
+        df = pd.DataFrame({'PO Line': ['PO001', 'PO002']})
+
+        spt = step._process_previous_po(df.copy(), previous_wp_standard, 202512, 'SPT')
+        spx = step._process_previous_po(df.copy(), previous_wp_standard, 202512, 'SPX')
+
+        assert 'previ_Liability' not in spt.columns
+        assert spx['previ_Liability'].tolist() == ['110001', '110002']
+
+    def test_bulk_mapping_preserves_index(self, step, previous_wp_standard):
+        """非連續索引的目標 DataFrame 應正確對齊"""
+        df = pd.DataFrame({'PO Line': ['PO002', 'PO003', 'PO001']}, index=[10, 5, 7])
+
+        result = step._process_previous_po(df, previous_wp_standard, 202512)
+
+        assert result.loc[10, 'Remarked by 上月 FN'] == 'Remark 2'
+        assert pd.isna(result.loc[5, 'Remarked by 上月 FN'])
+        assert result.loc[7, 'Noted by FN'] == 'Note 1'
+
+    def test_sql_join_matches_bulk(self, step, previous_wp_duplicated):
+        """SQL 模式結果應與批次映射一致（含重複鍵、空值與非連續索引）"""
+        df = pd.DataFrame(
+            {'PO Line': ['PO001', 'PO002', 'PO003', 'PO004', 'PO001']},
+            index=[4, 3, 2, 1, 0]
+        )
+
+        step.sql_join = False
+        bulk = step._process_previous_po(df.copy(), previous_wp_duplicated.copy(), 202512)
+        step.sql_join = True
+        sql = step._process_previous_po(df.copy(), previous_wp_duplicated.copy(), 202512)
+
+        pd.testing.assert_frame_equal(sql, bulk)
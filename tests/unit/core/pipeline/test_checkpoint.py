@@ -479,3 +479,189 @@ class TestCheckpointManagerExtended:
         # SPT 的不受影響
         spt_cps = manager.list_checkpoints(filter_by_entity='SPT')
         assert len(spt_cps) == 1
+
+
+@pytest.mark.unit
+class TestCheckpointArrowFormat:
+    """Arrow IPC checkpoint 格式測試"""
+
+    @pytest.fixture
+    def manager(self, tmp_checkpoint_dir):
+        return CheckpointManager(checkpoint_dir=tmp_checkpoint_dir, checkpoint_format='arrow')
+
+    @pytest.fixture
+    def sample_context(self):
+        ctx = ProcessingContext(
+            data=pd.DataFrame({
+                'GL#': ['100000', '100001'],
+                'Amount': [1000.0, 2000.0],
+                'erm_desc_start': pd.array([202401, None], dtype='Int32'),
+            }),
+            entity_type='SPX',
+            processing_date=202512,
+            processing_type='PO',
+        )
+        ctx.add_auxiliary_data('ref_account', pd.DataFrame({'Account': ['100000'], 'Desc': ['Cash']}))
+        ctx.add_auxiliary_data('ops_validation', pd.DataFrame({
+            'discount': [0.9, 'N/A'], 'qty': [1, 'x'],
+        }))
+        return ctx
+
+    def test_invalid_format_raises(self, tmp_checkpoint_dir):
+        with pytest.raises(ValueError, match="不支援的 checkpoint 格式"):
+            CheckpointManager(checkpoint_dir=tmp_checkpoint_dir, checkpoint_format='csv')
+
+    def test_save_writes_arrow_files(self, manager, sample_context):
+        name = manager.save_checkpoint(sample_context, 'Step1')
+        checkpoint_path = Path(manager.checkpoint_dir) / name
+        assert (checkpoint_path / 'data.arrow').exists()
+        assert (checkpoint_path / 'auxiliary_data' / 'ref_account.arrow').exists()
+        assert not list(checkpoint_path.rglob('*.parquet'))
+        with open(checkpoint_path / 'checkpoint_info.json', 'r', encoding='utf-8') as f:
+            assert json.load(f)['checkpoint_format'] == 'arrow'
+
+    def test_roundtrip_preserves_dtypes(self, manager, sample_context):
+        name = manager.save_checkpoint(sample_context, 'Step1')
+        loaded = manager.load_checkpoint(name)
+        pd.testing.assert_frame_equal(loaded.data, sample_context.data)
+
+    def test_mixed_type_columns_stored_as_string(self, manager, sample_context):
+        """混合型別欄位應轉為字串，而非 fallback 至 pickle"""
+        name = manager.save_checkpoint(sample_context, 'Step1')
+        aux_dir = Path(manager.checkpoint_dir) / name / 'auxiliary_data'
+        assert (aux_dir / 'ops_validation.arrow').exists()
+        loaded = manager.load_checkpoint(name)
+        ops = loaded.get_auxiliary_data('ops_validation')
+        assert ops['discount'].tolist() == ['0.9', 'N/A']
+        assert ops['qty'].tolist() == ['1', 'x']
+        # 原始 DataFrame 不應被修改
+        assert sample_context.get_auxiliary_data('ops_validation')['qty'].tolist() == [1, 'x']
+
+    def test_auxiliary_data_loaded_lazily(self, manager, sample_context):
+        name = manager.save_checkpoint(sample_context, 'Step1')
+        loaded = manager.load_checkpoint(name)
+        assert loaded.has_auxiliary_data('ref_account')
+        assert not loaded.is_auxiliary_data_loaded('ref_account')
+        ref = loaded.get_auxiliary_data('ref_account')
+        assert ref['Account'].tolist() == ['100000']
+        assert loaded.is_auxiliary_data_loaded('ref_account')
+
+    def test_resave_in_other_format_removes_stale_files(self, manager, sample_context):
+        name = manager.save_checkpoint(sample_context, 'Step1')
+        parquet_manager = CheckpointManager(checkpoint_dir=manager.checkpoint_dir)
+        parquet_manager.save_checkpoint(sample_context, 'Step1')
+        checkpoint_path = Path(manager.checkpoint_dir) / name
+        assert (checkpoint_path / 'data.parquet').exists()
+        assert not (checkpoint_path / 'data.arrow').exists()
+
+    def test_serial_write_when_single_worker(self, tmp_checkpoint_dir, sample_context):
+        manager = CheckpointManager(
+            checkpoint_dir=tmp_checkpoint_dir, checkpoint_format='arrow', max_workers=1
+        )
+        name = manager.save_checkpoint(sample_context, 'Step1')
+        loaded = manager.load_checkpoint(name)
+        assert sorted(loaded.list_auxiliary_data()) == ['ops_validation', 'ref_account']
+
+
+@pytest.mark.unit
+class TestIncrementalCheckpoint:
+    """增量 checkpoint（指紋比對 + hard link 重用）測試"""
+
+    @pytest.fixture
+    def manager(self, tmp_checkpoint_dir):
+        return CheckpointManager(checkpoint_dir=tmp_checkpoint_dir)
+
+    @pytest.fixture
+    def sample_context(self):
+        ctx = ProcessingContext(
+            data=pd.DataFrame({'A': [1, 2, 3]}),
+            entity_type='SPX',
+            processing_date=202512,
+            processing_type='PO',
+        )
+        ctx.add_auxiliary_data('reference_account', pd.DataFrame({
+            'Account': ['100000', '100001'], 'Desc': ['Cash', 'Bank'],
+        }))
+        ctx.add_auxiliary_data('closing_list', pd.DataFrame({'PO#': ['PO1']}))
+        return ctx
+
+    @staticmethod
+    def _read_info(manager, name):
+        with open(Path(manager.checkpoint_dir) / name / 'checkpoint_info.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_unchanged_aux_reuses_previous_file(self, manager, sample_context):
+        first = manager.save_checkpoint(sample_context, 'Step1')
+        sample_context.update_data(pd.DataFrame({'A': [4, 5]}))
+        second = manager.save_checkpoint(sample_context, 'Step2')
+
+        base = Path(manager.checkpoint_dir)
+        src = base / first / 'auxiliary_data' / 'reference_account.parquet'
+        dst = base / second / 'auxiliary_data' / 'reference_account.parquet'
+        assert dst.exists()
+        assert dst.read_bytes() == src.read_bytes()
+
+        info = self._read_info(manager, second)
+        assert info['parent_checkpoint'] == first
+        assert info['frames']['reference_account']['reused_from'] == first
+        assert info['frames']['data']['reused_from'] is None
+
+    def test_changed_aux_rewritten(self, manager, sample_context):
+        manager.save_checkpoint(sample_context, 'Step1')
+        sample_context.add_auxiliary_data('closing_list', pd.DataFrame({'PO#': ['PO1', 'PO2']}))
+        second = manager.save_checkpoint(sample_context, 'Step2')
+
+        info = self._read_info(manager, second)
+        assert info['frames']['closing_list']['reused_from'] is None
+        loaded = manager.load_checkpoint(second)
+        assert loaded.get_auxiliary_data('closing_list')['PO#'].tolist() == ['PO1', 'PO2']
+
+    def test_rewrite_does_not_modify_linked_checkpoint(self, manager, sample_context):
+        """覆寫共用檔案時不應影響其他 checkpoint"""
+        manager.save_checkpoint(sample_context, 'Step1')
+        second = manager.save_checkpoint(sample_context, 'Step2')
+        sample_context.add_auxiliary_data('closing_list', pd.DataFrame({'PO#': ['NEW']}))
+        manager.save_checkpoint(sample_context, 'Step1')
+
+        loaded = manager.load_checkpoint(second)
+        assert loaded.get_auxiliary_data('closing_list')['PO#'].tolist() == ['PO1']
+
+    def test_reuse_survives_source_deletion(self, manager, sample_context):
+        first = manager.save_checkpoint(sample_context, 'Step1')
+        second = manager.save_checkpoint(sample_context, 'Step2')
+        manager.delete_checkpoint(first)
+
+        loaded = manager.load_checkpoint(second)
+        assert loaded.get_auxiliary_data('reference_account')['Desc'].tolist() == ['Cash', 'Bank']
+        # 來源已刪除時改為重新寫入
+        third = manager.save_checkpoint(sample_context, 'Step3')
+        assert self._read_info(manager, third)['frames']['closing_list']['reused_from'] == second
+
+    def test_resume_links_lazy_aux_without_loading(self, tmp_checkpoint_dir, sample_context):
+        CheckpointManager(checkpoint_dir=tmp_checkpoint_dir).save_checkpoint(sample_context, 'Step1')
+
+        manager = CheckpointManager(checkpoint_dir=tmp_checkpoint_dir)
+        resumed = manager.load_checkpoint('SPX_PO_202512_after_Step1')
+        name = manager.save_checkpoint(resumed, 'Step2')
+
+        assert not resumed.is_auxiliary_data_loaded('reference_account')
+        info = self._read_info(manager, name)
+        assert info['parent_checkpoint'] == 'SPX_PO_202512_after_Step1'
+        assert info['frames']['reference_account']['reused_from'] == 'SPX_PO_202512_after_Step1'
+
+    def test_incremental_disabled_writes_all(self, tmp_checkpoint_dir, sample_context):
+        manager = CheckpointManager(checkpoint_dir=tmp_checkpoint_dir, incremental=False)
+        manager.save_checkpoint(sample_context, 'Step1')
+        second = manager.save_checkpoint(sample_context, 'Step2')
+        frames = self._read_info(manager, second)['frames']
+        assert all(f['reused_from'] is None for f in frames.values())
+        assert frames['reference_account']['fingerprint'] is None
+
+    def test_fingerprint_detects_value_change(self):
+        df = pd.DataFrame({'A': [1, 2], 'B': ['x', 'y']})
+        fp = CheckpointManager._frame_fingerprint(df)
+        assert fp == CheckpointManager._frame_fingerprint(df.copy())
+        changed = df.copy()
+        changed.loc[1, 'B'] = 'z'
+        assert fp != CheckpointManager._frame_fingerprint(changed)
+        assert fp != CheckpointManager._frame_fingerprint(df.astype({'A': 'float64'}))
@@ -1,14 +1,17 @@
 """Comprehensive unit tests for ProcessingContext, ValidationResult, and ContextMetadata."""
 
 import pytest
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from accrual_bot.core.pipeline.context import (
     ProcessingContext,
     ValidationResult,
     ContextMetadata,
+    copy_on_write_mode,
+    is_copy_on_write_active,
 )
 
 
@@ -106,6 +109,56 @@ class TestProcessingContext:
         copy["A"] = [99, 99, 99]
         assert list(context.data["A"]) == [1, 2, 3]
 
+    def test_update_data_tracks_version_and_owner(self, context):
+        assert context.data_version == 0
+        assert context.data_owner is None
+        context.update_data(pd.DataFrame({"C": [1]}), owner="StepA")
+        assert context.data_version == 1
+        assert context.data_owner == "StepA"
+        context.update_data(pd.DataFrame({"C": [2]}))
+        assert context.data_version == 2
+        assert context.data_owner is None
+
+    def test_claim_data_requires_matching_version(self, context):
+        context.update_data(pd.DataFrame({"C": [1]}))
+        assert context.claim_data("StepB", version=0) is False
+        assert context.claim_data("StepB", version=1) is True
+        assert context.data_owner == "StepB"
+        # 已有擁有者時不覆寫
+        assert context.claim_data("StepC", version=1) is False
+
+    # --- Copy-on-Write ---
+    def test_copy_on_write_mode_restores_option(self):
+        previous = pd.options.mode.copy_on_write
+        with copy_on_write_mode(True):
+            assert is_copy_on_write_active()
+        assert pd.options.mode.copy_on_write == previous
+
+    def test_get_data_copy_cow_returns_lazy_view(self, sample_df):
+        with patch("accrual_bot.core.pipeline.context.get_logger"):
+            ctx = ProcessingContext(
+                data=sample_df, entity_type="SPX", processing_date=202512,
+                copy_on_write=True,
+            )
+        with copy_on_write_mode(True):
+            view = ctx.get_data_copy()
+            assert np.shares_memory(view["A"].to_numpy(), ctx.data["A"].to_numpy())
+            view.loc[0, "A"] = 99
+            view["D"] = 1
+            assert list(ctx.data["A"]) == [1, 2, 3]
+            assert "D" not in ctx.data.columns
+
+    def test_get_data_copy_cow_flag_without_pandas_cow_deep_copies(self, sample_df):
+        with patch("accrual_bot.core.pipeline.context.get_logger"):
+            ctx = ProcessingContext(
+                data=sample_df, entity_type="SPX", processing_date=202512,
+                copy_on_write=True,
+            )
+        with copy_on_write_mode(False):
+            copy = ctx.get_data_copy()
+            copy.loc[0, "A"] = 99
+        assert list(ctx.data["A"]) == [1, 2, 3]
+
     # --- Auxiliary data ---
     def test_auxiliary_data_crud(self, context):
         assert context.has_auxiliary_data("ref") is False
@@ -127,6 +180,31 @@ class TestProcessingContext:
         prop["new"] = "added"
         assert "new" not in context._auxiliary_data
 
+    def test_lazy_auxiliary_data_loaded_on_first_access(self, context):
+        loader = MagicMock(return_value=pd.DataFrame({"x": [1]}))
+        context.add_lazy_auxiliary_data("lazy", loader)
+        assert context.has_auxiliary_data("lazy") is True
+        assert context.list_auxiliary_data() == ["lazy"]
+        assert context.is_auxiliary_data_loaded("lazy") is False
+        loader.assert_not_called()
+
+        assert len(context.get_auxiliary_data("lazy")) == 1
+        context.get_auxiliary_data("lazy")
+        loader.assert_called_once()
+        assert context.is_auxiliary_data_loaded("lazy") is True
+
+    def test_lazy_auxiliary_data_replaced_by_add(self, context):
+        loader = MagicMock()
+        context.add_lazy_auxiliary_data("lazy", loader)
+        context.add_auxiliary_data("lazy", pd.DataFrame({"x": [2]}))
+        assert context.get_auxiliary_data("lazy")["x"].tolist() == [2]
+        loader.assert_not_called()
+
+    def test_lazy_auxiliary_data_loader_returning_none(self, context):
+        context.add_lazy_auxiliary_data("broken", lambda: None)
+        assert context.get_auxiliary_data("broken") is None
+        assert context.has_auxiliary_data("broken") is False
+
     # --- Variables ---
     def test_variable_crud(self, context):
         assert context.has_variable("flag") is False
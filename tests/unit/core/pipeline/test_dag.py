@@ -0,0 +1,168 @@
+"""
+DAG 排程（core/pipeline/dag.py）單元測試
+"""
+
+import asyncio
+import threading
+
+import pandas as pd
+import pytest
+
+from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
+from accrual_bot.core.pipeline.context import ProcessingContext
+from accrual_bot.core.pipeline.dag import DAGScheduler, build_step_graph
+from accrual_bot.core.pipeline.pipeline import Pipeline, PipelineConfig
+
+
+class RecordingStep(PipelineStep):
+    """記錄執行順序的步驟，可選擇等待 barrier 以驗證並行"""
+
+    def __init__(self, name, reads=None, writes=None, log=None,
+                 barrier: threading.Barrier = None, fail: bool = False):
+        super().__init__(name)
+        if writes is not None:
+            self.declare_io(reads=reads, writes=writes)
+        self.log = log if log is not None else []
+        self.barrier = barrier
+        self.fail = fail
+
+    async def execute(self, context: ProcessingContext) -> StepResult:
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        self.log.append(self.name)
+        status = StepStatus.FAILED if self.fail else StepStatus.SUCCESS
+        return StepResult(step_name=self.name, status=status)
+
+    async def validate_input(self, context: ProcessingContext) -> bool:
+        return True
+
+
+@pytest.fixture
+def context():
+    return ProcessingContext(
+        data=pd.DataFrame({"col": [1, 2]}),
+        entity_type="SPX",
+        processing_date=202512,
+        processing_type="PO",
+    )
+
+
+@pytest.mark.unit
+class TestBuildStepGraph:
+    """相依圖建立測試"""
+
+    def test_independent_steps_have_no_dependencies(self):
+        steps = [
+            RecordingStep("A", reads=["data"], writes=["aux:a"]),
+            RecordingStep("B", reads=["data"], writes=["aux:b"]),
+        ]
+        assert build_step_graph(steps) == [set(), set()]
+
+    def test_read_after_write(self):
+        steps = [
+            RecordingStep("A", writes=["aux:a"]),
+            RecordingStep("B", reads=["aux:a"], writes=["data"]),
+        ]
+        assert build_step_graph(steps)[1] == {0}
+
+    def test_write_after_read_and_write_after_write(self):
+        steps = [
+            RecordingStep("A", reads=["data"], writes=["aux:a"]),
+            RecordingStep("B", writes=["data"]),
+            RecordingStep("C", writes=["aux:a"]),
+        ]
+        graph = build_step_graph(steps)
+        assert graph[1] == {0}
+        assert graph[2] == {0}
+
+    def test_undeclared_step_is_barrier(self):
+        steps = [
+            RecordingStep("A", writes=["aux:a"]),
+            RecordingStep("Undeclared"),
+            RecordingStep("C", writes=["aux:c"]),
+        ]
+        graph = build_step_graph(steps)
+        assert graph[1] == {0}
+        assert graph[2] == {1}
+
+    def test_transitive_edges_removed(self):
+        steps = [
+            RecordingStep("A", writes=["data"]),
+            RecordingStep("B", reads=["data"], writes=["data"]),
+            RecordingStep("C", reads=["data"], writes=["data"]),
+        ]
+        assert build_step_graph(steps)[2] == {1}
+
+
+@pytest.mark.unit
+class TestDAGScheduler:
+    """DAGScheduler 執行測試"""
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self, context):
+        """無相依步驟同時執行（barrier 需兩個執行緒同時到達）"""
+        barrier = threading.Barrier(2)
+        steps = [
+            RecordingStep("A", writes=["aux:a"], barrier=barrier),
+            RecordingStep("B", writes=["aux:b"], barrier=barrier),
+        ]
+        results = await DAGScheduler(steps, max_concurrent=2).run(context)
+
+        assert [r.status for r in results] == [StepStatus.SUCCESS, StepStatus.SUCCESS]
+
+    @pytest.mark.asyncio
+    async def test_dependencies_respected(self, context):
+        """相依步驟依序執行，結果依原始順序返回"""
+        log = []
+        steps = [
+            RecordingStep("Load", log=log),
+            RecordingStep("Closing", writes=["aux:closing_list"], log=log),
+            RecordingStep("AP", reads=["data"], writes=["data"], log=log),
+            RecordingStep("Status", reads=["data", "aux:closing_list"], writes=["data"], log=log),
+        ]
+        results = await DAGScheduler(steps, max_concurrent=4, use_threads=False).run(context)
+
+        assert [r.step_name for r in results] == ["Load", "Closing", "AP", "Status"]
+        assert log[0] == "Load"
+        assert log[-1] == "Status"
+        assert sorted(h["step"] for h in context.get_history()) == sorted(log)
+
+    @pytest.mark.asyncio
+    async def test_stop_on_error(self, context):
+        """失敗時不再排程後續步驟"""
+        log = []
+        steps = [
+            RecordingStep("A", writes=["data"], log=log, fail=True),
+            RecordingStep("B", reads=["data"], writes=["data"], log=log),
+        ]
+        results = await DAGScheduler(steps, stop_on_error=True).run(context)
+
+        assert [r.step_name for r in results] == ["A"]
+        assert log == ["A"]
+
+    @pytest.mark.asyncio
+    async def test_continue_on_error(self, context):
+        """stop_on_error=False 時相依步驟仍執行"""
+        steps = [
+            RecordingStep("A", writes=["data"], fail=True),
+            RecordingStep("B", reads=["data"], writes=["data"]),
+        ]
+        results = await DAGScheduler(steps, stop_on_error=False).run(context)
+
+        assert [r.status for r in results] == [StepStatus.FAILED, StepStatus.SUCCESS]
+
+    @pytest.mark.asyncio
+    async def test_pipeline_dag_mode(self, context):
+        """Pipeline execution_mode='dag' 使用 DAG 排程"""
+        pipeline = Pipeline(PipelineConfig(name="DAG", execution_mode="dag"))
+        pipeline.add_steps([
+            RecordingStep("A", writes=["aux:a"]),
+            RecordingStep("B", writes=["aux:b"]),
+            RecordingStep("C", reads=["aux:a", "aux:b"], writes=["data"]),
+        ])
+
+        result = await pipeline.execute(context)
+
+        assert result["success"] is True
+        assert result["executed_steps"] == 3
+        assert [r["step_name"] for r in result["results"]] == ["A", "B", "C"]
@@ -9,7 +9,7 @@ from unittest.mock import AsyncMock, patch
 
 from accrual_bot.core.pipeline.pipeline import Pipeline, PipelineConfig
 from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
-from accrual_bot.core.pipeline.context import ProcessingContext
+from accrual_bot.core.pipeline.context import ProcessingContext, copy_on_write_mode
 
 
 # === 輔助用具體步驟類 ===
@@ -50,6 +50,21 @@ class DummyExceptionStep(PipelineStep):
         return True
 
 
+class DummyMutatingStep(PipelineStep):
+    """修改主數據的步驟（記錄執行當下的 CoW 狀態）"""
+
+    async def execute(self, context: ProcessingContext) -> StepResult:
+        self.cow_active = pd.options.mode.copy_on_write is True
+        df = context.get_data_copy()
+        df.loc[0, "col"] = 99
+        df["added"] = 1
+        context.update_data(df)
+        return StepResult(step_name=self.name, status=StepStatus.SUCCESS, data=df)
+
+    async def validate_input(self, context: ProcessingContext) -> bool:
+        return True
+
+
 # === Fixtures ===
 
 
@@ -134,9 +149,13 @@ class TestPipelineConfig:
             "entity_type",
             "stop_on_error",
             "parallel_execution",
+            "execution_mode",
+            "copy_on_write",
             "max_concurrent_steps",
             "enable_cache",
             "log_level",
+            "profile",
+            "profile_trace",
         }
 
 
@@ -339,6 +358,91 @@ class TestPipeline:
         assert stats["total_executions"] == 1
         assert stats["last_execution"] is not None
 
+    # --- Copy-on-Write ---
+
+    @pytest.mark.asyncio
+    async def test_copy_on_write_scoped_to_execution(self, empty_context):
+        """CoW 模式僅在執行期間啟用，且不影響傳入的原始數據"""
+        original = empty_context.data
+        previous = pd.options.mode.copy_on_write
+        step = DummyMutatingStep(name="Mutate")
+        pipeline = Pipeline(PipelineConfig(name="CoW", copy_on_write=True))
+        pipeline.add_step(step)
+
+        result = await pipeline.execute(empty_context)
+
+        assert result["success"] is True
+        assert step.cow_active is True
+        assert pd.options.mode.copy_on_write == previous
+        assert list(original["col"]) == [1, 2, 3]
+        assert list(empty_context.data["col"]) == [99, 2, 3]
+        assert empty_context.copy_on_write is True
+        assert empty_context.data_owner == "Mutate"
+
+    @pytest.mark.asyncio
+    async def test_default_pipeline_does_not_enable_cow(self, empty_context):
+        """預設不啟用 CoW"""
+        step = DummyMutatingStep(name="Mutate")
+        pipeline = Pipeline(PipelineConfig(name="Plain"))
+        pipeline.add_step(step)
+
+        with copy_on_write_mode(False):
+            await pipeline.execute(empty_context)
+
+        assert step.cow_active is False
+        assert empty_context.data_version == 1
+
+    # --- Step listeners ---
+
+    @pytest.mark.asyncio
+    async def test_step_listener_reports_each_step(self, empty_context):
+        """監聽器在每個步驟開始與完成時收到通知"""
+        events = []
+        pipeline = Pipeline(PipelineConfig(name="Listen", stop_on_error=True))
+        pipeline.add_steps([make_success_step("S1"), make_fail_step("F1"), make_success_step("S2")])
+        pipeline.add_step_listener(lambda *event: events.append(event))
+
+        await pipeline.execute(empty_context)
+
+        assert events == [
+            ("S1", 1, 3, "running"),
+            ("S1", 1, 3, "success"),
+            ("F1", 2, 3, "running"),
+            ("F1", 2, 3, "failed"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_step_listener_dag_mode(self, empty_context):
+        """DAG 模式同樣回報步驟完成"""
+        events = []
+        pipeline = Pipeline(PipelineConfig(name="Listen", execution_mode="dag"))
+        pipeline.add_steps([make_success_step("S1"), make_success_step("S2")])
+        pipeline.add_step_listener(lambda *event: events.append(event))
+
+        await pipeline.execute(empty_context)
+
+        finished = sorted(e for e in events if e[3] != "running")
+        assert finished == [("S1", 1, 2, "success"), ("S2", 2, 2, "success")]
+
+    @pytest.mark.asyncio
+    async def test_step_listener_errors_do_not_fail_pipeline(self, empty_context):
+        """監聽器拋出例外不影響執行；移除後不再通知"""
+        def broken(*event):
+            raise RuntimeError("listener error")
+
+        calls = []
+        pipeline = Pipeline(PipelineConfig(name="Listen"))
+        pipeline.add_step(make_success_step("S1"))
+        pipeline.add_step_listener(broken)
+        result = await pipeline.execute(empty_context)
+        assert result["success"] is True
+
+        assert pipeline.remove_step_listener(broken) is True
+        assert pipeline.remove_step_listener(broken) is False
+        pipeline.add_step_listener(lambda *event: calls.append(event))
+        await pipeline.execute(empty_context)
+        assert len(calls) == 2
+
     # --- Clone ---
 
     def test_clone_creates_independent_copy(self, pipeline_config):
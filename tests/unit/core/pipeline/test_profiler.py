@@ -0,0 +1,197 @@
+"""
+步驟效能分析（core/pipeline/profiler.py）單元測試
+"""
+
+import json
+import sys
+
+import pandas as pd
+import pytest
+
+from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
+from accrual_bot.core.pipeline.context import ProcessingContext
+from accrual_bot.core.pipeline.pipeline import Pipeline, PipelineConfig
+from accrual_bot.core.pipeline.profiler import PipelineProfiler, frame_bytes, render_html_report
+
+
+class ExpandStep(PipelineStep):
+    """將主數據列數加倍並新增輔助數據"""
+
+    async def execute(self, context: ProcessingContext) -> StepResult:
+        df = context.get_data_copy()
+        df = pd.concat([df, df], ignore_index=True)
+        df["extra"] = 1.0
+        context.update_data(df)
+        context.add_auxiliary_data(f"aux_{self.name}", df.head(2))
+        return StepResult(step_name=self.name, status=StepStatus.SUCCESS)
+
+    async def validate_input(self, context: ProcessingContext) -> bool:
+        return True
+
+
+class ExportPathStep(ExpandStep):
+    """記錄輸出路徑的步驟"""
+
+    def __init__(self, name, output_path):
+        super().__init__(name)
+        self.output_path = output_path
+
+    async def execute(self, context: ProcessingContext) -> StepResult:
+        context.set_variable("export_output_path", self.output_path)
+        return StepResult(step_name=self.name, status=StepStatus.SUCCESS)
+
+
+class MetadataExportStep(ExpandStep):
+    """只以 metadata['output_path'] 回報輸出檔的步驟（如 SPXPRExportStep）"""
+
+    def __init__(self, name, output_path):
+        super().__init__(name)
+        self.output_path = output_path
+
+    async def execute(self, context: ProcessingContext) -> StepResult:
+        return StepResult(step_name=self.name, status=StepStatus.SUCCESS,
+                          metadata={"output_path": self.output_path})
+
+
+def _context(rows=100):
+    return ProcessingContext(
+        data=pd.DataFrame({"a": range(rows), "b": ["x"] * rows}),
+        entity_type="SPX",
+        processing_date=202512,
+        processing_type="PO",
+    )
+
+
+@pytest.mark.unit
+class TestPipelineProfiler:
+    """PipelineProfiler 指標記錄"""
+
+    @pytest.mark.asyncio
+    async def test_run_step_records_metrics(self):
+        profiler = PipelineProfiler()
+        context = _context(100)
+        result = await profiler.run_step(ExpandStep("Expand"), context)
+
+        assert result.status == StepStatus.SUCCESS
+        profile = profiler.profiles[0]
+        assert profile.step_name == "Expand"
+        assert profile.status == "success"
+        assert (profile.rows_in, profile.rows_out, profile.columns_out) == (100, 200, 3)
+        assert profile.data_bytes == frame_bytes(context.data)
+        assert profile.aux_count == 1
+        assert profile.aux_bytes > 0
+        assert profile.wall_seconds >= 0
+        assert profile.cpu_seconds is not None
+
+    def test_deep_memory_counts_object_payload(self):
+        df = pd.DataFrame({"s": ["a long string value"] * 50})
+        assert frame_bytes(df, deep=True) > frame_bytes(df, deep=False)
+
+    @pytest.mark.asyncio
+    async def test_cprofile_trace_written(self, tmp_path):
+        profiler = PipelineProfiler(trace="cprofile")
+        await profiler.run_step(ExpandStep("Expand Step"), _context())
+        assert "cumulative" in profiler.top_functions("Expand Step")
+
+        paths = profiler.write_report(tmp_path, "run")
+        report = json.loads((tmp_path / "run.json").read_text(encoding="utf-8"))
+        trace_path = report["steps"][0]["trace_path"]
+        assert trace_path.endswith("Expand_Step.prof")
+        assert (tmp_path / "run_traces" / "Expand_Step.prof").exists()
+        assert set(paths) == {"json", "html", "xlsx"}
+
+    def test_unknown_or_missing_tracer_falls_back(self, monkeypatch):
+        assert PipelineProfiler(trace="bogus").trace == "none"
+        monkeypatch.setitem(sys.modules, "pyinstrument", None)
+        assert PipelineProfiler(trace="pyinstrument").trace == "cprofile"
+
+    def test_html_report_escapes_and_scales_bars(self):
+        report = {
+            "pipeline": "<p>",
+            "steps": [
+                {"step_name": "A<b>", "status": "success", "wall_seconds": 2.0},
+                {"step_name": "B", "status": "success", "wall_seconds": 1.0},
+            ],
+        }
+        html = render_html_report(report)
+        assert "A&lt;b&gt;" in html and "&lt;p&gt;" in html
+        assert 'width:100.0%' in html and 'width:50.0%' in html
+
+
+@pytest.mark.unit
+class TestPipelineProfiling:
+    """Pipeline 整合"""
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        pipeline = Pipeline(PipelineConfig(name="p"))
+        pipeline.add_step(ExpandStep("Expand"))
+        result = await pipeline.execute(_context())
+        assert "profile" not in result
+
+    @pytest.mark.asyncio
+    async def test_profile_written_next_to_output(self, tmp_path):
+        output = tmp_path / "out" / "SPX_PO_202512.xlsx"
+        pipeline = Pipeline(PipelineConfig(name="p", profile=True))
+        pipeline.add_step(ExpandStep("Expand"))
+        pipeline.add_step(ExportPathStep("Export", str(output)))
+        context = _context()
+
+        result = await pipeline.execute(context)
+
+        report = result["profile"]
+        assert [s["step_name"] for s in report["steps"]] == ["Expand", "Export"]
+        assert report["entity"] == "SPX" and report["processing_date"] == 202512
+        assert report["slowest_step"] in ("Expand", "Export")
+        paths = result["profile_report_paths"]
+        assert set(paths) == {"json", "html", "xlsx"}
+        for path in paths.values():
+            assert str(output.parent) in path
+        assert context.get_variable("profile_report_paths") == paths
+
+        steps = pd.read_excel(paths["xlsx"], sheet_name="Steps")
+        assert steps["rows_out"].tolist() == [200, 200]
+
+    @pytest.mark.asyncio
+    async def test_profile_dir_from_export_metadata(self, tmp_path):
+        output = tmp_path / "spt" / "SPT_PR_202512_processed.xlsx"
+        pipeline = Pipeline(PipelineConfig(name="p", profile=True))
+        pipeline.add_step(ExpandStep("Expand"))
+        pipeline.add_step(MetadataExportStep("SPTExport", str(output)))
+
+        result = await pipeline.execute(_context())
+
+        for path in result["profile_report_paths"].values():
+            assert str(output.parent) in path
+
+    @pytest.mark.asyncio
+    async def test_lazy_auxiliary_data_stays_unloaded(self, tmp_path):
+        """效能分析只量測已載入的輔助數據，不觸發延遲載入"""
+        loads = []
+        context = _context()
+        context.add_lazy_auxiliary_data(
+            "checkpoint_aux", lambda: loads.append(1) or pd.DataFrame({"x": range(1000)})
+        )
+        pipeline = Pipeline(PipelineConfig(name="p", profile=True, profile_output_dir=str(tmp_path)))
+        pipeline.add_step(ExpandStep("Expand"))
+
+        result = await pipeline.execute(context)
+
+        assert loads == []
+        assert not context.is_auxiliary_data_loaded("checkpoint_aux")
+        step = result["profile"]["steps"][0]
+        assert (step["aux_count"], step["aux_lazy_count"]) == (1, 1)
+        assert step["aux_bytes"] == frame_bytes(context.get_auxiliary_data("aux_Expand"))
+
+    @pytest.mark.asyncio
+    async def test_dag_mode_records_wall_time_only(self, tmp_path):
+        config = PipelineConfig(name="p", profile=True, execution_mode="dag",
+                                profile_output_dir=str(tmp_path))
+        pipeline = Pipeline(config)
+        pipeline.add_step(ExpandStep("Expand"))
+        result = await pipeline.execute(_context())
+
+        step = result["profile"]["steps"][0]
+        assert step["step_name"] == "Expand"
+        assert step["cpu_seconds"] is None
+        assert list(tmp_path.glob("SPX_PO_202512_profile_*.json"))
@@ -0,0 +1,104 @@
+"""SQLJoinEngine 單元測試"""
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from accrual_bot.core.pipeline.engines.sql_join_engine import (
+    MISSING_POSITION,
+    SQLJoinEngine,
+    is_sql_join_enabled,
+    take_by_position,
+)
+
+
+@pytest.fixture(scope='module')
+def engine():
+    engine = SQLJoinEngine(threads=2, memory_limit='512MB')
+    yield engine
+    engine.close()
+
+
+@pytest.mark.unit
+class TestSQLJoinEngine:
+    """SQLJoinEngine 查詢語意測試"""
+
+    def test_query_arrow_returns_arrow_table(self, engine):
+        df = pd.DataFrame({'k': ['a', 'b', 'a'], 'v': [1, 2, 3]})
+        table = engine.query_arrow('SELECT k, sum(v) AS s FROM t GROUP BY k ORDER BY k', {'t': df})
+        assert table.column_names == ['k', 's']
+        assert table.to_pydict() == {'k': ['a', 'b'], 's': [4, 2]}
+
+    def test_lookup_last_valid_matches_groupby_last(self, engine):
+        rng = np.random.default_rng(0)
+        n = 2000
+        source = pd.DataFrame({
+            'k': [f'PO{i}' for i in rng.integers(0, 500, n)],
+            'a': np.where(rng.random(n) < 0.3, None, rng.integers(0, 9, n).astype(object)),
+            'b': np.where(rng.random(n) < 0.3, np.nan, rng.random(n)),
+        })
+        target = pd.Series([f'PO{i}' for i in rng.integers(0, 800, 1000)])
+
+        positions, found = engine.lookup_last_valid(
+            target, source['k'], {'a': source['a'], 'b': source['b']}
+        )
+        expected = source.groupby('k').last().reindex(target.to_numpy())
+
+        for col in ('a', 'b'):
+            result = take_by_position(source[col], positions[col], target.index)
+            assert result.equals(pd.Series(expected[col].to_numpy(), name=col))
+        assert (found == target.isin(source['k']).to_numpy()).all()
+
+    def test_lookup_ignores_null_keys(self, engine):
+        positions, found = engine.lookup_last_valid(
+            pd.Series(['a', None]), pd.Series([None, 'a']), {'v': pd.Series([1, 2])}
+        )
+        assert positions['v'].tolist() == [1, MISSING_POSITION]
+        assert found.tolist() == [True, False]
+
+    def test_latest_per_key_prefers_max_then_last(self, engine):
+        source_keys = pd.Series(['a', 'a', 'a', 'b'])
+        order = pd.Series([202501, 202502, 202502, 202412])
+        positions = engine.latest_per_key(pd.Series(['b', 'c', 'a']), source_keys, order)
+        assert positions.tolist() == [3, MISSING_POSITION, 2]
+
+    def test_full_outer_positions_matches_pandas(self, engine):
+        left = pd.DataFrame({'k': ['b', 'a', None, 'c', 'a'], 'x': range(5)})
+        right = pd.DataFrame({'k': ['a', 'd', None, 'b'], 'y': range(4)})
+
+        left_pos, right_pos = engine.full_outer_positions(left, right, ['k'])
+        expected = pd.merge(left, right, on=['k'], how='outer')
+
+        assert len(left_pos) == len(expected)
+        x = take_by_position(left['x'], left_pos, expected.index)
+        y = take_by_position(right['y'], right_pos, expected.index)
+        assert x.tolist() == pytest.approx(expected['x'].tolist(), nan_ok=True)
+        assert y.tolist() == pytest.approx(expected['y'].tolist(), nan_ok=True)
+
+    def test_non_string_keys_compared_as_text(self, engine):
+        positions, _ = engine.lookup_last_valid(
+            pd.Series([1, 2]), pd.Series([2, 1]), {'v': pd.Series(['x', 'y'])}
+        )
+        assert positions['v'].tolist() == [1, 0]
+
+    def test_take_by_position_keeps_extension_dtype(self):
+        values = pd.Series([202501, 202502], dtype='Int32')
+        result = take_by_position(values, np.array([1, MISSING_POSITION]), pd.RangeIndex(2))
+        assert str(result.dtype) == 'Int32'
+        assert result[0] == 202502 and pd.isna(result[1])
+
+
+@pytest.mark.unit
+class TestIsSqlJoinEnabled:
+    """[sql_join] 開關測試"""
+
+    @pytest.mark.parametrize("section,step_key,expected", [
+        ({}, 'procurement', False),
+        ({'enabled': True}, 'procurement', True),
+        ({'enabled': True, 'steps': ['ap_invoice']}, 'procurement', False),
+        ({'enabled': True, 'steps': ['ap_invoice']}, 'ap_invoice', True),
+    ])
+    def test_enabled_by_config(self, section, step_key, expected):
+        with patch('accrual_bot.core.pipeline.engines.sql_join_engine.config_manager') as cm:
+            cm._config_toml = {'sql_join': section}
+            assert is_sql_join_enabled(step_key) is expected
@@ -0,0 +1,278 @@
+"""
+串流執行模式（core/pipeline/streaming.py）單元測試
+"""
+
+import pandas as pd
+import pytest
+
+from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
+from accrual_bot.core.pipeline.context import ProcessingContext
+from accrual_bot.core.pipeline.pipeline import Pipeline, PipelineConfig
+from accrual_bot.core.pipeline.streaming import (
+    StreamingExecutor,
+    align_chunks,
+    iter_dataframe_chunks,
+    plan_streaming,
+)
+
+
+class DoubleStep(PipelineStep):
+    """列內步驟：value 乘 2"""
+
+    chunkable = True
+
+    def __init__(self, name="Double", fail_on=None):
+        super().__init__(name)
+        self.fail_on = fail_on
+        self.calls = 0
+
+    async def execute(self, context: ProcessingContext) -> StepResult:
+        self.calls += 1
+        df = context.get_data_copy()
+        if self.fail_on is not None and (df["value"] == self.fail_on).any():
+            return StepResult(step_name=self.name, status=StepStatus.FAILED, message="boom")
+        df["value"] = df["value"] * 2
+        context.update_data(df)
+        return StepResult(step_name=self.name, status=StepStatus.SUCCESS, data=df)
+
+    async def validate_input(self, context: ProcessingContext) -> bool:
+        return True
+
+
+class LookupStep(DoubleStep):
+    """列內步驟：以輔助數據對照 label，並重設索引"""
+
+    async def execute(self, context: ProcessingContext) -> StepResult:
+        self.calls += 1
+        df = context.get_data_copy()
+        mapping = context.get_auxiliary_data("labels").set_index("key")["label"]
+        df["label"] = df["key"].map(mapping)
+        df = df.reset_index(drop=True)
+        context.update_data(df)
+        return StepResult(step_name=self.name, status=StepStatus.SUCCESS, data=df)
+
+
+class GroupTotalStep(DoubleStep):
+    """需要完整數據：同 key 加總"""
+
+    chunkable = False
+
+    async def execute(self, context: ProcessingContext) -> StepResult:
+        self.calls += 1
+        df = context.get_data_copy()
+        df["total"] = df.groupby("key")["value"].transform("sum")
+        context.update_data(df)
+        return StepResult(step_name=self.name, status=StepStatus.SUCCESS, data=df)
+
+
+class KeyedGroupStep(GroupTotalStep):
+    """同 key 完整即可逐塊執行"""
+
+    chunkable = True
+    chunk_key = "key"
+
+
+class LoadLabelsStep(DoubleStep):
+    """只寫輔助數據的上下文步驟"""
+
+    chunkable = False
+    reads = ()
+    writes = ("aux:labels",)
+
+    async def execute(self, context: ProcessingContext) -> StepResult:
+        self.calls += 1
+        context.add_auxiliary_data("labels", pd.DataFrame({"key": ["a", "b", "c"], "label": ["A", "B", "C"]}))
+        return StepResult(step_name=self.name, status=StepStatus.SUCCESS)
+
+
+class FilterStep(DoubleStep):
+    """列內步驟：只保留 value 大於門檻的列"""
+
+    def __init__(self, name="Filter", threshold=4):
+        super().__init__(name)
+        self.threshold = threshold
+
+    async def execute(self, context: ProcessingContext) -> StepResult:
+        self.calls += 1
+        df = context.get_data_copy()
+        df = df[df["value"] > self.threshold]
+        context.update_data(df)
+        return StepResult(step_name=self.name, status=StepStatus.SUCCESS, data=df)
+
+
+class StrictDoubleStep(DoubleStep):
+    """輸入驗證拒絕空數據的列內步驟"""
+
+    async def validate_input(self, context: ProcessingContext) -> bool:
+        return context.data is not None and not context.data.empty
+
+
+def _frame(n=10):
+    return pd.DataFrame({
+        "key": ["a", "a", "a", "b", "b", "c", "c", "c", "c", "a"][:n],
+        "value": list(range(1, n + 1)),
+    })
+
+
+def _context(df):
+    return ProcessingContext(data=df, entity_type="SPX", processing_date=202512, processing_type="PO")
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.unit
+class TestPlanStreaming:
+    """串流計畫分類"""
+
+    def test_classifies_context_chunk_and_tail_steps(self):
+        steps = [DoubleStep("A"), LoadLabelsStep("Labels"), LookupStep("B"),
+                 GroupTotalStep("Total"), DoubleStep("C")]
+        plan = plan_streaming(steps)
+        assert plan.describe() == {
+            "context_steps": ["Labels"],
+            "chunk_steps": ["A", "B"],
+            "tail_steps": ["Total", "C"],
+            "chunk_key": None,
+        }
+
+    def test_context_step_reading_streamed_output_is_barrier(self):
+        writer = DoubleStep("Writer")
+        writer.declare_io(reads=["data"], writes=["data", "aux:summary"])
+        reader = LoadLabelsStep("Reader")
+        reader.declare_io(reads=["aux:summary"], writes=["aux:labels"])
+        plan = plan_streaming([writer, reader, DoubleStep("After")])
+        assert [s.name for s in plan.chunk_steps] == ["Writer"]
+        assert [s.name for s in plan.tail_steps] == ["Reader", "After"]
+
+    def test_chunk_key_from_steps(self):
+        plan = plan_streaming([DoubleStep("A"), KeyedGroupStep("Group")])
+        assert plan.chunk_key == "key"
+
+
+@pytest.mark.unit
+class TestChunkHelpers:
+    """切塊與對齊"""
+
+    @pytest.mark.asyncio
+    async def test_iter_dataframe_chunks(self):
+        chunks = await _collect(iter_dataframe_chunks(_frame(), 4))
+        assert [len(c) for c in chunks] == [4, 4, 2]
+        assert chunks[1].index.tolist() == [4, 5, 6, 7]
+
+    @pytest.mark.asyncio
+    async def test_align_chunks_keeps_key_blocks_together(self):
+        chunks = await _collect(align_chunks(iter_dataframe_chunks(_frame(), 4), "key"))
+        assert [c["key"].tolist() for c in chunks] == [
+            ["a", "a", "a"], ["b", "b"], ["c", "c", "c", "c"], ["a"],
+        ]
+        assert pd.concat(chunks).equals(_frame())
+
+
+@pytest.mark.unit
+class TestStreamingExecution:
+    """串流執行與一般執行一致"""
+
+    def _pipeline(self, *steps, stop_on_error=True):
+        pipeline = Pipeline(PipelineConfig(name="stream", stop_on_error=stop_on_error))
+        for step in steps:
+            pipeline.add_step(step)
+        return pipeline
+
+    @pytest.mark.asyncio
+    async def test_matches_full_execution(self):
+        make = lambda: self._pipeline(  # noqa: E731
+            DoubleStep("A"), LoadLabelsStep("Labels"), LookupStep("B"),
+            KeyedGroupStep("Group"), GroupTotalStep("Total"),
+        )
+        full = _context(_frame())
+        full_result = await make().execute(full)
+
+        streamed = _context(pd.DataFrame())
+        result = await make().execute_streaming(streamed, iter_dataframe_chunks(_frame(), 4))
+
+        assert full_result["success"] and result["success"]
+        pd.testing.assert_frame_equal(streamed.data, full.data)
+        assert result["streaming_plan"]["chunk_key"] == "key"
+        assert [r["step_name"] for r in result["results"]] == ["Labels", "A", "B", "Group", "Total"]
+
+    @pytest.mark.asyncio
+    async def test_merged_step_result_metadata(self):
+        step = DoubleStep("A")
+        context = _context(pd.DataFrame())
+        results = await StreamingExecutor([step, GroupTotalStep("Total")]).run(
+            context, iter_dataframe_chunks(_frame(), 3)
+        )
+        assert step.calls == 4
+        assert results[0].status == StepStatus.SUCCESS
+        assert results[0].metadata["chunks"] == 4
+        assert results[0].metadata["output_rows"] == 10
+        assert context.data["value"].tolist() == [v * 2 for v in range(1, 11)]
+
+    @pytest.mark.asyncio
+    async def test_sink_receives_chunks_without_materializing(self):
+        received = []
+        context = _context(pd.DataFrame())
+        await StreamingExecutor([DoubleStep("A")]).run(
+            context, iter_dataframe_chunks(_frame(), 4), sink=received.append
+        )
+        assert [len(c) for c in received] == [4, 4, 2]
+        assert context.data.empty
+
+    @pytest.mark.asyncio
+    async def test_sink_called_once_after_tail(self):
+        received = []
+
+        async def sink(df):
+            received.append(df)
+
+        context = _context(pd.DataFrame())
+        await StreamingExecutor([DoubleStep("A"), GroupTotalStep("Total")]).run(
+            context, iter_dataframe_chunks(_frame(), 4), sink=sink
+        )
+        assert len(received) == 1
+        assert "total" in received[0].columns
+
+    @pytest.mark.asyncio
+    async def test_stop_on_error_halts_stream(self):
+        failing = DoubleStep("A", fail_on=6)
+        tail = GroupTotalStep("Total")
+        context = _context(pd.DataFrame())
+        results = await StreamingExecutor([failing, tail], stop_on_error=True).run(
+            context, iter_dataframe_chunks(_frame(), 4)
+        )
+        assert failing.calls == 2
+        assert tail.calls == 0
+        assert results[0].status == StepStatus.FAILED
+        assert results[0].metadata["chunk_statuses"] == {"success": 1, "failed": 1}
+
+    @pytest.mark.asyncio
+    async def test_chunk_emptied_by_filter_skips_remaining_steps(self):
+        """篩選清空的塊不再交給後續步驟，結果與整批執行一致"""
+        make = lambda: self._pipeline(FilterStep("Filter"), StrictDoubleStep("Strict"))  # noqa: E731
+        full = _context(_frame())
+        full_result = await make().execute(full)
+
+        streamed = _context(pd.DataFrame())
+        pipeline = make()
+        result = await pipeline.execute_streaming(streamed, iter_dataframe_chunks(_frame(), 4))
+
+        assert full_result["success"] and result["success"]
+        pd.testing.assert_frame_equal(streamed.data, full.data)
+        strict = next(r for r in result["results"] if r["step_name"] == "Strict")
+        assert strict["status"] == StepStatus.SUCCESS.value
+        assert pipeline.steps[1].calls == 2
+
+    def test_spawn_chunk_shares_auxiliary_state(self):
+        parent = _context(pd.DataFrame({"value": [1]}))
+        parent.add_auxiliary_data("labels", pd.DataFrame({"key": ["a"]}))
+        child = parent.spawn_chunk(pd.DataFrame({"value": [5, 6]}))
+        child.set_variable("seen", True)
+        child.add_warning("chunk warning")
+
+        assert child.get_auxiliary_data("labels") is parent.get_auxiliary_data("labels")
+        assert parent.get_variable("seen") is True
+        assert "chunk warning" in parent.warnings
+        assert parent.data["value"].tolist() == [1]
+        assert child.data["value"].tolist() == [5, 6]
@@ -0,0 +1,190 @@
+"""
+batch_runner 單元測試
+
+測試 parse_job_spec, load_batch_jobs, run_batch_job, BatchRunner。
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from accrual_bot.core.pipeline import Pipeline, PipelineConfig, PipelineStep, StepResult, StepStatus
+from accrual_bot.runner.batch_runner import (
+    BatchJob,
+    BatchRunner,
+    load_batch_jobs,
+    parse_job_spec,
+    run_batch_job,
+)
+
+
+class _ExportStep(PipelineStep):
+    """寫入假輸出路徑的步驟"""
+
+    async def execute(self, context):
+        context.update_data(pd.DataFrame({'a': [1]}))
+        context.set_variable('export_output_path', f"/tmp/{context.metadata.entity_type}.xlsx")
+        return StepResult(step_name=self.name, status=StepStatus.SUCCESS)
+
+    async def validate_input(self, context):
+        return True
+
+
+def _service_with_pipeline():
+    pipeline = Pipeline(PipelineConfig(name="fake"))
+    pipeline.add_step(_ExportStep("Export"))
+    service = MagicMock()
+    service.build_pipeline.return_value = pipeline
+    return service
+
+
+# ===========================================================================
+# parse_job_spec / load_batch_jobs
+# ===========================================================================
+@pytest.mark.unit
+class TestParseJobSpec:
+    """測試工作字串解析"""
+
+    def test_entity_and_type(self):
+        job = parse_job_spec("spx:po", 202512)
+        assert (job.entity, job.processing_type, job.processing_date) == ("SPX", "PO", 202512)
+        assert job.label == "SPX_PO_202512"
+
+    def test_with_source_type(self):
+        job = parse_job_spec("SPT:PROCUREMENT:COMBINED", 202512)
+        assert job.source_type == "COMBINED"
+
+    @pytest.mark.parametrize("spec", ["SPX", "SPX:", "A:B:C:D"])
+    def test_invalid_spec(self, spec):
+        with pytest.raises(ValueError, match="工作格式錯誤"):
+            parse_job_spec(spec, 202512)
+
+
+@pytest.mark.unit
+class TestLoadBatchJobs:
+    """測試 [batch] 區段載入"""
+
+    def test_uses_run_processing_date_and_auto_workers(self, tmp_path):
+        config = tmp_path / "run_config.toml"
+        config.write_bytes(
+            b'[run]\nprocessing_date = 202603\n\n'
+            b'[batch]\njobs = ["SPX:PO", "SCT:PR"]\nmax_workers = 0\n'
+        )
+        jobs, max_workers = load_batch_jobs(config)
+        assert [job.label for job in jobs] == ["SPX_PO_202603", "SCT_PR_202603"]
+        assert max_workers is None
+
+    def test_batch_date_overrides_run(self, tmp_path):
+        config = tmp_path / "run_config.toml"
+        config.write_bytes(
+            b'[run]\nprocessing_date = 202603\n\n'
+            b'[batch]\njobs = ["SPX:PO"]\nprocessing_date = 202512\nmax_workers = 3\n'
+        )
+        jobs, max_workers = load_batch_jobs(config)
+        assert jobs[0].processing_date == 202512
+        assert max_workers == 3
+
+    def test_missing_batch_section(self, tmp_path):
+        config = tmp_path / "run_config.toml"
+        config.write_bytes(b'[run]\nentity = "SPX"\n')
+        assert load_batch_jobs(config) == ([], None)
+
+
+# ===========================================================================
+# run_batch_job
+# ===========================================================================
+@pytest.mark.unit
+class TestRunBatchJob:
+    """測試單一工作執行摘要"""
+
+    def test_success_summary_with_output_paths(self):
+        service = _service_with_pipeline()
+        job = BatchJob("SPX", "PO", 202512, file_paths={'raw_po': '/tmp/raw.csv'})
+        with patch("accrual_bot.runner.batch_runner._get_service", return_value=service):
+            summary = run_batch_job(job)
+
+        assert summary['success'] is True
+        assert summary['job'] == "SPX_PO_202512"
+        assert summary['successful_steps'] == 1
+        assert summary['steps'][0]['step_name'] == "Export"
+        assert summary['output_paths'] == {'export_output_path': "/tmp/SPX.xlsx"}
+        assert summary['pid'] == os.getpid()
+        service.build_pipeline.assert_called_once_with(
+            "SPX", "PO", {'raw_po': '/tmp/raw.csv'},
+            processing_date=202512, source_type=None,
+        )
+
+    def test_output_path_from_export_step_metadata(self, tmp_path):
+        """SPT / SPX PR 的 SPXPRExportStep 只以 metadata 回報輸出檔"""
+        from accrual_bot.tasks.spx.steps import SPXPRExportStep
+
+        class _LoadStep(PipelineStep):
+            async def execute(self, context):
+                context.update_data(pd.DataFrame({'PR#': ['PR1', 'PR2']}))
+                return StepResult(step_name=self.name, status=StepStatus.SUCCESS)
+
+            async def validate_input(self, context):
+                return True
+
+        pipeline = Pipeline(PipelineConfig(name="SPT_PR"))
+        pipeline.add_steps([_LoadStep("Load"), SPXPRExportStep("SPTExport", output_dir=str(tmp_path))])
+        service = MagicMock()
+        service.build_pipeline.return_value = pipeline
+        with patch("accrual_bot.runner.batch_runner._get_service", return_value=service):
+            summary = run_batch_job(BatchJob("SPT", "PR", 202512, file_paths={}))
+
+        assert summary['success'] is True
+        assert list(summary['output_paths']) == ['SPTExport']
+        output_path = summary['output_paths']['SPTExport']
+        assert os.path.dirname(output_path) == str(tmp_path)
+        assert os.path.exists(output_path)
+
+    def test_resolves_file_paths_when_missing(self):
+        service = _service_with_pipeline()
+        with patch("accrual_bot.runner.batch_runner._get_service", return_value=service), \
+                patch("accrual_bot.runner.batch_runner.load_file_paths", return_value={'raw_po': {}}) as mock_load:
+            run_batch_job(BatchJob("SCT", "PR", 202601))
+        mock_load.assert_called_once_with("SCT", "PR", 202601)
+
+    def test_build_error_is_reported(self):
+        service = MagicMock()
+        service.build_pipeline.side_effect = ValueError("不支援的 entity: XXX")
+        with patch("accrual_bot.runner.batch_runner._get_service", return_value=service):
+            summary = run_batch_job(BatchJob("XXX", "PO", 202512, file_paths={}))
+        assert summary['success'] is False
+        assert summary['errors'] == ["不支援的 entity: XXX"]
+
+
+# ===========================================================================
+# BatchRunner
+# ===========================================================================
+@pytest.mark.unit
+class TestBatchRunner:
+    """測試批次執行器"""
+
+    def test_single_worker_runs_in_process_in_order(self):
+        jobs = [BatchJob("SPX", "PO", 202512), BatchJob("SPX", "PR", 202512)]
+
+        def fake_run(job):
+            return {'job': job.label, 'success': job.processing_type == "PO", 'duration': 0.0}
+
+        with patch("accrual_bot.runner.batch_runner.run_batch_job", side_effect=fake_run):
+            result = BatchRunner(max_workers=1).run(jobs)
+
+        assert [job['job'] for job in result.jobs] == ["SPX_PO_202512", "SPX_PR_202512"]
+        assert result.success is False
+        assert result.failed_jobs == ["SPX_PR_202512"]
+        assert result.to_dict()['max_workers'] == 1
+
+    def test_process_pool_runs_jobs_in_workers(self):
+        """以真實行程池執行（不支援的 entity 會在 worker 內快速失敗）"""
+        jobs = [BatchJob("XXX", "PO", 202512, file_paths={}),
+                BatchJob("YYY", "PR", 202512, file_paths={})]
+        result = BatchRunner(max_workers=2).run(jobs)
+
+        assert [job['job'] for job in result.jobs] == ["XXX_PO_202512", "YYY_PR_202512"]
+        assert all(not job['success'] for job in result.jobs)
+        assert all("不支援的 entity" in job['errors'][0] for job in result.jobs)
+        assert all(job['pid'] != os.getpid() for job in result.jobs)
@@ -11,6 +11,7 @@ from unittest.mock import patch
 
 from accrual_bot.runner.config_loader import (
     RunConfig,
+    apply_profiling_config,
     load_run_config,
     load_file_paths,
     _calculate_date_vars,
@@ -233,6 +234,30 @@ auto_export = false
         assert rc.resume_enabled is False
         assert rc.output_dir == "./output"
         assert rc.auto_export is True
+        assert rc.profiling_enabled is False
+        assert rc.profiling_trace == "none"
+
+    def test_load_profiling_section(self, tmp_path):
+        """[profiling] 區段載入並套用到 Pipeline"""
+        from accrual_bot.core.pipeline import Pipeline, PipelineConfig
+
+        toml_content = """\
+[profiling]
+enabled = true
+trace = "cprofile"
+deep_memory = true
+"""
+        config_path = _write_toml(tmp_path / "run_config.toml", toml_content)
+        rc = load_run_config(config_path)
+        assert rc.profiling_enabled is True
+        assert rc.profiling_trace == "cprofile"
+        assert rc.profiling_deep_memory is True
+
+        pipeline = Pipeline(PipelineConfig(name="p"))
+        apply_profiling_config(pipeline, rc)
+        assert pipeline.config.profile is True
+        assert pipeline.config.profile_trace == "cprofile"
+        assert pipeline.config.profile_deep_memory is True
 
     def test_missing_file_raises(self, tmp_path):
         """不存在的檔案應拋出例外"""
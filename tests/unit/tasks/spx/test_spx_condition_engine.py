@@ -390,6 +390,28 @@ class TestEvaluateCheck:
         assert result is not None
         assert result.tolist() == [True, False, True]
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("check", [
+        {'type': 'contains', 'field': 'Supplier', 'pattern': '掌櫃|益欣'},
+        {'type': 'not_contains', 'field': 'Supplier', 'pattern': '掌櫃'},
+        {'type': 'equals', 'field': 'Supplier', 'value': '益欣'},
+        {'type': 'not_equals', 'field': 'Supplier', 'value': '益欣'},
+        {'type': 'in_list', 'field': 'Supplier', 'values': ['掌櫃', '其他']},
+        {'type': 'not_in_list', 'field': 'Supplier', 'values': ['掌櫃']},
+    ])
+    def test_category_column_matches_string_column(self, engine_with_rules, check):
+        """category 欄位走 codes 快速路徑，結果應與字串欄位一致（含缺值）"""
+        values = ['掌櫃', '益欣', None, '其他', '益欣', '掌櫃']
+        df_str = pd.DataFrame({'Supplier': values})
+        df_cat = pd.DataFrame({'Supplier': pd.Series(values, dtype='category')})
+
+        expected = engine_with_rules._evaluate_check(df_str, check, 'PO狀態', {})
+        result = engine_with_rules._evaluate_check(df_cat, check, 'PO狀態', {})
+
+        assert result.index.equals(expected.index)
+        assert result.astype(object).where(result.notna(), None).tolist() == \
+            expected.astype(object).where(expected.notna(), None).tolist()
+
 
 # ============================================================
 # 組合 mask 測試
@@ -634,6 +656,53 @@ class TestEvaluateCheckExtended:
         # 202510 在 [202510, 202512] 內 -> True
         assert result.tolist() == [True, False, True]
 
+    @pytest.mark.unit
+    def test_erm_in_range_prefers_integer_columns(self, engine_with_rules):
+        """存在 erm_desc_start/end 整數欄位時應優先使用"""
+        df = pd.DataFrame({
+            'Expected Received Month_轉換格式': [202510, 202601],
+            'YMs of Item Description': ['100001,100002', '100001,100002'],
+            'erm_desc_start': pd.array([202510, 202510], dtype='Int32'),
+            'erm_desc_end': pd.array([202512, 202512], dtype='Int32'),
+        })
+        result = engine_with_rules._compute_erm_in_range(df)
+        assert result.tolist() == [True, False]
+
+    @pytest.mark.unit
+    def test_desc_erm_checks_use_integer_columns(self, engine_with_rules):
+        """desc_erm_* check 應使用整數欄位"""
+        df = pd.DataFrame({
+            'erm_desc_start': pd.array([202510, 100001], dtype='Int32'),
+            'erm_desc_end': pd.array([202601, 100002], dtype='Int32'),
+        })
+        context = {'processing_date': 202512}
+        le = engine_with_rules._evaluate_check(
+            df, {'type': 'desc_erm_le_date'}, 'PO狀態', context)
+        gt = engine_with_rules._evaluate_check(
+            df, {'type': 'desc_erm_gt_date'}, 'PO狀態', context)
+        not_error = engine_with_rules._evaluate_check(
+            df, {'type': 'desc_erm_not_error'}, 'PO狀態', context)
+        assert le.tolist() == [False, True]
+        assert gt.tolist() == [False, False]
+        assert not_error.tolist() == [True, False]
+
+    @pytest.mark.unit
+    def test_format_error_uses_flag_column(self, engine_with_rules):
+        """format_error / out_of_range 應使用格式錯誤旗標欄位"""
+        df = pd.DataFrame({
+            'Expected Received Month_轉換格式': [202603, 202603],
+            'erm_desc_start': pd.array([202510, 100001], dtype='Int32'),
+            'erm_desc_end': pd.array([202601, 100002], dtype='Int32'),
+            'erm_desc_format_error': [False, True],
+        })
+        context = {'prebuilt_masks': {}}
+        format_error = engine_with_rules._evaluate_check(
+            df, {'type': 'format_error'}, 'PO狀態', context)
+        out_of_range = engine_with_rules._evaluate_check(
+            df, {'type': 'out_of_range'}, 'PO狀態', context)
+        assert format_error.tolist() == [False, True]
+        assert out_of_range.tolist() == [True, False]
+
     @pytest.mark.unit
     def test_erm_in_range_missing_columns(self, engine_with_rules):
         """erm_in_range 缺少必要欄位時應回傳 None"""
@@ -1114,3 +1183,114 @@ class TestApplyRulesExtended:
         assert df_result.loc[1, 'PO狀態'] == '第二批'
         # 第三列不匹配任何規則，應仍為 NA
         assert pd.isna(df_result.loc[2, 'PO狀態'])
+
+
+# ============================================================
+# 編譯計畫與 sub-mask memo 測試
+# ============================================================
+
+class TestCompiledPlan:
+    """測試規則編譯與 sub-mask 快取"""
+
+    @pytest.fixture
+    def shared_check_engine(self, mock_engine_deps):
+        """多條規則共用相同 check 的引擎"""
+        mock_engine_deps._config_toml['test_rules'] = {
+            'conditions': [
+                {
+                    'priority': 10,
+                    'status_value': '押金',
+                    'checks': [
+                        {'type': 'contains', 'field': 'Item Description',
+                         'pattern_key': 'spx.deposit_keywords'},
+                        {'type': 'equals', 'field': 'Type', 'value': 'A'},
+                    ],
+                },
+                {
+                    'priority': 20,
+                    'status_value': '非押金',
+                    'checks': [
+                        {'type': 'not_contains', 'field': 'Item Description',
+                         'pattern_key': 'spx.deposit_keywords'},
+                    ],
+                },
+                {
+                    'priority': 30,
+                    'status_value': '押金B',
+                    'checks': [
+                        {'type': 'contains', 'field': 'Item Description',
+                         'pattern_key': 'spx.deposit_keywords'},
+                    ],
+                },
+            ]
+        }
+        from accrual_bot.tasks.spx.steps.spx_condition_engine import SPXConditionEngine
+        return SPXConditionEngine('test_rules')
+
+    @pytest.mark.unit
+    def test_plan_resolves_keys(self, shared_check_engine):
+        """編譯後 pattern_key 應已解析為 pattern"""
+        check = shared_check_engine.plan[0].checks[0]
+        assert 'pattern_key' not in check
+        assert check['pattern'] == '訂金|押金|保證金'
+
+    @pytest.mark.unit
+    def test_plan_skips_empty_checks(self, mock_engine_deps):
+        """無 checks 的規則不應進入計畫"""
+        mock_engine_deps._config_toml['test_rules'] = {
+            'conditions': [{'priority': 1, 'status_value': 'x', 'checks': []}]
+        }
+        from accrual_bot.tasks.spx.steps.spx_condition_engine import SPXConditionEngine
+        engine = SPXConditionEngine('test_rules')
+        assert len(engine.rules) == 1
+        assert engine.plan == []
+
+    @pytest.mark.unit
+    def test_identical_checks_evaluated_once(self, shared_check_engine):
+        """相同 check（含反向）在同一次 apply_rules 中只評估一次"""
+        df = pd.DataFrame({
+            'PO狀態': [pd.NA, pd.NA, pd.NA],
+            'Item Description': ['押金', '一般', '保證金'],
+            'Type': ['A', 'A', 'B'],
+        })
+        with patch.object(
+            shared_check_engine, '_check_contains',
+            wraps=shared_check_engine._check_contains
+        ) as spy:
+            df_result, _ = shared_check_engine.apply_rules(
+                df, 'PO狀態', {'prebuilt_masks': {}}
+            )
+        assert spy.call_count == 1
+        assert df_result['PO狀態'].tolist() == ['押金', '非押金', '押金B']
+
+    @pytest.mark.unit
+    def test_status_column_check_not_memoized(self, mock_engine_deps):
+        """讀取狀態欄位的 check 應反映前一規則的賦值"""
+        mock_engine_deps._config_toml['test_rules'] = {
+            'conditions': [
+                {
+                    'priority': 10,
+                    'status_value': '已完成_租金',
+                    'checks': [{'type': 'equals', 'field': 'Type', 'value': 'A'}],
+                },
+                {
+                    'priority': 20,
+                    'status_value': '已入帳',
+                    'override_statuses': ['已完成_租金'],
+                    'checks': [{'type': 'contains', 'field': 'PO狀態',
+                                'pattern': '已完成_租金'}],
+                },
+                {
+                    'priority': 30,
+                    'status_value': '其他',
+                    'checks': [{'type': 'contains', 'field': 'PO狀態',
+                                'pattern': '已完成_租金'}],
+                },
+            ]
+        }
+        from accrual_bot.tasks.spx.steps.spx_condition_engine import SPXConditionEngine
+        engine = SPXConditionEngine('test_rules')
+        df = pd.DataFrame({'PO狀態': [pd.NA, pd.NA], 'Type': ['A', 'B']})
+        df_result, _ = engine.apply_rules(df, 'PO狀態', {'prebuilt_masks': {}})
+        assert df_result.loc[0, 'PO狀態'] == '已入帳'
+        assert pd.isna(df_result.loc[1, 'PO狀態'])
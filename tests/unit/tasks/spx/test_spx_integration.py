@@ -47,7 +47,7 @@ def mock_integration_deps():
                 'locker_suppliers': ['掌櫃'],
                 'locker_columns': [f'col{i}' for i in range(34)],
                 'locker_agg_columns': ['A', 'B'],
-                'locker_priority_order': ['A', 'B', 'XA'],
+                'locker_priority_order': ['A', 'B', 'XA', 'XA30'],
                 'locker_discount_pattern': r'\d+折',
                 'output_columns_before_nlp': ['PO#', 'Item Description'],
                 'output_columns_before_nlp_pr': ['PR#', 'Item Description'],
@@ -379,6 +379,36 @@ class TestAPInvoiceIntegrationStep:
         result = await step.execute(ctx)
         assert result.status == StepStatus.SUCCESS
 
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_sql_join_matches_merge(self):
+        """SQL 模式應與排序去重 + merge 結果一致（取 yyyymm 前最新期間）"""
+        from accrual_bot.tasks.spx.steps.spx_integration import APInvoiceIntegrationStep
+        df = _create_po_df(3)
+        df['PO Line'] = ['SPXTW-PO000-1', 'SPXTW-PO001-1', 'SPXTW-PO002-1']
+        ap_df = pd.DataFrame({
+            'Company': ['SPXTW'] * 4,
+            'PO Number': ['PO000', 'PO000', 'PO000', 'PO001'],
+            'PO_LINE_NUMBER': ['1', '1', '1', '1'],
+            'Period': ['Jan-25', 'Feb-25', 'Jun-25', 'Feb-25'],
+            'Match Type': ['A', None, 'C', 'D'],
+        })
+
+        results = []
+        for sql_join in (False, True):
+            step = APInvoiceIntegrationStep()
+            step.sql_join = sql_join
+            ctx = _create_context(df.copy(), pdate=202503)
+            ctx.add_auxiliary_data('ap_invoice', ap_df.copy())
+            result = await step.execute(ctx)
+            assert result.status == StepStatus.SUCCESS
+            results.append(ctx.data)
+
+        pd.testing.assert_frame_equal(results[1], results[0])
+        assert results[1]['GL DATE'].tolist()[:2] == [202502, 202502]
+        assert results[1]['match_type'].tolist()[:2] == ['system_filled', 'D']
+        assert pd.isna(results[1].loc[2, 'GL DATE'])
+
     @pytest.mark.asyncio
     @pytest.mark.unit
     async def test_validate_input_missing_po_line(self):
@@ -676,6 +706,108 @@ class TestValidationDataProcessingStep:
         result = step._apply_locker_validation(df, {}, ['掌櫃'])
         pd.testing.assert_frame_equal(result, df)
 
+    @pytest.mark.unit
+    def test_apply_locker_validation_with_match(self):
+        """智取櫃驗收應依 (PO#, 櫃體種類) 回寫，並排除減價/非供應商品項"""
+        from accrual_bot.tasks.spx.steps.spx_integration import ValidationDataProcessingStep
+        step = ValidationDataProcessingStep()
+        df = pd.DataFrame({
+            'PO#': ['PO001', 'PO001', 'PO001', 'PO002', 'PO003'],
+            'Item Description': [
+                '門市智取櫃工程SPX locker XA 第二期款項',
+                '門市智取櫃工程SPX locker XA30第一期款項',
+                '門市智取櫃工程SPX locker A 減價',
+                '門市智取櫃工程SPX locker A',
+                '門市智取櫃工程SPX locker A',
+            ],
+            'PO Supplier': ['掌櫃', '掌櫃', '掌櫃', '其他', '掌櫃'],
+            '本期驗收數量/金額': [0, 0, 0, 0, 0],
+        })
+        locker_data = {
+            'PO001': {'A': 1, 'XA': 2, 'XA30': 3},
+            'PO002': {'A': 4},
+        }
+        result = step._apply_locker_validation(df, locker_data, ['掌櫃'])
+        assert result['本期驗收數量/金額'].tolist() == [2, 3, 0, 0, 0]
+
+    @pytest.mark.unit
+    def test_apply_locker_validation_sparse_locker_data(self):
+        """各 PO 的櫃體種類不同時，缺少驗收數據的組合應維持原值 0"""
+        from accrual_bot.tasks.spx.steps.spx_integration import ValidationDataProcessingStep
+        step = ValidationDataProcessingStep()
+        df = pd.DataFrame({
+            'PO#': ['P1', 'P1', 'P2', 'P2'],
+            'Item Description': [
+                '門市智取櫃工程SPX locker A',
+                '門市智取櫃工程SPX locker B',
+                '門市智取櫃工程SPX locker A',
+                '門市智取櫃工程SPX locker B',
+            ],
+            'PO Supplier': ['掌櫃'] * 4,
+            '本期驗收數量/金額': [0, 0, 0, 0],
+        })
+        locker_data = {'P1': {'A': 5}, 'P2': {'B': 7}}
+        result = step._apply_locker_validation(df, locker_data, ['掌櫃'])
+        assert result['本期驗收數量/金額'].tolist() == [5, 0, 0, 7]
+        assert result['本期驗收數量/金額'].notna().all()
+
+    @pytest.mark.unit
+    def test_apply_locker_validation_named_index(self):
+        """index 有名稱或標籤重複時仍依列位置回寫"""
+        from accrual_bot.tasks.spx.steps.spx_integration import ValidationDataProcessingStep
+        step = ValidationDataProcessingStep()
+        df = pd.DataFrame({
+            'PO#': ['P1', 'P1', 'P2'],
+            'Item Description': [
+                '門市智取櫃工程SPX locker A',
+                '門市智取櫃工程SPX locker B',
+                '門市智取櫃工程SPX locker A',
+            ],
+            'PO Supplier': ['掌櫃'] * 3,
+            '本期驗收數量/金額': [0, 0, 0],
+        }, index=pd.Index([7, 7, 3], name='line_no'))
+        locker_data = {'P1': {'B': 5}, 'P2': {'A': 6}}
+        result = step._apply_locker_validation(
+            df, locker_data, ['掌櫃'], discount_rate=0.8, is_discount=True
+        )
+        assert result['本期驗收數量/金額'].tolist() == [0, 5, 6]
+        assert result['折扣率'].isna().tolist() == [True, False, False]
+        assert result.index.name == 'line_no'
+
+    @pytest.mark.unit
+    def test_apply_locker_validation_discount_rate(self):
+        """折扣驗收應記錄折扣率，且不覆蓋已有驗收值"""
+        from accrual_bot.tasks.spx.steps.spx_integration import ValidationDataProcessingStep
+        step = ValidationDataProcessingStep()
+        df = pd.DataFrame({
+            'PO#': ['PO001', 'PO001'],
+            'Item Description': ['門市智取櫃 locker B 減價', '門市智取櫃 locker B'],
+            'PO Supplier': ['掌櫃', '掌櫃'],
+            '本期驗收數量/金額': [0, 9],
+        })
+        result = step._apply_locker_validation(
+            df, {'PO001': {'B': 5}}, ['掌櫃'], discount_rate=0.8, is_discount=True
+        )
+        assert result['本期驗收數量/金額'].tolist() == [5, 9]
+        assert result.loc[0, '折扣率'] == 0.8
+        assert pd.isna(result.loc[1, '折扣率'])
+
+    @pytest.mark.unit
+    def test_extract_cabinet_type_follows_priority_order(self):
+        """同時命中多種櫃體時，應取 priority_order 中較前者而非字串中先出現者"""
+        from accrual_bot.tasks.spx.steps.spx_integration import ValidationDataProcessingStep
+        desc = pd.Series([
+            'locker A 與 locker 控制主櫃',
+            'locker xa30',
+            '無櫃體',
+        ])
+        result = ValidationDataProcessingStep._extract_cabinet_type(
+            desc, ['DA', 'A', 'XA', 'XA30']
+        )
+        assert result.iloc[0] == 'DA'
+        assert result.iloc[1] == 'XA30'
+        assert pd.isna(result.iloc[2])
+
     @pytest.mark.unit
     def test_update_cumulative_qty_for_ppe(self):
         """更新累計驗收數量"""
@@ -1240,6 +1372,35 @@ class TestPPEDataMergeStep:
         assert result.status == StepStatus.SUCCESS
         assert len(ctx.data) >= 2  # outer merge
 
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_sql_join_matches_outer_merge(self):
+        """SQL 模式應與 pd.merge(how='outer') 結果一致（含空鍵值與重複鍵）"""
+        from accrual_bot.tasks.spx.steps.spx_integration import PPEDataMergeStep
+        filing_df = pd.DataFrame({
+            'sp_code': [1001, 1002, 1003, 1004],
+            'address': ['addr2', 'addr1', None, 'addr1'],
+            'contract_end_day': ['2025-01-01', '2025-06-01', '2025-07-01', '2025-08-01'],
+        })
+        renewal_df = pd.DataFrame({
+            'sp_code': [2001, 2002, 2003],
+            'address': ['addr1', 'addr9', None],
+            'contract_end_day': ['2026-01-01', '2026-06-01', '2026-07-01'],
+        })
+
+        results = []
+        for sql_join in (False, True):
+            step = PPEDataMergeStep()
+            step.sql_join = sql_join
+            ctx = _create_context(filing_df, ptype='PPE')
+            ctx.add_auxiliary_data('filing_list_clean', filing_df)
+            ctx.add_auxiliary_data('renewal_list_clean', renewal_df)
+            result = await step.execute(ctx)
+            assert result.status == StepStatus.SUCCESS
+            results.append(ctx.data)
+
+        pd.testing.assert_frame_equal(results[1], results[0])
+
     @pytest.mark.asyncio
     @pytest.mark.unit
     async def test_execute_failure(self):
@@ -424,7 +424,8 @@ class TestSPXLoadReferenceData:
 
         ref_df = _make_ref_df()
         source = AsyncMock()
-        source.read = AsyncMock(return_value=ref_df)
+        source.attach_cache = MagicMock()
+        source.read_with_cache = AsyncMock(return_value=ref_df)
         source.close = AsyncMock()
         mock_spx_deps['factory'].create_from_file.return_value = source
 
@@ -434,6 +435,8 @@ class TestSPXLoadReferenceData:
             count = await step._load_reference_data(ctx)
 
         assert count == 2
+        source.attach_cache.assert_called_once()
+        source.read_with_cache.assert_awaited_once_with(dtype=str)
         source.close.assert_awaited_once()
 
     @pytest.mark.asyncio
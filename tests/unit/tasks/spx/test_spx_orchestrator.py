@@ -161,3 +161,19 @@ def test_orchestrator_processing_types(processing_type, expected_steps, mock_spx
         pipeline = orchestrator.build_pr_pipeline(file_paths)
 
     assert len(pipeline.steps) == expected_steps
+
+
+@pytest.mark.unit
+def test_execution_mode_opt_in(mock_spx_config):
+    """配置 execution_mode = "dag" 時 pipeline 使用 DAG 模式，且關單清單不依賴 AP 發票整合"""
+    from accrual_bot.core.pipeline.dag import build_step_graph
+
+    mock_spx_config._config_toml['pipeline']['spx']['execution_mode'] = 'dag'
+    mock_spx_config._config_toml['pipeline']['spx']['enabled_po_steps'] = [
+        'SPXDataLoading', 'ColumnAddition', 'APInvoiceIntegration', 'ClosingListIntegration',
+    ]
+    pipeline = SPXPipelineOrchestrator().build_po_pipeline({'input': '/tmp/test.xlsx'})
+
+    assert pipeline.config.execution_mode == 'dag'
+    graph = build_step_graph(pipeline.steps)
+    assert graph[3] == {0}  # ClosingListIntegration 只依賴資料載入
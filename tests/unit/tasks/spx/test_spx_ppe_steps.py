@@ -926,3 +926,46 @@ class TestAccountingOPSValidationStep:
         df = pd.DataFrame({'wrong': [1]})
         with pytest.raises(ValueError, match="PO單號"):
             step._aggregate_ops_data(df)
+
+    async def test_aggregate_ops_data_ref_and_blank_as_zero(self):
+        """Test 62: OPS 空值 / 空字串 / REF 視為 0，數值欄位直接加總"""
+        step = AccountingOPSValidationStep(amount_columns=['A', 'B', '裝運費'])
+        df_ops = pd.DataFrame({
+            'PO單號': ['PO001', 'PO001', 'PO002', 'PO003'],
+            'A': ['1', 'REF#123', '', None],
+            'B': [2.0, np.nan, 1.0, 3.0],
+            '裝運費': ['100', '50.5', 'REF', np.nan],
+        })
+        df_result, df_by_type = step._aggregate_ops_data(df_ops)
+
+        assert df_result['po_number'].tolist() == ['PO001', 'PO002', 'PO003']
+        # 費用欄位不計入 locker 數量
+        assert df_result['ops_locker_count'].tolist() == [3.0, 1.0, 3.0]
+        amounts = df_by_type.set_index(['po_number', 'locker_type'])['num/amt']
+        assert amounts[('PO001', '裝運費')] == 150.5
+        assert amounts[('PO002', 'A')] == 0
+        assert str(df_by_type['num/amt'].dtype) == 'Float64'
+
+    async def test_aggregate_ops_data_skips_missing_amount_columns(self):
+        """Test 63: 不存在的金額欄位不參與聚合"""
+        step = AccountingOPSValidationStep(amount_columns=['A', 'XG'])
+        df_ops = pd.DataFrame({'PO單號': ['PO001'], 'A': ['2']})
+        _, df_by_type = step._aggregate_ops_data(df_ops)
+
+        assert df_by_type['locker_type'].tolist() == ['A']
+
+    async def test_extract_locker_type_replacements(self):
+        """Test 64: locker_type 替換表依序套用，非字串儲存格為 NaN"""
+        step = AccountingOPSValidationStep()
+        df = pd.DataFrame({
+            'item_description': [
+                'SPX locker 控制主櫃 訂金',
+                'SPX locker 安裝運費 #tag',
+                'SPX locker XA30 50%款項',
+                12345,
+                None,
+            ],
+        })
+        result = step._extract_locker_type(df)['locker_type']
+        assert result.iloc[:3].tolist() == ['DA', '裝運費', 'XA30']
+        assert result.iloc[3:].isna().all()
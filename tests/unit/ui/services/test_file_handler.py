@@ -151,6 +151,36 @@ class TestValidateFile:
         assert errors == []
 
 
+@pytest.mark.unit
+class TestInspectFile:
+    """測試只讀取結構的檔案檢查"""
+
+    def test_xlsx_sheets_and_header(self, handler, tmp_path):
+        """xlsx 回傳所有工作表名稱與第一個工作表的標題列"""
+        import pandas as pd
+        path = str(tmp_path / "po.xlsx")
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+            pd.DataFrame({"PO#": ["PO1"], "Amount": [1]}).to_excel(writer, sheet_name="PO", index=False)
+            pd.DataFrame({"x": [1]}).to_excel(writer, sheet_name="Ref", index=False)
+
+        info = handler.inspect_file(path)
+        assert info == {"sheet_names": ["PO", "Ref"], "columns": ["PO#", "Amount"]}
+        assert handler.validate_file(path, 'raw_po') == []
+
+    def test_csv_header(self, handler, sample_csv):
+        assert handler.inspect_file(sample_csv)["columns"] == ["col1", "col2"]
+
+    def test_corrupted_xlsx(self, handler, tmp_path):
+        """無法開啟的 xlsx 回傳讀取錯誤"""
+        path = str(tmp_path / "broken.xlsx")
+        with open(path, 'wb') as f:
+            f.write(b"not a workbook")
+
+        errors = handler.validate_file(path, 'raw_po')
+        assert len(errors) == 1
+        assert '無法讀取檔案' in errors[0]
+
+
 # =============================================================================
 # validate_all_files 測試
 # =============================================================================
@@ -0,0 +1,213 @@
+"""
+PipelineWorker 單元測試
+
+測試常駐 worker 的工作佇列、即時進度事件與跨執行重用。
+"""
+
+import threading
+
+import pytest
+
+from accrual_bot.core.pipeline.base import PipelineStep, StepResult, StepStatus
+from accrual_bot.core.pipeline.context import ProcessingContext
+from accrual_bot.core.pipeline.pipeline import Pipeline, PipelineConfig
+from accrual_bot.ui.services.pipeline_worker import PipelineJob, PipelineWorker
+
+
+class GatedStep(PipelineStep):
+    """等待外部放行才完成的步驟（用來觀察執行中的進度）"""
+
+    def __init__(self, name: str, gate: threading.Event = None, fail: bool = False):
+        super().__init__(name=name)
+        self.gate = gate
+        self.fail = fail
+
+    async def execute(self, context: ProcessingContext) -> StepResult:
+        if self.gate is not None:
+            self.gate.wait(5)
+        status = StepStatus.FAILED if self.fail else StepStatus.SUCCESS
+        return StepResult(step_name=self.name, status=status, message=self.name)
+
+    async def validate_input(self, context: ProcessingContext) -> bool:
+        return True
+
+
+class FakeService:
+    """以預先建立的步驟組成 pipeline 的 service"""
+
+    instances = 0
+
+    def __init__(self, steps_factory=None):
+        FakeService.instances += 1
+        self.steps_factory = steps_factory or (lambda: [GatedStep("Load"), GatedStep("Export")])
+        self.build_calls = 0
+
+    def get_available_entities(self):
+        return ['SPX']
+
+    def build_pipeline(self, entity, proc_type, file_paths, processing_date=None, source_type=None):
+        self.build_calls += 1
+        pipeline = Pipeline(PipelineConfig(name=f"{entity}_{proc_type}"))
+        pipeline.add_steps(self.steps_factory())
+        return pipeline
+
+
+JOB_PARAMS = {'entity': 'SPX', 'proc_type': 'PO', 'file_paths': {}, 'processing_date': 202512}
+
+
+@pytest.fixture
+def worker():
+    FakeService.instances = 0
+    w = PipelineWorker(service_factory=FakeService)
+    yield w
+    w.stop()
+
+
+@pytest.mark.unit
+class TestPipelineWorker:
+    """測試 PipelineWorker"""
+
+    def test_submit_returns_result(self, worker):
+        job = worker.submit(**JOB_PARAMS)
+        result = job.wait(timeout=10)
+
+        assert result['success'] is True
+        assert list(result['step_results']) == ['Load', 'Export']
+        assert job.done()
+        assert worker.jobs_completed == 1
+
+    def test_progress_streamed_while_running(self, worker):
+        """步驟完成時即推送事件，不需等待整個 pipeline 結束"""
+        gate = threading.Event()
+        worker.service_factory = lambda: FakeService(
+            lambda: [GatedStep("Load"), GatedStep("Export", gate=gate)]
+        )
+        job = worker.submit(**JOB_PARAMS)
+
+        events = []
+        for _ in range(100):
+            events.extend(job.poll_events())
+            if ('Export', 'running') in [(e.get('step'), e.get('status')) for e in events]:
+                break
+            threading.Event().wait(0.05)
+
+        assert not job.done()
+        progress = [(e['step'], e['status']) for e in events if e['type'] == 'progress']
+        assert progress == [('Load', 'running'), ('Load', 'completed'), ('Export', 'running')]
+
+        gate.set()
+        job.wait(timeout=10)
+        events.extend(job.poll_events())
+        assert events[-1]['type'] == 'done'
+        assert events[-1]['success'] is True
+        assert any(e['type'] == 'log' for e in events)
+
+    def test_failed_step_reported(self, worker):
+        worker.service_factory = lambda: FakeService(lambda: [GatedStep("Load", fail=True)])
+        job = worker.submit(**JOB_PARAMS)
+        result = job.wait(timeout=10)
+
+        assert result['success'] is False
+        progress = [(e['step'], e['status']) for e in job.poll_events() if e['type'] == 'progress']
+        assert progress[-1] == ('Load', 'failed')
+
+    def test_service_reused_across_jobs(self, worker):
+        """同一個 worker 只建立一次 service 與執行緒"""
+        first = worker.submit(**JOB_PARAMS)
+        first.wait(timeout=10)
+        thread = worker._thread
+        second = worker.submit(**JOB_PARAMS)
+        second.wait(timeout=10)
+
+        assert FakeService.instances == 1
+        assert worker.service.build_calls == 2
+        assert worker._thread is thread
+        assert worker.warmup_seconds is not None
+
+    def test_runner_exception_raised_from_wait(self, worker):
+        """build_pipeline 失敗時結果標記為失敗，不會卡住 worker"""
+        job = worker.submit(entity='SPX', proc_type='PO', file_paths={}, unknown_arg=1)
+
+        with pytest.raises(TypeError):
+            job.wait(timeout=10)
+        assert worker.submit(**JOB_PARAMS).wait(timeout=10)['success'] is True
+
+    def test_stop_and_restart(self, worker):
+        worker.start()
+        assert worker.wait_ready(timeout=10)
+        worker.stop()
+        assert not worker.is_alive()
+
+        assert worker.submit(**JOB_PARAMS).wait(timeout=10)['success'] is True
+
+    def test_timeout_excludes_queue_wait(self, worker):
+        """排隊中的工作不計入超時，只有執行中的工作會被放棄"""
+        gate = threading.Event()
+        worker.service_factory = lambda: FakeService(lambda: [GatedStep("Load", gate=gate)])
+        first = worker.submit(**JOB_PARAMS)
+        second = worker.submit(**JOB_PARAMS)
+        while first.started_at is None:
+            threading.Event().wait(0.01)
+
+        assert second.elapsed() == 0
+        assert worker.abandon_timed_out(timeout=60) is None
+        gate.set()
+        assert first.wait(timeout=10)['success'] is True
+        assert second.wait(timeout=10)['success'] is True
+
+    def test_hung_job_abandoned_and_worker_restarted(self, worker):
+        """卡住的工作超時後以 TimeoutError 結束，佇列中的工作改由新執行緒執行"""
+        gate = threading.Event()
+        builds = []
+
+        def steps_factory():
+            builds.append(1)
+            # 只有第一次執行卡住
+            return [GatedStep("Load", gate=gate if len(builds) == 1 else None)]
+
+        worker.service_factory = lambda: FakeService(steps_factory)
+        hung = worker.submit(**JOB_PARAMS)
+        queued = worker.submit(**JOB_PARAMS)
+        while hung.started_at is None:
+            threading.Event().wait(0.01)
+        stuck_thread = worker._thread
+
+        assert worker.abandon_timed_out(timeout=0) is hung
+        with pytest.raises(TimeoutError):
+            hung.wait(timeout=0)
+        assert queued.wait(timeout=10)['success'] is True
+        assert worker._thread is not stuck_thread
+
+        # 卡住的執行緒結束後不覆寫已放棄工作的結果，並自行停止
+        gate.set()
+        stuck_thread.join(10)
+        assert not stuck_thread.is_alive()
+        assert hung.result is None
+        assert isinstance(hung.error, TimeoutError)
+        assert worker.submit(**JOB_PARAMS).wait(timeout=10)['success'] is True
+
+
+@pytest.mark.unit
+class TestPipelineJob:
+    """測試 PipelineJob"""
+
+    def test_wait_timeout(self):
+        job = PipelineJob(1, {})
+        with pytest.raises(TimeoutError):
+            job.wait(timeout=0)
+
+    def test_poll_events_drains_queue(self):
+        job = PipelineJob(1, {})
+        job.emit('log', message='a')
+        job.emit('log', message='b')
+
+        assert [e['message'] for e in job.poll_events()] == ['a', 'b']
+        assert job.poll_events() == []
+
+    def test_elapsed_counts_from_start(self):
+        job = PipelineJob(1, {})
+        assert job.elapsed() == 0
+        job.started_at = job.submitted_at + 5
+        job.finished_at = job.started_at + 3
+
+        assert job.elapsed() == 3
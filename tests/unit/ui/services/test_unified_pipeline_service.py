@@ -310,6 +310,35 @@ class TestEnrichFilePaths:
         )
         assert result['raw_po'] == '/tmp/test.csv'
 
+    @patch('accrual_bot.tasks.pipeline_service.ConfigManager')
+    def test_enrich_keeps_resolved_entries(self, mock_config_cls, service):
+        """已含 path/params 的項目（load_file_paths 結果）不應重複包裝"""
+        mock_config_instance = MagicMock()
+        mock_config_instance.get_paths_config.return_value = {
+            'raw_po': {'encoding': 'utf-8'},
+        }
+        mock_config_cls.return_value = mock_config_instance
+
+        resolved = {'path': '/tmp/test.csv', 'params': {'encoding': 'big5'}}
+        result = service._enrich_file_paths({'raw_po': resolved}, 'SPX', 'PO')
+        assert result['raw_po'] == resolved
+
+    @patch('accrual_bot.tasks.pipeline_service.ConfigManager')
+    def test_get_file_config(self, mock_config_cls, service):
+        """get_file_config 與 build_pipeline 使用相同參數，無參數時 params 為空字典"""
+        mock_config_instance = MagicMock()
+        mock_config_instance.get_paths_config.return_value = {
+            'raw_po': {'encoding': 'utf-8'},
+        }
+        mock_config_cls.return_value = mock_config_instance
+
+        assert service.get_file_config('raw_po', '/tmp/po.csv', 'SPX', 'PO') == {
+            'path': '/tmp/po.csv', 'params': {'encoding': 'utf-8'}
+        }
+        assert service.get_file_config('other', '/tmp/x.csv', 'SPX', 'PO') == {
+            'path': '/tmp/x.csv', 'params': {}
+        }
+
     @patch('accrual_bot.tasks.pipeline_service.ConfigManager')
     def test_enrich_with_source_type_suffix(self, mock_config_cls, service):
         """PROCUREMENT 帶 source_type 時，應嘗試 suffixed key 查找參數"""
@@ -0,0 +1,102 @@
+"""
+UploadIngestor 單元測試
+
+測試上傳檔案背景解析與交給載入步驟的 Parquet 快取 handoff。
+"""
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from accrual_bot.core.datasources import DataSourceFactory
+from accrual_bot.core.datasources.ingest_cache import IngestCache, set_ingest_cache
+from accrual_bot.ui.services.upload_ingest import (
+    INGEST_FAILED,
+    INGEST_READY,
+    UploadIngestor,
+)
+
+
+@pytest.fixture
+def ingest_cache(tmp_path):
+    """啟用的輸入檔案快取（寫入暫存目錄）"""
+    cache = IngestCache(cache_dir=str(tmp_path / "ingest"), max_size_mb=10)
+    set_ingest_cache(cache)
+    yield cache
+    set_ingest_cache(None)
+
+
+@pytest.fixture
+def xlsx_file(tmp_path):
+    path = tmp_path / "raw_po_upload.xlsx"
+    pd.DataFrame({"PO#": ["PO1", "PO2"], "Amount": [10, 20]}).to_excel(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def ingestor():
+    return UploadIngestor()
+
+
+@pytest.mark.unit
+class TestUploadIngestor:
+    """測試 UploadIngestor"""
+
+    def test_ingest_writes_cache_entry(self, ingestor, ingest_cache, xlsx_file):
+        record = ingestor.submit('raw_po', xlsx_file, {'dtype': str})
+        assert ingestor.wait(timeout=30)
+
+        assert record.status == INGEST_READY
+        assert (record.rows, record.columns) == (2, 2)
+        assert record.upload_hash
+        assert ingest_cache.get_stats()['entries'] == 1
+
+    def test_handoff_lets_loader_read_parquet(self, ingestor, ingest_cache, xlsx_file):
+        """載入步驟以 handoff 參數讀取時命中預先解析的 Parquet"""
+        ingestor.submit('raw_po', xlsx_file, {'dtype': str})
+        ingestor.wait(timeout=30)
+
+        handoff = ingestor.handoff_file_paths({'raw_po': xlsx_file, 'other': '/tmp/other.xlsx'})
+        assert handoff['other'] == '/tmp/other.xlsx'
+        assert handoff['raw_po'] == {'path': xlsx_file, 'params': {'dtype': str, 'ingest_cache': True}}
+
+        hits_before = ingest_cache.hits
+        source = DataSourceFactory.create_from_file(xlsx_file, **handoff['raw_po']['params'])
+        df = asyncio.run(source.read())
+
+        assert ingest_cache.hits == hits_before + 1
+        assert df['PO#'].tolist() == ['PO1', 'PO2']
+        assert df['Amount'].tolist() == ['10', '20']
+
+    def test_same_file_not_resubmitted(self, ingestor, ingest_cache, xlsx_file):
+        first = ingestor.submit('raw_po', xlsx_file)
+        second = ingestor.submit('raw_po', xlsx_file)
+        assert first is second
+
+        changed = ingestor.submit('raw_po', xlsx_file, {'dtype': str})
+        assert changed is not first
+
+    def test_failed_ingest_not_handed_off(self, ingestor, ingest_cache, tmp_path):
+        """解析失敗的檔案維持原路徑，由載入步驟照常解析"""
+        path = tmp_path / "broken.xlsx"
+        path.write_bytes(b"not a workbook")
+        record = ingestor.submit('raw_po', str(path))
+        ingestor.wait(timeout=30)
+
+        assert record.status == INGEST_FAILED
+        assert record.error
+        assert ingestor.handoff_file_paths({'raw_po': str(path)}) == {'raw_po': str(path)}
+
+    def test_unsupported_format_skipped(self, ingestor, tmp_path):
+        path = tmp_path / "data.parquet"
+        pd.DataFrame({"a": [1]}).to_parquet(path)
+        assert ingestor.submit('raw_po', str(path)) is None
+
+    def test_discard(self, ingestor, ingest_cache, xlsx_file):
+        ingestor.submit('raw_po', xlsx_file)
+        ingestor.wait(timeout=30)
+        ingestor.discard('raw_po')
+
+        assert ingestor.get('raw_po') is None
+        assert ingestor.handoff_file_paths({'raw_po': xlsx_file}) == {'raw_po': xlsx_file}
@@ -3,7 +3,9 @@ import pytest
 import pandas as pd
 import numpy as np
 import logging
+from unittest.mock import MagicMock
 
+from accrual_bot.utils.logging.logger import WarningAggregator
 from accrual_bot.utils.helpers.data_utils import (
     clean_nan_values,
     safe_string_operation,
@@ -19,10 +21,13 @@ from accrual_bot.utils.helpers.data_utils import (
     validate_dataframe_columns,
     concat_dataframes_safely,
     extract_date_range_from_description,
+    extract_date_ranges,
+    get_erm_desc_fields,
     extract_clean_description,
     give_account_by_keyword,
     parallel_apply,
     memory_efficient_operation,
+    compact_dtypes,
     classify_description,
 )
 
@@ -355,6 +360,126 @@ class TestExtractDateRangeFromDescription:
         )
         assert result == "100001,100002"
 
+    def test_without_logger(self, date_patterns):
+        """未提供 logger 時改用模組記錄器，不應拋出例外"""
+        assert extract_date_range_from_description("", patterns=date_patterns) == "100001,100002"
+
+    def test_warnings_aggregated(self, date_patterns):
+        """提供 WarningAggregator 時只計數，不逐筆輸出"""
+        logger = MagicMock()
+        warnings = WarningAggregator(logger)
+        for desc in ["", None, "2024/13 月份", "2024/03 月份"]:
+            extract_date_range_from_description(
+                desc, patterns=date_patterns, logger=logger, warnings=warnings
+            )
+        logger.warning.assert_not_called()
+        assert warnings.counts == {"描述為空，返回預設日期範圍": 2, "日期格式無效": 1}
+
+
+@pytest.mark.unit
+class TestExtractDateRanges:
+    """測試 extract_date_ranges — 批次日期範圍擷取"""
+
+    @pytest.fixture
+    def date_patterns(self):
+        return {
+            'DATE_YMD_TO_YMD': r'(\d{4}/\d{2}/\d{2})\s*[-~]\s*(\d{4}/\d{2}/\d{2})',
+            'DATE_YM_TO_YM': r'(\d{4}/\d{2})\s*[-~]\s*(\d{4}/\d{2})',
+            'DATE_YMD': r'(\d{4}/\d{2}/\d{2})',
+            'DATE_YM': r'(\d{4}/\d{2})',
+        }
+
+    @pytest.fixture
+    def descriptions(self):
+        return pd.Series([
+            "期間：2024/01/01-2024/12/31",
+            "合約 2024/01-2024/06",
+            "發票日期 2024/06/15",
+            "2024/03 月份",
+            "沒有任何日期的描述文字",
+            "",
+            None,
+            float('nan'),
+            "無效 2024/13-2024/14 但有 2024/05",
+            "日期無效 2024/02/40 退回月份 2024/02/40",
+            "2024/03 月份",
+        ], index=range(100, 111))
+
+    def test_matches_scalar_version(self, date_patterns, descriptions, mock_logger):
+        """結果應與逐筆版本一致"""
+        result = extract_date_ranges(descriptions, patterns=date_patterns)
+        expected = descriptions.apply(
+            lambda x: extract_date_range_from_description(
+                x, patterns=date_patterns, logger=mock_logger
+            )
+        )
+        assert result['YMs of Item Description'].tolist() == expected.tolist()
+        assert result.index.equals(descriptions.index)
+
+    def test_integer_columns(self, date_patterns, descriptions):
+        """應輸出 Int32 起迄欄位"""
+        result = extract_date_ranges(descriptions, patterns=date_patterns)
+        assert str(result['erm_desc_start'].dtype) == 'Int32'
+        assert result.loc[100, 'erm_desc_start'] == 202401
+        assert result.loc[100, 'erm_desc_end'] == 202412
+        assert result.loc[104, 'erm_desc_start'] == 100001
+        assert result.loc[104, 'erm_desc_end'] == 100002
+        assert result['erm_desc_format_error'].tolist() == (
+            [False] * 4 + [True] * 5 + [False, False]
+        )
+
+    def test_memo_reused(self, date_patterns, descriptions):
+        """提供 memo 時應寫入並於下次呼叫重用"""
+        memo = {}
+        first = extract_date_ranges(descriptions, patterns=date_patterns, memo=memo)
+        assert memo["合約 2024/01-2024/06"] == (202401, 202406)
+
+        memo["合約 2024/01-2024/06"] = (209901, 209912)
+        second = extract_date_ranges(descriptions, patterns=date_patterns, memo=memo)
+        assert second.loc[101, 'YMs of Item Description'] == "209901,209912"
+        assert second.drop(index=101).equals(first.drop(index=101))
+
+    def test_empty_descriptions_logged_once(self, date_patterns, descriptions):
+        """空描述（空字串 / None / NaN）彙總為一行 warning"""
+        logger = MagicMock()
+        extract_date_ranges(descriptions, patterns=date_patterns, logger=logger)
+        logger.warning.assert_called_once()
+        assert logger.warning.call_args.args[1:] == ('3',)
+
+    def test_empty_series(self, date_patterns):
+        """空 Series 應回傳空結果"""
+        result = extract_date_ranges(pd.Series([], dtype='object'), patterns=date_patterns)
+        assert result.empty
+        assert 'YMs of Item Description' in result.columns
+
+
+@pytest.mark.unit
+class TestGetErmDescFields:
+    """測試 get_erm_desc_fields — 摘要日期區間欄位存取"""
+
+    def test_prefers_integer_columns(self):
+        """有整數欄位時不應讀取字串欄位"""
+        df = pd.DataFrame({
+            'YMs of Item Description': ['應被忽略', '應被忽略'],
+            'erm_desc_start': pd.array([202401, 100001], dtype='Int32'),
+            'erm_desc_end': pd.array([202412, 100002], dtype='Int32'),
+        })
+        start, end, format_error = get_erm_desc_fields(df)
+        assert start.tolist() == [202401, 100001]
+        assert end.tolist() == [202412, 100002]
+        assert format_error.tolist() == [False, True]
+
+    def test_falls_back_to_string_column(self):
+        """缺少整數欄位時從字串欄位轉換"""
+        df = pd.DataFrame({'YMs of Item Description': ['202401,202412', '100001,100002']})
+        start, end, format_error = get_erm_desc_fields(df)
+        assert start.tolist() == [202401, 100001]
+        assert end.tolist() == [202412, 100002]
+        assert format_error.tolist() == [False, True]
+
+    def test_missing_columns_returns_none(self):
+        assert get_erm_desc_fields(pd.DataFrame({'a': [1]})) is None
+
 
 @pytest.mark.unit
 class TestExtractCleanDescription:
@@ -477,6 +602,68 @@ class TestMemoryEfficientOperation:
             memory_efficient_operation(df, lambda d: 1 / 0)
 
 
+@pytest.mark.unit
+class TestCompactDtypes:
+    """測試 compact_dtypes — 欄位型別壓縮"""
+
+    @pytest.fixture
+    def raw_df(self):
+        n = 1000
+        return pd.DataFrame({
+            'Department': np.random.choice(['001', '002', '003'], n),
+            'PO#': [f'PO{i}' for i in range(n)],
+            'Entry Quantity': np.random.randint(1, 500, n).astype(str),
+            'Entry Amount': np.random.uniform(1, 1e6, n).round(2).astype(str),
+            'Remarks': ['1,234'] + ['10'] * (n - 1),
+        })
+
+    def test_low_cardinality_to_category(self, raw_df):
+        df, converted = compact_dtypes(raw_df, category_columns=['Department', 'PO#'])
+        assert isinstance(df['Department'].dtype, pd.CategoricalDtype)
+        # 唯一值比例過高者略過
+        assert df['PO#'].dtype == object
+        assert converted == {'Department': 'category'}
+
+    def test_numeric_to_float64(self, raw_df):
+        expected_amount = raw_df['Entry Amount'].astype(float)
+        df, converted = compact_dtypes(
+            raw_df, numeric_columns=['Entry Quantity', 'Entry Amount', 'Remarks']
+        )
+        # 全為整數者亦維持 float64，不降為整數型別
+        assert df['Entry Quantity'].dtype == np.float64
+        assert df['Entry Amount'].dtype == np.float64
+        assert df['Entry Amount'].equals(expected_amount)
+        # 含無法解析的值時不轉換
+        assert 'Remarks' not in converted
+        assert df['Remarks'].iloc[0] == '1,234'
+
+    def test_numeric_with_missing_values_kept_float(self):
+        df, converted = compact_dtypes(
+            pd.DataFrame({'q': ['1', None, '3']}), numeric_columns=['q']
+        )
+        assert converted == {'q': 'float64'}
+        assert pd.isna(df['q'].iloc[1])
+
+    def test_pyarrow_string_storage(self, raw_df):
+        df, converted = compact_dtypes(raw_df, string_storage='pyarrow')
+        assert str(df['PO#'].dtype) == 'string'
+        assert converted['PO#'] == 'string[pyarrow]'
+
+    def test_memory_reduction(self, raw_df):
+        before = raw_df.memory_usage(deep=True).sum()
+        df, _ = compact_dtypes(
+            raw_df.copy(),
+            category_columns=['Department'],
+            numeric_columns=['Entry Quantity', 'Entry Amount'],
+            string_storage='pyarrow',
+        )
+        assert df.memory_usage(deep=True).sum() * 3 < before
+
+    def test_empty_df(self):
+        df, converted = compact_dtypes(pd.DataFrame(), category_columns=['a'])
+        assert df.empty and converted == {}
+
+
 @pytest.mark.unit
 class TestClassifyDescription:
     """測試 classify_description — 描述分類"""
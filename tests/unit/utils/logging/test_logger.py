@@ -7,6 +7,7 @@ from unittest.mock import patch, MagicMock
 from accrual_bot.utils.logging.logger import (
     Logger,
     StructuredLogger,
+    WarningAggregator,
     ColoredFormatter,
     ColorCodes,
     get_logger,
@@ -215,16 +216,28 @@ class TestSetupFileHandler:
             assert log_dir.exists()
 
     def test_setup_file_handler_adds_handler(self, tmp_path):
-        """驗證 _setup_file_handler 成功添加 RotatingFileHandler"""
+        """驗證 _setup_file_handler 成功添加 RotatingFileHandler（佇列模式下由 listener 持有）"""
         log_dir = tmp_path / "logs"
         with patch('accrual_bot.utils.logging.logger.config_manager') as mock_cm:
             mock_cm.get.return_value = 'INFO'
             logger_instance = Logger()
             root = logger_instance.get_logger()
-            initial_handler_count = len(root.handlers)
+            initial_handler_count = len(logger_instance._output_handlers())
             logger_instance._setup_file_handler(root, str(log_dir))
-            assert len(root.handlers) > initial_handler_count
+            assert len(logger_instance._output_handlers()) > initial_handler_count
             assert 'file' in logger_instance._handlers
+            assert logger_instance._handlers['file'] in logger_instance._output_handlers()
+
+    def test_sync_mode_adds_handler_to_root(self, tmp_path):
+        """queue = False 時處理器直接掛在 root logger"""
+        with patch('accrual_bot.utils.logging.logger.config_manager') as mock_cm:
+            mock_cm.get.return_value = 'INFO'
+            mock_cm.get_boolean.return_value = False
+            logger_instance = Logger()
+            root = logger_instance.get_logger()
+            logger_instance._setup_file_handler(root, str(tmp_path / "logs"))
+            assert logger_instance._listener is None
+            assert logger_instance._handlers['file'] in root.handlers
 
     def test_setup_file_handler_creates_log_file(self, tmp_path):
         """驗證 _setup_file_handler 建立日誌檔案"""
@@ -240,6 +253,95 @@ class TestSetupFileHandler:
             assert len(log_files) >= 1
 
 
+@pytest.mark.unit
+class TestQueueLogging:
+    """測試佇列式輸出（QueueHandler / QueueListener）"""
+
+    @pytest.fixture
+    def queued(self, tmp_path):
+        """佇列模式、INFO 控制台層級、日誌寫入 tmp_path"""
+        with patch('accrual_bot.utils.logging.logger.config_manager') as mock_cm:
+            mock_cm.get.side_effect = lambda section, key, fallback=None: {
+                ('LOGGING', 'level'): 'INFO',
+                ('LOGGING', 'file_level'): 'INFO',
+                ('PATHS', 'log_path'): str(tmp_path),
+            }.get((section, key), fallback)
+            mock_cm.get_boolean.return_value = True
+            yield Logger()
+
+    def test_root_only_has_queue_handler(self, queued):
+        """root logger 僅掛 QueueHandler，控制台與檔案由 listener 寫出"""
+        root = queued.get_logger()
+        assert queued._queue_handler in root.handlers
+        assert queued._handlers['console'] not in root.handlers
+        assert queued._handlers['file'] not in root.handlers
+        assert set(queued._output_handlers()) == {queued._handlers['console'], queued._handlers['file']}
+        assert queued.get_log_stats()['queue_enabled'] is True
+
+    def test_records_written_by_listener(self, queued, tmp_path):
+        """flush 後背景執行緒已將紀錄寫入檔案"""
+        queued.get_logger('queue_test').info("queued message %s", 42)
+        queued.flush()
+        content = next(tmp_path.glob("Accrual_bot_*.log")).read_text(encoding='utf-8')
+        assert 'queued message 42' in content
+
+    def test_debug_disabled_at_info_level(self, queued):
+        """控制台與檔案皆為 INFO 時，子記錄器的 debug 呼叫不建立紀錄"""
+        child = queued.get_logger('hot_path')
+        assert child.level == logging.NOTSET
+        assert not child.isEnabledFor(logging.DEBUG)
+        assert child.isEnabledFor(logging.INFO)
+
+    def test_cleanup_stops_listener(self, queued):
+        """cleanup 停止背景執行緒並移除 QueueHandler"""
+        root = queued.get_logger()
+        queue_handler = queued._queue_handler
+        queued.cleanup()
+        assert queued._listener is None
+        assert queue_handler not in root.handlers
+
+
+@pytest.mark.unit
+class TestWarningAggregator:
+    """測試 WarningAggregator 逐列警告彙總"""
+
+    def test_flush_emits_one_line_per_message(self):
+        """同類警告只輸出一行，含筆數與範例"""
+        logger = MagicMock()
+        logger.isEnabledFor.return_value = True
+        aggregator = WarningAggregator(logger, max_examples=2)
+        for value in ['a', 'b', 'c']:
+            aggregator.add('日期格式無效', value)
+        for _ in range(1500):
+            aggregator.add('描述為空')
+
+        counts = aggregator.flush()
+
+        assert counts == {'日期格式無效': 3, '描述為空': 1500}
+        assert logger.log.call_count == 2
+        first, second = (c.args for c in logger.log.call_args_list)
+        assert first == (logging.WARNING, "%s: %s 筆（例: %s）", '日期格式無效', '3', ['a', 'b'])
+        assert second == (logging.WARNING, "%s: %s 筆", '描述為空', '1,500')
+        assert aggregator.counts == {}
+
+    def test_context_manager_flushes(self):
+        """離開 with 區塊時自動 flush"""
+        logger = MagicMock()
+        logger.isEnabledFor.return_value = True
+        with WarningAggregator(logger) as aggregator:
+            aggregator.add('msg')
+        logger.log.assert_called_once()
+
+    def test_disabled_level_skips_logging(self):
+        """級別未啟用時不輸出但仍回傳計數"""
+        logger = MagicMock()
+        logger.isEnabledFor.return_value = False
+        aggregator = WarningAggregator(logger)
+        aggregator.add('msg')
+        assert aggregator.flush() == {'msg': 1}
+        logger.log.assert_not_called()
+
+
 @pytest.mark.unit
 class TestColoredFormatterExtended:
     """ColoredFormatter 擴展測試"""